@@ -10,11 +10,12 @@ from decimal import Decimal
 from typing import List, Optional
 
 # from urllib.parse import urlparse # Removed unused import
-from crawl4ai import AsyncWebCrawler, CacheMode, MemoryAdaptiveDispatcher, RateLimiter
-from crawl4ai.async_configs import CrawlerRunConfig, LLMConfig
+from crawl4ai.async_configs import LLMConfig
 from crawl4ai.extraction_strategy import LLMExtractionStrategy
 from pydantic import BaseModel, Field, RootModel
 
+from webcrawl.llm_extraction import DirectExtractor
+
 # Setup logging
 logger = logging.getLogger(__name__)
 
@@ -242,20 +243,15 @@ def ensure_output_directory(directory="llm_extracted_data"):
     return directory
 
 
-dispatcher = MemoryAdaptiveDispatcher(
-    memory_threshold_percent=70.0,
-    check_interval=1.0,
-    max_session_permit=5,
-)
-rate_limiter = RateLimiter(
-    base_delay=(10, 60), max_delay=60, max_retries=3, rate_limit_codes=[429, 503]
-)
+# Maximum number of LLM requests in flight during an extraction run
+MAX_CONCURRENT_REQUESTS = 5
 
 
 async def process_files(file_paths, llm_strategy, output_dir, overwrite=False):
     """
     Process one or more files using a specified LLM extraction strategy and save the results.
-    Uses streaming mode to process results as they become available.
+    Files are sent to the LLM directly (no browser) and results are processed as
+    they become available.
 
     Args:
         file_paths (list): List of file paths to process
@@ -290,179 +286,159 @@ async def process_files(file_paths, llm_strategy, output_dir, overwrite=False):
             logger.info("No files to process after skipping existing outputs")
             return []
 
-    # Convert file paths to URLs with file:// protocol
-    file_urls = [f"file://{os.path.abspath(path)}" for path in file_paths]
-
     logger.info(f"PROGRESS:extracting_machine:extract_sachanlagen:Processing {len(file_paths)} files using streaming mode")
 
-    config = CrawlerRunConfig(
-        cache_mode=CacheMode.ENABLED,
-        extraction_strategy=llm_strategy,
-        stream=True,  # Enable streaming mode
-        verbose=False,
-    )
+    extractor = DirectExtractor(llm_strategy, max_concurrent=MAX_CONCURRENT_REQUESTS)
+    file_urls = [f"file://{os.path.abspath(path)}" for path in file_paths]
 
     extracted_data = []
     processed_count = 0
 
-    async with AsyncWebCrawler() as crawler:
-        # Use streaming mode to process files as they complete
-        async for result in await crawler.arun_many(
-            urls=file_urls,
-            config=config,
-            dispatcher=dispatcher,
-            rate_limiter=rate_limiter,
-        ):  # type: ignore
-            processed_count += 1
-
-            # --- Get file path and define output file path ---
-            file_path = "Unknown file"
-            output_file = None
-            if result.url in file_urls:
-                file_path = file_paths[file_urls.index(result.url)]
-                basename = os.path.basename(file_path)
-                name_without_ext = os.path.splitext(basename)[0]
-                output_file = os.path.join(output_dir, f"{name_without_ext}.json")
-
-            # --- Progress Logging ---
-            log_message_subject = "Unknown file"
-            company_name_from_html = ""
-            if file_path != "Unknown file":
-                company_name_from_html = extract_company_name(file_path)
-                if company_name_from_html:
-                    log_message_subject = f"company {company_name_from_html}"
-                else:
-                    log_message_subject = f"file {os.path.basename(file_path)}"
-            logger.info(
-                f"PROGRESS:extracting_machine:extract_sachanlagen:{processed_count}/{len(file_paths)}:Processing {log_message_subject}"
-            )
-            # --- End Progress Logging ---
+    # Process files as their extraction completes
+    async for result in extractor.extract_many(file_paths):
+        processed_count += 1
 
-            # Process result as it comes in
-            if result.success and result.extracted_content and output_file:
-                # Extract company name from HTML comment (already done above for logging)
-                company_name = (
-                    company_name_from_html  # Use the name extracted for logging
-                )
+        # --- Get file path and define output file path ---
+        file_path = "Unknown file"
+        output_file = None
+        if result.url in file_urls:
+            file_path = file_paths[file_urls.index(result.url)]
+            basename = os.path.basename(file_path)
+            name_without_ext = os.path.splitext(basename)[0]
+            output_file = os.path.join(output_dir, f"{name_without_ext}.json")
 
-                # Add company_name to each entry in the extracted content
-                try:
-                    # Parse the extracted content if it's a string
-                    content_to_modify = result.extracted_content
-                    if isinstance(content_to_modify, str):
-                        content_to_modify = json.loads(content_to_modify)
-
-                    # Check for error in extracted content and raise exception if found
-                    if isinstance(content_to_modify, list) and any(
-                        isinstance(entry, dict) and entry.get("error") is True
-                        for entry in content_to_modify
-                    ):
-                        error_entry = next(
-                            entry
-                            for entry in content_to_modify
-                            if entry.get("error") is True
-                        )
-                        raise RuntimeError(
-                            f"Extraction error for '{company_name}': {error_entry.get('content', 'Unknown error')}"
-                        )
+        # --- Progress Logging ---
+        log_message_subject = "Unknown file"
+        company_name_from_html = ""
+        if file_path != "Unknown file":
+            company_name_from_html = extract_company_name(file_path)
+            if company_name_from_html:
+                log_message_subject = f"company {company_name_from_html}"
+            else:
+                log_message_subject = f"file {os.path.basename(file_path)}"
+        logger.info(
+            f"PROGRESS:extracting_machine:extract_sachanlagen:{processed_count}/{len(file_paths)}:Processing {log_message_subject}"
+        )
+        # --- End Progress Logging ---
 
-                    if (
-                        isinstance(content_to_modify, dict)
-                        and content_to_modify.get("error") is True
-                    ):
-                        raise RuntimeError(
-                            f"Extraction error for '{company_name}': {content_to_modify.get('content', 'Unknown error')}"
-                        )
+        # Process result as it comes in
+        if result.success and result.extracted_content and output_file:
+            # Extract company name from HTML comment (already done above for logging)
+            company_name = (
+                company_name_from_html  # Use the name extracted for logging
+            )
 
-                    # Add company name to each entry
-                    if isinstance(content_to_modify, list):
-                        for entry in content_to_modify:
-                            if isinstance(entry, dict):
-                                entry["company_name"] = company_name
-                    elif isinstance(content_to_modify, dict):
-                        content_to_modify["company_name"] = company_name
-
-                    # Update the result.extracted_content with the modified content
-                    result.extracted_content = content_to_modify
-                    logger.debug(f"Added company name '{company_name}' to content")
-                except json.JSONDecodeError as e:
-                    logger.warning(f"Could not parse extracted_content as JSON: {e}")
-                except KeyError as e:
-                    logger.warning(
-                        f"Missing expected key when adding company name: {e}"
-                    )
-                except Exception as e:
-                    logger.warning(f"Error adding company name to content: {e}")
-
-                # Only save output if content is non-empty and relevant
-                should_write = False
-                content = result.extracted_content
-                logger.debug(f"Content type: {type(content)}")
-                logger.debug(
-                    f"extracted content type: {type(result.extracted_content)}"
-                )
-                if isinstance(content, str):
-                    try:
-                        content = json.loads(content)
-                    except Exception:
-                        content = None
-                if isinstance(content, list) and len(content) > 0:
-                    # Check if at least one entry has Sachanlagen values or table_name
-                    if any(
-                        isinstance(e, dict) and (e.get("values") or e.get("table_name"))
-                        for e in content
-                    ):
-                        should_write = True
-                elif isinstance(content, dict) and (
-                    content.get("values") or content.get("table_name")
+            # Add company_name to each entry in the extracted content
+            try:
+                # Parse the extracted content if it's a string
+                content_to_modify = result.extracted_content
+                if isinstance(content_to_modify, str):
+                    content_to_modify = json.loads(content_to_modify)
+
+                # Check for error in extracted content and raise exception if found
+                if isinstance(content_to_modify, list) and any(
+                    isinstance(entry, dict) and entry.get("error") is True
+                    for entry in content_to_modify
                 ):
-                    should_write = True
-
-                if should_write:
-                    logger.debug(f"Writing output to {output_file}")
-                    with open(output_file, "w", encoding="utf-8") as f:
-                        if isinstance(result.extracted_content, str):
-                            f.write(result.extracted_content)
-                        else:
-                            json.dump(
-                                result.extracted_content,
-                                f,
-                                indent=2,
-                                ensure_ascii=False,
-                            )
-                    extracted_data.append(result.extracted_content)
-                    logger.info(
-                        f"Successfully extracted data for {log_message_subject}"
+                    error_entry = next(
+                        entry
+                        for entry in content_to_modify
+                        if entry.get("error") is True
                     )
-                else:
-                    logger.warning(
-                        f"No relevant Sachanlagen data found for {log_message_subject}"
+                    raise RuntimeError(
+                        f"Extraction error for '{company_name}': {error_entry.get('content', 'Unknown error')}"
                     )
-                    # Ensure no output file is created for irrelevant or empty data
-                    if os.path.exists(output_file):
-                        try:
-                            os.remove(output_file)
-                            logger.debug(
-                                f"Removed irrelevant output file: {output_file}"
-                            )
-                        except Exception as e:
-                            logger.warning(
-                                f"Failed to remove irrelevant output file {output_file}: {e}"
-                            )
-            else:
-                error_msg = getattr(result, "error_message", "Unknown error")
 
-                # Handle empty file or parsing errors specifically
-                if "'NoneType' object has no attribute 'find_all'" in str(error_msg):
-                    logger.warning(
-                        f"File appears to be empty or cannot be parsed: {file_path}"
+                if (
+                    isinstance(content_to_modify, dict)
+                    and content_to_modify.get("error") is True
+                ):
+                    raise RuntimeError(
+                        f"Extraction error for '{company_name}': {content_to_modify.get('content', 'Unknown error')}"
                     )
-                else:
-                    logger.warning(f"No content extracted: {error_msg}")
 
-        # Show usage stats
-        llm_strategy.show_usage()
-        return extracted_data
+                # Add company name to each entry
+                if isinstance(content_to_modify, list):
+                    for entry in content_to_modify:
+                        if isinstance(entry, dict):
+                            entry["company_name"] = company_name
+                elif isinstance(content_to_modify, dict):
+                    content_to_modify["company_name"] = company_name
+
+                # Update the result.extracted_content with the modified content
+                result.extracted_content = content_to_modify
+                logger.debug(f"Added company name '{company_name}' to content")
+            except json.JSONDecodeError as e:
+                logger.warning(f"Could not parse extracted_content as JSON: {e}")
+            except KeyError as e:
+                logger.warning(
+                    f"Missing expected key when adding company name: {e}"
+                )
+            except Exception as e:
+                logger.warning(f"Error adding company name to content: {e}")
+
+            # Only save output if content is non-empty and relevant
+            should_write = False
+            content = result.extracted_content
+            logger.debug(f"Content type: {type(content)}")
+            logger.debug(
+                f"extracted content type: {type(result.extracted_content)}"
+            )
+            if isinstance(content, str):
+                try:
+                    content = json.loads(content)
+                except Exception:
+                    content = None
+            if isinstance(content, list) and len(content) > 0:
+                # Check if at least one entry has Sachanlagen values or table_name
+                if any(
+                    isinstance(e, dict) and (e.get("values") or e.get("table_name"))
+                    for e in content
+                ):
+                    should_write = True
+            elif isinstance(content, dict) and (
+                content.get("values") or content.get("table_name")
+            ):
+                should_write = True
+
+            if should_write:
+                logger.debug(f"Writing output to {output_file}")
+                with open(output_file, "w", encoding="utf-8") as f:
+                    if isinstance(result.extracted_content, str):
+                        f.write(result.extracted_content)
+                    else:
+                        json.dump(
+                            result.extracted_content,
+                            f,
+                            indent=2,
+                            ensure_ascii=False,
+                        )
+                extracted_data.append(result.extracted_content)
+                logger.info(
+                    f"Successfully extracted data for {log_message_subject}"
+                )
+            else:
+                logger.warning(
+                    f"No relevant Sachanlagen data found for {log_message_subject}"
+                )
+                # Ensure no output file is created for irrelevant or empty data
+                if os.path.exists(output_file):
+                    try:
+                        os.remove(output_file)
+                        logger.debug(
+                            f"Removed irrelevant output file: {output_file}"
+                        )
+                    except Exception as e:
+                        logger.warning(
+                            f"Failed to remove irrelevant output file {output_file}: {e}"
+                        )
+        else:
+            error_msg = getattr(result, "error_message", "Unknown error")
+            logger.warning(f"No content extracted from {file_path}: {error_msg}")
+
+    # Show usage stats
+    llm_strategy.show_usage()
+    return extracted_data
 
 
 async def check_and_reprocess_error_files(output_dir, input_dir, ext, llm_strategy):
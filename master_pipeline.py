@@ -30,6 +30,9 @@ from tqdm import tqdm  # Add tqdm import
 
 # Import the enhanced ArtifactManager for artifact management
 from utils.artifact_manager import ArtifactManager as BaseArtifactManager
+from webcrawl.llm_cache import configure_llm_cache
+from webcrawl.llm_executor import configure_llm_executor
+from webcrawl.plural_lexicon import configure_plural_lexicon
 
 # --- Artifact Management ---
 
@@ -109,6 +112,11 @@ def parse_arguments() -> argparse.Namespace:
         action="store_true",
         help="Skip validation of LLM providers (not recommended for production runs)",
     )
+    parser.add_argument(
+        "--no-llm-cache",
+        action="store_true",
+        help="Send every LLM request instead of reusing cached answers",
+    )
 
     return parser.parse_args()
 
@@ -244,6 +252,9 @@ def merge_config_with_args(
     if args.verbose:
         merged_config["log_level"] = "DEBUG"
 
+    if args.no_llm_cache:
+        merged_config["llm_cache"] = {**config.get("llm_cache", {}), "enabled": False}
+
     return merged_config
 
 
@@ -545,7 +556,10 @@ def run_extracting_machine_pipeline(
 
 
 def run_webcrawl_pipeline(
-    extracting_output: str, output_dir: str, category: Optional[str] = None
+    extracting_output: str,
+    output_dir: str,
+    category: Optional[str] = None,
+    webcrawl_config: Optional[Dict[str, Any]] = None,
 ) -> tuple[str, PipelineArtifacts]:
     """
     Run the web crawling and keyword extraction pipeline component.
@@ -560,6 +574,7 @@ def run_webcrawl_pipeline(
     Args:
         extracting_output: Path to the filtered/processed CSV file from extracting machine pipeline
         output_dir: Path to output directory
+        webcrawl_config: The "webcrawl" section of the pipeline config
 
     Returns:
         str: Path to the output file from this pipeline component
@@ -580,14 +595,27 @@ def run_webcrawl_pipeline(
     # Check if extracting_output is a tuple (path, artifacts) and extract just the path
     if isinstance(extracting_output, tuple) and len(extracting_output) > 0:
         extracting_output = extracting_output[0]
+    webcrawl_config = webcrawl_config or {}
     # Step 1: Crawl domain
     logger.info("Step 1: Crawling company domains")
     try:
         from webcrawl.crawl_domain import main as crawl_domain_mains
 
+        # The store replaces the aggregated files by manifests, so it is opt-in
+        crawl_store_config = webcrawl_config.get("crawl_store", {})
+
         crawl_output = asyncio.run(
             crawl_domain_mains(
-                input_csv_path=extracting_output, output_dir=str(crawl_dir)
+                input_csv_path=extracting_output,
+                output_dir=str(crawl_dir),
+                link_scoring=webcrawl_config.get("link_scoring"),
+                resource_blocking=webcrawl_config.get("resource_blocking"),
+                dispatcher_config=webcrawl_config.get("dispatcher"),
+                crawl_store_dir=crawl_store_config.get("path")
+                if crawl_store_config.get("enabled", False)
+                else None,
+                page_cache_config=webcrawl_config.get("page_cache"),
+                html_guard_config=webcrawl_config.get("html_guard"),
             )
         )
         if not crawl_output:
@@ -657,15 +685,24 @@ def run_webcrawl_pipeline(
     # Step 4: Pluralize keywords with LLM
     logger.info("Step 4: Pluralizing keywords")
     try:
+        from webcrawl.pluralize_with_llm import (
+            DEFAULT_BATCH_SIZE,
+            DEFAULT_BATCH_TOKEN_BUDGET,
+        )
         from webcrawl.pluralize_with_llm import (
             process_file_or_directory as pluralize_with_llm,
         )
 
         # Always use directory output path since we're processing a directory
         pluralize_output_path = str(pluralize_dir)
+        pluralization_config = webcrawl_config.get("pluralization", {})
         pluralize_output = pluralize_with_llm(
             input_path=str(process_type_dir),  # Use the whole folder for pluralization
             output_path=pluralize_output_path,
+            batch_size=pluralization_config.get("batch_size", DEFAULT_BATCH_SIZE),
+            batch_token_budget=pluralization_config.get(
+                "batch_token_budget", DEFAULT_BATCH_TOKEN_BUDGET
+            ),
         )
         if not pluralize_output:
             raise ValueError("pluralize_with_llm returned None or empty output.")
@@ -707,11 +744,13 @@ def run_webcrawl_pipeline(
     csv_output = str(output_path / "webcrawl_output.csv")
     try:
         from webcrawl.convert_to_csv import convert_json_to_csv
+        from webcrawl.site_groups import SHARED_SITES_FILENAME
 
         final_output = convert_json_to_csv(
             json_file_path=consolidated_output,
             csv_file_path=csv_output,
             omit_config_path=None,
+            shared_sites_path=str(crawl_dir / SHARED_SITES_FILENAME),
         )
         if not final_output:
             raise ValueError("convert_json_to_csv returned None or empty output.")
@@ -921,6 +960,10 @@ def run_pipeline(config: Dict[str, Any]) -> str:
     phase_status = {}
     final_output = ""  # Initialize final_output
     pipeline_phases = []  # Initialize pipeline_phases
+    # Shared by the LLM calls of all phases
+    llm_cache = configure_llm_cache(config.get("llm_cache"))
+    llm_executor = configure_llm_executor(config.get("llm_executor", {}))
+    plural_lexicon = configure_plural_lexicon(config.get("plural_lexicon"))
 
     try:
         # Extract required configuration parameters
@@ -970,7 +1013,11 @@ def run_pipeline(config: Dict[str, Any]) -> str:
                 "Phase 2: Crawling & Scraping Keywords",
                 run_webcrawl_pipeline,
                 webcrawl_output_dir,
-                {"extracting_output": None, "category": category},
+                {
+                    "extracting_output": None,
+                    "category": category,
+                    "webcrawl_config": config.get("webcrawl", {}),
+                },
             ),
             (
                 "Phase 3: Final Data Integration",
@@ -1086,6 +1133,11 @@ def run_pipeline(config: Dict[str, Any]) -> str:
         for phase, status in phase_status.items():
             logger.info(f"{phase}: {status}")
         logger.info(f"Final Output File: {final_destination}")
+        if llm_cache is not None:
+            llm_cache.log_summary()
+        llm_executor.log_summary()
+        if plural_lexicon is not None:
+            plural_lexicon.log_summary()
         logger.info("----------------------")
 
         return str(final_destination)
@@ -1108,8 +1160,16 @@ def run_pipeline(config: Dict[str, Any]) -> str:
                 logger.info(f"{phase_name}: {status}")
         else:
             logger.info("Pipeline failed before phases could be defined.")
+        if llm_cache is not None:
+            llm_cache.log_summary()
+        llm_executor.log_summary()
+        if plural_lexicon is not None:
+            plural_lexicon.log_summary()
         logger.info("----------------------")
         raise
+    finally:
+        # Stop the worker threads of the LLM stages
+        configure_llm_executor(None)
 
 
 def main() -> None:
@@ -304,6 +304,11 @@ def _build_pipeline_config(temp_csv_path: str, job_output_dir: str, job_id: str,
         "log_level": "INFO",
         "skip_llm_validation": True,
         "job_id": job_id,
+        # Concurrent jobs share the cached LLM answers
+        "llm_cache": st_session_state_config.get("llm_cache", {}),
+        "plural_lexicon": st_session_state_config.get(
+            "plural_lexicon", {"overrides_path": "plural_overrides.json"}
+        ),
     }
 
     return pipeline_config
@@ -49,6 +49,33 @@ class TestMasterPipeline(unittest.TestCase):
                 self.assertIsNotNone(artifacts.get_artifact('webcrawl', 'crawl_output'))
                 self.assertIsNotNone(artifacts.get_artifact('webcrawl', 'final_output'))
 
+    def test_run_webcrawl_pipeline_without_crawl_store_section_keeps_store_disabled(self):
+        """
+        Test that the crawl store stays disabled when the config has no crawl_store section.
+
+        Method being tested: run_webcrawl_pipeline
+        Scenario: webcrawl_config without a crawl_store section (mocked stages)
+        Expected behavior: crawl_domain.main is called with crawl_store_dir=None
+        """
+        import tempfile
+
+        from master_pipeline import run_webcrawl_pipeline
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_csv = f"{temp_dir}/input.csv"
+            output_dir = f"{temp_dir}/output"
+            with open(input_csv, 'w') as f:
+                f.write("company name,location,url\nTest,Loc,https://test.com\n")
+            with patch('webcrawl.crawl_domain.main', return_value=f'{temp_dir}/crawled_dir') as mock_crawl, \
+                 patch('webcrawl.extract_llm.run_extract_llm', return_value=f'{temp_dir}/extracted_dir'), \
+                 patch('webcrawl.fill_process_type.run_fill_process_type', return_value=[f'{temp_dir}/filled.json']), \
+                 patch('webcrawl.pluralize_with_llm.process_file_or_directory', return_value=f'{temp_dir}/pluralized_dir'), \
+                 patch('webcrawl.consolidate.consolidate_main', return_value=f'{temp_dir}/consolidated.json'), \
+                 patch('webcrawl.convert_to_csv.convert_json_to_csv', return_value=f'{temp_dir}/converted.csv'):
+                run_webcrawl_pipeline(
+                    input_csv, output_dir, category='test', webcrawl_config={"page_cache": {}}
+                )
+                self.assertIsNone(mock_crawl.call_args.kwargs["crawl_store_dir"])
+
     def test_run_integration_pipeline_returns_artifacts(self):
         """
         Test that run_integration_pipeline returns both final output and artifacts.
@@ -437,7 +437,7 @@ class TestProcessFilesErrorHandling(unittest.TestCase):
         self.mock_llm_strategy = MagicMock()
         self.output_dir = "/tmp/test_output"
 
-    @patch('extract_sachanlagen.AsyncWebCrawler')
+    @patch('extract_sachanlagen.DirectExtractor')
     @patch('extract_sachanlagen.os.path.basename')
     @patch('extract_sachanlagen.os.path.splitext')
     @patch('extract_sachanlagen.extract_company_name')
@@ -447,7 +447,7 @@ class TestProcessFilesErrorHandling(unittest.TestCase):
     @patch('extract_sachanlagen.logger')
     async def test_nonetype_error_handling(self, mock_logger, mock_json_dump, mock_open,
                                            mock_path_join, mock_extract_company, mock_splitext,
-                                           mock_basename, MockCrawler):
+                                           mock_basename, MockExtractor):
         """Test handling of NoneType error in process_files"""
         # Setup
         file_paths = ["/path/to/test_file.html"]
@@ -467,9 +467,9 @@ class TestProcessFilesErrorHandling(unittest.TestCase):
         mock_result.url = file_urls[0]
         mock_result.error_message = "'NoneType' object has no attribute 'find_all'"
 
-        # Mock the crawler's arun_many method to return our mock result
-        mock_crawler_instance = MockCrawler.return_value.__aenter__.return_value
-        mock_crawler_instance.arun_many.return_value.__aiter__.return_value = [mock_result]
+        # Mock the extractor's extract_many method to return our mock result
+        mock_extractor_instance = MockExtractor.return_value
+        mock_extractor_instance.extract_many.return_value.__aiter__.return_value = [mock_result]
 
         # Call the function
         await process_files(file_paths, self.mock_llm_strategy, self.output_dir)
@@ -495,9 +495,9 @@ class TestProcessFilesErrorHandling(unittest.TestCase):
 
         mock_logger.info.assert_any_call("Created error placeholder for /tmp/test_output/test_file.json")
 
-    @patch('extract_sachanlagen.AsyncWebCrawler')
+    @patch('extract_sachanlagen.DirectExtractor')
     @patch('extract_sachanlagen.logger')
-    async def test_generic_error_handling(self, mock_logger, MockCrawler):
+    async def test_generic_error_handling(self, mock_logger, MockExtractor):
         """Test handling of generic errors in process_files"""
         # Setup
         file_paths = ["/path/to/test_file.html"]
@@ -509,9 +509,9 @@ class TestProcessFilesErrorHandling(unittest.TestCase):
         mock_result.url = file_urls[0]
         mock_result.error_message = "Some generic error occurred"
 
-        # Mock the crawler's arun_many method to return our mock result
-        mock_crawler_instance = MockCrawler.return_value.__aenter__.return_value
-        mock_crawler_instance.arun_many.return_value.__aiter__.return_value = [mock_result]
+        # Mock the extractor's extract_many method to return our mock result
+        mock_extractor_instance = MockExtractor.return_value
+        mock_extractor_instance.extract_many.return_value.__aiter__.return_value = [mock_result]
 
         # Call the function
         await process_files(file_paths, self.mock_llm_strategy, self.output_dir)
@@ -549,10 +549,10 @@ class TestProcessFilesSkipping(unittest.TestCase):
     @patch('extract_sachanlagen.os.path.basename')
     @patch('extract_sachanlagen.os.path.splitext')
     @patch('extract_sachanlagen.os.path.join')
-    @patch('extract_sachanlagen.AsyncWebCrawler')
+    @patch('extract_sachanlagen.DirectExtractor')
     @patch('extract_sachanlagen.logger')
     async def test_process_files_when_skipping_existing_output_files(self, mock_logger,
-                                                                     MockCrawler, mock_join,
+                                                                     MockExtractor, mock_join,
                                                                      mock_splitext, mock_basename,
                                                                      mock_exists):
         """Test process_files when skipping mechanism is enabled (default behavior)"""
@@ -568,9 +568,9 @@ class TestProcessFilesSkipping(unittest.TestCase):
         # Mock to indicate file1.json and file3.json already exist
         mock_exists.side_effect = [True, False, True]
 
-        # Mock the crawler's behavior (should not be called for skipped files)
-        mock_crawler_instance = MockCrawler.return_value.__aenter__.return_value
-        mock_crawler_instance.arun_many.return_value.__aiter__.return_value = [
+        # Mock the extractor's behavior (should not be called for skipped files)
+        mock_extractor_instance = MockExtractor.return_value
+        mock_extractor_instance.extract_many.return_value.__aiter__.return_value = [
             # Only file2.html should be processed
             self._create_mock_result(success=True, url=self.expected_file_urls[1], content=[{"values": {}}])
         ]
@@ -590,20 +590,17 @@ class TestProcessFilesSkipping(unittest.TestCase):
         # Verify message about skipped files
         mock_logger.info.assert_any_call("Skipping 2 files that already have output files")
 
-        # Verify file URLs passed to crawler are only for non-skipped files
-        expected_file_urls = ["file:///path/to/file2.html"]
-        mock_crawler_instance.arun_many.assert_called_once()
-        # Check that the first arg (urls) contains only non-skipped files
-        self.assertEqual(mock_crawler_instance.arun_many.call_args[1]['urls'], expected_file_urls)
+        # Verify only non-skipped files are passed to the extractor
+        mock_extractor_instance.extract_many.assert_called_once_with(["/path/to/file2.html"])
 
     @patch('extract_sachanlagen.os.path.exists')
     @patch('extract_sachanlagen.os.path.basename')
     @patch('extract_sachanlagen.os.path.splitext')
     @patch('extract_sachanlagen.os.path.join')
-    @patch('extract_sachanlagen.AsyncWebCrawler')
+    @patch('extract_sachanlagen.DirectExtractor')
     @patch('extract_sachanlagen.logger')
     async def test_process_files_when_overwrite_enabled(self, mock_logger,
-                                                        MockCrawler, mock_join,
+                                                        MockExtractor, mock_join,
                                                         mock_splitext, mock_basename,
                                                         mock_exists):
         """Test process_files when overwrite mechanism is enabled"""
@@ -619,9 +616,9 @@ class TestProcessFilesSkipping(unittest.TestCase):
         # Mock to indicate file1.json and file3.json already exist
         mock_exists.side_effect = [True, False, True]
 
-        # Mock the crawler's behavior (should process all files)
-        mock_crawler_instance = MockCrawler.return_value.__aenter__.return_value
-        mock_crawler_instance.arun_many.return_value.__aiter__.return_value = [
+        # Mock the extractor's behavior (should process all files)
+        mock_extractor_instance = MockExtractor.return_value
+        mock_extractor_instance.extract_many.return_value.__aiter__.return_value = [
             # All files should be processed
             self._create_mock_result(success=True, url=self.expected_file_urls[0], content=[{"values": {}}]),
             self._create_mock_result(success=True, url=self.expected_file_urls[1], content=[{"values": {}}]),
@@ -635,18 +632,16 @@ class TestProcessFilesSkipping(unittest.TestCase):
         mock_exists.assert_not_called()
 
         # Verify all files were processed
-        mock_crawler_instance.arun_many.assert_called_once()
-        # Check that urls parameter contains all file paths
-        self.assertEqual(mock_crawler_instance.arun_many.call_args[1]['urls'], self.expected_file_urls)
+        mock_extractor_instance.extract_many.assert_called_once_with(self.file_paths)
 
     @patch('extract_sachanlagen.os.path.exists')
     @patch('extract_sachanlagen.os.path.basename')
     @patch('extract_sachanlagen.os.path.splitext')
     @patch('extract_sachanlagen.os.path.join')
-    @patch('extract_sachanlagen.AsyncWebCrawler')
+    @patch('extract_sachanlagen.DirectExtractor')
     @patch('extract_sachanlagen.logger')
     async def test_process_files_when_all_files_should_be_skipped(self, mock_logger,
-                                                                  MockCrawler, mock_join,
+                                                                  MockExtractor, mock_join,
                                                                   mock_splitext, mock_basename,
                                                                   mock_exists):
         """Test process_files when all files should be skipped"""
@@ -662,8 +657,8 @@ class TestProcessFilesSkipping(unittest.TestCase):
         # Mock to indicate all files already exist
         mock_exists.side_effect = [True, True, True]
 
-        # Mock the crawler (should not be called at all)
-        mock_crawler_instance = MockCrawler.return_value.__aenter__.return_value
+        # Mock the extractor (should not be called at all)
+        mock_extractor_instance = MockExtractor.return_value
 
         # Call the function with overwrite=False
         result = await process_files(self.file_paths, self.mock_llm_strategy, self.output_dir, overwrite=False)
@@ -682,8 +677,8 @@ class TestProcessFilesSkipping(unittest.TestCase):
         mock_logger.info.assert_any_call("Skipping 3 files that already have output files")
         mock_logger.info.assert_any_call("No files to process after skipping existing outputs")
 
-        # Verify crawler was not used at all
-        mock_crawler_instance.arun_many.assert_not_called()
+        # Verify extractor was not used at all
+        mock_extractor_instance.extract_many.assert_not_called()
 
     @patch('extract_sachanlagen.os.path.exists')
     @patch('extract_sachanlagen.check_and_reprocess_error_files')
@@ -0,0 +1,84 @@
+"""Threaded local HTTP server serving canned responses for webcrawl tests."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+# A route is either a fixed (status, headers, body) response or a callable
+# receiving the request handler and returning one
+Response = Tuple[int, Dict[str, str], bytes]
+Route = Union[Response, Callable[[BaseHTTPRequestHandler], Response]]
+
+
+class LocalHTTPServer:
+    """
+    Serve a dict of routes on 127.0.0.1 for the duration of a test.
+
+    Usage:
+        with LocalHTTPServer({"/robots.txt": (200, {}, b"...")}) as server:
+            url = server.url("/robots.txt")
+    """
+
+    def __init__(self, routes: Optional[Dict[str, Route]] = None):
+        self.routes: Dict[str, Route] = dict(routes or {})
+        self.requests: List[Tuple[str, str, Dict[str, str]]] = []
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]  # type: ignore
+        return f"http://{host}:{port}"
+
+    def url(self, path: str) -> str:
+        return self.base_url + path
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self, send_body: bool) -> None:
+                server.requests.append((self.command, self.path, dict(self.headers)))
+                route = server.routes.get(self.path)
+                if route is None:
+                    status, headers, body = 404, {}, b"not found"
+                elif callable(route):
+                    status, headers, body = route(self)
+                else:
+                    status, headers, body = route
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if send_body:
+                    self.wfile.write(body)
+
+            def do_GET(self):
+                self._respond(send_body=True)
+
+            def do_HEAD(self):
+                self._respond(send_body=False)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "LocalHTTPServer":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "LocalHTTPServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
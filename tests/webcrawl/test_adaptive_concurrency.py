@@ -0,0 +1,117 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from crawl4ai import CrawlerRunConfig
+
+from webcrawl.adaptive_concurrency import (
+    AdaptiveConcurrencyDispatcher,
+    ConcurrencyController,
+    ConcurrencyPolicy,
+)
+
+
+def _controller(memory=50.0, **kwargs):
+    settings = dict(
+        initial_sessions=8,
+        min_sessions=1,
+        max_sessions=10,
+        target_latency=5.0,
+        max_error_rate=0.2,
+        window_size=4,
+        memory_threshold_percent=80.0,
+    )
+    settings.update(kwargs)
+    return ConcurrencyController(memory_percent=lambda: memory, **settings)
+
+
+class TestConcurrencyController(unittest.TestCase):
+
+    def test_record_healthyWindows_growUpToMax(self):
+        controller = _controller()
+        for _ in range(4 * 5):
+            controller.record(latency=1.0, success=True, status_code=200)
+
+        self.assertEqual(controller.limit, 10)
+        self.assertEqual(
+            [decision[:2] for decision in controller.decisions], [(8, 9), (9, 10)]
+        )
+
+    def test_record_decidesOncePerWindow(self):
+        controller = _controller()
+        for _ in range(3):
+            controller.record(latency=1.0, success=True)
+        self.assertEqual(controller.limit, 8)
+        controller.record(latency=1.0, success=True)
+        self.assertEqual(controller.limit, 9)
+
+    def test_record_throttled_halvesImmediately(self):
+        controller = _controller()
+        with self.assertLogs("webcrawl.adaptive_concurrency", level="INFO") as logs:
+            limit = controller.record(latency=0.5, success=True, status_code=429)
+
+        self.assertEqual(limit, 4)
+        self.assertIn("8 -> 4 sessions (1x 429/503", logs.output[0])
+        controller.record(latency=0.5, success=False, status_code=503)
+        controller.record(latency=0.5, success=False, status_code=503)
+        controller.record(latency=0.5, success=False, status_code=503)
+        self.assertEqual(controller.limit, 1)  # never below min_sessions
+
+    def test_record_highMemory_halves(self):
+        controller = _controller(memory=90.0)
+        for _ in range(4):
+            controller.record(latency=1.0, success=True)
+        self.assertEqual(controller.decisions, [(8, 4, "memory 90%")])
+
+    def test_record_errorsAndTimeouts_backOff(self):
+        controller = _controller()
+        controller.record(latency=30.0, success=False, error_message="Timeout 30000ms exceeded")
+        controller.record(latency=1.0, success=False, error_message="net::ERR_FAILED")
+        controller.record(latency=1.0, success=True)
+        controller.record(latency=1.0, success=True)
+        self.assertEqual(controller.decisions, [(8, 6, "error rate 50%")])
+
+    def test_record_slowPages_decrementByOne(self):
+        controller = _controller()
+        for _ in range(4):
+            controller.record(latency=7.5, success=True)
+        self.assertEqual(controller.decisions, [(8, 7, "latency 7.5s")])
+
+
+class TestConcurrencyPolicy(unittest.TestCase):
+
+    def test_from_config_readsPipelineDispatcherSection(self):
+        policy = ConcurrencyPolicy.from_config(
+            {"memory_threshold_percent": 85.0, "check_interval": 0.5, "max_sessions": 12}
+        )
+        dispatcher = policy.create_dispatcher("example.de")
+
+        self.assertEqual(dispatcher.memory_threshold_percent, 85.0)
+        self.assertEqual(dispatcher.check_interval, 0.5)
+        self.assertEqual(dispatcher.controller.max_sessions, 12)
+        self.assertEqual(dispatcher.controller.memory_threshold_percent, 85.0)
+        self.assertEqual(dispatcher.max_session_permit, dispatcher.controller.limit)
+        # Every domain gets its own controller
+        self.assertIsNot(policy.create_dispatcher().controller, dispatcher.controller)
+
+
+class TestAdaptiveConcurrencyDispatcher(unittest.TestCase):
+
+    def test_crawl_url_updatesSessionPermit(self):
+        controller = _controller(window_size=1)
+        dispatcher = AdaptiveConcurrencyDispatcher(controller)
+        result = MagicMock(success=True, status_code=429, error_message="")
+        dispatcher.crawler = MagicMock()
+        dispatcher.crawler.arun = AsyncMock(return_value=result)
+
+        task_result = asyncio.run(
+            dispatcher.crawl_url("https://example.de/a", CrawlerRunConfig(), "task-1")
+        )
+
+        self.assertIs(task_result.result, result)
+        self.assertEqual(dispatcher.max_session_permit, 4)
+        self.assertEqual(controller.pages, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
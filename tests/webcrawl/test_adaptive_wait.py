@@ -0,0 +1,81 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from crawl4ai import CrawlerRunConfig
+
+from webcrawl.adaptive_wait import WAIT_CAP_KEY, AdaptiveWaiter
+
+
+def _page(url, settle_ms):
+    page = MagicMock()
+    page.url = url
+    page.evaluate = AsyncMock(return_value=settle_ms)
+    return page
+
+
+class TestAdaptiveWaiter(unittest.TestCase):
+
+    def test_configure_replacesFixedDelayWithCap(self):
+        waiter = AdaptiveWaiter()
+        config = waiter.configure(
+            CrawlerRunConfig(delay_before_return_html=0.5, shared_data={"x": 1}), cap=0.5
+        )
+        self.assertEqual(config.delay_before_return_html, 0)
+        self.assertEqual(config.shared_data, {"x": 1, WAIT_CAP_KEY: 0.5})
+        # The cap survives the clone used for streaming
+        self.assertEqual(config.clone(stream=True).shared_data[WAIT_CAP_KEY], 0.5)
+
+    def test_before_retrieve_html_withoutCap_doesNotWait(self):
+        waiter = AdaptiveWaiter()
+        page = _page("https://example.de/a", 50)
+
+        asyncio.run(waiter.before_retrieve_html(page, config=CrawlerRunConfig()))
+
+        page.evaluate.assert_not_awaited()
+        self.assertEqual(waiter.pages, 0)
+
+    def test_before_retrieve_html_learnsPerHostWait(self):
+        waiter = AdaptiveWaiter()
+        config = waiter.configure(CrawlerRunConfig(), cap=1.0)
+
+        async def crawl(url, settle_ms):
+            page = _page(url, settle_ms)
+            await waiter.before_retrieve_html(page, config=config)
+            return page.evaluate.call_args[0][1][1]  # cap passed to the script (ms)
+
+        async def run():
+            caps = [await crawl(f"https://www.fast.de/{i}", 100) for i in range(4)]
+            caps.append(await crawl("https://slow.de/", 900))
+            return caps
+
+        caps = asyncio.run(run())
+
+        # Unknown host: full cap; after enough samples: learned 1.5 x 0.1s
+        self.assertEqual(caps[:3], [1000.0, 1000.0, 1000.0])
+        self.assertAlmostEqual(caps[3], 150.0)
+        self.assertEqual(caps[4], 1000.0)
+        self.assertAlmostEqual(waiter.total_waited, 1.3)
+        self.assertAlmostEqual(waiter.total_fixed, 5.0)
+
+    def test_wait_cap_neverExceedsConfiguredCap(self):
+        waiter = AdaptiveWaiter()
+        for _ in range(5):
+            waiter.record("example.de", 2.0)
+        self.assertEqual(waiter.wait_cap("example.de", 0.5), 0.5)
+
+    def test_before_retrieve_html_evaluateFails_returnsPage(self):
+        waiter = AdaptiveWaiter()
+        page = MagicMock()
+        page.url = "https://example.de"
+        page.evaluate = AsyncMock(side_effect=RuntimeError("page closed"))
+        config = waiter.configure(CrawlerRunConfig(), cap=1.0)
+
+        result = asyncio.run(waiter.before_retrieve_html(page, config=config))
+
+        self.assertIs(result, page)
+        self.assertEqual(waiter.settle_times, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
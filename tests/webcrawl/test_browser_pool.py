@@ -0,0 +1,148 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from webcrawl.browser_pool import BrowserPool
+
+
+def _make_crawler_factory():
+    """Return a factory producing mock crawlers and the list of created instances."""
+    created = []
+
+    def factory(*args, **kwargs):
+        crawler = MagicMock()
+        crawler.start = AsyncMock()
+        crawler.close = AsyncMock()
+        created.append(crawler)
+        return crawler
+
+    return factory, created
+
+
+def _memory(percent):
+    memory = MagicMock()
+    memory.percent = percent
+    return memory
+
+
+class TestBrowserPool(unittest.TestCase):
+
+    def test_lease_launchesBrowserOnceAcrossDomains(self):
+        factory, created = _make_crawler_factory()
+
+        async def run():
+            async with BrowserPool(headers={"Accept-Language": "de-DE"}) as pool:
+                for _ in range(3):
+                    async with pool.lease() as crawler:
+                        self.assertIs(crawler, created[0])
+                    pool.record_pages(5)
+            return pool
+
+        with patch("webcrawl.browser_pool.AsyncWebCrawler", side_effect=factory), \
+             patch("webcrawl.browser_pool.psutil.virtual_memory", return_value=_memory(10.0)):
+            pool = asyncio.run(run())
+
+        self.assertEqual(len(created), 1)
+        self.assertEqual(pool.launch_count, 1)
+        created[0].crawler_strategy.set_custom_headers.assert_called_once_with(
+            {"Accept-Language": "de-DE"}
+        )
+        created[0].close.assert_awaited_once()
+
+    def test_start_setsHooksOnEveryLaunch(self):
+        factory, created = _make_crawler_factory()
+        hook = AsyncMock()
+
+        async def run():
+            async with BrowserPool(
+                recycle_after_pages=1, hooks={"before_retrieve_html": hook}
+            ) as pool:
+                async with pool.lease():
+                    pass
+                pool.record_pages(1)
+                async with pool.lease():
+                    pass
+
+        with patch("webcrawl.browser_pool.AsyncWebCrawler", side_effect=factory), \
+             patch("webcrawl.browser_pool.psutil.virtual_memory", return_value=_memory(10.0)):
+            asyncio.run(run())
+
+        self.assertEqual(len(created), 2)
+        for crawler in created:
+            crawler.crawler_strategy.set_hook.assert_called_once_with(
+                "before_retrieve_html", hook
+            )
+
+    def test_lease_recyclesAfterPageBudget(self):
+        factory, created = _make_crawler_factory()
+
+        async def run():
+            async with BrowserPool(recycle_after_pages=10) as pool:
+                async with pool.lease():
+                    pass
+                pool.record_pages(10)
+                async with pool.lease() as crawler:
+                    self.assertIs(crawler, created[1])
+            return pool
+
+        with patch("webcrawl.browser_pool.AsyncWebCrawler", side_effect=factory), \
+             patch("webcrawl.browser_pool.psutil.virtual_memory", return_value=_memory(10.0)):
+            pool = asyncio.run(run())
+
+        self.assertEqual(pool.launch_count, 2)
+        created[0].close.assert_awaited_once()
+        self.assertEqual(pool.pages_since_launch, 0)
+
+    def test_lease_recyclesOnHighMemoryOnlyAfterPagesRendered(self):
+        factory, created = _make_crawler_factory()
+
+        async def run():
+            async with BrowserPool(memory_threshold_percent=80.0) as pool:
+                async with pool.lease():
+                    pass
+                # No pages rendered yet: high memory alone must not relaunch
+                async with pool.lease():
+                    pass
+                self.assertEqual(pool.launch_count, 1)
+                pool.record_pages(1)
+                async with pool.lease():
+                    pass
+            return pool
+
+        with patch("webcrawl.browser_pool.AsyncWebCrawler", side_effect=factory), \
+             patch("webcrawl.browser_pool.psutil.virtual_memory", return_value=_memory(95.0)):
+            pool = asyncio.run(run())
+
+        self.assertEqual(pool.launch_count, 2)
+
+    def test_lease_waitsForActiveLeasesBeforeRecycling(self):
+        factory, created = _make_crawler_factory()
+        events = []
+
+        async def long_crawl(pool):
+            async with pool.lease():
+                events.append("long_start")
+                pool.record_pages(10)
+                await asyncio.sleep(0.05)
+                events.append("long_end")
+
+        async def late_crawl(pool):
+            await asyncio.sleep(0.01)
+            async with pool.lease():
+                events.append("late_start")
+
+        async def run():
+            async with BrowserPool(recycle_after_pages=10) as pool:
+                await asyncio.gather(long_crawl(pool), late_crawl(pool))
+            return pool
+
+        with patch("webcrawl.browser_pool.AsyncWebCrawler", side_effect=factory), \
+             patch("webcrawl.browser_pool.psutil.virtual_memory", return_value=_memory(10.0)):
+            pool = asyncio.run(run())
+
+        self.assertEqual(events, ["long_start", "long_end", "late_start"])
+        self.assertEqual(pool.launch_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,212 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from crawl4ai import CrawlResult
+from crawl4ai.models import MarkdownGenerationResult
+
+from tests.webcrawl.local_http_server import LocalHTTPServer
+from webcrawl.change_detection import (
+    PageStates,
+    find_unmodified_pages,
+    get_page_state_path,
+    is_domain_unchanged,
+)
+from webcrawl.crawl_domain import crawl_domain, is_crawl_complete
+from webcrawl.page_cache import PageCache
+
+
+def _conditional_route(etag, body=b"<html></html>"):
+    """Answer 304 when the request carries the current ETag of the page."""
+
+    def route(handler):
+        if handler.headers.get("If-None-Match") == etag:
+            return 304, {"ETag": etag}, b""
+        return 200, {"ETag": etag}, body
+
+    return route
+
+
+class TestChangeDetection(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.server = LocalHTTPServer(
+            {
+                "/": _conditional_route('"m1"'),
+                "/a": _conditional_route('"a1"'),
+                "/b": (200, {}, b"<html>B</html>"),
+            }
+        ).start()
+        self.main_url = self.server.base_url
+
+    def tearDown(self):
+        self.server.stop()
+        self.tmp.cleanup()
+
+    def _page_result(self, url, markdown, etag=None):
+        result = MagicMock()
+        result.url = url
+        result.success = True
+        result.markdown = markdown
+        result.metadata = {"title": url}
+        result.response_headers = {"etag": etag} if etag else {}
+        return result
+
+    def _patch_crawler(self, main_result, page_results):
+        crawler = MagicMock()
+        crawler.arun = AsyncMock(return_value=main_result)
+
+        async def stream(urls):
+            for result in page_results:
+                if result.url in urls:
+                    yield result
+
+        crawler.arun_many = AsyncMock(
+            side_effect=lambda urls, *args, **kwargs: stream(urls)
+        )
+
+        @asynccontextmanager
+        async def fake_open_crawler(browser_pool=None, hooks=None, html_guard=None):
+            yield crawler
+
+        self.crawler = crawler
+        return patch("webcrawl.crawl_domain.open_crawler", fake_open_crawler)
+
+    def _crawl(self, main_result, page_results, refresh=False, page_cache=None):
+        links = AsyncMock(return_value=[r.url for r in page_results])
+        with self._patch_crawler(main_result, page_results), \
+             patch("webcrawl.crawl_domain.collect_internal_links", links):
+            return asyncio.run(
+                crawl_domain(
+                    self.main_url,
+                    self.tmp.name,
+                    10,
+                    use_http_fast_path=False,
+                    refresh=refresh,
+                    page_cache=page_cache,
+                )
+            )
+
+    def _first_crawl(self, pages=("a", "b")):
+        """Crawl the local site once, recording the ETags of / and /a."""
+        etags = {"a": '"a1"'}
+        return self._crawl(
+            self._page_result(self.main_url, "Startseite", etag='"m1"'),
+            [
+                self._page_result(
+                    self.server.url(f"/{page}"), f"Seite {page.upper()}", etags.get(page)
+                )
+                for page in pages
+            ],
+        )
+
+    def test_page_states_record_detectsChangedContent(self):
+        path = os.path.join(self.tmp.name, "muster_de.pages.json")
+        states = PageStates(path)
+
+        self.assertTrue(states.record("https://muster.de", "Drehteile", {"ETag": '"1"'}))
+        self.assertFalse(states.record("https://muster.de", "  Drehteile\n", {}))
+        self.assertTrue(states.record("https://muster.de", "Frästeile", {}))
+        states.save()
+
+        reloaded = PageStates(path)
+        self.assertEqual(
+            reloaded.get("https://muster.de")["content_hash"],
+            states.get("https://muster.de")["content_hash"],
+        )
+
+    def test_find_unmodified_pages_onlyRequestsPagesWithValidators(self):
+        states = PageStates(os.path.join(self.tmp.name, "pages.json"))
+        states.record(self.server.url("/"), "Startseite", {"ETag": '"m1"'})
+        states.record(self.server.url("/a"), "Seite A", {"ETag": '"outdated"'})
+        states.record(self.server.url("/b"), "Seite B", {})
+
+        unmodified = asyncio.run(
+            find_unmodified_pages(
+                states, [self.server.url(path) for path in ("/", "/a", "/b")]
+            )
+        )
+
+        self.assertEqual(unmodified, {self.server.url("/")})
+        self.assertEqual(
+            sorted(path for _, path, _ in self.server.requests), ["/", "/a"]
+        )
+
+    def test_crawl_domain_refresh_allPagesNotModified_skipsCrawl(self):
+        output_file, _ = self._first_crawl(pages=("a",))
+        with open(output_file, encoding="utf-8") as f:
+            before = f.read()
+        self.assertFalse(is_domain_unchanged(output_file))
+        self.assertTrue(os.path.exists(get_page_state_path(output_file)))
+
+        output_file, pages_crawled = self._crawl(None, [], refresh=True)
+
+        self.assertEqual(pages_crawled, 0)
+        self.assertTrue(is_domain_unchanged(output_file))
+        self.crawler.arun.assert_not_called()
+        with open(output_file, encoding="utf-8") as f:
+            self.assertEqual(f.read(), before)
+
+    def test_crawl_domain_refresh_recrawlsOnlyModifiedPages(self):
+        self._first_crawl()
+        page_b = self._page_result(self.server.url("/b"), "Seite B")
+
+        # /b has no validators; the same content keeps the domain unchanged
+        output_file, pages_crawled = self._crawl(None, [page_b], refresh=True)
+
+        self.crawler.arun.assert_not_called()
+        self.crawler.arun_many.assert_called_once()
+        self.assertEqual(self.crawler.arun_many.call_args[0][0], [page_b.url])
+        self.assertEqual(pages_crawled, 3)
+        self.assertTrue(is_domain_unchanged(output_file))
+
+        page_b.markdown = "Seite B mit neuen Maschinen"
+        output_file, _ = self._crawl(None, [page_b], refresh=True)
+
+        with open(output_file, encoding="utf-8") as f:
+            content = f.read()
+        self.assertTrue(is_crawl_complete(output_file))
+        self.assertFalse(is_domain_unchanged(output_file))
+        self.assertIn("Startseite", content)
+        self.assertIn("Seite A", content)
+        self.assertIn("Seite B mit neuen Maschinen", content)
+
+    def test_crawl_domain_refresh_modifiedPageInPageCache_isFetchedAgain(self):
+        self._first_crawl()
+        url = self.server.url("/b")
+        cache = PageCache(os.path.join(self.tmp.name, "pages.sqlite"))
+
+        def result(markdown):
+            return CrawlResult(
+                url=url,
+                html="",
+                success=True,
+                markdown=MarkdownGenerationResult(
+                    raw_markdown=markdown,
+                    markdown_with_citations="",
+                    references_markdown="",
+                ),
+                metadata={"title": url},
+            )
+
+        cache.put(url, result("Seite B"))
+        output_file, _ = self._crawl(
+            None, [result("Seite B mit neuen Maschinen")], refresh=True, page_cache=cache
+        )
+
+        self.assertEqual(self.crawler.arun_many.call_args[0][0], [url])
+        self.assertFalse(is_domain_unchanged(output_file))
+        with open(output_file, encoding="utf-8") as f:
+            self.assertIn("Seite B mit neuen Maschinen", f.read())
+        self.assertEqual(
+            cache.get(url).markdown.raw_markdown, "Seite B mit neuen Maschinen"
+        )
+        cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
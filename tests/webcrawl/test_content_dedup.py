@@ -0,0 +1,64 @@
+import unittest
+
+from webcrawl.content_dedup import (
+    EXACT_DUPLICATE,
+    NEAR_DUPLICATE,
+    ContentDeduplicator,
+    hamming_distance,
+    normalize_content,
+    simhash,
+)
+
+ARTICLE = " ".join(
+    f"Unsere CNC-Fraesmaschine Nummer {i} bearbeitet Bauteile aus Aluminium."
+    for i in range(15)
+)
+
+
+class TestContentDedup(unittest.TestCase):
+
+    def test_normalize_content_ignoresMarkupCaseAndWhitespace(self):
+        self.assertEqual(
+            normalize_content("## Über  uns\n\n**CNC**-Fertigung!"),
+            ["über", "uns", "cnc", "fertigung"],
+        )
+
+    def test_simhash_similarTextsAreClose(self):
+        words = normalize_content(ARTICLE)
+        changed = normalize_content(ARTICLE + " Stand: 01.02.2024")
+        other = normalize_content(
+            " ".join(f"Karriere bei uns: Stelle {i} als Elektriker." for i in range(15))
+        )
+
+        self.assertLessEqual(hamming_distance(simhash(words), simhash(changed)), 6)
+        self.assertGreater(hamming_distance(simhash(words), simhash(other)), 12)
+
+    def test_check_detectsExactAndNearDuplicates(self):
+        dedup = ContentDeduplicator()
+
+        self.assertIsNone(dedup.check("https://a.de/produkte", ARTICLE))
+        self.assertEqual(
+            dedup.check("https://a.de/produkte?utm_source=x", "**" + ARTICLE + "**"),
+            (EXACT_DUPLICATE, "https://a.de/produkte"),
+        )
+        self.assertEqual(
+            dedup.check("https://a.de/produkte/print", ARTICLE + " Druckansicht"),
+            (NEAR_DUPLICATE, "https://a.de/produkte"),
+        )
+        self.assertIsNone(dedup.check("https://a.de/kontakt", "Kontakt"))
+        self.assertEqual((dedup.unique_pages, dedup.exact_duplicates), (2, 1))
+        self.assertEqual(dedup.near_duplicates, 1)
+
+    def test_check_shortPagesAreOnlyComparedExactly(self):
+        dedup = ContentDeduplicator()
+        self.assertIsNone(dedup.check("https://a.de/1", "Seite 1"))
+        self.assertIsNone(dedup.check("https://a.de/2", "Seite 2"))
+
+    def test_check_zeroDistance_disablesNearDuplicates(self):
+        dedup = ContentDeduplicator(max_hamming_distance=0)
+        dedup.check("https://a.de/produkte", ARTICLE)
+        self.assertIsNone(dedup.check("https://a.de/print", ARTICLE + " Druckansicht"))
+
+
+if __name__ == "__main__":
+    unittest.main()
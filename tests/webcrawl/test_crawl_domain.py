@@ -1,22 +1,36 @@
+import asyncio
+import os
 import sys
+import tempfile
 import unittest
-from unittest.mock import MagicMock, patch
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from webcrawl.crawl_domain import (
+    CRAWL_COMPLETE_MARKER,
     apply_content_filters,
+    collect_internal_links,
     crawl_domain,
     ensure_output_directory,
     filter_urls_by_depth,
     filter_urls_by_depth_reverse,
+    format_main_page_section,
+    format_page_section,
     get_path_depth,
+    is_crawl_complete,
     is_file_url,
     is_non_content_url,
+    load_webcrawl_config,
     normalize_and_filter_links,
+    open_crawler,
+    parse_section,
+    remove_boilerplate_from_markdown,
     remove_duplicate_urls,
     remove_links_from_markdown,
     sanitize_filename,
     should_filter_by_language,
 )
+from webcrawl.crawl_journal import get_journal_path
 
 sys.modules['excel_reader'] = MagicMock()
 sys.modules['get_company_by_category'] = MagicMock()
@@ -288,6 +302,430 @@ class TestCrawlDomain(unittest.TestCase):
         self.assertEqual(pages_crawled, 2)
         self.assertTrue(output_file.endswith("example_com.md"))
 
+    def test_collect_internal_links_reusesMainResultLinks(self):
+        crawler = MagicMock()
+        crawler.arun = AsyncMock()
+        main_result = MagicMock()
+        main_result.success = True
+        main_result.links = {
+            "internal": [
+                {"href": "https://www.example.com/produkte"},
+                {"href": "https://www.example.com/kontakt"},
+                {"href": "https://www.example.com/produkte?ref=nav"},
+            ]
+        }
+
+        links = asyncio.run(
+            collect_internal_links(
+                crawler,
+                "https://www.example.com",
+                10,
+                main_result=main_result,
+                use_sitemap=False,
+            )
+        )
+
+        crawler.arun.assert_not_called()
+        self.assertEqual(links, ["https://www.example.com/produkte"])
+
+    def test_collect_internal_links_withoutMainResult_crawlsMainUrl(self):
+        crawl_result = MagicMock()
+        crawl_result.success = True
+        crawl_result.links = {"internal": [{"href": "/leistungen"}]}
+        crawler = MagicMock()
+        crawler.arun = AsyncMock(return_value=crawl_result)
+
+        links = asyncio.run(
+            collect_internal_links(
+                crawler, "https://www.example.com", 10, use_sitemap=False
+            )
+        )
+
+        crawler.arun.assert_awaited_once()
+        self.assertEqual(links, ["https://www.example.com/leistungen"])
+
+    def test_collect_internal_links_linkRender_isNotCachedAsMainPage(self):
+        crawl_result = MagicMock()
+        crawl_result.success = True
+        crawl_result.links = {"internal": [{"href": "/leistungen"}]}
+        crawler = MagicMock()
+        crawler.arun = AsyncMock(return_value=crawl_result)
+        page_cache = MagicMock()
+        page_cache.get.return_value = None
+
+        asyncio.run(
+            collect_internal_links(
+                crawler,
+                "https://www.example.com",
+                10,
+                use_sitemap=False,
+                page_cache=page_cache,
+            )
+        )
+
+        crawler.arun.assert_awaited_once()
+        page_cache.put.assert_not_called()
+
+    @patch("webcrawl.crawl_domain.AsyncWebCrawler")
+    def test_open_crawler_withoutPool_installsPassedHtmlGuard(self, mock_AsyncWebCrawler):
+        crawler = MagicMock()
+        mock_AsyncWebCrawler.return_value.__aenter__ = AsyncMock(return_value=crawler)
+        mock_AsyncWebCrawler.return_value.__aexit__ = AsyncMock(return_value=False)
+        html_guard = MagicMock()
+
+        async def run():
+            async with open_crawler(html_guard=html_guard) as opened:
+                return opened
+
+        self.assertIs(asyncio.run(run()), crawler)
+        html_guard.install.assert_called_once_with(crawler)
+
+    def test_load_webcrawl_config_returnsWebcrawlSection(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            config_file = os.path.join(tmp, "config.json")
+            with open(config_file, "w", encoding="utf-8") as f:
+                f.write('{"category": "x", "webcrawl": {"html_guard": {"max_dom_depth": 50}}}')
+
+            webcrawl_config = load_webcrawl_config(config_file)
+
+        self.assertEqual(webcrawl_config, {"html_guard": {"max_dom_depth": 50}})
+
+    def test_load_webcrawl_config_missingFile_raises(self):
+        with self.assertRaises(FileNotFoundError):
+            load_webcrawl_config("/nonexistent/config.json")
+
+    def test_collect_internal_links_usesSitemapBeforeBrowserLinks(self):
+        crawler = MagicMock()
+        crawler.arun = AsyncMock()
+        main_result = MagicMock()
+        main_result.success = True
+        main_result.links = {"internal": [{"href": "https://www.example.com/nav"}]}
+        sitemap = AsyncMock(
+            return_value=[
+                "https://www.example.com/produkte",
+                "https://www.example.com/impressum",
+            ]
+        )
+
+        with patch("webcrawl.crawl_domain.discover_sitemap_urls", sitemap):
+            links = asyncio.run(
+                collect_internal_links(
+                    crawler, "https://www.example.com", 10, main_result=main_result
+                )
+            )
+
+        crawler.arun.assert_not_called()
+        self.assertEqual(links, ["https://www.example.com/produkte"])
+
+    def test_collect_internal_links_noSitemap_fallsBackToPageLinks(self):
+        main_result = MagicMock()
+        main_result.success = True
+        main_result.links = {"internal": [{"href": "https://www.example.com/nav"}]}
+
+        with patch(
+            "webcrawl.crawl_domain.discover_sitemap_urls", AsyncMock(return_value=[])
+        ):
+            links = asyncio.run(
+                collect_internal_links(
+                    MagicMock(), "https://www.example.com", 10, main_result=main_result
+                )
+            )
+
+        self.assertEqual(links, ["https://www.example.com/nav"])
+
+    def _page_result(self, url, markdown="", success=True):
+        result = MagicMock()
+        result.url = url
+        result.success = success
+        result.markdown = markdown
+        result.metadata = {"title": url}
+        result.error = "timeout"
+        return result
+
+    def _patch_crawler(self, main_result, page_results, fail_after=None):
+        """Patch open_crawler with a mock crawler streaming page_results."""
+        crawler = MagicMock()
+        crawler.arun = AsyncMock(return_value=main_result)
+
+        async def stream(urls):
+            requested = [r for r in page_results if r.url in urls]
+            for index, result in enumerate(requested):
+                if fail_after is not None and index == fail_after:
+                    raise RuntimeError("browser crashed")
+                yield result
+
+        crawler.arun_many = AsyncMock(
+            side_effect=lambda urls, *args, **kwargs: stream(urls)
+        )
+
+        @asynccontextmanager
+        async def fake_open_crawler(browser_pool=None, hooks=None, html_guard=None):
+            yield crawler
+
+        self.crawler = crawler
+        return patch("webcrawl.crawl_domain.open_crawler", fake_open_crawler)
+
+    def test_crawl_domain_streamsPagesToFileWithCompletionMarker(self):
+        main_result = self._page_result("https://www.example.com", "Startseite")
+        pages = [
+            self._page_result("https://www.example.com/a", "Seite [A](https://x.de)"),
+            self._page_result("https://www.example.com/b", success=False),
+        ]
+        links = AsyncMock(return_value=[p.url for p in pages])
+
+        with tempfile.TemporaryDirectory() as tmp, \
+             self._patch_crawler(main_result, pages), \
+             patch("webcrawl.crawl_domain.collect_internal_links", links):
+            output_file, pages_crawled = asyncio.run(
+                crawl_domain(
+                    "https://www.example.com",
+                    tmp,
+                    10,
+                    "Example GmbH",
+                    use_http_fast_path=False,
+                )
+            )
+            with open(output_file, encoding="utf-8") as f:
+                content = f.read()
+            self.assertTrue(is_crawl_complete(output_file))
+
+        self.assertEqual(pages_crawled, 2)
+        self.assertIn("Company Name: Example GmbH", content)
+        self.assertIn("## Main Page: https://www.example.com", content)
+        self.assertIn("## Page 1: https://www.example.com/a", content)
+        self.assertIn("Seite A", content)
+        self.assertIn("Failed to crawl: timeout", content)
+        self.assertTrue(content.rstrip().endswith(CRAWL_COMPLETE_MARKER))
+
+    def test_crawl_domain_inputUrl_namesFileAndMainUrl(self):
+        main_result = self._page_result("https://www.neue-firma.de", "Startseite")
+        links = AsyncMock(return_value=[])
+
+        with tempfile.TemporaryDirectory() as tmp, \
+             self._patch_crawler(main_result, []), \
+             patch("webcrawl.crawl_domain.collect_internal_links", links):
+            output_file, _ = asyncio.run(
+                crawl_domain(
+                    "https://www.neue-firma.de",
+                    tmp,
+                    10,
+                    "Alte Firma GmbH",
+                    use_http_fast_path=False,
+                    input_url="https://www.alte-firma.de",
+                )
+            )
+            with open(output_file, encoding="utf-8") as f:
+                content = f.read()
+
+        self.assertEqual(os.path.basename(output_file), "alte-firma.de.md")
+        self.assertIn("Main URL: https://www.alte-firma.de\n", content)
+        self.assertIn("Moved to: https://www.neue-firma.de\n", content)
+        self.crawler.arun.assert_awaited_once()
+        self.assertEqual(self.crawler.arun.call_args[0][0], "https://www.neue-firma.de")
+
+    def test_crawl_domain_interruptedCrawl_resumesMissingPagesFromJournal(self):
+        main_result = self._page_result("https://www.example.com", "Startseite")
+        pages = [
+            self._page_result("https://www.example.com/a", "Seite A"),
+            self._page_result("https://www.example.com/b", "Seite B"),
+        ]
+        links = AsyncMock(return_value=[p.url for p in pages])
+
+        with tempfile.TemporaryDirectory() as tmp, \
+             patch("webcrawl.crawl_domain.collect_internal_links", links):
+            with self._patch_crawler(main_result, pages, fail_after=1):
+                with self.assertRaises(RuntimeError):
+                    asyncio.run(
+                        crawl_domain(
+                            "https://www.example.com",
+                            tmp,
+                            10,
+                            use_http_fast_path=False,
+                        )
+                    )
+
+            output_file = os.path.join(tmp, "example.com.md")
+            with open(output_file, encoding="utf-8") as f:
+                partial = f.read()
+            self.assertIn("Seite A", partial)
+            self.assertFalse(is_crawl_complete(output_file))
+
+            self.assertTrue(os.path.exists(get_journal_path(output_file)))
+
+            # Without --overwrite the crawl resumes with only the missing page
+            with self._patch_crawler(main_result, pages):
+                _, pages_crawled = asyncio.run(
+                    crawl_domain(
+                        "https://www.example.com", tmp, 10, use_http_fast_path=False
+                    )
+                )
+                self.crawler.arun.assert_not_awaited()
+                self.assertEqual(
+                    self.crawler.arun_many.call_args[0][0],
+                    ["https://www.example.com/b"],
+                )
+            with open(output_file, encoding="utf-8") as f:
+                content = f.read()
+
+            self.assertEqual(pages_crawled, 3)
+            self.assertTrue(is_crawl_complete(output_file))
+            self.assertFalse(os.path.exists(get_journal_path(output_file)))
+            self.assertIn("Startseite", content)
+            self.assertEqual(content.count("Seite A"), 1)
+            self.assertIn("## Page 2: https://www.example.com/b", content)
+
+    def test_crawl_domain_legacyFileWithoutMarker_isSkipped(self):
+        main_result = self._page_result("https://www.example.com", "Startseite")
+        legacy = "# Aggregated Content for example.com\n\n## Main Page: ...\n"
+
+        with tempfile.TemporaryDirectory() as tmp, \
+             self._patch_crawler(main_result, []):
+            output_file = os.path.join(tmp, "example.com.md")
+            with open(output_file, "w", encoding="utf-8") as f:
+                f.write(legacy)
+
+            _, pages_crawled = asyncio.run(
+                crawl_domain("https://www.example.com", tmp, 10, use_http_fast_path=False)
+            )
+
+            self.assertTrue(is_crawl_complete(output_file))
+            self.assertEqual(pages_crawled, 0)
+            self.crawler.arun.assert_not_awaited()
+            with open(output_file, encoding="utf-8") as f:
+                self.assertEqual(f.read(), legacy)
+
+    def test_crawl_domain_dropsDuplicatePages(self):
+        text = " ".join(f"Wir fertigen Bauteil {i} aus Edelstahl." for i in range(20))
+        main_result = self._page_result("https://www.example.com", "Startseite")
+        pages = [
+            self._page_result("https://www.example.com/de/produkte", text),
+            self._page_result("https://www.example.com/de-de/produkte", text),
+            self._page_result(
+                "https://www.example.com/produkte?print=1", text + " Stand: 2024"
+            ),
+            self._page_result("https://www.example.com/kontakt", "Kontakt"),
+        ]
+        links = AsyncMock(return_value=[p.url for p in pages])
+
+        with tempfile.TemporaryDirectory() as tmp, \
+             self._patch_crawler(main_result, pages), \
+             patch("webcrawl.crawl_domain.collect_internal_links", links):
+            output_file, pages_crawled = asyncio.run(
+                crawl_domain("https://www.example.com", tmp, 10, use_http_fast_path=False)
+            )
+            with open(output_file, encoding="utf-8") as f:
+                content = f.read()
+
+        self.assertEqual(pages_crawled, 3)
+        self.assertEqual(content.count("Bauteil 7 aus Edelstahl"), 1)
+        self.assertIn("## Page 1: https://www.example.com/de/produkte", content)
+        self.assertIn("## Page 2: https://www.example.com/kontakt", content)
+        self.assertNotIn("de-de/produkte", content)
+        self.assertNotIn("print=1", content)
+
+    def test_crawl_domain_sharedBoilerplate_keepsDistinctProductPages(self):
+        frame = "\n\n".join(
+            f"Muster GmbH Abschnitt {i}: Wir verwenden Cookies, liefern weltweit "
+            f"und sind nach ISO 9001 zertifiziert, Rubrik {i} des Menüs."
+            for i in range(12)
+        )
+        products = ["Drehteile", "Frästeile", "Stanzteile", "Baugruppen", "Wellen"]
+        main_result = self._page_result("https://www.example.com", f"Startseite\n\n{frame}")
+        pages = [
+            self._page_result(
+                f"https://www.example.com/produkte/{i}",
+                f"Wir fertigen {name} aus Edelstahl nach Zeichnung.\n\n{frame}",
+            )
+            for i, name in enumerate(products)
+        ]
+        links = AsyncMock(return_value=[p.url for p in pages])
+
+        with tempfile.TemporaryDirectory() as tmp, \
+             self._patch_crawler(main_result, pages), \
+             patch("webcrawl.crawl_domain.collect_internal_links", links):
+            output_file, pages_crawled = asyncio.run(
+                crawl_domain(
+                    "https://www.example.com",
+                    tmp,
+                    10,
+                    use_http_fast_path=False,
+                    boilerplate_page_fraction=0,
+                )
+            )
+            with open(output_file, encoding="utf-8") as f:
+                content = f.read()
+
+        self.assertEqual(pages_crawled, 1 + len(products))
+        for name in products:
+            self.assertIn(f"Wir fertigen {name} aus Edelstahl", content)
+
+    def test_parse_section_returnsUrlAndContent(self):
+        result = self._page_result("https://www.example.com/a", "Seite [A](https://x.de)")
+        self.assertEqual(
+            parse_section(format_page_section(4, result.url, result)),
+            ("https://www.example.com/a", "Seite A"),
+        )
+        self.assertEqual(
+            parse_section(format_main_page_section("https://www.example.com", result)),
+            ("https://www.example.com", "Seite [A](https://x.de)"),
+        )
+
+    def _aggregated_markdown(self, page_bodies):
+        result = self._page_result("https://www.example.com", page_bodies[0])
+        content = "# Aggregated Content for example.com\n\n"
+        content += format_main_page_section("https://www.example.com", result)
+        for number, body in enumerate(page_bodies[1:], start=1):
+            url = f"https://www.example.com/{number}"
+            content += format_page_section(number, url, self._page_result(url, body))
+        return content + CRAWL_COMPLETE_MARKER + "\n"
+
+    def test_remove_boilerplate_from_markdown_keepsFirstOccurrence(self):
+        cookie = "Wir verwenden Cookies, um unsere Website zu verbessern."
+        footer = "Muster GmbH | Industriestr. 1 | 12345 Musterstadt"
+        bodies = [
+            f"Willkommen bei Muster.\n\n{cookie}\n\n"
+            f"[{footer}](https://www.example.com/kontakt)",
+            f"Wir fertigen Drehteile aus Edelstahl.\n\n{cookie}\n\n{footer}",
+            f"Unser Maschinenpark umfasst 12 CNC-Maschinen.\n\n{cookie}\n\n{footer}",
+            f"Zertifiziert nach ISO 9001 seit 2001.\n\n{cookie.upper()}",
+        ]
+
+        cleaned, removed = remove_boilerplate_from_markdown(
+            self._aggregated_markdown(bodies)
+        )
+
+        self.assertEqual(removed, 5)
+        self.assertEqual(cleaned.count(cookie), 1)
+        self.assertNotIn(cookie.upper(), cleaned)
+        self.assertEqual(cleaned.count(footer), 1)
+        # Page content, headings and the completion marker are kept
+        for text in [
+            "Wir fertigen Drehteile aus Edelstahl.",
+            "Zertifiziert nach ISO 9001 seit 2001.",
+            "## Page 3: https://www.example.com/3",
+            "### Content (body only):",
+        ]:
+            self.assertIn(text, cleaned)
+        self.assertTrue(cleaned.endswith(CRAWL_COMPLETE_MARKER + "\n"))
+
+    def test_remove_boilerplate_from_markdown_rareBlocksAreKept(self):
+        shared = "Fordern Sie jetzt Ihr individuelles Angebot an."
+        bodies = [
+            "Startseite der Muster GmbH.",
+            f"Drehteile aus Edelstahl.\n\n{shared}",
+            f"Fraesteile aus Aluminium.\n\n{shared}",
+            "Unser Team im Portrait.",
+            "Ausbildung und Karriere.",
+            "Anfahrt und Kontakt.",
+        ]
+        content = self._aggregated_markdown(bodies)
+
+        # On 2 of 6 pages: below both the page fraction and the minimum pages
+        self.assertEqual(remove_boilerplate_from_markdown(content), (content, 0))
+        self.assertEqual(
+            remove_boilerplate_from_markdown(content, 0.3, min_pages=2)[1], 1
+        )
+
     def test_remove_links_from_markdown(self):
         markdown_text = "[link text](https://example.com) and ![alt text](image_url)"
         expected = "link text and "
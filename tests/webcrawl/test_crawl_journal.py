@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+
+from webcrawl.crawl_journal import CrawlJournal, get_journal_path
+
+
+class TestCrawlJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = get_journal_path(os.path.join(self.tmp.name, "example.com.md"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_get_journal_path_replacesMarkdownExtension(self):
+        self.assertEqual(
+            get_journal_path("out/example.com.md"), "out/example.com.journal.jsonl"
+        )
+
+    def test_load_restoresStateAndPendingLinks(self):
+        journal = CrawlJournal(self.path)
+        journal.record_main("main section\n")
+        journal.record_discovered(["https://a.de/1", "https://a.de/2", "https://a.de/3"])
+        journal.record_page("https://a.de/1", 1, True, "section 1\n")
+        journal.record_page("https://a.de/2", 2, False, "failed 2\n")
+
+        restored = CrawlJournal(self.path).load()
+
+        self.assertEqual(restored.main_section, "main section\n")
+        self.assertEqual(restored.completed, {"https://a.de/1": 1})
+        self.assertEqual(restored.failed, {"https://a.de/2": 2})
+        self.assertEqual(restored.pending_links(), ["https://a.de/2", "https://a.de/3"])
+        self.assertEqual(restored.next_page_number, 3)
+        self.assertEqual(list(restored.iter_completed_sections()), ["section 1\n"])
+
+    def test_load_duplicatePagesAreNotPending(self):
+        journal = CrawlJournal(self.path)
+        journal.record_discovered(["https://a.de/1", "https://a.de/1?print=1"])
+        journal.record_page("https://a.de/1", 1, True, "section 1\n")
+        journal.record_duplicate("https://a.de/1?print=1", "https://a.de/1")
+
+        restored = CrawlJournal(self.path).load()
+
+        self.assertEqual(restored.duplicates, {"https://a.de/1?print=1": "https://a.de/1"})
+        self.assertEqual(restored.pending_links(), [])
+        self.assertEqual(restored.next_page_number, 2)
+        self.assertEqual(list(restored.iter_completed_sections()), ["section 1\n"])
+
+    def test_load_retriedPageMovesFromFailedToCompleted(self):
+        journal = CrawlJournal(self.path)
+        journal.record_discovered(["https://a.de/1"])
+        journal.record_page("https://a.de/1", 1, False, "failed\n")
+        journal.record_page("https://a.de/1", 2, True, "ok\n")
+
+        restored = CrawlJournal(self.path).load()
+
+        self.assertEqual(restored.failed, {})
+        self.assertEqual(restored.pending_links(), [])
+
+    def test_load_ignoresTruncatedLastLine(self):
+        journal = CrawlJournal(self.path)
+        journal.record_discovered(["https://a.de/1"])
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"type": "page", "url": "https://a.de/1", "pa')
+
+        restored = CrawlJournal(self.path).load()
+
+        self.assertEqual(restored.discovered_links, ["https://a.de/1"])
+        self.assertEqual(restored.completed, {})
+
+    def test_remove_missingJournal_doesNotRaise(self):
+        journal = CrawlJournal(self.path)
+        journal.remove()
+        self.assertFalse(journal.exists)
+
+
+if __name__ == "__main__":
+    unittest.main()
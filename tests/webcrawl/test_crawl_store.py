@@ -0,0 +1,102 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from webcrawl.crawl_domain import (
+    CRAWL_COMPLETE_MARKER,
+    SECTION_SEPARATOR,
+    archive_to_store,
+    split_aggregated_markdown,
+)
+from webcrawl.crawl_store import (
+    CODEC_GZIP,
+    CrawlStore,
+    find_manifests,
+    load_manifest,
+    materialized_markdown,
+)
+
+HEADER = (
+    "# Aggregated Content for muster_de\n\n"
+    "Company Name: Muster GmbH\nMain URL: https://muster.de\n"
+    "Crawled on: 2025-01-01 10:00:00\n\n"
+)
+MAIN_SECTION = (
+    "## Main Page: https://muster.de\n\n### Title: Muster GmbH\n\n"
+    "### Content:\n\nWir fertigen Drehteile und Frästeile.\n\n"
+    + SECTION_SEPARATOR
+    + "\n\n"
+)
+PAGE_SECTION = (
+    "## Page 1: https://muster.de/maschinen\n\n### Title: Maschinenpark\n\n"
+    "### Content (body only):\n\n"
+    + "Unser Maschinenpark umfasst CNC-Drehmaschinen und Bearbeitungszentren. " * 40
+    + "\n\n"
+)
+AGGREGATED = HEADER + MAIN_SECTION + PAGE_SECTION + CRAWL_COMPLETE_MARKER + "\n"
+
+
+class TestCrawlStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = CrawlStore(os.path.join(self.tmp.name, "store"), codec=CODEC_GZIP)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_put_storesIdenticalContentOnce(self):
+        first = self.store.put(PAGE_SECTION)
+        second = self.store.put(PAGE_SECTION)
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.store.get(first), PAGE_SECTION)
+        self.assertEqual((self.store.blobs_written, self.store.blobs_reused), (1, 1))
+        self.assertLess(self.store.stored_bytes, len(PAGE_SECTION.encode()) / 5)
+
+    def test_get_unknownDigest_raisesKeyError(self):
+        with self.assertRaises(KeyError):
+            self.store.get("0" * 64)
+
+    def test_split_aggregated_markdown_roundTrips(self):
+        header, sections, footer = split_aggregated_markdown(AGGREGATED)
+
+        self.assertEqual(header, HEADER)
+        self.assertEqual(sections, [MAIN_SECTION, PAGE_SECTION])
+        self.assertEqual(footer, CRAWL_COMPLETE_MARKER + "\n")
+
+    def test_archive_to_store_replacesMarkdownWithManifest(self):
+        output_dir = os.path.join(self.tmp.name, "domain_content")
+        os.makedirs(output_dir)
+        markdown_file = os.path.join(output_dir, "muster_de.md")
+        with open(markdown_file, "w", encoding="utf-8") as f:
+            f.write(AGGREGATED)
+
+        manifest_path = asyncio.run(
+            archive_to_store(markdown_file, self.store, main_url="https://muster.de")
+        )
+
+        self.assertFalse(os.path.exists(markdown_file))
+        manifest = load_manifest(manifest_path)
+        self.assertEqual(manifest["main_url"], "https://muster.de")
+        self.assertEqual(
+            [(page["url"], page["title"]) for page in manifest["pages"]],
+            [
+                ("https://muster.de", "Muster GmbH"),
+                ("https://muster.de/maschinen", "Maschinenpark"),
+            ],
+        )
+        self.assertEqual(self.store.read_markdown(manifest_path), AGGREGATED)
+
+        # The manifest stands in for the markdown file until it is materialized
+        self.assertEqual(find_manifests(output_dir), [manifest_path])
+        with materialized_markdown(find_manifests(output_dir)) as files:
+            self.assertEqual(os.path.basename(files[0]), "muster_de.md")
+            with open(files[0], encoding="utf-8") as f:
+                self.assertEqual(f.read(), AGGREGATED)
+        self.assertFalse(os.path.exists(files[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
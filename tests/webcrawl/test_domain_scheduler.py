@@ -0,0 +1,91 @@
+import asyncio
+import time
+import unittest
+
+from webcrawl.domain_scheduler import DomainScheduler, get_host, interleave_by_host
+
+
+class TestInterleaveByHost(unittest.TestCase):
+
+    def test_interleave_by_host_roundRobinAcrossHosts(self):
+        hosts = ["a", "a", "b", "c", "b"]
+        self.assertEqual(interleave_by_host(hosts), [0, 2, 3, 1, 4])
+
+    def test_interleave_by_host_emptyInput_returnsEmpty(self):
+        self.assertEqual(interleave_by_host([]), [])
+
+    def test_get_host_stripsWwwAndLowercases(self):
+        self.assertEqual(get_host("https://WWW.Example.com/de/"), "example.com")
+
+
+class TestDomainScheduler(unittest.TestCase):
+
+    def test_run_resultsInInputOrder(self):
+        items = ["https://a.de", "https://b.de", "https://c.de"]
+
+        async def worker(url):
+            # Finish in reverse order
+            await asyncio.sleep(0.03 - 0.01 * items.index(url))
+            return url.upper()
+
+        scheduler = DomainScheduler(max_concurrent_domains=3, host_crawl_delay=0)
+        results = asyncio.run(scheduler.run(items, worker, host_of=get_host))
+        self.assertEqual(results, [u.upper() for u in items])
+
+    def test_run_respectsGlobalConcurrencyCap(self):
+        items = [f"https://host{i}.de" for i in range(6)]
+        active = 0
+        peak = 0
+
+        async def worker(url):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return url
+
+        scheduler = DomainScheduler(max_concurrent_domains=2, host_crawl_delay=0)
+        asyncio.run(scheduler.run(items, worker, host_of=get_host))
+        self.assertEqual(peak, 2)
+
+    def test_run_respectsPerHostCapAndDelay(self):
+        items = ["https://a.de", "https://www.a.de/de/", "https://b.de"]
+        starts = {}
+        active_per_host = {}
+        peak_per_host = {}
+
+        async def worker(url):
+            host = get_host(url)
+            starts.setdefault(host, []).append(time.monotonic())
+            active_per_host[host] = active_per_host.get(host, 0) + 1
+            peak_per_host[host] = max(peak_per_host.get(host, 0), active_per_host[host])
+            await asyncio.sleep(0.01)
+            active_per_host[host] -= 1
+            return url
+
+        scheduler = DomainScheduler(
+            max_concurrent_domains=3, max_per_host=1, host_crawl_delay=0.05
+        )
+        asyncio.run(scheduler.run(items, worker, host_of=get_host))
+
+        self.assertEqual(peak_per_host["a.de"], 1)
+        self.assertEqual(len(starts["a.de"]), 2)
+        self.assertGreaterEqual(starts["a.de"][1] - starts["a.de"][0], 0.045)
+
+    def test_run_workerRaises_propagatesException(self):
+        async def worker(url):
+            if "bad" in url:
+                raise RuntimeError("boom")
+            await asyncio.sleep(0.01)
+            return url
+
+        scheduler = DomainScheduler(max_concurrent_domains=2, host_crawl_delay=0)
+        with self.assertRaises(RuntimeError):
+            asyncio.run(
+                scheduler.run(["https://ok.de", "https://bad.de"], worker, host_of=get_host)
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,214 @@
+import asyncio
+import os
+import socket
+import tempfile
+import time
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from tests.webcrawl.local_http_server import LocalHTTPServer
+from webcrawl.domain_triage import (
+    STATUS_DEAD,
+    STATUS_LIVE,
+    STATUS_PARKED,
+    STATUS_REDIRECTED,
+    TriageCache,
+    TriageResult,
+    apply_triage,
+    company_name_tokens,
+    is_parked_page,
+    moved_input_urls,
+    triage_domains,
+)
+
+HTML = {"Content-Type": "text/html; charset=utf-8"}
+COMPANY_PAGE = (
+    b"<html><head><title>Muster Maschinenbau</title></head>"
+    b"<body><p>Wir fertigen Drehteile.</p></body></html>"
+)
+PARKED_PAGE = (
+    b"<html><body><h1>Diese Domain kaufen</h1>"
+    b"<p>Diese Domain steht zum Verkauf.</p></body></html>"
+)
+
+
+def _unused_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class TestDomainTriage(unittest.TestCase):
+
+    def setUp(self):
+        self.server = LocalHTTPServer().start()
+        # localhost and 127.0.0.1 are different sites for the triage
+        other_origin = self.server.base_url.replace("127.0.0.1", "localhost")
+        self.server.routes.update(
+            {
+                "/": (200, HTML, COMPANY_PAGE),
+                "/old": (301, {"Location": "/de/start"}, b""),
+                "/de/start": (200, HTML, COMPANY_PAGE),
+                "/parked": (200, HTML, PARKED_PAGE),
+                "/no-charset": (200, {"Content-Type": "text/html"}, COMPANY_PAGE),
+                "/no-charset-parked": (200, {"Content-Type": "text/html"}, PARKED_PAGE),
+                "/gone": (410, HTML, b"<html><body>Gone</body></html>"),
+                "/acquired": (301, {"Location": other_origin + "/konzern"}, b""),
+                "/konzern": (
+                    200,
+                    HTML,
+                    b"<html><head><title>Grosskonzern AG</title></head></html>",
+                ),
+            }
+        )
+
+    def tearDown(self):
+        self.server.stop()
+
+    def _triage(self, urls_and_companies, cache=None):
+        return asyncio.run(triage_domains(urls_and_companies, cache=cache, timeout=5))
+
+    def test_triage_domains_classifiesLocalSites(self):
+        live = self.server.url("/")
+        moved = self.server.url("/old")
+        parked = self.server.url("/parked")
+        gone = self.server.url("/gone")
+        acquired = self.server.url("/acquired")
+        refused = f"http://127.0.0.1:{_unused_port()}"
+
+        results = self._triage(
+            [
+                (live, "Muster GmbH"),
+                (moved, "Muster GmbH"),
+                (parked, "Parkplatz GmbH"),
+                (gone, "Weg GmbH"),
+                (acquired, "Kleinbetrieb Schmidt GmbH"),
+                (refused, "Offline GmbH"),
+            ]
+        )
+
+        self.assertEqual(results[live].status, STATUS_LIVE)
+        self.assertEqual(results[moved].status, STATUS_LIVE)
+        self.assertEqual(results[moved].canonical_url, self.server.url("/de/"))
+        self.assertEqual(results[parked].status, STATUS_PARKED)
+        self.assertEqual(results[gone].status, STATUS_DEAD)
+        self.assertEqual(results[gone].http_status, 410)
+        self.assertEqual(results[acquired].status, STATUS_REDIRECTED)
+        self.assertEqual(results[refused].status, STATUS_DEAD)
+        self.assertEqual(results[refused].reason, "unreachable")
+
+    def test_triage_domains_redirectToCompanyNamedSite_isLive(self):
+        acquired = self.server.url("/acquired")
+
+        results = self._triage([(acquired, "Grosskonzern Holding GmbH")])
+
+        self.assertEqual(results[acquired].status, STATUS_LIVE)
+        self.assertIn("localhost", results[acquired].canonical_url)
+        self.assertEqual(
+            moved_input_urls(results), {results[acquired].canonical_url: acquired}
+        )
+
+    def test_triage_domains_htmlWithoutCharset_isDecoded(self):
+        live = self.server.url("/no-charset")
+        parked = self.server.url("/no-charset-parked")
+
+        results = self._triage([(live, "Muster GmbH"), (parked, "Parkplatz GmbH")])
+
+        self.assertEqual(results[live].status, STATUS_LIVE)
+        self.assertEqual(results[parked].status, STATUS_PARKED)
+
+    def test_triage_domains_unresolvableHost_isDead(self):
+        with patch(
+            "webcrawl.domain_triage.resolve_host", AsyncMock(return_value=False)
+        ):
+            results = self._triage([("https://gibt-es-nicht.invalid", "X GmbH")])
+
+        result = results["https://gibt-es-nicht.invalid"]
+        self.assertEqual(result.status, STATUS_DEAD)
+        self.assertEqual(result.reason, "no DNS record")
+
+    def test_triage_domains_usesFreshCacheEntries(self):
+        live = self.server.url("/")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "triage.json")
+            self._triage([(live, "Muster GmbH")], cache=TriageCache(path))
+            requests_after_first_run = len(self.server.requests)
+
+            results = self._triage([(live, "Muster GmbH")], cache=TriageCache(path))
+            self.assertEqual(len(self.server.requests), requests_after_first_run)
+            self.assertEqual(results[live].status, STATUS_LIVE)
+
+            # Expired entries are checked again
+            self._triage([(live, "Muster GmbH")], cache=TriageCache(path, ttl=-1))
+            self.assertGreater(len(self.server.requests), requests_after_first_run)
+
+            # Unreachable servers may be back on the next run
+            refused = f"http://127.0.0.1:{_unused_port()}"
+            self._triage([(refused, "Offline GmbH")], cache=TriageCache(path))
+            self.assertIsNone(TriageCache(path).get(refused, "Offline GmbH"))
+
+
+class TestTriageHelpers(unittest.TestCase):
+
+    def test_apply_triage_rewritesLiveAndSkipsOthers(self):
+        results = {
+            "http://a.de": TriageResult(
+                "http://a.de", STATUS_LIVE, canonical_url="https://www.a.de"
+            ),
+            "http://b.de": TriageResult("http://b.de", STATUS_PARKED),
+        }
+
+        to_crawl, skipped = apply_triage(
+            [("http://a.de", "A GmbH"), ("http://b.de", "B GmbH"), ("http://c.de", "C")],
+            results,
+        )
+
+        self.assertEqual(
+            to_crawl, [("https://www.a.de", "A GmbH"), ("http://c.de", "C")]
+        )
+        self.assertEqual(
+            [(url, name) for url, name, _ in skipped], [("http://b.de", "B GmbH")]
+        )
+
+    def test_is_parked_page_parkingHost(self):
+        self.assertTrue(is_parked_page("https://www.sedoparking.com/x", ""))
+        self.assertFalse(is_parked_page("https://firma.de", COMPANY_PAGE.decode()))
+
+    def test_company_name_tokens_dropsLegalForms(self):
+        self.assertEqual(
+            company_name_tokens("Müller Maschinenbau GmbH & Co. KG"),
+            ["mueller", "maschinenbau"],
+        )
+
+    def test_triage_cache_saveDropsExpiredEntries(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "triage.json")
+            cache = TriageCache(path, ttl=60)
+            cache.put(TriageResult("http://new.de", STATUS_LIVE))
+            cache.put(
+                TriageResult("http://old.de", STATUS_DEAD, checked_at=time.time() - 120)
+            )
+            cache.save()
+
+            reloaded = TriageCache(path, ttl=60)
+            self.assertIsNotNone(reloaded.get("http://new.de"))
+            self.assertIsNone(reloaded.get("http://old.de"))
+
+
+    def test_triage_cache_keysResultsByCompany(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "triage.json")
+            cache = TriageCache(path)
+            cache.put(
+                TriageResult("http://shared.de", STATUS_REDIRECTED), "Alt GmbH"
+            )
+            cache.save()
+
+            reloaded = TriageCache(path)
+            self.assertEqual(
+                reloaded.get("http://shared.de", "Alt GmbH").status, STATUS_REDIRECTED
+            )
+            self.assertIsNone(reloaded.get("http://shared.de", "Neu GmbH"))
+
+if __name__ == "__main__":
+    unittest.main()
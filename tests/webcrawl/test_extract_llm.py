@@ -3,7 +3,7 @@ import shutil
 import sys
 import unittest
 from io import StringIO
-from unittest.mock import AsyncMock, MagicMock, mock_open, patch
+from unittest.mock import MagicMock, mock_open, patch
 
 from webcrawl.extract_llm import ensure_output_directory, main, process_files
 
@@ -38,13 +38,11 @@ class TestExtractLLM(unittest.TestCase):
             mock_makedirs.assert_not_called()
             self.assertEqual(result, self.test_output_dir)
 
-    @patch("webcrawl.extract_llm.AsyncWebCrawler")
-    @patch("webcrawl.extract_llm.CrawlerRunConfig")
+    @patch("webcrawl.extract_llm.DirectExtractor")
     @patch("os.path.abspath", return_value="/absolute/path/to/file.md")
-    async def test_process_files_successful(self, mock_abspath, mock_config, mock_crawler):
+    async def test_process_files_successful(self, mock_abspath, mock_extractor):
         # Setup mocks
-        mock_crawler_instance = AsyncMock()
-        mock_crawler.return_value.__aenter__.return_value = mock_crawler_instance
+        mock_extractor_instance = mock_extractor.return_value
 
         # Setup mock results with successful extraction
         mock_result1 = MagicMock()
@@ -57,7 +55,7 @@ class TestExtractLLM(unittest.TestCase):
         mock_result2.url = "file:///absolute/path/to/file2.md"
         mock_result2.extracted_content = {"company_name": "Another Company"}
 
-        mock_crawler_instance.arun_many.return_value = [mock_result1, mock_result2]
+        mock_extractor_instance.extract_many.return_value.__aiter__.return_value = [mock_result1, mock_result2]
 
         # Setup mock llm_strategy
         mock_llm_strategy = MagicMock()
@@ -72,8 +70,8 @@ class TestExtractLLM(unittest.TestCase):
 
             await process_files(self.test_input_files, mock_llm_strategy, self.test_output_dir)
 
-            # Assert crawler was called correctly
-            mock_crawler_instance.arun_many.assert_called_once()
+            # Assert extractor was called correctly
+            mock_extractor_instance.extract_many.assert_called_once()
 
             # Assert files were written correctly
             self.assertEqual(mock_file.call_count, 2)
@@ -86,20 +84,18 @@ class TestExtractLLM(unittest.TestCase):
             mock_print.assert_any_call(f"Extracted data saved to {self.test_output_dir}/file1_extracted.json")
             mock_print.assert_any_call(f"Extracted data saved to {self.test_output_dir}/file2_extracted.json")
 
-    @patch("webcrawl.extract_llm.AsyncWebCrawler")
-    @patch("webcrawl.extract_llm.CrawlerRunConfig")
+    @patch("webcrawl.extract_llm.DirectExtractor")
     @patch("os.path.abspath", return_value="/absolute/path/to/file.md")
-    async def test_process_files_with_failure(self, mock_abspath, mock_config, mock_crawler):
+    async def test_process_files_with_failure(self, mock_abspath, mock_extractor):
         # Setup mocks
-        mock_crawler_instance = AsyncMock()
-        mock_crawler.return_value.__aenter__.return_value = mock_crawler_instance
+        mock_extractor_instance = mock_extractor.return_value
 
         # Setup mock results with a failed extraction
         mock_result = MagicMock()
         mock_result.success = False
         mock_result.error_message = "Extraction failed"
 
-        mock_crawler_instance.arun_many.return_value = [mock_result]
+        mock_extractor_instance.extract_many.return_value.__aiter__.return_value = [mock_result]
 
         # Setup mock llm_strategy
         mock_llm_strategy = MagicMock()
@@ -284,15 +280,14 @@ class TestExtractLLM(unittest.TestCase):
         # Check output
         self.assertIn("Error: invalid_path is not a valid file or directory", captured_output.getvalue())
 
-    @patch("webcrawl.extract_llm.AsyncWebCrawler")
-    @patch("webcrawl.extract_llm.CrawlerRunConfig")
+    @patch("webcrawl.extract_llm.DirectExtractor")
     @patch("os.path.abspath", return_value="/absolute/path/to/file.md")
     @patch("os.path.exists")
     @patch("os.path.basename")
     @patch("os.path.splitext")
     @patch("logging.getLogger")
     async def test_process_files_skip_existing(self, mock_logger, mock_splitext, mock_basename,
-                                               mock_exists, mock_abspath, mock_config, mock_crawler):
+                                               mock_exists, mock_abspath, mock_extractor):
         """Test that process_files skips existing files when overwrite=False."""
         # Setup mock logger
         mock_logger_instance = MagicMock()
@@ -311,8 +306,8 @@ class TestExtractLLM(unittest.TestCase):
         # Test with mock file paths and overwrite=False
         result = await process_files(self.test_input_files, mock_llm_strategy, self.test_output_dir, overwrite=False)
 
-        # Assert that no crawler was used (files were skipped)
-        mock_crawler.assert_not_called()
+        # Assert that no extractor was used (files were skipped)
+        mock_extractor.assert_not_called()
 
         # Assert that logger recorded skipping messages
         mock_logger_instance.info.assert_any_call(f"Skipping {self.test_input_files[0]} as output already exists at {self.test_output_dir}/test_file1_extracted.json")
@@ -322,15 +317,14 @@ class TestExtractLLM(unittest.TestCase):
         # Assert that returned data is empty since all files were skipped
         self.assertEqual(result, [])
 
-    @patch("webcrawl.extract_llm.AsyncWebCrawler")
-    @patch("webcrawl.extract_llm.CrawlerRunConfig")
+    @patch("webcrawl.extract_llm.DirectExtractor")
     @patch("os.path.abspath", return_value="/absolute/path/to/file.md")
     @patch("os.path.exists")
     @patch("os.path.basename")
     @patch("os.path.splitext")
     @patch("logging.getLogger")
     async def test_process_files_with_overwrite(self, mock_logger, mock_splitext, mock_basename,
-                                                mock_exists, mock_abspath, mock_config, mock_crawler):
+                                                mock_exists, mock_abspath, mock_extractor):
         """Test that process_files processes files when overwrite=True even if files exist."""
         # Setup mock logger
         mock_logger_instance = MagicMock()
@@ -343,9 +337,8 @@ class TestExtractLLM(unittest.TestCase):
         mock_basename.side_effect = lambda p: p.split('/')[-1]
         mock_splitext.side_effect = lambda p: (p.split('.')[0], '.md')
 
-        # Setup crawler mocks
-        mock_crawler_instance = AsyncMock()
-        mock_crawler.return_value.__aenter__.return_value = mock_crawler_instance
+        # Setup extractor mocks
+        mock_extractor_instance = mock_extractor.return_value
 
         # Setup mock results with successful extraction
         mock_result1 = MagicMock()
@@ -358,7 +351,7 @@ class TestExtractLLM(unittest.TestCase):
         mock_result2.url = "file:///absolute/path/to/file2.md"
         mock_result2.extracted_content = {"company_name": "Another Company"}
 
-        mock_crawler_instance.arun_many.return_value = [mock_result1, mock_result2]
+        mock_extractor_instance.extract_many.return_value.__aiter__.return_value = [mock_result1, mock_result2]
 
         # Setup mock llm_strategy
         mock_llm_strategy = MagicMock()
@@ -370,8 +363,8 @@ class TestExtractLLM(unittest.TestCase):
 
             result = await process_files(self.test_input_files, mock_llm_strategy, self.test_output_dir, overwrite=True)
 
-            # Assert that crawler was called (files were processed despite existing)
-            mock_crawler_instance.arun_many.assert_called_once()
+            # Assert that extractor was called (files were processed despite existing)
+            mock_extractor_instance.extract_many.assert_called_once()
 
             # Assert files were written
             self.assertEqual(mock_file.call_count, 2)
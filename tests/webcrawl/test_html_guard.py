@@ -0,0 +1,92 @@
+import asyncio
+import unittest
+
+from crawl4ai import AsyncWebCrawler, CrawlerRunConfig
+
+from webcrawl.html_guard import HtmlGuard, estimate_max_depth
+from webcrawl.structured_data import harvest_structured_data
+
+PARAGRAPH = "<p>Wir fertigen Drehteile &amp; Frästeile.</p>"
+
+
+def _nested_page(depth):
+    return (
+        "<html><body><p>Oben</p>"
+        + "<div class='wrap'>" * depth
+        + "<p>Tief verschachtelter Maschinenpark</p>"
+        + "</div>" * depth
+        + "<p>Unten</p></body></html>"
+    )
+
+
+async def _process(crawler, html):
+    return await crawler.aprocess_html(
+        url="https://muster.de",
+        html=html,
+        extracted_content=None,
+        config=CrawlerRunConfig(verbose=False),
+        screenshot=None,
+        pdf_data=None,
+        verbose=False,
+    )
+
+
+class TestHtmlGuard(unittest.TestCase):
+
+    def test_apply_pageWithinLimits_isPassedThrough(self):
+        html = f"<html><body><div>{PARAGRAPH * 20}</div></body></html>"
+        guard = HtmlGuard()
+
+        self.assertIs(guard.apply("https://muster.de", html), html)
+        self.assertEqual(estimate_max_depth(html, 200), 3)
+        self.assertEqual((guard.pages_flattened, guard.pages_truncated), (0, 0))
+
+    def test_apply_deepDom_unwrapsDeepElementsAndKeepsText(self):
+        guard = HtmlGuard(max_dom_depth=50)
+
+        guarded = guard.apply("https://muster.de", _nested_page(5000))
+
+        self.assertEqual(guarded.count("<div"), 48)  # html and body count too
+        self.assertEqual(guarded.count("<div"), guarded.count("</div>"))
+        self.assertIn("<p>Tief verschachtelter Maschinenpark</p>", guarded)
+        self.assertTrue(guarded.endswith("<p>Unten</p></body></html>"))
+        self.assertEqual(guard.pages_flattened, 1)
+
+    def test_apply_oversizedPage_truncatesAndKeepsJsonLd(self):
+        json_ld = '{"@type": "Product", "name": "Drehteile"}'
+        html = (
+            "<html><head>"
+            f'<script type="application/ld+json">{json_ld}</script>'
+            f"<script>var bundle = '{'x' * 200000}';</script>"
+            "</head><body>" + PARAGRAPH * 20000 + "</body></html>"
+        )
+        guard = HtmlGuard(max_html_mb=0.1)
+
+        guarded = guard.apply("https://muster.de", html)
+
+        self.assertLessEqual(len(guarded), 0.1 * 1024 * 1024 + 50)
+        self.assertNotIn("var bundle", guarded)
+        self.assertTrue(guarded.endswith("</body></html>"))
+        self.assertIn(PARAGRAPH, guarded)
+        self.assertEqual(
+            harvest_structured_data(guarded)["json_ld"],
+            [{"type": "Product", "name": "Drehteile"}],
+        )
+        self.assertEqual(guard.pages_truncated, 1)
+
+    def test_install_processesDeepPageWithoutRecursionError(self):
+        html = _nested_page(3000)
+        plain = AsyncWebCrawler()
+        guarded = AsyncWebCrawler()
+        HtmlGuard().install(guarded)
+
+        with self.assertRaises(ValueError):
+            asyncio.run(_process(plain, html))
+        result = asyncio.run(_process(guarded, html))
+
+        self.assertIn("Tief verschachtelter Maschinenpark", result.markdown)
+        self.assertIn("Unten", result.markdown)
+
+
+if __name__ == "__main__":
+    unittest.main()
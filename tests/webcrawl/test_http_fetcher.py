@@ -0,0 +1,184 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from crawl4ai import (
+    AsyncWebCrawler,
+    CrawlerRunConfig,
+    DefaultMarkdownGenerator,
+    LXMLWebScrapingStrategy,
+    PruningContentFilter,
+)
+
+from tests.webcrawl.local_http_server import LocalHTTPServer
+from webcrawl.adaptive_concurrency import ConcurrencyController
+from webcrawl.http_fetcher import (
+    REASON_NOSCRIPT,
+    REASON_SPA_ROOT,
+    REASON_TINY_BODY,
+    HybridFetcher,
+    detect_js_rendering,
+)
+
+HTML = {"Content-Type": "text/html; charset=utf-8"}
+LONG_TEXT = "Wir fertigen Sondermaschinen für die Automobilindustrie. " * 20
+
+
+def _page(body, title="Seite"):
+    return f"<html><head><title>{title}</title></head><body>{body}</body></html>"
+
+
+STATIC_PAGE = _page(f"<nav>Menü</nav><main><h1>Produkte</h1><p>{LONG_TEXT}</p></main>")
+SPA_PAGE = _page('<div id="root"></div><script src="/app.js"></script>')
+
+
+class TestDetectJsRendering(unittest.TestCase):
+
+    def test_detect_js_rendering_serverRenderedPage_returnsNone(self):
+        self.assertIsNone(detect_js_rendering(STATIC_PAGE))
+
+    def test_detect_js_rendering_emptySpaRoot(self):
+        self.assertEqual(detect_js_rendering(SPA_PAGE), REASON_SPA_ROOT)
+
+    def test_detect_js_rendering_tinyBody(self):
+        self.assertEqual(detect_js_rendering(_page("<p>Hallo</p>")), REASON_TINY_BODY)
+
+    def test_detect_js_rendering_noscriptHintWithLittleText(self):
+        html = _page(
+            "<noscript>Bitte JavaScript aktivieren</noscript>"
+            f"<p>{LONG_TEXT[:400]}</p>"
+        )
+        self.assertEqual(detect_js_rendering(html), REASON_NOSCRIPT)
+
+    def test_detect_js_rendering_noscriptTrackingPixel_isIgnored(self):
+        html = _page(
+            '<noscript><iframe src="https://www.googletagmanager.com/ns.html">'
+            f"</iframe></noscript><p>{LONG_TEXT}</p>"
+        )
+        self.assertIsNone(detect_js_rendering(html))
+
+
+class TestHybridFetcher(unittest.TestCase):
+
+    def _config(self):
+        return CrawlerRunConfig(
+            only_text=True,
+            excluded_tags=["nav"],
+            scraping_strategy=LXMLWebScrapingStrategy(),
+            markdown_generator=DefaultMarkdownGenerator(
+                content_filter=PruningContentFilter(threshold=0.4),
+                options={"ignore_links": True},
+            ),
+        )
+
+    def test_fetch_many_escalatesOnlyJsPagesToBrowser(self):
+        # A crawler that was never started: HTML processing needs no browser
+        crawler = AsyncWebCrawler()
+        browser_result = MagicMock(success=True)
+
+        async def stream(urls):
+            for url in urls:
+                browser_result.url = url
+                yield browser_result
+
+        crawler.arun_many = AsyncMock(side_effect=lambda urls, **kwargs: stream(urls))
+
+        async def run(urls):
+            fetcher = HybridFetcher(crawler, self._config())
+            results = [result async for result in fetcher.fetch_many(urls)]
+            return fetcher, results
+
+        with LocalHTTPServer({
+            "/produkte": (200, HTML, STATIC_PAGE.encode("utf-8")),
+            "/app": (200, HTML, SPA_PAGE.encode("utf-8")),
+            "/broschuere.pdf": (200, {"Content-Type": "application/pdf"}, b"%PDF"),
+        }) as server:
+            urls = [server.url(p) for p in ("/produkte", "/app", "/broschuere.pdf")]
+            fetcher, results = asyncio.run(run(urls))
+
+        self.assertEqual(fetcher.http_pages, 1)
+        self.assertEqual(fetcher.browser_pages, 2)
+        self.assertEqual(crawler.arun_many.call_args[0][0], urls[1:])
+        static = results[0]
+        self.assertTrue(static.success)
+        self.assertEqual(static.url, urls[0])
+        self.assertEqual(static.metadata["title"], "Seite")
+        self.assertEqual(static.status_code, 200)
+        self.assertEqual(static.redirected_url, urls[0])
+        self.assertIn("Sondermaschinen", static.markdown)
+        self.assertNotIn("Menü", static.markdown)
+
+    def test_fetch_many_redirectedPage_keepsFinalUrl(self):
+        crawler = AsyncWebCrawler()
+        crawler.arun_many = AsyncMock()
+
+        async def run(urls):
+            fetcher = HybridFetcher(crawler, self._config())
+            return [result async for result in fetcher.fetch_many(urls)]
+
+        with LocalHTTPServer({
+            "/alt": (301, {"Location": "/produkte"}, b""),
+            "/produkte": (200, HTML, STATIC_PAGE.encode("utf-8")),
+        }) as server:
+            old_url, final_url = server.url("/alt"), server.url("/produkte")
+            results = asyncio.run(run([old_url]))
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].url, old_url)
+        self.assertEqual(results[0].status_code, 200)
+        self.assertEqual(results[0].redirected_url, final_url)
+        crawler.arun_many.assert_not_called()
+
+    def test_fetch_many_httpError_escalatesToBrowser(self):
+        crawler = MagicMock()
+
+        async def stream(urls):
+            for url in urls:
+                yield MagicMock(url=url, success=False)
+
+        crawler.arun_many = AsyncMock(side_effect=lambda urls, **kwargs: stream(urls))
+
+        async def run(urls):
+            fetcher = HybridFetcher(crawler, self._config())
+            return [result.url async for result in fetcher.fetch_many(urls)]
+
+        with LocalHTTPServer() as server:
+            urls = [server.url("/gibt-es-nicht")]
+            result_urls = asyncio.run(run(urls))
+
+        self.assertEqual(result_urls, urls)
+        crawler.aprocess_html.assert_not_called()
+
+    def test_fetch_many_throttledPage_backsOffInsteadOfEscalating(self):
+        crawler = AsyncWebCrawler()
+        crawler.arun_many = AsyncMock()
+        controller = ConcurrencyController(initial_sessions=8, label="test")
+        dispatcher = MagicMock(controller=controller, max_session_permit=8)
+        responses = iter([
+            (429, {"Retry-After": "0"}, b"slow down"),
+            (200, HTML, STATIC_PAGE.encode("utf-8")),
+        ])
+
+        async def run(urls):
+            fetcher = HybridFetcher(crawler, self._config(), dispatcher)
+            results = [result async for result in fetcher.fetch_many(urls)]
+            return fetcher, results
+
+        with LocalHTTPServer({"/produkte": lambda handler: next(responses)}) as server:
+            fetcher, results = asyncio.run(run([server.url("/produkte")]))
+            request_count = len(server.requests)
+
+        self.assertEqual(request_count, 2)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].status_code, 200)
+        self.assertEqual(fetcher.http_pages, 1)
+        self.assertEqual(fetcher.browser_pages, 0)
+        crawler.arun_many.assert_not_called()
+        # The 429 halved the limit of the browser dispatcher as well
+        self.assertEqual(controller.decisions, [(8, 4, "1x 429/503")])
+        self.assertEqual(dispatcher.max_session_permit, 4)
+        self.assertEqual(fetcher.request_limit, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
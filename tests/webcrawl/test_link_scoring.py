@@ -0,0 +1,66 @@
+import unittest
+
+from webcrawl.crawl_domain import filter_internal_links
+from webcrawl.link_scoring import LinkScorer, normalize_for_matching
+
+
+class TestLinkScorer(unittest.TestCase):
+
+    def test_normalize_for_matching_spellsOutUmlauts(self):
+        self.assertEqual(normalize_for_matching("/L%C3%B6sungen"), "/loesungen")
+
+    def test_score_productPageOutranksNewsPage(self):
+        scorer = LinkScorer()
+        self.assertGreater(
+            scorer.score("https://example.de/produkte"),
+            scorer.score("https://example.de/news"),
+        )
+
+    def test_score_anchorTextCounts(self):
+        scorer = LinkScorer()
+        self.assertGreater(
+            scorer.score("https://example.de/seite-3", "Unser Maschinenpark"),
+            scorer.score("https://example.de/seite-3"),
+        )
+
+    def test_score_deeperPathsArePenalized(self):
+        scorer = LinkScorer()
+        self.assertGreater(
+            scorer.score("https://example.de/maschinen"),
+            scorer.score("https://example.de/maschinen/fraesen/5-achs"),
+        )
+
+    def test_rank_isStableForEqualScores(self):
+        urls = ["https://example.de/a", "https://example.de/b", "https://example.de/c"]
+        self.assertEqual(LinkScorer().rank(urls), urls)
+
+    def test_from_config_mergesKeywordWeights(self):
+        scorer = LinkScorer.from_config(
+            {"keyword_weights": {"blog": 10.0}, "depth_penalty": 0}
+        )
+        self.assertEqual(scorer.keyword_weights["blog"], 10.0)
+        self.assertEqual(scorer.keyword_weights["produkt"], 3.0)
+        self.assertEqual(scorer.depth_penalty, 0)
+
+
+class TestFilterInternalLinksRanking(unittest.TestCase):
+
+    def test_filter_internal_links_keepsMostRelevantLinksWithinBudget(self):
+        links = [
+            {"href": "/news/2024", "text": "Neuigkeiten"},
+            {"href": "/blog", "text": "Blog"},
+            {"href": "/karriere", "text": "Jobs"},
+            {"href": "/seite-7", "text": "Unser Maschinenpark"},
+            {"href": "/produkte", "text": "Produkte"},
+        ]
+
+        result = filter_internal_links(links, "https://www.example.de", max_links=2)
+
+        self.assertEqual(
+            result,
+            ["https://www.example.de/produkte", "https://www.example.de/seite-7"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
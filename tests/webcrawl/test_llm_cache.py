@@ -0,0 +1,104 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from webcrawl import llm_cache
+from webcrawl.fill_process_type import generate_process_types
+from webcrawl.llm_cache import (
+    BYPASS_ENV_VAR,
+    LlmCache,
+    configure_llm_cache,
+    get_llm_cache,
+    llm_cache_key,
+)
+
+MESSAGES = [{"role": "user", "content": "Nenne die Fertigungsprozesse."}]
+
+
+def _response(content):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))]
+    )
+
+
+class TestLlmCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "llm_cache.sqlite")
+
+    def tearDown(self):
+        configure_llm_cache(None)
+        self.tmp.cleanup()
+
+    def test_llm_cache_key_ignoresCredentialsButNotParameters(self):
+        key = llm_cache_key("1", "bedrock/nova", messages=MESSAGES, temperature=0.3)
+
+        self.assertEqual(
+            key,
+            llm_cache_key(
+                "1", "bedrock/nova", messages=MESSAGES, temperature=0.3, api_key="x"
+            ),
+        )
+        self.assertNotEqual(
+            key, llm_cache_key("2", "bedrock/nova", messages=MESSAGES, temperature=0.3)
+        )
+        self.assertNotEqual(
+            key, llm_cache_key("1", "bedrock/nova", messages=MESSAGES, temperature=0.5)
+        )
+        self.assertNotEqual(
+            key, llm_cache_key("1", "bedrock/lite", messages=MESSAGES, temperature=0.3)
+        )
+
+    def test_get_put_countsHitsAndExpiresAfterTtl(self):
+        cache = LlmCache(self.path, ttl_days=1)
+        self.assertFalse(os.path.exists(self.path))  # created on first use
+
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", "bedrock/nova", '{"process_types": ["Fräsungen"]}')
+
+        self.assertEqual(cache.get("a"), '{"process_types": ["Fräsungen"]}')
+        self.assertEqual(LlmCache(self.path).get("a"), cache.get("a"))  # shared file
+        self.assertEqual((cache.hits, cache.misses, cache.stores), (2, 1, 1))
+        with patch("webcrawl.llm_cache.time.time", return_value=time.time() + 2 * 86400):
+            self.assertIsNone(cache.get("a"))
+
+    def test_put_evictsLeastRecentlyUsedBeyondSizeLimit(self):
+        cache = LlmCache(self.path, max_size_mb=2500 / (1024 * 1024))
+        for key in ("a", "b"):
+            cache.put(key, "bedrock/nova", "x" * 1000)
+            time.sleep(0.01)
+        cache.get("a")
+        time.sleep(0.01)
+
+        cache.put("c", "bedrock/nova", "x" * 1000)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertEqual((cache.entry_count, cache.evictions), (2, 1))
+
+    @patch("webcrawl.fill_process_type.completion")
+    def test_generate_process_types_reusesCachedAnswerUnlessBypassed(self, mock_completion):
+        answer = json.dumps({"process_types": ["Fräsungen", "Drehungen"]})
+        mock_completion.return_value = _response(answer)
+        configure_llm_cache({"path": self.path})
+
+        first = generate_process_types(["Wellen"], ["CNC"], "maschinenbauer")
+        second = generate_process_types(["Wellen"], ["CNC"], "maschinenbauer")
+        with patch.dict(os.environ, {BYPASS_ENV_VAR: "1"}):
+            self.assertIsNone(get_llm_cache())
+            generate_process_types(["Wellen"], ["CNC"], "maschinenbauer")
+
+        self.assertEqual(first, ["Fräsungen", "Drehungen"])
+        self.assertEqual(second, first)
+        self.assertEqual(mock_completion.call_count, 2)
+        self.assertEqual(llm_cache._llm_cache.hits, 1)
+        self.assertIsNone(configure_llm_cache({"enabled": False}))
+
+
+if __name__ == "__main__":
+    unittest.main()
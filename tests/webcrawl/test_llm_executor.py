@@ -0,0 +1,166 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from webcrawl.fill_process_type import process_json_file, run_fill_process_type
+from webcrawl.llm_executor import LlmExecutor, configure_llm_executor
+
+
+class TestLlmExecutor(unittest.TestCase):
+
+    def tearDown(self):
+        configure_llm_executor(None)
+
+    def test_imap_concurrentWork_yieldsResultsInItemOrder(self):
+        executor = LlmExecutor(max_concurrent=4)
+        running, peak = [0], [0]
+        lock = threading.Lock()
+
+        def work(item):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.05 if item % 2 else 0.01)
+            with lock:
+                running[0] -= 1
+            return item * 10
+
+        results = list(executor.imap(work, range(8)))
+        executor.shutdown()
+
+        self.assertEqual(results, [i * 10 for i in range(8)])
+        self.assertEqual(peak[0], 4)
+
+    def test_imap_failingItem_raisesAtItsPosition(self):
+        executor = LlmExecutor(max_concurrent=3)
+
+        def work(item):
+            if item == 2:
+                raise ValueError("kaputt")
+            return item
+
+        results = executor.imap(work, range(5))
+        self.assertEqual([next(results), next(results)], [0, 1])
+        with self.assertRaises(ValueError):
+            next(results)
+        executor.shutdown()
+
+        nested = LlmExecutor(max_concurrent=2)
+        outer = nested.imap(lambda item: list(nested.imap(str, range(item))), [2, 3])
+        self.assertEqual(list(outer), [["0", "1"], ["0", "1", "2"]])
+        nested.shutdown()
+
+    @patch("webcrawl.llm_executor.time.sleep")
+    def test_throttle_spacesRequestsToRateLimit(self, mock_sleep):
+        executor = LlmExecutor(max_concurrent=2, requests_per_minute=600)
+
+        for _ in range(3):
+            executor.throttle()
+
+        waits = [c.args[0] for c in mock_sleep.call_args_list]
+        self.assertEqual(len(waits), 2)
+        self.assertAlmostEqual(waits[0], 0.1, delta=0.01)
+        self.assertAlmostEqual(waits[1], 0.2, delta=0.01)
+        self.assertEqual(executor.requests, 3)
+
+    @patch("webcrawl.fill_process_type.completion")
+    def test_fill_process_type_concurrentRequests_keepCompanyOrder(self, mock_completion):
+        def answer(**kwargs):
+            prompt = kwargs["messages"][0]["content"]
+            product = prompt.split("Die Produkte sind: ")[1].split(".")[0]
+            time.sleep(0.05 if product == "Wellen" else 0.0)
+            content = json.dumps({"process_types": [f"{product}fertigungen"]})
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content=content))]
+            )
+
+        mock_completion.side_effect = answer
+        companies = [
+            {"company_name": "A", "products": ["Wellen"]},
+            {"company_name": "B", "products": ["Zahnräder"]},
+            {"company_name": "C", "products": ["Flansche"], "process_type": ["Drehen"]},
+            {"company_name": "D", "products": ["Bolzen"]},
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            input_file = os.path.join(tmp, "firmen.json")
+            with open(input_file, "w", encoding="utf-8") as f:
+                json.dump(companies, f)
+            configure_llm_executor({"max_concurrent_requests": 4})
+
+            with self.assertLogs("webcrawl.fill_process_type", level="INFO") as logs:
+                process_json_file(input_file, input_file, category="maschinenbau")
+            with open(input_file, encoding="utf-8") as f:
+                filled = json.load(f)
+
+        self.assertEqual(
+            [company["process_type"] for company in filled],
+            [["Wellenfertigungen"], ["Zahnräderfertigungen"], ["Drehen"], ["Bolzenfertigungen"]],
+        )
+        progress = [line for line in logs.output if "PROGRESS:" in line]
+        self.assertEqual(
+            [line.split(":")[5] for line in progress], ["1/4", "2/4", "3/4", "4/4"]
+        )
+        self.assertEqual(mock_completion.call_count, 3)
+
+    @patch("webcrawl.fill_process_type.completion")
+    def test_run_fill_process_type_severalFiles_keepProgressInOrder(self, mock_completion):
+        content = json.dumps({"process_types": ["Drehen"]})
+        mock_completion.return_value = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))]
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ("pluralized_a.json", "pluralized_b.json"):
+                with open(os.path.join(tmp, name), "w", encoding="utf-8") as f:
+                    json.dump(
+                        [{"company_name": n, "products": ["Wellen"]} for n in "XYZ"], f
+                    )
+            configure_llm_executor({"max_concurrent_requests": 4})
+
+            with self.assertLogs("webcrawl.fill_process_type", level="INFO") as logs:
+                run_fill_process_type(folder=tmp, category="maschinenbau")
+
+        progress = [
+            line.split(":")[5] for line in logs.output if "PROGRESS:" in line
+        ]
+        self.assertEqual(
+            progress, ["1/2", "1/3", "2/3", "3/3", "2/2", "1/3", "2/3", "3/3"]
+        )
+
+
+    @patch("webcrawl.fill_process_type.completion")
+    def test_run_fill_process_type_oneCompanyPerFile_requestsRunConcurrently(self, mock_completion):
+        content = json.dumps({"process_types": ["Drehen"]})
+        lock = threading.Lock()
+        active = [0, 0]  # current, maximum
+
+        def answer(**kwargs):
+            with lock:
+                active[0] += 1
+                active[1] = max(active[1], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content=content))]
+            )
+
+        mock_completion.side_effect = answer
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ("a", "b", "c"):
+                with open(os.path.join(tmp, f"{name}_extracted.json"), "w", encoding="utf-8") as f:
+                    json.dump([{"company_name": name, "products": ["Wellen"]}], f)
+            configure_llm_executor({"max_concurrent_requests": 3})
+
+            output_files = run_fill_process_type(folder=tmp, category="maschinenbau")
+
+        self.assertEqual(len(output_files), 3)
+        self.assertEqual(mock_completion.call_count, 3)
+        self.assertGreater(active[1], 1)
+
+if __name__ == "__main__":
+    unittest.main()
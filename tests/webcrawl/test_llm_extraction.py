@@ -0,0 +1,148 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from crawl4ai.async_configs import LLMConfig
+from crawl4ai.extraction_strategy import LLMExtractionStrategy
+from litellm.exceptions import RateLimitError
+
+from webcrawl.llm_cache import configure_llm_cache
+from webcrawl.llm_extraction import DirectExtractor
+
+SCHEMA = {
+    "type": "object",
+    "properties": {"company_name": {"type": "string"}},
+}
+BLOCKS = [{"company_name": "Muster GmbH", "products": ["Drehteile"]}]
+
+
+def _response(content):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage=SimpleNamespace(completion_tokens=5, prompt_tokens=100, total_tokens=105),
+    )
+
+
+def _strategy(**kwargs):
+    return LLMExtractionStrategy(
+        llm_config=LLMConfig(provider="openai/gpt-4o-mini", api_token="test"),
+        schema=SCHEMA,
+        extraction_type="schema",
+        instruction="Extrahiere den Firmennamen.",
+        apply_chunking=False,
+        **kwargs,
+    )
+
+
+async def _extract_all(extractor, paths):
+    return [result async for result in extractor.extract_many(paths)]
+
+
+class TestDirectExtractor(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.md_path = os.path.join(self.tmp.name, "muster_de.md")
+        with open(self.md_path, "w", encoding="utf-8") as f:
+            f.write("# Muster GmbH\nWir fertigen CNC-Drehteile in Ulm.\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    @patch("webcrawl.llm_extraction.acompletion", new_callable=AsyncMock)
+    def test_extract_many_sendsSchemaInstructionAndFileWithoutBrowser(self, mock_completion):
+        mock_completion.return_value = _response(f"<blocks>{json.dumps(BLOCKS)}</blocks>")
+        strategy = _strategy()
+
+        with patch("crawl4ai.AsyncWebCrawler.start") as mock_start:
+            results = asyncio.run(_extract_all(DirectExtractor(strategy), [self.md_path]))
+
+        mock_start.assert_not_called()
+        prompt = mock_completion.call_args.kwargs["messages"][0]["content"]
+        self.assertIn('"company_name"', prompt)
+        self.assertIn("Extrahiere den Firmennamen.", prompt)
+        self.assertIn("Wir fertigen CNC-Drehteile in Ulm.", prompt)
+        self.assertEqual(results[0].url, f"file://{os.path.abspath(self.md_path)}")
+        self.assertEqual(
+            json.loads(results[0].extracted_content), [dict(BLOCKS[0], error=False)]
+        )
+        self.assertEqual(strategy.total_usage.total_tokens, 105)
+
+    @patch("webcrawl.llm_extraction.acompletion", new_callable=AsyncMock)
+    def test_extract_file_copyInOtherDirectory_reusesCachedAnswer(self, mock_completion):
+        mock_completion.return_value = _response(f"<blocks>{json.dumps(BLOCKS)}</blocks>")
+        copy_dir = os.path.join(self.tmp.name, "copy")
+        os.makedirs(copy_dir)
+        copy_path = os.path.join(copy_dir, "muster_de.md")
+        with open(self.md_path, encoding="utf-8") as src, open(
+            copy_path, "w", encoding="utf-8"
+        ) as dst:
+            dst.write(src.read())
+        configure_llm_cache({"path": os.path.join(self.tmp.name, "llm_cache.sqlite")})
+        try:
+            extractor = DirectExtractor(_strategy())
+            first = asyncio.run(extractor.extract_file(self.md_path))
+            second = asyncio.run(extractor.extract_file(copy_path))
+        finally:
+            configure_llm_cache(None)
+
+        self.assertEqual(mock_completion.await_count, 1)
+        self.assertEqual(first.extracted_content, second.extracted_content)
+        prompt = mock_completion.call_args.kwargs["messages"][0]["content"]
+        self.assertIn(f"file://{os.path.abspath(self.md_path)}", prompt)
+
+    @patch("webcrawl.llm_extraction.acompletion", new_callable=AsyncMock)
+    def test_extract_file_unparsableAnswer_becomesErrorBlock(self, mock_completion):
+        mock_completion.return_value = _response(
+            '<blocks>[{"company_name": "Muster GmbH",}]</blocks>'
+        )
+
+        result = asyncio.run(DirectExtractor(_strategy()).extract_file(self.md_path))
+
+        blocks = json.loads(result.extracted_content)
+        self.assertEqual(len(blocks), 1)
+        self.assertTrue(blocks[0]["error"])
+        self.assertEqual(blocks[0]["tags"], ["error"])
+
+    @patch("webcrawl.llm_extraction.asyncio.sleep", new_callable=AsyncMock)
+    @patch("webcrawl.llm_extraction.acompletion", new_callable=AsyncMock)
+    def test_extract_file_rateLimited_retriesWithBackoff(self, mock_completion, mock_sleep):
+        rate_limited = RateLimitError("rate limited", "openai", "gpt-4o-mini")
+        mock_completion.side_effect = [
+            rate_limited,
+            rate_limited,
+            _response(f"<blocks>{json.dumps(BLOCKS)}</blocks>"),
+        ]
+
+        result = asyncio.run(DirectExtractor(_strategy()).extract_file(self.md_path))
+
+        self.assertEqual([c.args[0] for c in mock_sleep.call_args_list], [2.0, 4.0])
+        self.assertFalse(json.loads(result.extracted_content)[0]["error"])
+
+        mock_completion.side_effect = rate_limited
+        result = asyncio.run(DirectExtractor(_strategy()).extract_file(self.md_path))
+        self.assertTrue(json.loads(result.extracted_content)[0]["error"])
+
+    @patch("webcrawl.llm_extraction.acompletion", new_callable=AsyncMock)
+    def test_read_content_convertsHtmlForMarkdownInput(self, mock_completion):
+        html_path = os.path.join(self.tmp.name, "bericht.html")
+        with open(html_path, "w", encoding="utf-8") as f:
+            f.write("<html><body><h1>Sachanlagen</h1><p>Technische Anlagen</p></body></html>")
+
+        as_markdown = asyncio.run(DirectExtractor(_strategy()).read_content(html_path))
+        as_html = asyncio.run(
+            DirectExtractor(_strategy(input_format="html")).read_content(html_path)
+        )
+
+        self.assertIn("# Sachanlagen", as_markdown)
+        self.assertNotIn("<p>", as_markdown)
+        self.assertIn("<p>Technische Anlagen</p>", as_html)
+        mock_completion.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from crawl4ai import CrawlResult
+from crawl4ai.models import MarkdownGenerationResult
+
+from webcrawl.crawl_domain import collect_internal_links
+from webcrawl.page_cache import PageCache, normalize_cache_url
+
+
+def _result(url, markdown="Wir fertigen Drehteile.", success=True, links=None):
+    return CrawlResult(
+        url=url,
+        html="<html></html>",
+        success=success,
+        markdown=MarkdownGenerationResult(
+            raw_markdown=markdown, markdown_with_citations="", references_markdown=""
+        ),
+        metadata={"title": "Muster GmbH"},
+        links=links or {"internal": [], "external": [{"href": "https://x.de"}]},
+    )
+
+
+class TestPageCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "pages.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_normalize_cache_url_dropsTrackingAndSortsQuery(self):
+        self.assertEqual(
+            normalize_cache_url("HTTPS://Muster.DE/produkte/?b=2&utm_source=x&a=1#top"),
+            "https://muster.de/produkte?a=1&b=2",
+        )
+
+    def test_get_returnsCachedResultAndCountsHits(self):
+        cache = PageCache(self.path)
+        self.assertIsNone(cache.get("https://muster.de/produkte"))
+        cache.put("https://muster.de/produkte", _result("https://muster.de/produkte"))
+
+        cached = cache.get("https://muster.de/produkte/?utm_medium=mail")
+
+        self.assertTrue(cached.success)
+        self.assertEqual(cached.markdown, "Wir fertigen Drehteile.")
+        self.assertEqual(cached.metadata["title"], "Muster GmbH")
+        self.assertNotIn("external", cached.links)
+        self.assertEqual((cache.hits, cache.misses, cache.stores), (1, 1, 1))
+
+    def test_put_failedResult_isNotCached(self):
+        cache = PageCache(self.path)
+        cache.put("https://muster.de", _result("https://muster.de", success=False))
+        self.assertIsNone(cache.get("https://muster.de"))
+
+    def test_get_expiredEntry_isMiss(self):
+        cache = PageCache(self.path, ttl_days=1)
+        cache.put("https://muster.de", _result("https://muster.de"))
+        with patch("webcrawl.page_cache.time.time", return_value=time.time() + 2 * 86400):
+            self.assertIsNone(cache.get("https://muster.de"))
+            cache.save()
+        self.assertEqual(cache.page_count, 0)
+
+    def test_put_evictsLeastRecentlyUsedPages(self):
+        cache = PageCache(self.path)
+        for i in range(3):
+            cache.put(f"https://muster.de/{i}", _result(f"https://muster.de/{i}", "x" * i))
+        with patch("webcrawl.page_cache.time.time", return_value=time.time() + 1):
+            cache.get("https://muster.de/0")
+        cache.max_size = cache.size - 1
+
+        cache.put("https://muster.de/0", _result("https://muster.de/0"))
+
+        self.assertEqual(cache.evictions, 1)
+        self.assertIsNone(cache.get("https://muster.de/1"))
+        self.assertIsNotNone(cache.get("https://muster.de/0"))
+        self.assertIsNotNone(cache.get("https://muster.de/2"))
+
+    def test_close_persistsPagesBetweenRuns(self):
+        cache = PageCache(self.path)
+        cache.put("https://muster.de", _result("https://muster.de"))
+        cache.close()
+
+        reloaded = PageCache.from_config({"path": self.path})
+
+        self.assertIsNotNone(reloaded.get("https://muster.de"))
+        self.assertIsNone(PageCache.from_config({"enabled": False}))
+
+    def test_put_concurrentRuns_shareCommittedPages(self):
+        first = PageCache(self.path)
+        second = PageCache(self.path)
+
+        first.put("https://muster.de/a", _result("https://muster.de/a"))
+        second.put("https://muster.de/b", _result("https://muster.de/b"))
+
+        # Pages are committed as they are stored, without waiting for save()
+        self.assertIsNotNone(second.get("https://muster.de/a"))
+        self.assertIsNotNone(first.get("https://muster.de/b"))
+        first.close()
+        second.close()
+
+    def test_collect_internal_links_usesCachedMainPage(self):
+        cache = PageCache(self.path)
+        cache.put(
+            "https://www.example.com",
+            _result(
+                "https://www.example.com",
+                links={"internal": [{"href": "https://www.example.com/leistungen"}]},
+            ),
+        )
+        crawler = MagicMock()
+        crawler.arun = AsyncMock()
+
+        links = asyncio.run(
+            collect_internal_links(
+                crawler,
+                "https://www.example.com",
+                10,
+                use_sitemap=False,
+                page_cache=cache,
+            )
+        )
+
+        crawler.arun.assert_not_called()
+        self.assertEqual(links, ["https://www.example.com/leistungen"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import json
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from webcrawl.plural_lexicon import (
+    PluralLexicon,
+    configure_plural_lexicon,
+    merge_known_words,
+    seed_from_directories,
+    split_known_words,
+)
+from webcrawl.pluralize_with_llm import pluralize_with_llm
+
+
+def _response(content):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(content)))]
+    )
+
+
+class TestPluralLexicon(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "plural_lexicon.sqlite")
+        self.overrides_path = os.path.join(self.tmp.name, "plural_overrides.json")
+
+    def tearDown(self):
+        configure_plural_lexicon(None)
+        self.tmp.cleanup()
+
+    def test_learn_lookup_persistsAndOverridesTakePrecedence(self):
+        with open(self.overrides_path, "w", encoding="utf-8") as f:
+            json.dump({"Baugruppe": "Baugruppen"}, f)
+        lexicon = PluralLexicon(self.path, overrides_path=self.overrides_path)
+
+        lexicon.learn_fields(
+            {"products": ["Drehteil", "Baugruppe"], "machines": ["CNC-Fräsmaschine"]},
+            {"products": ["Drehteile", "Baugruppes"], "machines": ["CNC-Fräsmaschinen"]},
+        )
+        reopened = PluralLexicon(self.path, overrides_path=self.overrides_path)
+
+        self.assertEqual(
+            reopened.lookup(["Drehteil", "Baugruppe", "CNC-Fräsmaschine", "Welle"]),
+            {
+                "Drehteil": "Drehteile",
+                "Baugruppe": "Baugruppen",
+                "CNC-Fräsmaschine": "CNC-Fräsmaschinen",
+            },
+        )
+        self.assertEqual((reopened.hits, reopened.misses), (3, 1))
+        self.assertEqual(lexicon.word_count, 2)  # the override is not learned
+
+    def test_split_and_merge_knownWords_keepWordOrder(self):
+        lexicon = PluralLexicon(self.path)
+        lexicon.learn([("Drehteil", "Drehteile"), ("Fräsen", "Fräsungen")])
+        fields = {
+            "products": ["Drehteil", "Welle", "Drehteil"],
+            "process_type": ["Fräsen"],
+        }
+
+        known, unknown_fields = split_known_words(lexicon, fields)
+
+        self.assertEqual(unknown_fields, {"products": ["Welle"]})
+        self.assertEqual(
+            merge_known_words(fields, known, {"products": ["Wellen"]}),
+            {"products": ["Drehteile", "Wellen", "Drehteile"], "process_type": ["Fräsungen"]},
+        )
+        self.assertEqual(split_known_words(None, fields), ({}, fields))
+
+    @patch("webcrawl.pluralize_with_llm.completion")
+    def test_pluralize_with_llm_sendsOnlyUnknownWordsAndLearnsAnswer(self, mock_completion):
+        configure_plural_lexicon({"path": self.path})
+        mock_completion.side_effect = [
+            _response({"products": ["Drehteile", "Wellen"], "machines": [], "process_type": []}),
+            _response({"products": ["Flansche"], "machines": [], "process_type": []}),
+        ]
+
+        first = pluralize_with_llm({"products": ["Drehteil", "Welle"]})
+        second = pluralize_with_llm({"products": ["Welle", "Flansch", "Drehteil"]})
+        third = pluralize_with_llm({"products": ["Flansch", "Welle"]})
+
+        self.assertEqual(first, {"products": ["Drehteile", "Wellen"]})
+        self.assertEqual(second, {"products": ["Wellen", "Flansche", "Drehteile"]})
+        self.assertEqual(third, {"products": ["Flansche", "Wellen"]})
+        self.assertEqual(mock_completion.call_count, 2)
+        prompt = mock_completion.call_args.kwargs["messages"][0]["content"]
+        payload = json.loads(prompt[prompt.index("Here is the input:") + 18:])
+        self.assertEqual(payload["products"], ["Flansch"])
+
+    def test_seed_from_directories_learnsValidatedPairsOfPastRun(self):
+        input_dir = os.path.join(self.tmp.name, "process_type_filled")
+        output_dir = os.path.join(self.tmp.name, "pluralized_keywords")
+        os.makedirs(input_dir)
+        os.makedirs(output_dir)
+        runs = {
+            "a.json": (
+                [{"products": ["Drehteil", "Welle"], "machines": ["Presse"]}],
+                [{"products": ["Drehteile", "Wellen"], "machines": ["Presse"]}],
+            ),
+            "b.json": (
+                [{"products": ["Flansch"], "process_type": ["Fräsen", "Drehen"]}],
+                [{"products": ["Flansche"], "process_type": ["Fräsungen"]}],
+            ),
+        }
+        for filename, (inputs, outputs) in runs.items():
+            with open(os.path.join(input_dir, filename), "w", encoding="utf-8") as f:
+                json.dump(inputs, f)
+            with open(os.path.join(output_dir, filename), "w", encoding="utf-8") as f:
+                json.dump(outputs, f)
+        lexicon = PluralLexicon(self.path, overrides_path=self.overrides_path)
+
+        learned = seed_from_directories(lexicon, input_dir, output_dir)
+        lexicon.set_override("Presse", "Pressen")
+
+        self.assertEqual(learned, 3)
+        self.assertEqual(
+            lexicon.lookup(["Drehteil", "Welle", "Flansch", "Fräsen", "Presse"]),
+            {
+                "Drehteil": "Drehteile",
+                "Welle": "Wellen",
+                "Flansch": "Flansche",
+                "Presse": "Pressen",
+            },
+        )
+        with open(self.overrides_path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f), {"Presse": "Pressen"})
+
+
+if __name__ == "__main__":
+    unittest.main()
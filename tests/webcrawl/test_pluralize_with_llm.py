@@ -10,6 +10,7 @@ import io
 import json
 import logging
 import os
+import tempfile
 import unittest
 from pathlib import Path
 from unittest import mock
@@ -17,12 +18,18 @@ from unittest.mock import MagicMock, call, patch
 
 from litellm.exceptions import JSONSchemaValidationError
 
+from webcrawl.llm_cache import configure_llm_cache
+from webcrawl.llm_executor import configure_llm_executor
 from webcrawl.pluralize_with_llm import (
+    batch_stats,
     clean_compound_words,
     compound_word_stats,
+    create_batch_pluralization_prompt,
+    create_batches,
     create_pluralization_prompt,
     extract_fields_from_entry,
     failed_files,
+    pluralize_batch_with_llm,
     pluralize_with_llm,
     process_directory,
     process_json_file,
@@ -898,7 +905,8 @@ class TestProcessDirectory(unittest.TestCase):
         with self.assertRaises(FileNotFoundError):
             process_directory("input_dir", "output_dir", temperatures=[0.5, 0.7])
 
-    @patch("webcrawl.pluralize_with_llm.process_json_file")
+    @patch("webcrawl.pluralize_with_llm.write_pluralized_entries")
+    @patch("webcrawl.pluralize_with_llm.load_json_entries")
     @patch("os.makedirs")
     @patch("os.listdir")
     @patch("os.path.isdir", return_value=True)  # Mock isdir to return True
@@ -911,11 +919,13 @@ class TestProcessDirectory(unittest.TestCase):
         mock_isdir,
         mock_listdir,
         mock_makedirs,
-        mock_process_json_file,
+        mock_load_json_entries,
+        mock_write_pluralized_entries,
     ):
         """Test successful processing of multiple files."""
         # Setup
         mock_listdir.return_value = ["file1.json", "file2.json", "file3.txt"]
+        mock_load_json_entries.return_value = [{"products": ["Welle"]}]
         temperatures = [0.5, 0.7]
 
         # Execute
@@ -924,29 +934,30 @@ class TestProcessDirectory(unittest.TestCase):
         # Verify
         mock_makedirs.assert_called_once_with("output_dir", exist_ok=True)
         self.assertEqual(
-            mock_process_json_file.call_count, 2
+            mock_write_pluralized_entries.call_count, 2
         )  # Should be called twice for 2 JSON files
 
-        # Check that process_json_file was called with the correct parameters
-        expected_calls = [
-            call(
-                os.path.join("input_dir", "file1.json"),
-                os.path.join("output_dir", "file1.json"),
-                temperatures,
-            ),
-            call(
-                os.path.join("input_dir", "file2.json"),
-                os.path.join("output_dir", "file2.json"),
-                temperatures,
-            ),
-        ]
-        mock_process_json_file.assert_has_calls(expected_calls, any_order=False)
+        # Check that every file was written with the correct paths, in order
+        self.assertEqual(
+            [c.args[3:] for c in mock_write_pluralized_entries.call_args_list],
+            [
+                (
+                    os.path.join("input_dir", "file1.json"),
+                    os.path.join("output_dir", "file1.json"),
+                ),
+                (
+                    os.path.join("input_dir", "file2.json"),
+                    os.path.join("output_dir", "file2.json"),
+                ),
+            ],
+        )
 
         # Check log messages
         log_output = self.log_output.getvalue()
         self.assertIn("Found 2 JSON files to process", log_output)
 
-    @patch("webcrawl.pluralize_with_llm.process_json_file")
+    @patch("webcrawl.pluralize_with_llm.write_pluralized_entries")
+    @patch("webcrawl.pluralize_with_llm.load_json_entries", return_value=[])
     @patch("os.makedirs")
     @patch("os.listdir")
     @patch("os.path.isdir", return_value=True)  # Mock isdir to return True
@@ -959,7 +970,8 @@ class TestProcessDirectory(unittest.TestCase):
         mock_isdir,
         mock_listdir,
         mock_makedirs,
-        mock_process_json_file,
+        mock_load_json_entries,
+        mock_write_pluralized_entries,
     ):
         """Test processing with some failures."""
         # Setup
@@ -976,7 +988,7 @@ class TestProcessDirectory(unittest.TestCase):
         # Verify
         mock_makedirs.assert_called_once_with("output_dir", exist_ok=True)
         self.assertEqual(
-            mock_process_json_file.call_count, 3
+            mock_write_pluralized_entries.call_count, 3
         )  # Should be called for all 3 JSON files
 
         # Check log messages
@@ -1238,3 +1250,184 @@ class TestModelFallbackIntegration(unittest.TestCase):
         self.assertEqual(len(failed_files), 1)
         self.assertEqual(failed_files[0][0], file_path)
         self.assertIn("products", failed_files[0][1])  # Should include field info
+
+
+class TestBatchPluralization(unittest.TestCase):
+    """Test packing several entries into one pluralization request."""
+
+    def setUp(self):
+        """Set up the test environment before each test."""
+        failed_files.clear()
+        compound_word_stats["files_affected"] = set()
+        compound_word_stats["words_modified"] = []
+        for key in batch_stats:
+            batch_stats[key] = 0
+
+    @staticmethod
+    def _response(content):
+        response = MagicMock()
+        response.choices[0].message.content = json.dumps(content)
+        return response
+
+    def test_create_batches_respectsBatchSizeAndTokenBudget(self):
+        """Test that batches are split by entry count and estimated tokens, in order."""
+        items = [(f"{i}.json", {"products": [f"Produkt{i}"]}) for i in range(5)]
+        large = ("large.json", {"products": ["Maschinenbauteil"] * 100})
+
+        self.assertEqual(
+            [len(batch) for batch in create_batches(items, batch_size=2)], [2, 2, 1]
+        )
+        batches = create_batches(items[:2] + [large] + items[2:], 10, token_budget=100)
+        self.assertEqual([len(batch) for batch in batches], [2, 1, 3])
+        self.assertEqual(batches[1], [large])
+
+    def test_create_batch_pluralization_prompt_sendsInstructionsOnceKeyedById(self):
+        """Test that the batch prompt holds the instructions once and every entry by id."""
+        prompt = create_batch_pluralization_prompt(
+            {"1": {"products": ["Welle"]}, "2": {"machines": ["Drehmaschine"]}}
+        )
+
+        self.assertEqual(prompt.count("Do not include any explanations"), 1)
+        payload = json.loads(prompt[prompt.index("Here is the input:") + 18:])
+        self.assertEqual(
+            payload,
+            {
+                "1": {"products": ["Welle"], "machines": [], "process_type": []},
+                "2": {"products": [], "machines": ["Drehmaschine"], "process_type": []},
+            },
+        )
+
+    @patch("webcrawl.pluralize_with_llm.completion")
+    def test_pluralize_batch_with_llm_invalidEntry_retriedIndividually(self, mock_completion):
+        """Test that only entries failing validation are sent again on their own."""
+        mock_completion.side_effect = [
+            self._response(
+                {
+                    "entries": [
+                        {"id": "2", "products": ["Zahnräder"], "machines": [], "process_type": []},
+                        {"id": "1", "products": ["Wellen"], "machines": [], "process_type": []},
+                        {"id": "3", "products": ["Flansche", "Extra"], "machines": [], "process_type": []},
+                    ]
+                }
+            ),
+            self._response({"products": ["Flansche"], "machines": [], "process_type": []}),
+        ]
+        batch = [
+            ("a.json", {"products": ["Welle"]}),
+            ("b.json", {"products": ["Zahnrad"]}),
+            ("c.json", {"products": ["Flansch"]}),
+        ]
+
+        results = pluralize_batch_with_llm(batch)
+
+        self.assertEqual(
+            results,
+            [{"products": ["Wellen"]}, {"products": ["Zahnräder"]}, {"products": ["Flansche"]}],
+        )
+        self.assertEqual(mock_completion.call_count, 2)
+        retry_prompt = mock_completion.call_args.kwargs["messages"][0]["content"]
+        self.assertIn("Flansch", retry_prompt)
+        self.assertNotIn("Welle", retry_prompt)
+        self.assertEqual(
+            batch_stats, {"requests": 1, "cached": 0, "entries": 3, "retried": 1}
+        )
+        self.assertEqual(failed_files, [])
+
+    @patch("webcrawl.pluralize_with_llm.completion")
+    def test_pluralize_batch_with_llm_cachedAnswer_notCountedAsRequest(self, mock_completion):
+        """Test that a batch answered from the LLM cache is not counted as an LLM request."""
+        mock_completion.return_value = self._response(
+            {
+                "entries": [
+                    {"id": "1", "products": ["Wellen"], "machines": [], "process_type": []},
+                    {"id": "2", "products": ["Zahnräder"], "machines": [], "process_type": []},
+                ]
+            }
+        )
+        batch = [("a.json", {"products": ["Welle"]}), ("b.json", {"products": ["Zahnrad"]})]
+        with tempfile.TemporaryDirectory() as tmp:
+            configure_llm_cache({"path": os.path.join(tmp, "llm_cache.sqlite")})
+            try:
+                first = pluralize_batch_with_llm(batch)
+                second = pluralize_batch_with_llm(batch)
+            finally:
+                configure_llm_cache(None)
+
+        self.assertEqual(first, second)
+        self.assertEqual(mock_completion.call_count, 1)
+        self.assertEqual(
+            batch_stats, {"requests": 1, "cached": 1, "entries": 4, "retried": 0}
+        )
+
+    @patch("webcrawl.pluralize_with_llm.completion")
+    def test_process_directory_batchSize_packsEntriesOfAllFiles(self, mock_completion):
+        """Test that the entries of several files share one request and keep their files."""
+        mock_completion.return_value = self._response(
+            {
+                "entries": [
+                    {"id": "1", "products": ["Wellen"], "machines": [], "process_type": []},
+                    {"id": "2", "products": ["Zahnräder"], "machines": ["Fräsmaschinen"], "process_type": []},
+                ]
+            }
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            input_dir = os.path.join(tmp, "in")
+            output_dir = os.path.join(tmp, "out")
+            os.makedirs(input_dir)
+            companies = {
+                "a.json": [{"company_name": "A", "products": ["Welle"]}],
+                "b.json": [
+                    {"company_name": "B", "products": ["Zahnrad"], "machines": ["Fräsmaschine"]},
+                    {"company_name": "C", "products": []},
+                ],
+            }
+            for filename, data in companies.items():
+                with open(os.path.join(input_dir, filename), "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+
+            with patch("webcrawl.pluralize_with_llm.os.listdir", return_value=list(companies)):
+                process_directory(input_dir, output_dir, batch_size=20)
+
+            with open(os.path.join(output_dir, "a.json"), encoding="utf-8") as f:
+                a = json.load(f)
+            with open(os.path.join(output_dir, "b.json"), encoding="utf-8") as f:
+                b = json.load(f)
+
+        mock_completion.assert_called_once()
+        self.assertEqual(a[0]["products"], ["Wellen"])
+        self.assertEqual(b[0]["products"], ["Zahnräder"])
+        self.assertEqual(b[0]["machines"], ["Fräsmaschinen"])
+        self.assertEqual(b[1]["products"], [])
+
+
+    @patch("webcrawl.pluralize_with_llm.completion")
+    def test_process_directory_concurrentEntries_keepProgressInOrder(self, mock_completion):
+        """Test that per-entry requests of several files keep the PROGRESS lines in order."""
+        mock_completion.return_value = self._response(
+            {"products": ["Wellen"], "machines": [], "process_type": []}
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            input_dir = os.path.join(tmp, "in")
+            output_dir = os.path.join(tmp, "out")
+            os.makedirs(input_dir)
+            for filename in ("a.json", "b.json"):
+                with open(os.path.join(input_dir, filename), "w", encoding="utf-8") as f:
+                    json.dump(
+                        [{"company_name": n, "products": ["Welle"]} for n in "XYZ"], f
+                    )
+            configure_llm_executor({"max_concurrent_requests": 4})
+            try:
+                with patch(
+                    "webcrawl.pluralize_with_llm.os.listdir", return_value=["a.json", "b.json"]
+                ), self.assertLogs("webcrawl.pluralize_with_llm.py", level="INFO") as logs:
+                    process_directory(input_dir, output_dir)
+            finally:
+                configure_llm_executor(None)
+
+        progress = [
+            line.split(":")[5] for line in logs.output if "PROGRESS:" in line
+        ]
+        self.assertEqual(
+            progress, ["1/2", "1/3", "2/3", "3/3", "2/2", "1/3", "2/3", "3/3"]
+        )
+        self.assertEqual(mock_completion.call_count, 6)
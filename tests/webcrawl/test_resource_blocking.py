@@ -0,0 +1,192 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from webcrawl.crawl_domain import combine_hooks
+from webcrawl.resource_blocking import (
+    ESTIMATED_BYTES_BY_TYPE,
+    REASON_HOST,
+    REASON_RESOURCE_TYPE,
+    REASON_THIRD_PARTY_SCRIPT,
+    ResourceBlocker,
+    ResourcePolicy,
+)
+
+PAGE_URL = "https://www.maschinenbau.de/produkte"
+
+
+def _route(url, resource_type):
+    route = MagicMock()
+    route.request.url = url
+    route.request.resource_type = resource_type
+    route.abort = AsyncMock()
+    route.fallback = AsyncMock()
+    return route
+
+
+def _page(url=PAGE_URL):
+    page = MagicMock()
+    page.url = url
+    page.route = AsyncMock()
+    return page
+
+
+class TestResourcePolicy(unittest.TestCase):
+
+    def test_block_reason_defaults(self):
+        policy = ResourcePolicy()
+        cases = [
+            ("document", "https://www.maschinenbau.de/", None),
+            ("document", "https://www.youtube.com/embed/x", None),
+            ("image", "https://www.maschinenbau.de/logo.png", REASON_RESOURCE_TYPE),
+            ("font", "https://www.maschinenbau.de/a.woff2", REASON_RESOURCE_TYPE),
+            ("media", "https://cdn.video.de/clip.mp4", REASON_RESOURCE_TYPE),
+            (
+                "script",
+                "https://www.googletagmanager.com/gtm.js",
+                REASON_HOST,
+            ),
+            ("stylesheet", "https://fonts.googleapis.com/css", REASON_HOST),
+            ("script", "https://widget.chat-anbieter.com/w.js", REASON_THIRD_PARTY_SCRIPT),
+            ("script", "https://static.maschinenbau.de/app.js", None),
+            ("script", "https://code.jquery.com/jquery.min.js", None),
+            ("stylesheet", "https://www.maschinenbau.de/style.css", None),
+            ("xhr", "https://api.other-site.com/data", None),
+        ]
+        for resource_type, url, expected in cases:
+            with self.subTest(resource_type=resource_type, url=url):
+                self.assertEqual(
+                    policy.block_reason(resource_type, url, PAGE_URL), expected
+                )
+
+    def test_from_config_extendsAndOverridesDefaults(self):
+        policy = ResourcePolicy.from_config(
+            {
+                "blocked_resource_types": ["image", "stylesheet"],
+                "extra_blocked_hosts": ["tracker.example.com"],
+                "extra_allowed_hosts": ["widget.chat-anbieter.com"],
+                "block_third_party_scripts": True,
+            }
+        )
+
+        self.assertEqual(
+            policy.block_reason("stylesheet", "https://www.maschinenbau.de/s.css", PAGE_URL),
+            REASON_RESOURCE_TYPE,
+        )
+        self.assertIsNone(
+            policy.block_reason("font", "https://www.maschinenbau.de/a.woff2", PAGE_URL)
+        )
+        self.assertEqual(
+            policy.block_reason("xhr", "https://tracker.example.com/collect", PAGE_URL),
+            REASON_HOST,
+        )
+        # Default blocked hosts are kept
+        self.assertEqual(
+            policy.block_reason("script", "https://www.google-analytics.com/a.js", PAGE_URL),
+            REASON_HOST,
+        )
+        self.assertIsNone(
+            policy.block_reason("script", "https://widget.chat-anbieter.com/w.js", PAGE_URL)
+        )
+
+    def test_from_config_emptyConfig_usesDefaults(self):
+        policy = ResourcePolicy.from_config(None)
+        default = ResourcePolicy()
+        self.assertEqual(policy.blocked_resource_types, default.blocked_resource_types)
+        self.assertEqual(policy.blocked_hosts, default.blocked_hosts)
+        self.assertEqual(policy.allowed_hosts, default.allowed_hosts)
+
+
+class TestResourceBlocker(unittest.TestCase):
+
+    def test_hooks_interceptAndReportPerPage(self):
+        blocker = ResourceBlocker()
+        page = _page()
+        routes = [
+            _route("https://www.maschinenbau.de/", "document"),
+            _route("https://www.maschinenbau.de/bild.jpg", "image"),
+            _route("https://www.maschinenbau.de/bild2.jpg", "image"),
+            _route("https://www.googletagmanager.com/gtm.js", "script"),
+            _route("https://www.maschinenbau.de/app.js", "script"),
+        ]
+
+        async def run():
+            await blocker.on_page_context_created(page, context=None, config=None)
+            handler = page.route.call_args[0][1]
+            for route in routes:
+                await handler(route)
+            with self.assertLogs("webcrawl.resource_blocking", level="INFO") as logs:
+                await blocker.before_return_html(page, "<html></html>")
+            return logs
+
+        logs = asyncio.run(run())
+
+        self.assertEqual(page.route.call_args[0][0], "**/*")
+        for route in (routes[0], routes[4]):
+            route.fallback.assert_awaited_once()
+            route.abort.assert_not_awaited()
+        for route in routes[1:4]:
+            route.abort.assert_awaited_once_with("blockedbyclient")
+            route.fallback.assert_not_awaited()
+
+        self.assertEqual(blocker.pages, 1)
+        self.assertEqual(blocker.total_blocked, 3)
+        self.assertEqual(
+            blocker.total_estimated_bytes_saved,
+            2 * ESTIMATED_BYTES_BY_TYPE["image"] + ESTIMATED_BYTES_BY_TYPE["script"],
+        )
+        self.assertIn("Blocked 3 of 5 requests", logs.output[0])
+
+    def test_before_return_html_unknownPage_isIgnored(self):
+        blocker = ResourceBlocker()
+        page = _page()
+
+        result = asyncio.run(blocker.before_return_html(page, ""))
+
+        self.assertIs(result, page)
+        self.assertEqual(blocker.pages, 0)
+
+    def test_route_handler_closedPage_doesNotRaise(self):
+        blocker = ResourceBlocker()
+        page = _page()
+        route = _route("https://www.maschinenbau.de/bild.jpg", "image")
+        route.abort = AsyncMock(side_effect=RuntimeError("Target page closed"))
+
+        async def run():
+            await blocker.on_page_context_created(page)
+            await page.route.call_args[0][1](route)
+
+        asyncio.run(run())
+        route.abort.assert_awaited_once()
+
+
+class TestCombineHooks(unittest.TestCase):
+
+    def test_combine_hooks_chainsHooksOfSameType(self):
+        calls = []
+
+        def strategy(name, hook_types):
+            async def hook(page, *args, **kwargs):
+                calls.append(name)
+                return page
+
+            instance = MagicMock()
+            instance.hooks.return_value = {hook_type: hook for hook_type in hook_types}
+            return instance
+
+        first = strategy("first", ["before_return_html", "on_page_context_created"])
+        second = strategy("second", ["before_return_html"])
+
+        hooks = combine_hooks(first, None, second)
+
+        self.assertEqual(
+            set(hooks), {"before_return_html", "on_page_context_created"}
+        )
+        result = asyncio.run(hooks["before_return_html"]("page", "<html></html>"))
+        self.assertEqual(result, "page")
+        self.assertEqual(calls, ["first", "second"])
+        self.assertIsNone(combine_hooks(None, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
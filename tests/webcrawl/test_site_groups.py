@@ -0,0 +1,106 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+from webcrawl.convert_to_csv import convert_json_to_csv
+from webcrawl.site_groups import (
+    SHARED_SITES_FILENAME,
+    companies_sharing_site,
+    group_by_site,
+    load_shared_sites,
+    site_key,
+    write_shared_sites,
+)
+
+
+class TestSiteGroups(unittest.TestCase):
+
+    def test_site_key_ignoresSchemeWwwAndTrailingSlash(self):
+        self.assertEqual(site_key("http://www.Muster.de/"), "muster.de")
+        self.assertEqual(site_key("https://muster.de"), "muster.de")
+        self.assertEqual(site_key("muster.de"), "muster.de")
+        self.assertEqual(site_key("https://muster.de/de/"), "muster.de/de")
+
+    def test_group_by_site_keepsFirstUrlAndInputOrder(self):
+        groups = group_by_site(
+            [
+                ("https://www.muster.de", "Muster Holding GmbH"),
+                ("https://andere.de", "Andere AG"),
+                ("http://muster.de/", "Muster GmbH & Co. KG"),
+                ("https://muster.de", "Muster Holding GmbH"),
+            ]
+        )
+
+        self.assertEqual(
+            groups,
+            [
+                ("https://www.muster.de", ["Muster Holding GmbH", "Muster GmbH & Co. KG"]),
+                ("https://andere.de", ["Andere AG"]),
+            ],
+        )
+
+    def test_write_shared_sites_onlyListsSharedSites(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_shared_sites(
+                tmp,
+                [
+                    ("https://www.muster.de", ["Muster Holding GmbH", "Muster KG"]),
+                    ("https://andere.de", ["Andere AG"]),
+                ],
+            )
+
+            self.assertEqual(path, os.path.join(tmp, SHARED_SITES_FILENAME))
+            shared = load_shared_sites(path)
+            self.assertEqual(shared, {"muster.de": ["Muster Holding GmbH", "Muster KG"]})
+
+            # A later run without shared sites removes the stale manifest
+            self.assertIsNone(write_shared_sites(tmp, [("https://andere.de", ["A"])]))
+            self.assertFalse(os.path.exists(path))
+
+    def test_companies_sharing_site_matchesExtractedUrl(self):
+        shared = {"muster.de/de": ["Muster Holding GmbH", "Muster KG"]}
+
+        self.assertEqual(
+            companies_sharing_site(shared, "http://www.muster.de"), ["Muster KG"]
+        )
+        self.assertEqual(companies_sharing_site(shared, "https://andere.de"), [])
+        self.assertEqual(companies_sharing_site(shared, ""), [])
+
+
+class TestSharedSiteFanOut(unittest.TestCase):
+
+    def test_convert_json_to_csv_copiesRowToCompaniesSharingTheSite(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path = os.path.join(tmp, "consolidated.json")
+            csv_path = os.path.join(tmp, "out.csv")
+            with open(json_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    [
+                        {
+                            # Name read from the page, not the one of the input
+                            "company_name": "Muster GmbH & Co. KG",
+                            "company_url": "https://www.muster.de",
+                            "products": ["Drehteile"],
+                        },
+                        {"company_name": "Andere AG", "company_url": "https://andere.de"},
+                    ],
+                    f,
+                )
+            manifest = write_shared_sites(
+                tmp, [("https://muster.de", ["Muster Holding GmbH", "Muster KG"])]
+            )
+
+            convert_json_to_csv(json_path, csv_path, shared_sites_path=manifest)
+
+            with open(csv_path, encoding="utf-8-sig") as f:
+                rows = list(csv.reader(f))[1:]
+            self.assertEqual(
+                [row[0] for row in rows], ["Muster GmbH & Co. KG", "Muster KG", "Andere AG"]
+            )
+            self.assertEqual(rows[1][1:], rows[0][1:])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import asyncio
+import gzip
+import unittest
+
+from tests.webcrawl.local_http_server import LocalHTTPServer
+from webcrawl.sitemap_discovery import (
+    discover_sitemap_urls,
+    parse_robots_sitemaps,
+    parse_sitemap,
+)
+
+URLSET = """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+{entries}
+</urlset>"""
+
+SITEMAP_INDEX = """<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+{entries}
+</sitemapindex>"""
+
+
+def _urlset(*locs):
+    entries = "\n".join(f"<url><loc>{loc}</loc></url>" for loc in locs)
+    return URLSET.format(entries=entries).encode("utf-8")
+
+
+def _index(*locs):
+    entries = "\n".join(f"<sitemap><loc>{loc}</loc></sitemap>" for loc in locs)
+    return SITEMAP_INDEX.format(entries=entries).encode("utf-8")
+
+
+XML = {"Content-Type": "application/xml"}
+
+
+class TestSitemapParsing(unittest.TestCase):
+
+    def test_parse_robots_sitemaps_caseInsensitiveAndRelative(self):
+        robots = "User-agent: *\nDisallow: /admin\nSITEMAP: /sitemap_index.xml\n"
+        self.assertEqual(
+            parse_robots_sitemaps(robots, "https://example.de/robots.txt"),
+            ["https://example.de/sitemap_index.xml"],
+        )
+
+    def test_parse_sitemap_urlsetAndIndex(self):
+        self.assertEqual(
+            parse_sitemap(_urlset("https://example.de/a")),
+            (["https://example.de/a"], []),
+        )
+        self.assertEqual(
+            parse_sitemap(_index("https://example.de/s1.xml")),
+            ([], ["https://example.de/s1.xml"]),
+        )
+
+    def test_parse_sitemap_invalidXml_returnsEmpty(self):
+        self.assertEqual(parse_sitemap(b"<html>not a sitemap"), ([], []))
+
+
+class TestDiscoverSitemapUrls(unittest.TestCase):
+
+    def test_discover_followsRobotsIndexAndGzip(self):
+        with LocalHTTPServer() as server:
+            base = server.base_url
+            server.routes.update({
+                "/robots.txt": (200, {}, f"Sitemap: {base}/sitemap_index.xml\n".encode()),
+                "/sitemap_index.xml": (
+                    200, XML, _index(f"{base}/pages.xml.gz", f"{base}/produkte.xml")
+                ),
+                "/pages.xml.gz": (
+                    200,
+                    {"Content-Type": "application/gzip"},
+                    gzip.compress(_urlset(f"{base}/ueber-uns", f"{base}/leistungen")),
+                ),
+                "/produkte.xml": (
+                    200, XML, _urlset(f"{base}/produkte/maschinen", "https://other.de/x")
+                ),
+            })
+
+            urls = asyncio.run(discover_sitemap_urls(base + "/"))
+
+        self.assertEqual(
+            urls,
+            [f"{base}/ueber-uns", f"{base}/leistungen", f"{base}/produkte/maschinen"],
+        )
+
+    def test_discover_withoutRobots_usesDefaultLocation(self):
+        with LocalHTTPServer() as server:
+            base = server.base_url
+            server.routes["/sitemap.xml"] = (200, XML, _urlset(f"{base}/kontakt"))
+
+            urls = asyncio.run(discover_sitemap_urls(base))
+
+        self.assertEqual(urls, [f"{base}/kontakt"])
+
+    def test_discover_noSitemap_returnsEmpty(self):
+        with LocalHTTPServer() as server:
+            urls = asyncio.run(discover_sitemap_urls(server.base_url))
+
+        self.assertEqual(urls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import json
+import os
+import tempfile
+import unittest
+
+from crawl4ai import CrawlResult
+from crawl4ai.models import MarkdownGenerationResult
+
+from webcrawl.page_cache import PageCache
+from webcrawl.structured_data import (
+    StructuredData,
+    format_structured_data,
+    get_structured_data_path,
+    harvest_result,
+    harvest_structured_data,
+    structured_prefixed_markdown,
+)
+
+JSON_LD = {
+    "@context": "https://schema.org",
+    "@graph": [
+        {
+            "@type": "Organization",
+            "name": "Muster GmbH",
+            "description": "Lohnfertiger für CNC-Drehteile",
+            "address": {"@type": "PostalAddress", "addressLocality": "Ulm"},
+        },
+        {
+            "@type": "Offer",
+            "itemOffered": {
+                "@type": "http://schema.org/Product",
+                "name": "Präzisionsdrehteile",
+                "brand": {"@type": "Brand", "name": "Muster"},
+                "category": ["Drehteile", "Frästeile"],
+            },
+        },
+        {"@type": "WebPage", "name": "Startseite"},
+    ],
+}
+HTML = (
+    "<html><head><title>Muster GmbH</title>"
+    '<meta name="description" content="Drehteile und Frästeile aus Ulm">'
+    '<meta property="og:title" content="Muster GmbH - Lohnfertigung">'
+    '<script type="application/ld+json">' + json.dumps(JSON_LD) + "</script>"
+    '<script type="application/ld+json">{ invalid</script>'
+    "</head><body><p>Willkommen</p></body></html>"
+)
+
+
+class TestStructuredData(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_harvest_structured_data_keepsRelevantEntitiesAndMetaTags(self):
+        data = harvest_structured_data(HTML)
+
+        self.assertEqual(
+            data["json_ld"],
+            [
+                {
+                    "type": "Organization",
+                    "name": "Muster GmbH",
+                    "description": "Lohnfertiger für CNC-Drehteile",
+                },
+                {
+                    "type": "Product",
+                    "name": "Präzisionsdrehteile",
+                    "brand": "Muster",
+                    "category": "Drehteile, Frästeile",
+                },
+                {"type": "Brand", "name": "Muster"},
+            ],
+        )
+        self.assertEqual(
+            data["meta"],
+            {
+                "description": "Drehteile und Frästeile aus Ulm",
+                "og:title": "Muster GmbH - Lohnfertigung",
+            },
+        )
+        self.assertEqual(harvest_structured_data("<html><body>x</body></html>"), {})
+
+    def test_format_structured_data_listsRepeatedEntriesOnce(self):
+        page = harvest_structured_data(HTML)
+        block = format_structured_data(
+            {"https://muster.de": page, "https://muster.de/kontakt": page}
+        )
+
+        self.assertTrue(block.startswith("## Structured Data"))
+        self.assertEqual(block.count("- Organization: Muster GmbH"), 1)
+        self.assertIn(
+            "- Product: Präzisionsdrehteile | brand: Muster | "
+            "category: Drehteile, Frästeile",
+            block,
+        )
+        self.assertLessEqual(len(format_structured_data({"u": page}, 80)), 81)
+        self.assertEqual(format_structured_data({}), "")
+
+    def test_page_cache_keepsStructuredDataOfCachedPages(self):
+        result = CrawlResult(
+            url="https://muster.de",
+            html=HTML,
+            success=True,
+            markdown=MarkdownGenerationResult(
+                raw_markdown="Willkommen",
+                markdown_with_citations="",
+                references_markdown="",
+            ),
+            metadata={"title": "Muster GmbH"},
+        )
+        cache = PageCache(os.path.join(self.tmp.name, "pages.sqlite"))
+        cache.put(result.url, result)
+
+        cached = cache.get(result.url)
+
+        self.assertEqual(cached.html, "")
+        self.assertEqual(harvest_result(cached), harvest_structured_data(HTML))
+
+    def test_structured_prefixed_markdown_prefixesFilesWithData(self):
+        with_data = os.path.join(self.tmp.name, "muster_de.md")
+        without_data = os.path.join(self.tmp.name, "other_de.md")
+        for path in (with_data, without_data):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("# Aggregated Content\n")
+        states = StructuredData(get_structured_data_path(with_data))
+        states.record("https://muster.de", harvest_structured_data(HTML))
+        states.record("https://muster.de/leer", {})
+        states.save()
+
+        with structured_prefixed_markdown([with_data, without_data]) as paths:
+            self.assertEqual(paths[1], without_data)
+            self.assertEqual(os.path.basename(paths[0]), "muster_de.md")
+            with open(paths[0], encoding="utf-8") as f:
+                content = f.read()
+        self.assertTrue(content.startswith("## Structured Data"))
+        self.assertTrue(content.endswith("# Aggregated Content\n"))
+        self.assertFalse(os.path.exists(paths[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
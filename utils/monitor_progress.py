@@ -27,6 +27,11 @@ FILE_PATTERNS = {
     'consolidated_csv': 'consolidated_output/*{}*.csv'
 }
 
+# Files standing for one crawled domain; the crawl also writes sidecar files
+# (journal, page states, structured data) next to them, which are not counted.
+# With the crawl store enabled, the markdown file is replaced by a manifest.
+DOMAIN_CONTENT_SUFFIXES = ('.md', '.manifest.json')
+
 # Initialize colorama
 init()
 
@@ -110,15 +115,16 @@ def get_merged_file_count(category):
 
 
 def count_domain_content_files(category):
-    """Count files in domain_content_<category> folders"""
+    """Count crawled domain files in domain_content_<category> folders"""
     domain_folders = glob.glob(FOLDER_PATTERNS['domain'].format(category))
     total_files = 0
 
     for folder in domain_folders:
         if os.path.exists(folder) and os.path.isdir(folder):
-            # Count only files in the folder, not in subfolders
+            # Count only domain files in the folder, not sidecars or subfolders
             total_files += len([name for name in os.listdir(folder)
-                                if os.path.isfile(os.path.join(folder, name))])
+                                if name.endswith(DOMAIN_CONTENT_SUFFIXES)
+                                and os.path.isfile(os.path.join(folder, name))])
 
     return total_files
 
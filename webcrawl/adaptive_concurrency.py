@@ -0,0 +1,328 @@
+"""
+Feedback-driven concurrency for the browser phase of a domain crawl.
+
+crawl_domain used to run every site with a fixed MemoryAdaptiveDispatcher of 30
+sessions, which overloads small shared-hosting sites and leaves capacity idle on
+fast ones. AdaptiveConcurrencyDispatcher keeps the memory gate of
+MemoryAdaptiveDispatcher and lets a ConcurrencyController move its session limit
+after every finished page:
+
+- 429/503 responses halve the limit immediately
+- host memory at or above the threshold halves the limit
+- an error/timeout rate above max_error_rate shrinks the limit by a quarter
+- a median page latency above target_latency lowers the limit by one
+- otherwise the limit grows by one, up to max_sessions
+
+Decisions are taken once per window of finished pages (throttling responses
+excepted) and logged. The settings come from the "dispatcher" entry of the
+webcrawl section in config.json:
+
+    "dispatcher": {
+        "memory_threshold_percent": 80.0,
+        "check_interval": 0.5,
+        "initial_sessions": 8,
+        "max_sessions": 30
+    }
+"""
+
+import logging
+import statistics
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import psutil
+from crawl4ai import CrawlerRunConfig, MemoryAdaptiveDispatcher
+from crawl4ai.models import CrawlerTaskResult
+
+logger = logging.getLogger(__name__)
+
+# Controller defaults
+DEFAULT_INITIAL_SESSIONS = 8
+DEFAULT_MIN_SESSIONS = 1
+DEFAULT_MAX_SESSIONS = 30  # the former fixed session permit
+DEFAULT_TARGET_LATENCY = 8.0  # seconds; median page latency above this -> back off
+DEFAULT_MAX_ERROR_RATE = 0.2  # failed pages per window above this -> back off
+DEFAULT_WINDOW_SIZE = 5  # finished pages per decision
+DEFAULT_MEMORY_THRESHOLD = 70.0  # percent of host memory
+DEFAULT_CHECK_INTERVAL = 2.0  # seconds between memory checks of the dispatcher
+
+THROTTLE_STATUS_CODES = {429, 503}
+TIMEOUT_HINTS = ["timeout", "timed out"]
+
+
+def _memory_percent() -> float:
+    return psutil.virtual_memory().percent
+
+
+class ConcurrencyController:
+    """
+    Adjust a session limit from the latency, errors and throttling of finished pages.
+    """
+
+    def __init__(
+        self,
+        initial_sessions: int = DEFAULT_INITIAL_SESSIONS,
+        min_sessions: int = DEFAULT_MIN_SESSIONS,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        target_latency: float = DEFAULT_TARGET_LATENCY,
+        max_error_rate: float = DEFAULT_MAX_ERROR_RATE,
+        window_size: int = DEFAULT_WINDOW_SIZE,
+        memory_threshold_percent: float = DEFAULT_MEMORY_THRESHOLD,
+        memory_percent: Callable[[], float] = _memory_percent,
+        label: str = "",
+    ):
+        """
+        Args:
+            initial_sessions: Session limit before any page has finished
+            min_sessions: Lower bound of the session limit
+            max_sessions: Upper bound of the session limit
+            target_latency: Median page latency in seconds the limit may not push past
+            max_error_rate: Share of failed pages per window that triggers a back-off
+            window_size: Number of finished pages per decision
+            memory_threshold_percent: Host memory usage that triggers a back-off
+            memory_percent: Callable returning the current host memory usage
+            label: Name used in log messages (e.g. the domain)
+        """
+        self.min_sessions = max(1, min_sessions)
+        self.max_sessions = max(self.min_sessions, max_sessions)
+        self.limit = min(self.max_sessions, max(self.min_sessions, initial_sessions))
+        self.target_latency = target_latency
+        self.max_error_rate = max_error_rate
+        self.window_size = max(1, window_size)
+        self.memory_threshold_percent = memory_threshold_percent
+        self.memory_percent = memory_percent
+        self.label = label
+        self._latencies: List[float] = []
+        self._errors = 0
+        self._timeouts = 0
+        self._throttled = 0
+        self.pages = 0
+        # (old limit, new limit, reason) of every change
+        self.decisions: List[Tuple[int, int, str]] = []
+
+    def record(
+        self,
+        latency: float,
+        success: bool,
+        status_code: Optional[int] = None,
+        error_message: str = "",
+    ) -> int:
+        """
+        Record a finished page and adjust the limit when a decision is due.
+
+        Args:
+            latency: Seconds the page took
+            success: Whether the page was crawled successfully
+            status_code: HTTP status of the page, if known
+            error_message: Error of a failed page
+
+        Returns:
+            int: Session limit after the update
+        """
+        self.pages += 1
+        self._latencies.append(latency)
+        if not success:
+            self._errors += 1
+            if any(hint in (error_message or "").lower() for hint in TIMEOUT_HINTS):
+                self._timeouts += 1
+        if status_code in THROTTLE_STATUS_CODES:
+            self._throttled += 1
+
+        if self._throttled or len(self._latencies) >= self.window_size:
+            self._decide()
+        return self.limit
+
+    def _decide(self) -> None:
+        window = len(self._latencies)
+        median_latency = statistics.median(self._latencies)
+        error_rate = self._errors / window
+        memory = self.memory_percent()
+
+        if self._throttled:
+            new_limit = self.limit // 2
+            reason = f"{self._throttled}x 429/503"
+        elif memory >= self.memory_threshold_percent:
+            new_limit = self.limit // 2
+            reason = f"memory {memory:.0f}%"
+        elif error_rate > self.max_error_rate:
+            new_limit = self.limit - max(1, self.limit // 4)
+            reason = f"error rate {error_rate:.0%}"
+        elif median_latency > self.target_latency:
+            new_limit = self.limit - 1
+            reason = f"latency {median_latency:.1f}s"
+        else:
+            new_limit = self.limit + 1
+            reason = "healthy"
+        new_limit = min(self.max_sessions, max(self.min_sessions, new_limit))
+
+        if new_limit != self.limit:
+            logger.info(
+                "Concurrency %s: %d -> %d sessions (%s; median latency %.1fs, "
+                "%d/%d failed, %d timeouts, memory %.0f%%)",
+                self.label,
+                self.limit,
+                new_limit,
+                reason,
+                median_latency,
+                self._errors,
+                window,
+                self._timeouts,
+                memory,
+            )
+            self.decisions.append((self.limit, new_limit, reason))
+            self.limit = new_limit
+
+        self._latencies = []
+        self._errors = 0
+        self._timeouts = 0
+        self._throttled = 0
+
+    def log_summary(self) -> None:
+        """Log the final limit and the number of adjustments."""
+        if not self.pages:
+            return
+        logger.info(
+            "Concurrency %s: %d pages, final limit %d sessions after %d adjustments",
+            self.label,
+            self.pages,
+            self.limit,
+            len(self.decisions),
+        )
+
+
+class AdaptiveConcurrencyDispatcher(MemoryAdaptiveDispatcher):
+    """
+    MemoryAdaptiveDispatcher whose session permit follows a ConcurrencyController.
+
+    The dispatcher loops read max_session_permit before starting every task, so a
+    lowered limit takes effect as soon as running pages finish.
+    """
+
+    def __init__(
+        self,
+        controller: ConcurrencyController,
+        memory_threshold_percent: float = DEFAULT_MEMORY_THRESHOLD,
+        check_interval: float = DEFAULT_CHECK_INTERVAL,
+        **kwargs: Any,
+    ):
+        """
+        Args:
+            controller: Controller deciding the number of concurrent sessions
+            memory_threshold_percent: Memory usage above which no new page starts
+            check_interval: Seconds between memory checks while waiting
+            **kwargs: Further MemoryAdaptiveDispatcher arguments
+        """
+        super().__init__(
+            memory_threshold_percent=memory_threshold_percent,
+            check_interval=check_interval,
+            max_session_permit=controller.limit,
+            **kwargs,
+        )
+        self.controller = controller
+
+    async def crawl_url(
+        self, url: str, config: CrawlerRunConfig, task_id: str
+    ) -> CrawlerTaskResult:
+        task_result = await super().crawl_url(url, config, task_id)
+        result = task_result.result
+        self.max_session_permit = self.controller.record(
+            latency=float(task_result.end_time) - float(task_result.start_time),
+            success=bool(getattr(result, "success", False))
+            and not task_result.error_message,
+            status_code=getattr(result, "status_code", None),
+            error_message=task_result.error_message,
+        )
+        return task_result
+
+
+class ConcurrencyPolicy:
+    """
+    Settings shared by the per-domain dispatchers of a run.
+    """
+
+    def __init__(
+        self,
+        initial_sessions: int = DEFAULT_INITIAL_SESSIONS,
+        min_sessions: int = DEFAULT_MIN_SESSIONS,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        target_latency: float = DEFAULT_TARGET_LATENCY,
+        max_error_rate: float = DEFAULT_MAX_ERROR_RATE,
+        window_size: int = DEFAULT_WINDOW_SIZE,
+        memory_threshold_percent: float = DEFAULT_MEMORY_THRESHOLD,
+        check_interval: float = DEFAULT_CHECK_INTERVAL,
+    ):
+        """
+        Args:
+            initial_sessions: Session limit a domain crawl starts with
+            min_sessions: Lower bound of the session limit
+            max_sessions: Upper bound of the session limit
+            target_latency: Median page latency in seconds to stay below
+            max_error_rate: Share of failed pages per window that triggers a back-off
+            window_size: Number of finished pages per decision
+            memory_threshold_percent: Host memory usage that blocks new pages and
+                triggers a back-off
+            check_interval: Seconds between memory checks while waiting
+        """
+        self.initial_sessions = initial_sessions
+        self.min_sessions = min_sessions
+        self.max_sessions = max_sessions
+        self.target_latency = target_latency
+        self.max_error_rate = max_error_rate
+        self.window_size = window_size
+        self.memory_threshold_percent = memory_threshold_percent
+        self.check_interval = check_interval
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> "ConcurrencyPolicy":
+        """
+        Build a policy from a config dict, falling back to defaults for missing keys.
+
+        Args:
+            config: Dict with optional keys initial_sessions, min_sessions,
+                max_sessions, target_latency, max_error_rate, window_size,
+                memory_threshold_percent and check_interval
+
+        Returns:
+            ConcurrencyPolicy: Configured policy
+        """
+        config = config or {}
+        return cls(
+            initial_sessions=config.get("initial_sessions", DEFAULT_INITIAL_SESSIONS),
+            min_sessions=config.get("min_sessions", DEFAULT_MIN_SESSIONS),
+            max_sessions=config.get("max_sessions", DEFAULT_MAX_SESSIONS),
+            target_latency=config.get("target_latency", DEFAULT_TARGET_LATENCY),
+            max_error_rate=config.get("max_error_rate", DEFAULT_MAX_ERROR_RATE),
+            window_size=config.get("window_size", DEFAULT_WINDOW_SIZE),
+            memory_threshold_percent=config.get(
+                "memory_threshold_percent", DEFAULT_MEMORY_THRESHOLD
+            ),
+            check_interval=config.get("check_interval", DEFAULT_CHECK_INTERVAL),
+        )
+
+    def create_controller(self, label: str = "") -> ConcurrencyController:
+        """Create a controller with this policy's settings."""
+        return ConcurrencyController(
+            initial_sessions=self.initial_sessions,
+            min_sessions=self.min_sessions,
+            max_sessions=self.max_sessions,
+            target_latency=self.target_latency,
+            max_error_rate=self.max_error_rate,
+            window_size=self.window_size,
+            memory_threshold_percent=self.memory_threshold_percent,
+            label=label,
+        )
+
+    def create_dispatcher(self, label: str = "") -> AdaptiveConcurrencyDispatcher:
+        """
+        Create a dispatcher for one domain crawl.
+
+        Args:
+            label: Name used in log messages (e.g. the domain)
+
+        Returns:
+            AdaptiveConcurrencyDispatcher: Dispatcher with a fresh controller
+        """
+        return AdaptiveConcurrencyDispatcher(
+            self.create_controller(label),
+            memory_threshold_percent=self.memory_threshold_percent,
+            check_interval=self.check_interval,
+        )
@@ -0,0 +1,201 @@
+"""
+Adaptive page readiness wait replacing fixed delay_before_return_html sleeps.
+
+crawl_domain used to sleep a fixed 1.0s (main page) / 0.5s (internal pages)
+before reading the HTML of every page. AdaptiveWaiter instead waits only until
+the page has settled: a small script observes DOM mutations and newly started
+network requests in the page and returns as soon as neither happened during a
+short quiet window. The former fixed delay is kept as the upper bound.
+
+Observed settle times are recorded per host. Once a host has a few samples,
+later pages on that host are capped at a learned wait (a multiple of the
+host's 90th-percentile settle time) instead of the full fixed cap, so pages
+with endless animations or polling no longer always cost the full delay.
+
+The waiter is installed as a crawl4ai 'before_retrieve_html' hook and only acts
+on run configs prepared with AdaptiveWaiter.configure(); all other crawls on the
+same crawler keep their behaviour.
+"""
+
+import logging
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+from crawl4ai import CrawlerRunConfig
+
+from webcrawl.domain_scheduler import get_host
+
+logger = logging.getLogger(__name__)
+
+# Key in CrawlerRunConfig.shared_data holding the wait cap in seconds
+WAIT_CAP_KEY = "adaptive_wait_cap"
+
+DEFAULT_QUIET_WINDOW_MS = 100  # no DOM/network activity for this long -> settled
+MIN_LEARNED_SAMPLES = 3  # settle times needed before a host uses a learned wait
+LEARNED_WAIT_FACTOR = 1.5  # learned wait = factor x 90th percentile settle time
+MIN_LEARNED_WAIT = 0.1  # seconds; lower bound of a learned wait
+SETTLE_HISTORY_SIZE = 20  # settle times kept per host
+
+# Resolves with the elapsed milliseconds once the page had no DOM mutations and
+# no new resource requests for quietMs, or when capMs is reached.
+SETTLE_SCRIPT = """
+([quietMs, capMs]) => new Promise((resolve) => {
+    const start = performance.now();
+    let lastActivity = start;
+    const touch = () => { lastActivity = performance.now(); };
+    const mutations = new MutationObserver(touch);
+    mutations.observe(document.documentElement || document, {
+        childList: true, subtree: true, characterData: true, attributes: true
+    });
+    let resources = null;
+    try {
+        resources = new PerformanceObserver(touch);
+        resources.observe({ type: "resource", buffered: false });
+    } catch (e) { resources = null; }
+    const check = () => {
+        const now = performance.now();
+        if (now - lastActivity >= quietMs || now - start >= capMs) {
+            mutations.disconnect();
+            if (resources) { resources.disconnect(); }
+            resolve(now - start);
+        } else {
+            setTimeout(check, Math.min(25, quietMs));
+        }
+    };
+    setTimeout(check, Math.min(25, quietMs));
+})
+"""
+
+
+class AdaptiveWaiter:
+    """
+    Wait for pages to settle and learn typical settle times per host.
+
+    Usage:
+        waiter = AdaptiveWaiter()
+        for hook_type, hook in waiter.hooks().items():
+            crawler.crawler_strategy.set_hook(hook_type, hook)
+        config = waiter.configure(CrawlerRunConfig(...), cap=1.0)
+    """
+
+    def __init__(
+        self,
+        quiet_window_ms: int = DEFAULT_QUIET_WINDOW_MS,
+        learned_wait_factor: float = LEARNED_WAIT_FACTOR,
+        min_learned_wait: float = MIN_LEARNED_WAIT,
+        history_size: int = SETTLE_HISTORY_SIZE,
+    ):
+        """
+        Args:
+            quiet_window_ms: Milliseconds without activity after which a page is settled
+            learned_wait_factor: Multiple of the 90th percentile used as learned wait
+            min_learned_wait: Lower bound in seconds of a learned wait
+            history_size: Number of settle times kept per host
+        """
+        self.quiet_window_ms = quiet_window_ms
+        self.learned_wait_factor = learned_wait_factor
+        self.min_learned_wait = min_learned_wait
+        self.history_size = history_size
+        self.settle_times: Dict[str, Deque[float]] = {}
+        self.pages = 0
+        self.total_waited = 0.0
+        self.total_fixed = 0.0
+
+    def configure(self, config: CrawlerRunConfig, cap: float) -> CrawlerRunConfig:
+        """
+        Prepare a run config for adaptive waiting.
+
+        Args:
+            config: Run config to adapt
+            cap: Maximum wait in seconds (the former fixed delay)
+
+        Returns:
+            CrawlerRunConfig: Copy without fixed delay and with the wait cap set
+        """
+        shared_data = dict(config.shared_data or {})
+        shared_data[WAIT_CAP_KEY] = cap
+        return config.clone(delay_before_return_html=0, shared_data=shared_data)
+
+    def record(self, host: str, seconds: float) -> None:
+        """Record the observed settle time of a page on host."""
+        history = self.settle_times.setdefault(host, deque(maxlen=self.history_size))
+        history.append(seconds)
+
+    def wait_cap(self, host: str, cap: float) -> float:
+        """
+        Get the wait cap for the next page on host.
+
+        Args:
+            host: Host key of the page
+            cap: Configured maximum wait in seconds
+
+        Returns:
+            float: Learned wait for known hosts, otherwise cap
+        """
+        history = self.settle_times.get(host)
+        if not history or len(history) < MIN_LEARNED_SAMPLES:
+            return cap
+        ordered = sorted(history)
+        p90 = ordered[min(len(ordered) - 1, int(0.9 * len(ordered)))]
+        learned = max(self.min_learned_wait, self.learned_wait_factor * p90)
+        return min(cap, learned)
+
+    async def before_retrieve_html(
+        self,
+        page: Any,
+        context: Any = None,
+        config: Optional[CrawlerRunConfig] = None,
+        **kwargs,
+    ) -> Any:
+        """crawl4ai hook: wait until the page has settled before its HTML is read."""
+        shared_data = getattr(config, "shared_data", None) or {}
+        cap = shared_data.get(WAIT_CAP_KEY)
+        if cap is None:
+            return page
+
+        host = get_host(page.url)
+        effective_cap = self.wait_cap(host, cap)
+        try:
+            elapsed_ms = await page.evaluate(
+                SETTLE_SCRIPT, [self.quiet_window_ms, effective_cap * 1000]
+            )
+            waited = float(elapsed_ms) / 1000
+        except Exception as e:
+            # Navigation or a closed page: do not block the crawl on the wait
+            logger.debug("Adaptive wait failed on %s: %s", page.url, e)
+            return page
+
+        self.record(host, waited)
+        self.pages += 1
+        self.total_waited += waited
+        self.total_fixed += cap
+        logger.debug(
+            "Page %s settled after %.3fs (cap %.3fs)", page.url, waited, effective_cap
+        )
+        return page
+
+    def hooks(self) -> Dict[str, Callable]:
+        """
+        Get the crawl4ai hooks implementing the adaptive wait.
+
+        Returns:
+            Dict[str, Callable]: Hook callables by hook type
+        """
+        return {"before_retrieve_html": self.before_retrieve_html}
+
+    def log_summary(self) -> None:
+        """Log how much waiting was saved compared to the fixed delays."""
+        if not self.pages:
+            return
+        logger.info(
+            "Adaptive wait: %d pages, %.1fs waited instead of %.1fs with fixed delays "
+            "(%d hosts learned)",
+            self.pages,
+            self.total_waited,
+            self.total_fixed,
+            sum(
+                1
+                for history in self.settle_times.values()
+                if len(history) >= MIN_LEARNED_SAMPLES
+            ),
+        )
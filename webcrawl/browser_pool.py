@@ -0,0 +1,181 @@
+"""
+Long-lived browser pool shared by all domain crawls of a run.
+
+Launching and tearing down Chromium costs several seconds, so instead of opening
+a new AsyncWebCrawler for every company, crawl_domain.main() creates one
+BrowserPool and leases its crawler to each domain crawl. The underlying browser
+is recycled (closed and relaunched) after a configurable number of pages or when
+system memory usage climbs above a threshold, which releases the contexts and
+pages that accumulate inside a long-running browser.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, Optional
+
+import psutil
+from crawl4ai import AsyncWebCrawler, BrowserConfig
+
+from webcrawl.html_guard import HtmlGuard
+
+logger = logging.getLogger(__name__)
+
+# Recycle the browser after this many rendered pages
+DEFAULT_RECYCLE_AFTER_PAGES = 500
+# Recycle the browser when system memory usage reaches this percentage
+DEFAULT_RECYCLE_MEMORY_PERCENT = 85.0
+
+
+class BrowserPool:
+    """
+    Owns a single AsyncWebCrawler and hands it out to concurrent domain crawls.
+
+    Usage:
+        async with BrowserPool(browser_cfg) as pool:
+            async with pool.lease() as crawler:
+                result = await crawler.arun(url, config=run_config)
+                pool.record_pages(1)
+
+    Pages are recorded while the lease is held, so a recycle that is due is seen
+    before the next lease hands out the browser.
+
+    A recycle is only performed when no lease is active; once a recycle is due,
+    new leases wait until the running crawls have drained.
+    """
+
+    def __init__(
+        self,
+        browser_config: Optional[BrowserConfig] = None,
+        headers: Optional[Dict[str, str]] = None,
+        recycle_after_pages: int = DEFAULT_RECYCLE_AFTER_PAGES,
+        memory_threshold_percent: float = DEFAULT_RECYCLE_MEMORY_PERCENT,
+        hooks: Optional[Dict[str, Callable]] = None,
+        html_guard: Optional[HtmlGuard] = None,
+    ):
+        """
+        Args:
+            browser_config: Browser configuration used for every launch
+            headers: Custom headers set on the crawler strategy after each launch
+            recycle_after_pages: Relaunch the browser after this many pages (0 disables)
+            memory_threshold_percent: Relaunch when system memory usage reaches this value
+            hooks: crawl4ai hooks (hook type -> callable) set after each launch
+            html_guard: Size and depth guard installed on every launched crawler
+                (default: HtmlGuard with its default limits)
+        """
+        self.browser_config = browser_config
+        self.headers = headers or {}
+        self.recycle_after_pages = recycle_after_pages
+        self.memory_threshold_percent = memory_threshold_percent
+        self.hooks = hooks or {}
+        self.html_guard = html_guard or HtmlGuard()
+
+        self._crawler: Optional[AsyncWebCrawler] = None
+        self._condition = asyncio.Condition()
+        self._active_leases = 0
+        self.pages_since_launch = 0
+        self.launch_count = 0
+
+    async def __aenter__(self) -> "BrowserPool":
+        # The browser is launched lazily by the first lease, so runs where every
+        # domain is skipped never start Chromium
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        """Launch the browser if it is not already running."""
+        if self._crawler is not None:
+            return
+        crawler = AsyncWebCrawler(config=self.browser_config)
+        try:
+            await crawler.start()
+        except Exception:
+            # Stop the half-started Playwright driver before giving up
+            try:
+                await crawler.close()
+            except Exception as close_error:
+                logger.debug("Error while cleaning up failed launch: %s", close_error)
+            raise
+        if self.headers:
+            crawler.crawler_strategy.set_custom_headers(self.headers)  # type: ignore
+        for hook_type, hook in self.hooks.items():
+            crawler.crawler_strategy.set_hook(hook_type, hook)
+        self.html_guard.install(crawler)
+        self._crawler = crawler
+        self.pages_since_launch = 0
+        self.launch_count += 1
+        logger.info("Browser pool launched browser (launch #%d)", self.launch_count)
+
+    async def close(self) -> None:
+        """Close the browser, if running."""
+        if self._crawler is None:
+            return
+        crawler, self._crawler = self._crawler, None
+        try:
+            await crawler.close()
+        except Exception as e:
+            logger.warning("Error while closing pooled browser: %s", e)
+
+    def record_pages(self, count: int) -> None:
+        """Account for pages rendered with the current browser."""
+        self.pages_since_launch += count
+
+    def needs_recycle(self) -> bool:
+        """
+        Check whether the browser should be relaunched before the next lease.
+
+        Returns:
+            bool: True if the page budget is used up or memory usage is too high
+        """
+        if self._crawler is None:
+            return False
+        if (
+            self.recycle_after_pages
+            and self.pages_since_launch >= self.recycle_after_pages
+        ):
+            return True
+        # A freshly launched browser is not recycled for memory pressure alone,
+        # otherwise a busy host would relaunch Chromium on every lease
+        return (
+            self.pages_since_launch > 0
+            and psutil.virtual_memory().percent >= self.memory_threshold_percent
+        )
+
+    async def _recycle(self) -> None:
+        logger.info(
+            "Recycling browser after %d pages (memory usage %.1f%%)",
+            self.pages_since_launch,
+            psutil.virtual_memory().percent,
+        )
+        await self.close()
+        await self.start()
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[AsyncWebCrawler]:
+        """
+        Lease the pooled crawler for the duration of one domain crawl.
+
+        Yields:
+            AsyncWebCrawler: The running crawler instance
+        """
+        async with self._condition:
+            while True:
+                if self._crawler is None:
+                    await self.start()
+                if not self.needs_recycle():
+                    break
+                if self._active_leases == 0:
+                    await self._recycle()
+                    break
+                # Let the running crawls drain before relaunching
+                await self._condition.wait()
+            self._active_leases += 1
+
+        try:
+            yield self._crawler  # type: ignore
+        finally:
+            async with self._condition:
+                self._active_leases -= 1
+                self._condition.notify_all()
@@ -0,0 +1,223 @@
+"""
+Per-page change detection for re-crawls of already crawled domains.
+
+For every page of a domain crawl, crawl_domain() records the HTTP validators
+(ETag, Last-Modified) and a hash of the page's markdown content in a page state
+file next to the aggregated markdown. A refresh of the domain then:
+
+1. sends conditional GET requests (If-None-Match / If-Modified-Since) for all
+   known pages over plain HTTP
+2. reuses the previous markdown section of every page answered with 304
+3. crawls the other pages again and compares their content hash with the
+   recorded one, so servers without validators still count as unchanged when
+   the content is the same
+
+When no page of a domain changed, the domain is marked unchanged with a small
+marker file, and extract_llm skips the re-extraction of its markdown.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Set
+
+import aiohttp
+
+from webcrawl.content_dedup import content_hash, normalize_content
+from webcrawl.http_fetcher import HTTP_HEADERS
+
+logger = logging.getLogger(__name__)
+
+PAGE_STATE_SUFFIX = ".pages.json"
+UNCHANGED_MARKER_SUFFIX = ".unchanged"
+CONDITIONAL_REQUEST_TIMEOUT = 15  # seconds per request
+MAX_CONCURRENT_CONDITIONAL_REQUESTS = 8
+
+
+def get_page_state_path(markdown_file: str) -> str:
+    """Get the page state file belonging to an aggregated markdown file."""
+    return os.path.splitext(markdown_file)[0] + PAGE_STATE_SUFFIX
+
+
+def get_unchanged_marker_path(markdown_file: str) -> str:
+    """Get the unchanged marker belonging to an aggregated markdown file."""
+    return os.path.splitext(markdown_file)[0] + UNCHANGED_MARKER_SUFFIX
+
+
+def page_content_hash(markdown: str) -> str:
+    """Get the hash of the normalized markdown content of a page."""
+    return content_hash(normalize_content(markdown))
+
+
+def get_header(headers: Optional[Dict[str, str]], name: str) -> Optional[str]:
+    """Get a response header regardless of the case of its name."""
+    for key, value in (headers or {}).items():
+        if key.lower() == name.lower():
+            return value
+    return None
+
+
+class PageStates:
+    """
+    Validators and content hashes of the pages of one domain, kept in a JSON file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Path of the page state file
+        """
+        self.path = path
+        self.pages: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.pages = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning("Ignoring unreadable page state file %s: %s", path, e)
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Get the recorded state of a page."""
+        return self.pages.get(url)
+
+    def record(
+        self,
+        url: str,
+        markdown: str,
+        response_headers: Optional[Dict[str, str]] = None,
+    ) -> bool:
+        """
+        Record the state of a crawled page.
+
+        Args:
+            url: URL of the page
+            markdown: Markdown content of the page
+            response_headers: HTTP response headers of the page, if known
+
+        Returns:
+            bool: True if the content differs from the recorded one (or the page
+                is new)
+        """
+        digest = page_content_hash(markdown)
+        previous = self.pages.get(url)
+        self.pages[url] = {
+            "etag": get_header(response_headers, "ETag"),
+            "last_modified": get_header(response_headers, "Last-Modified"),
+            "content_hash": digest,
+            "checked_at": time.time(),
+        }
+        return previous is None or previous.get("content_hash") != digest
+
+    def touch(self, url: str) -> None:
+        """Mark a page confirmed unchanged by a conditional request."""
+        if url in self.pages:
+            self.pages[url]["checked_at"] = time.time()
+
+    def retain(self, urls: List[str]) -> None:
+        """Forget the pages that are no longer part of the domain crawl."""
+        keep = set(urls)
+        self.pages = {url: state for url, state in self.pages.items() if url in keep}
+
+    def save(self) -> None:
+        """Write the page states to the file."""
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.pages, f, indent=2)
+        os.replace(temp_path, self.path)
+
+
+def conditional_request_headers(state: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Get the conditional request headers for a recorded page state.
+
+    Args:
+        state: Recorded state of the page
+
+    Returns:
+        Dict[str, str]: If-None-Match and/or If-Modified-Since headers; empty
+            if the server sent no validators
+    """
+    headers = {}
+    if state.get("etag"):
+        headers["If-None-Match"] = state["etag"]
+    if state.get("last_modified"):
+        headers["If-Modified-Since"] = state["last_modified"]
+    return headers
+
+
+async def find_unmodified_pages(
+    page_states: PageStates,
+    urls: List[str],
+    timeout: float = CONDITIONAL_REQUEST_TIMEOUT,
+    max_concurrent: int = MAX_CONCURRENT_CONDITIONAL_REQUESTS,
+) -> Set[str]:
+    """
+    Send conditional requests for recorded pages and collect the unmodified ones.
+
+    Pages without validators are not requested; they are compared by their
+    content hash after crawling them again.
+
+    Args:
+        page_states: Recorded page states of the domain
+        urls: Pages to check
+        timeout: Timeout in seconds for every request
+        max_concurrent: Maximum number of requests in flight
+
+    Returns:
+        Set[str]: URLs answered with 304 Not Modified
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrent))
+
+    async def check(session: aiohttp.ClientSession, url: str) -> Optional[str]:
+        headers = conditional_request_headers(page_states.get(url) or {})
+        if not headers:
+            return None
+        async with semaphore:
+            try:
+                async with session.get(
+                    url, headers=headers, allow_redirects=True
+                ) as response:
+                    if response.status == 304:
+                        return url
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.debug("Conditional request for %s failed: %s", url, e)
+        return None
+
+    async with aiohttp.ClientSession(
+        headers=HTTP_HEADERS,
+        timeout=aiohttp.ClientTimeout(total=timeout),
+    ) as session:
+        results = await asyncio.gather(*(check(session, url) for url in urls))
+
+    unmodified = {url for url in results if url is not None}
+    for url in unmodified:
+        page_states.touch(url)
+    logger.info(
+        "Conditional re-crawl check: %d of %d pages not modified",
+        len(unmodified),
+        len(urls),
+    )
+    return unmodified
+
+
+def mark_domain_unchanged(markdown_file: str, unchanged: bool) -> None:
+    """
+    Set or clear the unchanged marker of an aggregated markdown file.
+
+    Args:
+        markdown_file: Path to the aggregated markdown file
+        unchanged: Whether no page of the domain changed in the last refresh
+    """
+    marker = get_unchanged_marker_path(markdown_file)
+    if unchanged:
+        with open(marker, "w", encoding="utf-8") as f:
+            f.write(f"{time.time()}\n")
+    elif os.path.exists(marker):
+        os.remove(marker)
+
+
+def is_domain_unchanged(markdown_file: str) -> bool:
+    """Check whether the last refresh of a domain found no changed page."""
+    return os.path.isfile(get_unchanged_marker_path(markdown_file))
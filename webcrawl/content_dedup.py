@@ -0,0 +1,210 @@
+"""
+Content fingerprinting to drop duplicate pages of a domain before aggregation.
+
+remove_duplicate_urls() only normalizes URLs, but many sites serve the same
+content under several of them: print views, tracking parameters, /de/ and
+/de-de/ trees, paginated lists repeating the same teaser texts. Every such page
+would end up in the aggregated markdown and be sent to the LLM again.
+
+ContentDeduplicator fingerprints the markdown of each crawled page twice:
+
+- an exact hash of the normalized text (case, punctuation and whitespace ignored)
+- a 64-bit SimHash over word shingles; pages whose SimHashes differ in at most
+  max_hamming_distance bits are near duplicates (e.g. same text, other date line)
+
+The first page with a given content is kept, later duplicates are reported so
+the caller can drop them.
+
+Header, footer and cookie texts shared by all pages of a domain dominate a
+SimHash over the whole page, so pages with different products but the same
+frame would look alike. crawl_domain() therefore only compares exact hashes of
+the full text while streaming (check() with max_hamming_distance=0) and looks
+for near duplicates once the domain is complete, with check_near_duplicate() on
+the page bodies without the blocks repeated across the domain.
+"""
+
+import hashlib
+import logging
+import re
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SIMHASH_BITS = 64
+SHINGLE_SIZE = 3  # words per shingle
+DEFAULT_MAX_HAMMING_DISTANCE = 6  # differing bits (of 64) of near duplicates
+MIN_WORDS_FOR_NEAR_DUPLICATE = 30  # shorter pages are only compared exactly
+
+# Duplicate kinds
+EXACT_DUPLICATE = "exact"
+NEAR_DUPLICATE = "near"
+
+_NON_WORD_PATTERN = re.compile(r"[^\w]+")
+
+
+def normalize_content(text: str) -> List[str]:
+    """
+    Split text into lower-cased words, ignoring markdown syntax and punctuation.
+
+    Args:
+        text: Page markdown
+
+    Returns:
+        List[str]: Normalized words
+    """
+    return _NON_WORD_PATTERN.sub(" ", text.lower()).split()
+
+
+def content_hash(words: List[str]) -> str:
+    """Get the exact fingerprint of normalized words."""
+    return hashlib.sha1(" ".join(words).encode("utf-8")).hexdigest()
+
+
+def simhash(words: List[str], shingle_size: int = SHINGLE_SIZE) -> int:
+    """
+    Compute the SimHash of normalized words over overlapping word shingles.
+
+    Args:
+        words: Normalized words, as returned by normalize_content()
+        shingle_size: Number of words per shingle
+
+    Returns:
+        int: 64-bit SimHash
+    """
+    if len(words) < shingle_size:
+        shingles = [" ".join(words)]
+    else:
+        shingles = [
+            " ".join(words[i : i + shingle_size])
+            for i in range(len(words) - shingle_size + 1)
+        ]
+
+    weights = [0] * SIMHASH_BITS
+    for shingle in shingles:
+        value = int.from_bytes(
+            hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Get the number of differing bits of two fingerprints."""
+    return bin(a ^ b).count("1")
+
+
+class ContentDeduplicator:
+    """
+    Detect pages of one domain whose content was already seen.
+
+    Usage:
+        dedup = ContentDeduplicator()
+        duplicate = dedup.check(url, markdown)
+        if duplicate is None:
+            ...  # keep the page
+    """
+
+    def __init__(
+        self,
+        max_hamming_distance: int = DEFAULT_MAX_HAMMING_DISTANCE,
+        shingle_size: int = SHINGLE_SIZE,
+        min_words_for_near_duplicate: int = MIN_WORDS_FOR_NEAR_DUPLICATE,
+    ):
+        """
+        Args:
+            max_hamming_distance: Maximum SimHash distance of near duplicates,
+                0 to detect exact duplicates only
+            shingle_size: Number of words per SimHash shingle
+            min_words_for_near_duplicate: Pages with fewer words are only compared
+                by their exact hash
+        """
+        self.max_hamming_distance = max_hamming_distance
+        self.shingle_size = shingle_size
+        self.min_words_for_near_duplicate = min_words_for_near_duplicate
+        self._exact: Dict[str, str] = {}
+        self._simhashes: List[Tuple[int, str]] = []
+        self.unique_pages = 0
+        self.exact_duplicates = 0
+        self.near_duplicates = 0
+
+    def check(self, url: str, text: str) -> Optional[Tuple[str, str]]:
+        """
+        Check a page against the pages seen so far and remember it if it is new.
+
+        Args:
+            url: URL of the page
+            text: Markdown content of the page
+
+        Returns:
+            Optional[Tuple[str, str]]: (EXACT_DUPLICATE or NEAR_DUPLICATE, URL of
+                the first page with this content), or None for new content
+        """
+        words = normalize_content(text)
+        exact = content_hash(words)
+        if exact in self._exact:
+            self.exact_duplicates += 1
+            return EXACT_DUPLICATE, self._exact[exact]
+
+        fingerprint = None
+        if self.max_hamming_distance > 0 and (
+            len(words) >= self.min_words_for_near_duplicate
+        ):
+            fingerprint = simhash(words, self.shingle_size)
+            for other, other_url in self._simhashes:
+                if hamming_distance(fingerprint, other) <= self.max_hamming_distance:
+                    self.near_duplicates += 1
+                    return NEAR_DUPLICATE, other_url
+
+        self._exact[exact] = url
+        if fingerprint is not None:
+            self._simhashes.append((fingerprint, url))
+        self.unique_pages += 1
+        return None
+
+    def check_near_duplicate(self, url: str, text: str) -> Optional[Tuple[str, str]]:
+        """
+        Check a page for near duplicates only and remember it if it is new.
+
+        Args:
+            url: URL of the page
+            text: Content of the page to fingerprint, e.g. without boilerplate
+
+        Returns:
+            Optional[Tuple[str, str]]: (NEAR_DUPLICATE, URL of the similar page),
+                or None if no similar page was seen or the text is too short
+        """
+        words = normalize_content(text)
+        if self.max_hamming_distance <= 0 or len(words) < self.min_words_for_near_duplicate:
+            self.unique_pages += 1
+            return None
+        fingerprint = simhash(words, self.shingle_size)
+        for other, other_url in self._simhashes:
+            if hamming_distance(fingerprint, other) <= self.max_hamming_distance:
+                self.near_duplicates += 1
+                return NEAR_DUPLICATE, other_url
+        self._simhashes.append((fingerprint, url))
+        self.unique_pages += 1
+        return None
+
+    @property
+    def duplicates(self) -> int:
+        return self.exact_duplicates + self.near_duplicates
+
+    def log_summary(self, label: str = "") -> None:
+        """Log the number of unique and dropped pages."""
+        if not self.duplicates:
+            return
+        logger.info(
+            "Content dedup %s: %d unique pages, dropped %d exact and %d near "
+            "duplicates",
+            label,
+            self.unique_pages,
+            self.exact_duplicates,
+            self.near_duplicates,
+        )
@@ -6,6 +6,8 @@ import os
 import re
 from typing import List, Optional, Set
 
+from webcrawl.site_groups import companies_sharing_site, load_shared_sites
+
 
 def load_omit_keywords(config_path: Optional[str]) -> Set[str]:
     """
@@ -74,17 +76,20 @@ def filter_items(items: List[str], omit_keywords: Set[str]) -> List[str]:
     return [item for item in items if not any(keyword in item.lower() for keyword in omit_keywords)]
 
 
-def convert_json_to_csv(json_file_path: str, csv_file_path: Optional[str] = None, omit_config_path: Optional[str] = None) -> Optional[str]:
+def convert_json_to_csv(json_file_path: str, csv_file_path: Optional[str] = None, omit_config_path: Optional[str] = None, shared_sites_path: Optional[str] = None) -> Optional[str]:
     """
     Converts a consolidated JSON file (output from consolidate.py) to a CSV file.
     Each row in the CSV corresponds to a company (top-level key in JSON).
     Columns include 'company_name', 'process_type', 'keywords', 'pluralized_keywords'.
     Optionally omits keywords based on a configuration file.
+    Companies of the input whose website was crawled once for another company
+    (see webcrawl.site_groups) get a copy of that company's row.
 
     Args:
         json_file_path: Path to the input JSON file
         csv_file_path: Path to the output CSV file. If None, derived from JSON filename
         omit_config_path: Path to the omit keywords config file (optional)
+        shared_sites_path: Path to the shared-site manifest written by crawl_domain (optional)
     Returns:
         The path to the generated CSV file.
     """
@@ -96,6 +101,7 @@ def convert_json_to_csv(json_file_path: str, csv_file_path: Optional[str] = None
         base_name = os.path.splitext(json_file_path)[0]
         csv_file_path = f"{base_name}.csv"
     omit_keywords = load_omit_keywords(omit_config_path)
+    shared_sites = load_shared_sites(shared_sites_path)
     try:
         with open(json_file_path, 'r', encoding='utf-8') as json_file:
             data = json.load(json_file)
@@ -135,6 +141,9 @@ def convert_json_to_csv(json_file_path: str, csv_file_path: Optional[str] = None
                     *process_types
                 ]
                 writer.writerow(row)
+                for shared_name in companies_sharing_site(shared_sites, row[1]):
+                    logger.info(f"Copying row of {company_name} to {shared_name} (same website)")
+                    writer.writerow([shared_name, *row[1:]])
         logger.info(f"Conversion successful. CSV file created at: {csv_file_path}")
         return csv_file_path
     except FileNotFoundError:
@@ -1,16 +1,16 @@
 # Import argparse for command line arguments
 import argparse
 import asyncio
+import json
 import logging
 import os
 import re
-
-# Import to handle colorama recursion issues
-import sys
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
 from urllib.parse import urljoin, urlparse
 
+import aiofiles
 from crawl4ai import (
     AsyncWebCrawler,
     BrowserConfig,
@@ -19,19 +19,60 @@ from crawl4ai import (
     CrawlResult,
     DefaultMarkdownGenerator,
     LXMLWebScrapingStrategy,
-    MemoryAdaptiveDispatcher,
     PruningContentFilter,
 )
 
+from webcrawl.adaptive_concurrency import ConcurrencyPolicy
+from webcrawl.adaptive_wait import AdaptiveWaiter
+from webcrawl.browser_pool import (
+    DEFAULT_RECYCLE_AFTER_PAGES,
+    DEFAULT_RECYCLE_MEMORY_PERCENT,
+    BrowserPool,
+)
+from webcrawl.change_detection import (
+    PageStates,
+    find_unmodified_pages,
+    get_page_state_path,
+    mark_domain_unchanged,
+)
+from webcrawl.content_dedup import DEFAULT_MAX_HAMMING_DISTANCE, ContentDeduplicator
+from webcrawl.crawl_journal import CrawlJournal, get_journal_path
+from webcrawl.crawl_store import CrawlStore, get_manifest_path
+from webcrawl.domain_triage import (
+    TRIAGE_CACHE_FILENAME,
+    TriageCache,
+    apply_triage,
+    moved_input_urls,
+    triage_domains,
+)
+from webcrawl.domain_scheduler import (
+    DEFAULT_HOST_CRAWL_DELAY,
+    DEFAULT_MAX_CONCURRENT_DOMAINS,
+    DEFAULT_MAX_PER_HOST,
+    DomainScheduler,
+    get_host,
+)
+
 # Import the new function
 from webcrawl.get_company_by_top1machine import read_urls_and_companies_by_top1machine
+from webcrawl.html_guard import HtmlGuard
+from webcrawl.http_fetcher import HybridFetcher
+from webcrawl.link_scoring import LinkScorer
+from webcrawl.page_cache import PAGE_CACHE_FILENAME, PageCache
+from webcrawl.resource_blocking import ResourceBlocker, ResourcePolicy
+from webcrawl.site_groups import group_by_site, write_shared_sites
+from webcrawl.sitemap_discovery import discover_sitemap_urls
+from webcrawl.structured_data import (
+    StructuredData,
+    get_structured_data_path,
+    harvest_result,
+)
 
 # Configuration constants
 # ----------------------
 
 # File and URL constants
 WEBPAGE_EXTENSIONS = ["html", "htm", "php", "asp", "aspx", "jsp", ""]
-LARGE_CONTENT_THRESHOLD = 100000  # 100KB threshold for disabling colorama
 
 # Language-related constants
 GERMAN_LANGUAGE_PATTERNS = ["/de/", "/de-de/", "/de_de/"]
@@ -96,7 +137,6 @@ NON_CONTENT_KEYWORDS = [
 # Crawler configuration constants
 DEFAULT_PATH_DEPTH = 2
 DEFAULT_MAX_LINKS = 50
-DEFAULT_MEMORY_THRESHOLD = 70.0
 PRUNE_FILTER_THRESHOLD = 0.40
 PRUNE_FILTER_MIN_WORDS = 30
 CRAWL_WORD_COUNT_THRESHOLD = {
@@ -105,12 +145,22 @@ CRAWL_WORD_COUNT_THRESHOLD = {
     "links": 5,  # For link collection
 }
 EXCLUDED_TAGS = ["header", "footer", "nav", "img"]
+# Wait before reading the HTML (upper bound when the adaptive wait is used)
+MAIN_PAGE_DELAY = 1.0
+BODY_PAGE_DELAY = 0.5
 
 # Browser headers
 GERMAN_LANGUAGE_HEADERS = {"Accept-Language": "de-DE,de;q=0.9"}
 
-# System constants
-RECURSION_LIMIT = 10000  # Temporary recursion limit for large data processing
+# Output constants
+SECTION_SEPARATOR = "-" * 80
+# Text blocks found on at least this fraction of the pages of a domain (and on at
+# least BOILERPLATE_MIN_PAGES pages) are boilerplate and kept only once
+BOILERPLATE_PAGE_FRACTION = 0.5
+BOILERPLATE_MIN_PAGES = 3
+BOILERPLATE_MIN_BLOCK_CHARS = 15
+# Last line of an aggregated file whose crawl finished; files without it are partial
+CRAWL_COMPLETE_MARKER = "<!-- crawl complete -->"
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -139,27 +189,6 @@ def configure_logging(log_level=logging.INFO):
     logger.debug("Logging configured with level: %s", logging.getLevelName(log_level))
 
 
-# Add a function to disable colorama to prevent recursion errors
-def disable_colorama() -> None:
-    """
-    Disable colorama's text processing to prevent recursion errors with large outputs.
-
-    This is necessary when processing very large strings that can exceed Python's recursion limit.
-    Colorama can cause stack overflow when processing large texts due to its recursive pattern matching.
-
-    Returns:
-        None
-    """
-    try:
-        import colorama
-
-        # Disable colorama's text processing
-        colorama.deinit()
-        logger.info("Colorama disabled to prevent recursion errors with large outputs.")
-    except ImportError:
-        pass
-
-
 # Add a function to parse command line arguments
 def extract_name_from_input_file(input_file_path: str) -> str:
     """
@@ -202,6 +231,23 @@ def parse_args() -> argparse.Namespace:
     - output/o: Output directory for aggregated content (optional, defaults to name derived from input file)
     - max-links: Maximum number of internal links to crawl per domain (default: 60)
     - overwrite: Whether to overwrite existing files (default: False)
+    - recycle-after-pages: Pages rendered before the shared browser is relaunched
+    - max-concurrent-domains: Number of companies crawled at the same time
+    - max-per-host: Number of concurrent domain crawls allowed on one host
+    - host-crawl-delay: Seconds between two domain crawls starting on the same host
+    - no-sitemap: Discover internal links from the rendered page only
+    - no-http-fast-path: Render every internal page in the browser
+    - no-adaptive-wait: Always wait the fixed delay before reading a page
+    - no-resource-blocking: Let the browser load images, fonts, media and trackers
+    - no-content-dedup: Keep pages whose content duplicates an earlier page
+    - boilerplate-fraction: Share of pages a text block must recur on to be
+      stripped as boilerplate (0 disables)
+    - no-triage: Crawl every URL without checking for dead, parked or redirected domains
+    - no-page-cache: Crawl every page again instead of reusing fresh cached pages
+    - refresh: Re-crawl already crawled domains with conditional requests
+    - crawl-store: Directory of the compressed crawl store (overrides the config file)
+    - config-file: Pipeline config (JSON) whose webcrawl section sets the dispatcher,
+      page cache, HTML guard, link scoring, resource blocking and crawl store
 
     Returns:
         argparse.Namespace: Parsed command line arguments
@@ -240,9 +286,141 @@ def parse_args() -> argparse.Namespace:
         help="Overwrite existing files (default: False)",
     )
 
+    parser.add_argument(
+        "--recycle-after-pages",
+        type=int,
+        default=DEFAULT_RECYCLE_AFTER_PAGES,
+        help=f"Relaunch the shared browser after this many pages, 0 to disable (default: {DEFAULT_RECYCLE_AFTER_PAGES})",
+    )
+
+    parser.add_argument(
+        "--max-concurrent-domains",
+        type=int,
+        default=DEFAULT_MAX_CONCURRENT_DOMAINS,
+        help=f"Number of companies crawled at the same time (default: {DEFAULT_MAX_CONCURRENT_DOMAINS})",
+    )
+
+    parser.add_argument(
+        "--max-per-host",
+        type=int,
+        default=DEFAULT_MAX_PER_HOST,
+        help=f"Number of concurrent domain crawls allowed on one host (default: {DEFAULT_MAX_PER_HOST})",
+    )
+
+    parser.add_argument(
+        "--host-crawl-delay",
+        type=float,
+        default=DEFAULT_HOST_CRAWL_DELAY,
+        help=f"Seconds between two domain crawls starting on the same host (default: {DEFAULT_HOST_CRAWL_DELAY})",
+    )
+
+    parser.add_argument(
+        "--no-sitemap",
+        dest="use_sitemap",
+        action="store_false",
+        default=True,
+        help="Do not read sitemaps; discover internal links from the rendered main page only",
+    )
+
+    parser.add_argument(
+        "--no-http-fast-path",
+        dest="use_http_fast_path",
+        action="store_false",
+        default=True,
+        help="Render every internal page in the browser instead of fetching server-rendered pages over HTTP",
+    )
+
+    parser.add_argument(
+        "--no-adaptive-wait",
+        dest="adaptive_wait",
+        action="store_false",
+        default=True,
+        help="Always wait the fixed delay before reading a page instead of waiting until it has settled",
+    )
+
+    parser.add_argument(
+        "--no-resource-blocking",
+        dest="block_resources",
+        action="store_false",
+        default=True,
+        help="Let the browser load images, fonts, media, trackers and third-party scripts",
+    )
+
+    parser.add_argument(
+        "--no-content-dedup",
+        dest="deduplicate_content",
+        action="store_false",
+        default=True,
+        help="Keep internal pages whose content duplicates an already crawled page",
+    )
+
+    parser.add_argument(
+        "--boilerplate-fraction",
+        type=float,
+        default=BOILERPLATE_PAGE_FRACTION,
+        help=f"Keep text blocks recurring on at least this share of a domain's pages only once, 0 to disable (default: {BOILERPLATE_PAGE_FRACTION})",
+    )
+
+    parser.add_argument(
+        "--no-triage",
+        dest="triage",
+        action="store_false",
+        default=True,
+        help="Do not check URLs for dead, parked or redirected domains before crawling",
+    )
+
+    parser.add_argument(
+        "--no-page-cache",
+        dest="use_page_cache",
+        action="store_false",
+        default=True,
+        help="Crawl every page again instead of reusing fresh pages from the page cache",
+    )
+
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        default=False,
+        help="Re-crawl already crawled domains with conditional requests; unmodified pages keep their markdown and unchanged domains are not re-extracted",
+    )
+
+    parser.add_argument(
+        "--crawl-store",
+        dest="crawl_store_dir",
+        default=None,
+        help="Directory of a compressed crawl store; finished domains are moved into it and their markdown files replaced by manifests",
+    )
+
+    parser.add_argument(
+        "--config-file",
+        type=str,
+        default=None,
+        help="Pipeline configuration file (JSON); its webcrawl section configures the dispatcher, page cache, HTML guard, link scoring, resource blocking and crawl store",
+    )
+
     return parser.parse_args()
 
 
+def load_webcrawl_config(config_file: str) -> Dict[str, Any]:
+    """
+    Load the webcrawl section of a pipeline configuration file.
+
+    Args:
+        config_file: Path to the configuration file (e.g. config.json)
+
+    Returns:
+        Dict[str, Any]: The webcrawl section, empty if the file has none
+
+    Raises:
+        FileNotFoundError: If the configuration file does not exist
+        json.JSONDecodeError: If the configuration file is not valid JSON
+    """
+    if not os.path.exists(config_file):
+        raise FileNotFoundError(f"Configuration file not found: {config_file}")
+    with open(config_file, "r", encoding="utf-8") as f:
+        return json.load(f).get("webcrawl", {})
+
+
 def sanitize_filename(url: str) -> str:
     """
     Convert URL to a valid filename by removing scheme and replacing invalid characters.
@@ -687,50 +865,56 @@ def remove_duplicate_urls(urls: List[str]) -> List[str]:
     return unique_links
 
 
-async def collect_internal_links(
-    crawler: AsyncWebCrawler, main_url: str, max_links: int = DEFAULT_MAX_LINKS
-) -> List[str]:
+def get_anchor_texts(internal_links: List[Any], base_url: str) -> Dict[str, str]:
     """
-    Collect and filter internal links from a website's main URL.
-
-    Performs a series of operations:
-    1. Crawls the main URL to extract all internal links
-    2. Normalizes links to absolute URLs
-    3. Filters out non-content, file, and non-German pages
-    4. Filters by path depth to focus on important pages
-    5. Removes duplicates
+    Map the absolute URL of every link dict to its anchor text.
 
     Args:
-        crawler: Initialized AsyncWebCrawler instance
-        main_url: Primary URL to crawl for internal links
-        max_links: Maximum number of internal links to return
+        internal_links: Raw links (strings or dicts with 'href'/'url' and 'text' keys)
+        base_url: The base URL of the website (scheme + domain)
 
     Returns:
-        List[str]: Filtered list of internal URLs to crawl
+        Dict[str, str]: Anchor text by absolute URL (with and without trailing slash)
     """
-    logger.info(f"Collecting internal links from {main_url}...")
+    anchor_texts: Dict[str, str] = {}
+    for link_obj in internal_links:
+        if not isinstance(link_obj, dict):
+            continue
+        href = link_obj.get("href") or link_obj.get("url")
+        text = (link_obj.get("text") or "").strip()
+        if not href or not text:
+            continue
+        absolute_link = urljoin(base_url, href)
+        anchor_texts.setdefault(absolute_link, text)
+        anchor_texts.setdefault(absolute_link.rstrip("/"), text)
+    return anchor_texts
 
-    # Configure crawler for link collection
-    crawl_config = CrawlerRunConfig(
-        cache_mode=CacheMode.ENABLED,
-        only_text=True,
-        exclude_external_links=True,
-        exclude_social_media_links=True,
-        word_count_threshold=CRAWL_WORD_COUNT_THRESHOLD[
-            "links"
-        ],  # We want all pages, even small ones
-    )
 
-    # Crawl the main URL
-    result = await crawler.arun(main_url, config=crawl_config)
+def filter_internal_links(
+    internal_links: List[Any],
+    main_url: str,
+    max_links: int = DEFAULT_MAX_LINKS,
+    link_scorer: Optional[LinkScorer] = None,
+) -> List[str]:
+    """
+    Turn raw internal links of a site into the list of pages to crawl.
 
-    if not result.success:  # type: ignore
-        logger.error(f"Failed to collect links from {main_url}: Unknown error")
-        return []
+    Performs a series of operations:
+    1. Normalizes links to absolute URLs
+    2. Filters out non-content, file, and non-German pages
+    3. Filters by path depth to focus on important pages
+    4. Removes duplicates
+    5. Ranks the links by relevance and keeps the best max_links
 
-    # Get internal links
-    internal_links = result.links.get("internal", [])  # type: ignore
+    Args:
+        internal_links: Raw links (strings or dicts with 'href'/'url' keys)
+        main_url: Primary URL of the website the links were found on
+        max_links: Maximum number of internal links to return
+        link_scorer: Scorer used to rank the links (default: LinkScorer())
 
+    Returns:
+        List[str]: Filtered internal URLs to crawl, most relevant first
+    """
     logger.info(f"Found {len(internal_links)} internal links.")
 
     # Ensure all URLs are absolute and perform initial filtering
@@ -758,6 +942,12 @@ async def collect_internal_links(
     # Remove duplicates
     unique_links = remove_duplicate_urls(filtered_links)
 
+    # Rank by relevance so the link budget goes to product and machine pages
+    link_scorer = link_scorer or LinkScorer()
+    unique_links = link_scorer.rank(
+        unique_links, get_anchor_texts(internal_links, base_url)
+    )
+
     # Limit number of links to avoid overwhelming the system
     if len(unique_links) > max_links:
         logger.info(
@@ -768,6 +958,177 @@ async def collect_internal_links(
     return unique_links
 
 
+async def collect_internal_links(
+    crawler: AsyncWebCrawler,
+    main_url: str,
+    max_links: int = DEFAULT_MAX_LINKS,
+    main_result: Optional[CrawlResult] = None,
+    use_sitemap: bool = True,
+    link_scorer: Optional[LinkScorer] = None,
+    page_cache: Optional[PageCache] = None,
+) -> List[str]:
+    """
+    Collect and filter internal links from a website's main URL.
+
+    With use_sitemap, the site's sitemaps (from robots.txt or the default
+    locations) are read over plain HTTP first; the browser is only used for link
+    discovery when no sitemap yields usable pages.
+
+    When the already rendered main page is passed as main_result, its links are
+    reused and the main URL is not fetched a second time. Otherwise the main URL
+    is crawled once just to read its links.
+
+    Args:
+        crawler: Initialized AsyncWebCrawler instance
+        main_url: Primary URL to crawl for internal links
+        max_links: Maximum number of internal links to return
+        main_result: Successful crawl result of main_url, if already available
+        use_sitemap: Whether to try sitemap discovery before browser links
+        link_scorer: Scorer used to rank the links (default: LinkScorer())
+        page_cache: Cache consulted before the main URL is crawled for its links;
+            the link-only render is not stored, as the cache entry of main_url
+            holds the content render of the main page
+
+    Returns:
+        List[str]: Filtered list of internal URLs to crawl
+    """
+    logger.info(f"Collecting internal links from {main_url}...")
+
+    if use_sitemap:
+        sitemap_links = await discover_sitemap_urls(main_url)
+        if sitemap_links:
+            links = filter_internal_links(
+                sitemap_links, main_url, max_links, link_scorer=link_scorer
+            )
+            if links:
+                logger.info("Using %d links from the sitemap", len(links))
+                return links
+        logger.info("No usable sitemap for %s, using links from the page", main_url)
+
+    if main_result is not None and main_result.success and main_result.links:
+        logger.info("Reusing links from the main page render")
+        result = main_result
+    else:
+        result = page_cache.get(main_url) if page_cache is not None else None
+        if result is not None:
+            logger.info("Using links of the cached main page")
+        else:
+            # Configure crawler for link collection
+            crawl_config = CrawlerRunConfig(
+                cache_mode=CacheMode.BYPASS,
+                only_text=True,
+                exclude_external_links=True,
+                exclude_social_media_links=True,
+                word_count_threshold=CRAWL_WORD_COUNT_THRESHOLD[
+                    "links"
+                ],  # We want all pages, even small ones
+            )
+
+            # Crawl the main URL
+            result = await crawler.arun(main_url, config=crawl_config)
+
+            if not result.success:  # type: ignore
+                logger.error(f"Failed to collect links from {main_url}: Unknown error")
+                return []
+
+    # Get internal links
+    internal_links = result.links.get("internal", [])  # type: ignore
+
+    return filter_internal_links(
+        internal_links, main_url, max_links, link_scorer=link_scorer
+    )
+
+
+def create_browser_config() -> BrowserConfig:
+    """
+    Create the browser configuration used for all domain crawls.
+
+    Returns:
+        BrowserConfig: Headless, text-only browser configuration
+    """
+    return BrowserConfig(
+        # verbose=True,
+        headless=True,
+        text_mode=True,
+    )
+
+
+def combine_hooks(*strategies: Any) -> Optional[Dict[str, Callable]]:
+    """
+    Merge the crawl4ai hooks of several strategies into one hook table.
+
+    crawl4ai keeps a single hook per hook type, so hooks of the same type are
+    chained: each one is awaited in the given order and the last result returned.
+
+    Args:
+        strategies: Objects with a hooks() method (AdaptiveWaiter, ResourceBlocker);
+            None entries are skipped
+
+    Returns:
+        Optional[Dict[str, Callable]]: Hook callables by hook type, or None if no
+            strategy was given
+    """
+    hooks_by_type: Dict[str, List[Callable]] = {}
+    for strategy in strategies:
+        if strategy is None:
+            continue
+        for hook_type, hook in strategy.hooks().items():
+            hooks_by_type.setdefault(hook_type, []).append(hook)
+    if not hooks_by_type:
+        return None
+
+    def chain(hooks: List[Callable]) -> Callable:
+        async def chained_hook(*args, **kwargs):
+            result = None
+            for hook in hooks:
+                result = await hook(*args, **kwargs)
+            return result
+
+        return chained_hook
+
+    return {
+        hook_type: hooks[0] if len(hooks) == 1 else chain(hooks)
+        for hook_type, hooks in hooks_by_type.items()
+    }
+
+
+@asynccontextmanager
+async def open_crawler(
+    browser_pool: Optional[BrowserPool] = None,
+    hooks: Optional[Dict[str, Callable]] = None,
+    html_guard: Optional[HtmlGuard] = None,
+) -> AsyncIterator[AsyncWebCrawler]:
+    """
+    Provide a crawler for one domain crawl.
+
+    Leases the shared crawler from the browser pool when one is given, otherwise
+    launches a dedicated browser that is closed again when the crawl finishes.
+
+    Args:
+        browser_pool: Optional long-lived browser pool shared across domains
+        hooks: crawl4ai hooks set on a dedicated browser; a browser pool sets
+            its own hooks at launch, so these are ignored when a pool is given
+        html_guard: Size and depth guard installed on a dedicated browser
+            (default: HtmlGuard with its default limits); a browser pool
+            installs its own guard
+
+    Yields:
+        AsyncWebCrawler: A started crawler with German language headers set
+    """
+    if browser_pool is not None:
+        async with browser_pool.lease() as crawler:
+            yield crawler
+        return
+
+    async with AsyncWebCrawler(config=create_browser_config()) as crawler:
+        # Set German language header
+        crawler.crawler_strategy.set_custom_headers(GERMAN_LANGUAGE_HEADERS)  # type: ignore
+        for hook_type, hook in (hooks or {}).items():
+            crawler.crawler_strategy.set_hook(hook_type, hook)
+        (html_guard or HtmlGuard()).install(crawler)
+        yield crawler
+
+
 def remove_links_from_markdown(markdown_text: str) -> str:
     """
     Remove markdown links from text while preserving the link text.
@@ -817,12 +1178,492 @@ def remove_links_from_markdown(markdown_text: str) -> str:
     return text_without_links
 
 
+def _block_key(block: str) -> str:
+    """Get the comparison key of a content block (case, whitespace and links ignored)."""
+    # The main page keeps its links, internal pages are written without
+    return " ".join(remove_links_from_markdown(block.strip()).lower().split())
+
+
+def _classify_content_blocks(
+    blocks: List[str],
+) -> Tuple[List[str], List[Optional[int]]]:
+    """
+    Get the comparison key and page index of the blocks of an aggregated file.
+
+    Args:
+        blocks: Blocks (paragraphs separated by blank lines) of the file
+
+    Returns:
+        Tuple[List[str], List[Optional[int]]]: Key and page index of every
+            block; structural blocks have an empty key and no page
+    """
+    page_of_block: List[Optional[int]] = []
+    keys: List[str] = []
+    page_index = -1
+    in_content = False
+    for block in blocks:
+        stripped = block.strip()
+        key = ""
+        page = None
+        if stripped.startswith(("## Main Page:", "## Page ")):
+            page_index += 1
+            in_content = False
+        elif stripped.startswith("### Content"):
+            in_content = True
+        elif (
+            in_content
+            and len(stripped) >= BOILERPLATE_MIN_BLOCK_CHARS
+            and stripped != SECTION_SEPARATOR
+            and not stripped.startswith("<!--")
+        ):
+            key = _block_key(stripped)
+            page = page_index
+        page_of_block.append(page)
+        keys.append(key)
+    return keys, page_of_block
+
+
+def _find_boilerplate_keys(
+    keys: List[str],
+    page_of_block: List[Optional[int]],
+    min_page_fraction: float,
+    min_pages: int,
+) -> Set[str]:
+    """Get the keys of the blocks found on enough pages to be boilerplate."""
+    total_pages = max((page for page in page_of_block if page is not None), default=-1) + 1
+    threshold = max(min_pages, min_page_fraction * total_pages)
+    pages_by_key: Dict[str, Set[int]] = {}
+    for key, page in zip(keys, page_of_block):
+        if page is not None:
+            pages_by_key.setdefault(key, set()).add(page)
+    return {key for key, pages in pages_by_key.items() if len(pages) >= threshold}
+
+
+def remove_boilerplate_from_markdown(
+    markdown_text: str,
+    min_page_fraction: float = BOILERPLATE_PAGE_FRACTION,
+    min_pages: int = BOILERPLATE_MIN_PAGES,
+) -> Tuple[str, int]:
+    """
+    Remove text blocks that recur across the pages of an aggregated domain file.
+
+    Cookie banners, footer texts, address blocks and menu remnants survive the
+    tag and pruning filters and are repeated in every page section. Blocks
+    (paragraphs separated by blank lines) inside the content of the page sections
+    are compared case- and whitespace-insensitively and without links; a block
+    found on at least min_page_fraction of the pages (and on at least min_pages
+    pages) is kept at its first occurrence and removed everywhere else. Section headings, titles,
+    separators and markers are never touched.
+
+    Args:
+        markdown_text: Aggregated markdown as written by crawl_domain()
+        min_page_fraction: Fraction of the pages a block must appear on
+        min_pages: Minimum number of pages a block must appear on
+
+    Returns:
+        Tuple[str, int]: (markdown without repeated boilerplate, blocks removed)
+    """
+    blocks = re.split(r"\n\s*\n", markdown_text)
+    keys, page_of_block = _classify_content_blocks(blocks)
+    boilerplate = _find_boilerplate_keys(
+        keys, page_of_block, min_page_fraction, min_pages
+    )
+    if not boilerplate:
+        return markdown_text, 0
+
+    kept: List[str] = []
+    seen = set()
+    removed = 0
+    for block, key, page in zip(blocks, keys, page_of_block):
+        if page is not None and key in boilerplate:
+            if key in seen:
+                removed += 1
+                continue
+            seen.add(key)
+        kept.append(block)
+    return "\n\n".join(kept), removed
+
+
+async def remove_boilerplate_from_file(
+    markdown_file: str, min_page_fraction: float = BOILERPLATE_PAGE_FRACTION
+) -> int:
+    """
+    Strip repeated boilerplate from an aggregated markdown file in place.
+
+    The cleaned content is written to a temporary file that replaces the original,
+    so the file is complete at any time.
+
+    Args:
+        markdown_file: Path to the aggregated markdown file
+        min_page_fraction: Fraction of the pages a block must appear on
+
+    Returns:
+        int: Number of text blocks removed
+    """
+    async with aiofiles.open(markdown_file, "r", encoding="utf-8") as f:
+        content = await f.read()
+    cleaned, removed = remove_boilerplate_from_markdown(content, min_page_fraction)
+    if not removed:
+        return 0
+
+    temp_file = markdown_file + ".tmp"
+    async with aiofiles.open(temp_file, "w", encoding="utf-8") as f:
+        await f.write(cleaned)
+    os.replace(temp_file, markdown_file)
+    logger.info(
+        "Removed %d repeated boilerplate blocks from %s (%d -> %d characters)",
+        removed,
+        os.path.basename(markdown_file),
+        len(content),
+        len(cleaned),
+    )
+    return removed
+
+
+def remove_near_duplicates_from_markdown(
+    markdown_text: str,
+    min_page_fraction: float = BOILERPLATE_PAGE_FRACTION,
+    min_pages: int = BOILERPLATE_MIN_PAGES,
+    max_hamming_distance: int = DEFAULT_MAX_HAMMING_DISTANCE,
+) -> Tuple[str, List[Tuple[str, str]]]:
+    """
+    Remove internal pages whose body is a near duplicate of an earlier page.
+
+    Only the body of a page is fingerprinted: blocks found on enough pages to be
+    boilerplate (see remove_boilerplate_from_markdown()) are left out, so pages
+    sharing the frame of the site but describing different products are kept.
+    This does not depend on the boilerplate stripping: with a min_page_fraction
+    of 0 (stripping disabled) BOILERPLATE_PAGE_FRACTION is used. The main page
+    and failed pages are never removed; the remaining internal pages are
+    renumbered.
+
+    Args:
+        markdown_text: Aggregated markdown as written by crawl_domain()
+        min_page_fraction: Fraction of the pages a block must appear on
+        min_pages: Minimum number of pages a block must appear on
+        max_hamming_distance: Maximum SimHash distance of near duplicates
+
+    Returns:
+        Tuple[str, List[Tuple[str, str]]]: (markdown without the duplicates,
+            (URL, URL of the similar page) of every removed page)
+    """
+    keys, page_of_block = _classify_content_blocks(
+        re.split(r"\n\s*\n", markdown_text)
+    )
+    boilerplate = _find_boilerplate_keys(
+        keys,
+        page_of_block,
+        min_page_fraction if min_page_fraction > 0 else BOILERPLATE_PAGE_FRACTION,
+        min_pages,
+    )
+    header, sections, footer = split_aggregated_markdown(markdown_text)
+    deduplicator = ContentDeduplicator(max_hamming_distance=max_hamming_distance)
+
+    kept: List[str] = []
+    removed: List[Tuple[str, str]] = []
+    for index, section in enumerate(sections):
+        url, content = parse_section(section)
+        body = "\n\n".join(
+            block
+            for block in re.split(r"\n\s*\n", content)
+            if _block_key(block) not in boilerplate
+        )
+        duplicate = deduplicator.check_near_duplicate(url, body) if content else None
+        if index > 0 and duplicate is not None:
+            removed.append((url, duplicate[1]))
+            continue
+        if index > 0:
+            section = renumber_section(section, len(kept))
+        kept.append(section)
+    if not removed:
+        return markdown_text, removed
+    return header + "".join(kept) + footer, removed
+
+
+async def remove_near_duplicates_from_file(
+    markdown_file: str,
+    min_page_fraction: float = BOILERPLATE_PAGE_FRACTION,
+    max_hamming_distance: int = DEFAULT_MAX_HAMMING_DISTANCE,
+) -> List[Tuple[str, str]]:
+    """
+    Remove near-duplicate internal pages from an aggregated markdown file in place.
+
+    Args:
+        markdown_file: Path to the aggregated markdown file
+        min_page_fraction: Fraction of the pages a block must appear on to be
+            left out of the fingerprints as boilerplate (0 uses
+            BOILERPLATE_PAGE_FRACTION)
+        max_hamming_distance: Maximum SimHash distance of near duplicates
+
+    Returns:
+        List[Tuple[str, str]]: (URL, URL of the similar page) of every removed page
+    """
+    async with aiofiles.open(markdown_file, "r", encoding="utf-8") as f:
+        content = await f.read()
+    cleaned, removed = remove_near_duplicates_from_markdown(
+        content,
+        min_page_fraction=min_page_fraction,
+        max_hamming_distance=max_hamming_distance,
+    )
+    if not removed:
+        return removed
+
+    temp_file = markdown_file + ".tmp"
+    async with aiofiles.open(temp_file, "w", encoding="utf-8") as f:
+        await f.write(cleaned)
+    os.replace(temp_file, markdown_file)
+    return removed
+
+
+def is_crawl_complete(markdown_file: str) -> bool:
+    """
+    Check whether an aggregated markdown file was written by a finished crawl.
+
+    Files written before the completion marker was introduced have no marker;
+    they count as complete as long as no journal of an interrupted crawl lies
+    next to them.
+
+    Args:
+        markdown_file: Path to the aggregated markdown file
+
+    Returns:
+        bool: True if the file ends with the completion marker, or has no
+            journal sidecar
+    """
+    marker = CRAWL_COMPLETE_MARKER.encode("utf-8")
+    try:
+        with open(markdown_file, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - len(marker) - 16))
+            if marker in f.read():
+                return True
+    except OSError:
+        return False
+    return not os.path.exists(get_journal_path(markdown_file))
+
+
+_SECTION_START_PATTERN = re.compile(r"^(?=## (?:Main Page|Page \d+): )", re.MULTILINE)
+_TITLE_PATTERN = re.compile(r"^### Title: (.*)$", re.MULTILINE)
+
+
+def split_aggregated_markdown(content: str) -> Tuple[str, List[str], str]:
+    """
+    Split an aggregated markdown file into its header, page sections and footer.
+
+    Joining the three parts again gives back the original content.
+
+    Args:
+        content: Content of an aggregated markdown file
+
+    Returns:
+        Tuple[str, List[str], str]: (header, sections, footer); the footer holds
+            the completion marker
+    """
+    parts = _SECTION_START_PATTERN.split(content)
+    header, sections = parts[0], parts[1:]
+    footer = ""
+    if sections:
+        marker_index = sections[-1].rfind(CRAWL_COMPLETE_MARKER)
+        if marker_index >= 0:
+            footer = sections[-1][marker_index:]
+            sections[-1] = sections[-1][:marker_index]
+    return header, sections, footer
+
+
+def renumber_section(section: str, page_number: int) -> str:
+    """Give an internal page section reused from an earlier crawl a new number."""
+    return re.sub(r"^## Page \d+:", f"## Page {page_number}:", section, count=1)
+
+
+async def read_previous_sections(
+    markdown_file: str, crawl_store: Optional[CrawlStore] = None
+) -> List[str]:
+    """
+    Read the page sections of the previous crawl of a domain.
+
+    Args:
+        markdown_file: Path to the aggregated markdown file
+        crawl_store: Store holding the domain if its file was archived
+
+    Returns:
+        List[str]: Sections of the main page and the internal pages, in file order
+    """
+    if os.path.exists(markdown_file):
+        async with aiofiles.open(markdown_file, "r", encoding="utf-8") as f:
+            content = await f.read()
+    elif crawl_store is not None:
+        content = crawl_store.read_markdown(get_manifest_path(markdown_file))
+    else:
+        return []
+    return split_aggregated_markdown(content)[1]
+
+
+async def archive_to_store(
+    markdown_file: str, crawl_store: CrawlStore, **metadata: Any
+) -> str:
+    """
+    Move a complete aggregated markdown file into the crawl store.
+
+    Every page section becomes a compressed blob and the file is replaced by a
+    manifest listing the pages in order; see webcrawl.crawl_store.
+
+    Args:
+        markdown_file: Path to the complete aggregated markdown file
+        crawl_store: Store receiving the blobs
+        **metadata: Additional manifest fields
+
+    Returns:
+        str: Path to the manifest
+    """
+    async with aiofiles.open(markdown_file, "r", encoding="utf-8") as f:
+        content = await f.read()
+    header, sections, footer = split_aggregated_markdown(content)
+    fetched_at = os.path.getmtime(markdown_file)
+    pages = []
+    for section in sections:
+        title = _TITLE_PATTERN.search(section)
+        pages.append(
+            {
+                "url": parse_section(section)[0],
+                "title": title.group(1).strip() if title else "",
+                "fetched_at": fetched_at,
+                "content": section,
+            }
+        )
+    manifest_path = get_manifest_path(markdown_file)
+    crawl_store.write_manifest(manifest_path, header, pages, footer, **metadata)
+    os.remove(markdown_file)
+    logger.info(
+        "Archived %d pages of %s to the crawl store",
+        len(pages),
+        os.path.basename(markdown_file),
+    )
+    return manifest_path
+
+
+def format_main_page_section(main_url: str, result: CrawlResult) -> str:
+    """
+    Format the aggregated markdown section of the main page.
+
+    Args:
+        main_url: The main URL that was crawled
+        result: Successful crawl result of the main URL
+
+    Returns:
+        str: Markdown section for the main page
+    """
+    title = result.metadata.get("title", "Untitled") if result.metadata else "Untitled"
+    section = f"## Main Page: {main_url}\n\n"
+    section += f"### Title: {title}\n\n"
+    # Add the raw content
+    section += "### Content:\n\n"
+    section += (result.markdown or "") + "\n\n"
+    section += SECTION_SEPARATOR + "\n\n"
+    return section
+
+
+def format_page_section(page_number: int, url: str, result: CrawlResult) -> str:
+    """
+    Format the aggregated markdown section of an internal page.
+
+    Args:
+        page_number: 1-based number of the page within the domain crawl
+        url: URL of the page
+        result: Crawl result of the page (successful or failed)
+
+    Returns:
+        str: Markdown section for the page
+    """
+    section = f"## Page {page_number}: {url}\n\n"
+    if not result.success:
+        # Report failure
+        error_msg = result.error if hasattr(result, "error") else "Unknown error"
+        section += f"Failed to crawl: {error_msg}\n\n"
+        section += SECTION_SEPARATOR + "\n\n"
+        return section
+
+    title = result.metadata.get("title", "Untitled") if result.metadata else "Untitled"
+    section += f"### Title: {title}\n\n"
+
+    # Add the content with links removed
+    section += "### Content (body only):\n\n"
+    if hasattr(result, "markdown") and isinstance(result.markdown, str):
+        section += remove_links_from_markdown(result.markdown) + "\n\n"
+    else:
+        logger.warning("Unexpected markdown format for URL: %s", url)
+        section += "Content could not be processed.\n\n"
+    return section
+
+
+def parse_section(section: str) -> Tuple[str, str]:
+    """
+    Split an aggregated markdown section into its URL and its page content.
+
+    Args:
+        section: Section as returned by format_main_page_section() or
+            format_page_section()
+
+    Returns:
+        Tuple[str, str]: (url, content); content is empty for failed pages
+    """
+    first_line, _, rest = section.partition("\n")
+    url = first_line.split(": ", 1)[1].strip() if ": " in first_line else ""
+    match = re.search(r"^### Content[^\n]*\n", rest, flags=re.MULTILINE)
+    if match is None:
+        return url, ""
+    content = rest[match.end() :]
+    if content.rstrip().endswith(SECTION_SEPARATOR):
+        content = content.rstrip()[: -len(SECTION_SEPARATOR)]
+    return url, content.strip()
+
+
+async def iter_cached_and_fetched(
+    cached_results: List[CrawlResult],
+    fetched: Optional[AsyncIterator[CrawlResult]],
+    page_cache: Optional[PageCache] = None,
+) -> AsyncIterator[CrawlResult]:
+    """
+    Yield the cached pages of a domain, then stream and cache the fetched ones.
+
+    Args:
+        cached_results: Pages served from the page cache
+        fetched: Stream of newly crawled pages, if any page had to be fetched
+        page_cache: Cache receiving the newly crawled pages
+
+    Yields:
+        CrawlResult: Cached results first, then fetched results as they arrive
+    """
+    for result in cached_results:
+        yield result
+    if fetched is None:
+        return
+    async for result in fetched:
+        if page_cache is not None:
+            page_cache.put(result.url, result)
+        yield result
+
+
 async def crawl_domain(
     main_url: str,
     output_dir_aggregated: str = "domain_content_default",
     max_links: int = DEFAULT_MAX_LINKS,
     company_name: Optional[str] = None,
     overwrite: bool = False,
+    browser_pool: Optional[BrowserPool] = None,
+    use_sitemap: bool = True,
+    use_http_fast_path: bool = True,
+    link_scorer: Optional[LinkScorer] = None,
+    wait_strategy: Optional[AdaptiveWaiter] = None,
+    resource_blocker: Optional[ResourceBlocker] = None,
+    concurrency_policy: Optional[ConcurrencyPolicy] = None,
+    deduplicate_content: bool = True,
+    boilerplate_page_fraction: float = BOILERPLATE_PAGE_FRACTION,
+    shared_with: Optional[List[str]] = None,
+    crawl_store: Optional[CrawlStore] = None,
+    page_cache: Optional[PageCache] = None,
+    refresh: bool = False,
+    input_url: Optional[str] = None,
+    html_guard: Optional[HtmlGuard] = None,
 ) -> Tuple[str, int]:
     """
     Crawl a main URL and all its internal links, then aggregate the content.
@@ -832,6 +1673,14 @@ async def crawl_domain(
     2. Then crawl the internal links (body content only) up to max_links
 
     The crawled content is processed, cleaned, and aggregated into a single markdown file.
+    Internal pages are streamed: each page is appended to the file as soon as it is
+    crawled, and CRAWL_COMPLETE_MARKER is written once the domain is finished.
+    Progress is kept in a crawl journal next to the output file, so a domain whose
+    crawl was interrupted only crawls its missing pages on the next run.
+    ETag, Last-Modified and a content hash of every page are kept in a page state
+    file next to the output file for later refreshes. JSON-LD entities and meta
+    tags of the pages are kept in a structured data file next to it for
+    extract_llm (see webcrawl.structured_data).
 
     Args:
         main_url: Primary URL to crawl
@@ -839,12 +1688,50 @@ async def crawl_domain(
         max_links: Maximum number of internal links to crawl (default: 50)
         company_name: Optional company name associated with the URL
         overwrite: Whether to overwrite existing files (default: False)
+        browser_pool: Shared browser pool to lease the crawler from. If None, a
+            dedicated browser is launched for this domain.
+        use_sitemap: Whether to discover internal links from the site's sitemaps
+            before falling back to the links of the rendered main page
+        use_http_fast_path: Whether to fetch internal pages over plain HTTP first and
+            render only JS-dependent pages in the browser
+        link_scorer: Scorer used to pick the most relevant internal links
+        wait_strategy: Adaptive waiter replacing the fixed delays before reading
+            the HTML. When a browser pool is given, it must have been created
+            with the waiter's hooks.
+        resource_blocker: Request interception aborting images, fonts, media,
+            trackers and third-party scripts. When a browser pool is given, it
+            must have been created with the blocker's hooks.
+        concurrency_policy: Settings of the adaptive dispatcher that adjusts the
+            number of concurrently rendered pages (default: ConcurrencyPolicy())
+        deduplicate_content: Whether to drop internal pages whose content is an
+            exact or near duplicate of an already aggregated page
+        boilerplate_page_fraction: Text blocks found on at least this fraction of
+            the pages are kept only once in the aggregated file; 0 disables it
+        shared_with: Other companies of the input using the same website; they
+            are listed in the header of the aggregated file
+        crawl_store: Store the finished file is moved into. The aggregated
+            file is then replaced by a manifest (see webcrawl.crawl_store), and
+            a domain with a manifest counts as crawled.
+        page_cache: Cache of crawled pages; fresh cached pages are not fetched
+            again and newly crawled pages are added to it (with refresh, the
+            cache is only written)
+        refresh: Re-crawl an already crawled domain with conditional requests
+            instead of skipping it: pages answered with 304 Not Modified keep
+            their previous markdown, and a domain without any changed page is
+            marked unchanged (see webcrawl.change_detection)
+        input_url: URL of the company in the input when the crawl starts at
+            another domain (a site the company moved to); it names the output
+            file and is the Main URL of the aggregated file, so the later
+            stages still match the company with the input
+        html_guard: Size and depth guard of a dedicated browser (see
+            open_crawler()); ignored when a browser pool is given
 
     Returns:
         Tuple[str, int]: (output_file_path, pages_crawled)
             - note: this output is only used for reporting at the end of the run
             - output_file_path: Path to the generated markdown file
-            - pages_crawled: Number of successfully crawled pages
+            - pages_crawled: Number of successfully crawled pages, without the
+              pages dropped as duplicates
     """
     prune_filter = PruningContentFilter(
         threshold=PRUNE_FILTER_THRESHOLD,
@@ -852,32 +1739,25 @@ async def crawl_domain(
         threshold_type="fixed",
     )
 
-    # Create browser configuration
-    browser_cfg = BrowserConfig(
-        # verbose=True,
-        headless=True,
-        text_mode=True,
-    )
-
     # Create crawler configuration for main URL - complete crawl
     main_crawl_config = CrawlerRunConfig(
-        cache_mode=CacheMode.WRITE_ONLY,
+        cache_mode=CacheMode.BYPASS,
         only_text=True,
         exclude_external_links=True,
         exclude_social_media_links=True,
-        delay_before_return_html=1.0,
+        delay_before_return_html=MAIN_PAGE_DELAY,
         word_count_threshold=CRAWL_WORD_COUNT_THRESHOLD["main"],
         # magic=True
     )
 
     # Create crawler configuration for internal links - body only
     body_only_config = CrawlerRunConfig(
-        cache_mode=CacheMode.WRITE_ONLY,
+        cache_mode=CacheMode.BYPASS,
         only_text=True,
         exclude_external_links=True,
         exclude_social_media_links=True,
         word_count_threshold=CRAWL_WORD_COUNT_THRESHOLD["body"],
-        delay_before_return_html=0.5,
+        delay_before_return_html=BODY_PAGE_DELAY,
         # magic=True,
         # remove_forms=True,
         # Only extract the main content body
@@ -894,23 +1774,47 @@ async def crawl_domain(
         ),
     )
 
-    dispatcher = MemoryAdaptiveDispatcher(
-        memory_threshold_percent=DEFAULT_MEMORY_THRESHOLD,
-        check_interval=2.0,
-        max_session_permit=30,
-    )
+    if wait_strategy is not None:
+        # Return as soon as the page has settled, the fixed delays become the cap
+        main_crawl_config = wait_strategy.configure(main_crawl_config, MAIN_PAGE_DELAY)
+        body_only_config = wait_strategy.configure(body_only_config, BODY_PAGE_DELAY)
+
+    # The dispatcher keeps per-run state, so a new one is needed for every domain
+    concurrency_policy = concurrency_policy or ConcurrencyPolicy()
+    dispatcher = concurrency_policy.create_dispatcher(get_host(main_url))
 
     # Ensure both output directories exist
     ensure_output_directory(output_dir_aggregated)
 
     # Get domain name for the output file
-    domain_name = sanitize_filename(main_url)
+    company_url = input_url or main_url
+    domain_name = sanitize_filename(company_url)
 
     # Create output filenames in their respective directories
     output_markdown_file = os.path.join(output_dir_aggregated, f"{domain_name}.md")
 
-    # Check if the file already exists and skip if overwrite is False
-    if not overwrite and os.path.exists(output_markdown_file):
+    # The journal records the progress of this domain so an interrupted crawl
+    # can be resumed instead of starting from scratch
+    journal = CrawlJournal(get_journal_path(output_markdown_file))
+
+    # Check if the file already exists and skip if overwrite is False.
+    # A file without the completion marker but with a journal is left over from
+    # an interrupted crawl and is resumed from the journal.
+    manifest_file = get_manifest_path(output_markdown_file)
+    page_states = PageStates(get_page_state_path(output_markdown_file))
+    structured_data = StructuredData(get_structured_data_path(output_markdown_file))
+    # Sections of the previous crawl confirmed unmodified, by URL (refresh only)
+    reusable_sections: Dict[str, str] = {}
+    previous_urls: Optional[List[str]] = None
+    previous_complete = (
+        os.path.exists(output_markdown_file)
+        and is_crawl_complete(output_markdown_file)
+    ) or (crawl_store is not None and os.path.exists(manifest_file))
+    if overwrite:
+        journal.remove()
+        if os.path.exists(manifest_file):
+            os.remove(manifest_file)
+    elif previous_complete and not refresh:
         logger.info(
             "Skipping %s - output file already exists at %s",
             main_url,
@@ -918,146 +1822,308 @@ async def crawl_domain(
         )
         logger.info("Use --overwrite flag to overwrite existing files")
         return output_markdown_file, 0
+    elif previous_complete:
+        previous_sections = await read_previous_sections(
+            output_markdown_file, crawl_store
+        )
+        previous_urls = [parse_section(section)[0] for section in previous_sections]
+        unmodified = await find_unmodified_pages(page_states, previous_urls)
+        if previous_urls and unmodified.issuperset(previous_urls):
+            logger.info("No page of %s changed since the last crawl", main_url)
+            mark_domain_unchanged(output_markdown_file, True)
+            page_states.save()
+            return output_markdown_file, 0
+
+        journal.remove()
+        reusable_sections = {
+            url: section
+            for url, section in zip(previous_urls, previous_sections)
+            if url in unmodified
+        }
+        if main_url in reusable_sections:
+            # Keep the previous link selection, only modified pages are crawled
+            journal.record_main(reusable_sections.pop(main_url))
+            journal.record_discovered(previous_urls[1:])
+        logger.info(
+            "Refreshing %s: %d of %d pages not modified",
+            main_url,
+            len(unmodified),
+            len(previous_urls),
+        )
+
+    journal.load()
+    if journal.main_section is not None:
+        logger.info(
+            "Resuming interrupted crawl of %s: %d pages already completed",
+            main_url,
+            len(journal.completed),
+        )
 
-    # Initialize aggregate content
-    aggregate_content = f"# Aggregated Content for {domain_name}\n\n"
+    # Header of the aggregated file
+    header = f"# Aggregated Content for {domain_name}\n\n"
 
     # Add company name if provided
     if company_name:
-        aggregate_content += f"Company Name: {company_name}\n"
-
-    aggregate_content += f"Main URL: {main_url}\n"
-    aggregate_content += (
-        f"Crawled on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        header += f"Company Name: {company_name}\n"
+    if shared_with:
+        header += f"Also listed as: {'; '.join(shared_with)}\n"
+
+    header += f"Main URL: {company_url}\n"
+    if company_url != main_url:
+        header += f"Moved to: {main_url}\n"
+    header += f"Crawled on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+
+    # Pages rendered by the browser for this domain, reported to the browser pool
+    pages_rendered = 0
+    # Pages whose content differs from the page state of the previous crawl
+    changed_pages = 0
+    # Streamed pages are only compared exactly; near duplicates are looked for
+    # on the page bodies once the domain is complete
+    deduplicator = (
+        ContentDeduplicator(max_hamming_distance=0) if deduplicate_content else None
     )
 
-    # Temporarily increase recursion limit for large data processing
-    original_limit = sys.getrecursionlimit()
-    try:
-        sys.setrecursionlimit(RECURSION_LIMIT)  # Increase the recursion limit
-
-        async with AsyncWebCrawler(config=browser_cfg) as crawler:
-            # Set German language header
-            crawler.crawler_strategy.set_custom_headers(GERMAN_LANGUAGE_HEADERS)  # type: ignore
-
-            # Phase 1: Crawl the main URL
-            logger.info("=== Phase 1: Crawling main URL: %s ===", main_url)
-            main_result: CrawlResult = await crawler.arun(
-                main_url, config=main_crawl_config
-            )  # type: ignore
-
-            if not main_result.success:
-                logger.error("Failed to crawl main URL: %s", main_url)
-                logger.error(
-                    "Error: %s",
-                    main_result.error_message
-                    if hasattr(main_result, "error")
-                    else "Unknown error",
+    hooks = combine_hooks(wait_strategy, resource_blocker)
+    async with open_crawler(
+        browser_pool, hooks=hooks, html_guard=html_guard
+    ) as crawler:
+        # The pages are counted before the lease is released, so the pool sees
+        # them before another domain can take the browser
+        try:
+            if journal.main_section is None or journal.discovered_links is None:
+                # Phase 1: Crawl the main URL
+                logger.info("=== Phase 1: Crawling main URL: %s ===", main_url)
+                main_result = (
+                    page_cache.get(main_url) if page_cache and not refresh else None
                 )
-                return output_markdown_file, 0
-
-            # Process main URL result
-            aggregate_content += f"## Main Page: {main_url}\n\n"
-            title = (
-                main_result.metadata.get("title", "Untitled")
-                if main_result.metadata
-                else "Untitled"
-            )
-            aggregate_content += f"### Title: {title}\n\n"
-
-            # Add the raw content
-            aggregate_content += "### Content:\n\n"
-            aggregate_content += (main_result.markdown or "") + "\n\n"
-            aggregate_content += "-" * 80 + "\n\n"
-
-            logger.info("Successfully crawled main URL: %s", main_url)
-
-            # Now collect internal links from the main result
-            internal_links = await collect_internal_links(crawler, main_url, max_links)
-
-            # Remove the main URL from the list if present, as we've already crawled it
-            internal_links = [link for link in internal_links if link != main_url]
+                if main_result is not None:
+                    logger.info("Using cached main page of %s", main_url)
+                else:
+                    main_result = await crawler.arun(
+                        main_url, config=main_crawl_config
+                    )  # type: ignore
+                    pages_rendered += 1
+                    if page_cache is not None:
+                        page_cache.put(main_url, main_result)
+
+                if not main_result.success:
+                    logger.error("Failed to crawl main URL: %s", main_url)
+                    logger.error(
+                        "Error: %s",
+                        main_result.error_message
+                        if hasattr(main_result, "error")
+                        else "Unknown error",
+                    )
+                    return output_markdown_file, 0
+
+                journal.record_main(format_main_page_section(main_url, main_result))
+                logger.info("Successfully crawled main URL: %s", main_url)
+                _, main_content = parse_section(journal.main_section)  # type: ignore
+                if page_states.record(
+                    main_url,
+                    remove_links_from_markdown(main_content),
+                    main_result.response_headers,
+                ):
+                    changed_pages += 1
+                structured_data.record(main_url, harvest_result(main_result))
+
+                # Now collect internal links from the main result
+                internal_links = await collect_internal_links(
+                    crawler,
+                    main_url,
+                    max_links,
+                    main_result=main_result,
+                    use_sitemap=use_sitemap,
+                    link_scorer=link_scorer,
+                    page_cache=page_cache,
+                )
+                del main_result
 
-            # Phase 2: Crawl the internal links (body content only)
-            if internal_links:
-                logger.info(
-                    "=== Phase 2: Crawling %d internal links (body only) ===",
-                    len(internal_links),
+                # Remove the main URL from the list if present, as we've already crawled it
+                journal.record_discovered(
+                    [link for link in internal_links if link != main_url]
                 )
-                # Now crawl all internal links at once using arun_many with body-only config
-                if dispatcher:
-                    results = await crawler.arun_many(
-                        internal_links,
-                        config=body_only_config,
-                        # verbose=True,
-                        dispatcher=dispatcher,
-                    )
-                else:
-                    results = await crawler.arun_many(
-                        internal_links,
-                        config=body_only_config,
-                        # verbose=True
+
+            # Unmodified pages of a refreshed domain keep their previous section
+            for link in journal.pending_links():
+                if link in reusable_sections:
+                    page_number = journal.next_page_number
+                    journal.record_page(
+                        link,
+                        page_number,
+                        True,
+                        renumber_section(reusable_sections[link], page_number),
                     )
 
-                # Process results
-                for i, result in enumerate(results):  # type: ignore
-                    url = result.url if hasattr(result, "url") else internal_links[i]
+            # Sections are appended to the file as soon as each page is crawled,
+            # so memory stays flat on large sites and an interrupted crawl still
+            # leaves the pages crawled so far (without the completion marker).
+            # Pages completed by an earlier, interrupted run come from the journal.
+            async with aiofiles.open(output_markdown_file, "w", encoding="utf-8") as f:
+                await f.write(header)
+                await f.write(journal.main_section)  # type: ignore
+                if deduplicator is not None:
+                    # Internal pages are compared without links, like they are written
+                    _, main_content = parse_section(journal.main_section)  # type: ignore
+                    deduplicator.check(main_url, remove_links_from_markdown(main_content))
+                for section in journal.iter_completed_sections():
+                    await f.write(section)
+                    if deduplicator is not None:
+                        deduplicator.check(*parse_section(section))
+                await f.flush()
+
+                internal_links = journal.pending_links()
+
+                # Phase 2: Crawl the internal links (body content only)
+                if internal_links:
+                    logger.info(
+                        "=== Phase 2: Crawling %d internal links (body only) ===",
+                        len(internal_links),
+                    )
+                    cached_results: List[CrawlResult] = []
+                    links_to_fetch = internal_links
+                    # A refresh fetches every page that was not confirmed unmodified;
+                    # the fresh results still go into the page cache
+                    if page_cache is not None and not refresh:
+                        links_to_fetch = []
+                        for link in internal_links:
+                            cached = page_cache.get(link)
+                            if cached is None:
+                                links_to_fetch.append(link)
+                            else:
+                                cached_results.append(cached)
+                        if cached_results:
+                            logger.info(
+                                "%d of %d internal pages served from the page cache",
+                                len(cached_results),
+                                len(internal_links),
+                            )
 
-                    if result.success:
-                        # Add the page content to our aggregate
-                        aggregate_content += f"## Page {i + 1}: {url}\n\n"
-                        aggregate_content += (
-                            f"### Title: {result.metadata.get('title', 'Untitled')}\n\n"
+                    # Stream the results so each page is written and dropped on arrival
+                    fetcher = None
+                    fetched = None
+                    if not links_to_fetch:
+                        pass
+                    elif use_http_fast_path:
+                        # Server-rendered pages are fetched over plain HTTP, only
+                        # JS-rendered pages are crawled with the browser
+                        fetcher = HybridFetcher(crawler, body_only_config, dispatcher)
+                        fetched = fetcher.fetch_many(links_to_fetch)
+                    else:
+                        pages_rendered += len(links_to_fetch)
+                        fetched = await crawler.arun_many(
+                            links_to_fetch,
+                            config=body_only_config.clone(stream=True),
+                            dispatcher=dispatcher,
                         )
+                    results = iter_cached_and_fetched(
+                        cached_results, fetched, page_cache  # type: ignore
+                    )
 
-                        # Add the content with links removed
-                        aggregate_content += "### Content (body only):\n\n"
-                        # Remove links from the content for the internal pages
-                        # Check if the result has a 'fit_markdown' attribute, else use 'markdown'
-                        if hasattr(result, "markdown") and isinstance(
-                            result.markdown, str
-                        ):
-                            cleaned_content = remove_links_from_markdown(
-                                result.markdown
+                    async for result in results:
+                        page_number = journal.next_page_number
+                        url = result.url if hasattr(result, "url") else ""
+                        section = format_page_section(page_number, url, result)
+                        if deduplicator is not None and result.success:
+                            duplicate = deduplicator.check(
+                                url, parse_section(section)[1]
                             )
-                            aggregate_content += cleaned_content + "\n\n"
+                            if duplicate is not None:
+                                kind, original_url = duplicate
+                                logger.info(
+                                    "Dropping %s: %s duplicate of %s",
+                                    url,
+                                    kind,
+                                    original_url,
+                                )
+                                journal.record_duplicate(url, original_url)
+                                del result
+                                continue
+                        journal.record_page(url, page_number, result.success, section)
+                        await f.write(section)
+                        await f.flush()
+                        if result.success:
+                            if page_states.record(
+                                url, parse_section(section)[1], result.response_headers
+                            ):
+                                changed_pages += 1
+                            structured_data.record(url, harvest_result(result))
+
+                        if result.success:
+                            logger.info("Successfully crawled: %s", url)
                         else:
-                            logger.warning(
-                                "Unexpected markdown format for URL: %s", url
+                            logger.error(
+                                "Failed to crawl: %s, Error: %s",
+                                url,
+                                getattr(result, "error", "Unknown error"),
                             )
-                            aggregate_content += "Content could not be processed.\n\n"
+                        del result
 
-                        logger.info("Successfully crawled: %s", url)
-                    else:
-                        # Report failure
-                        error_msg = (
-                            result.error
-                            if hasattr(result, "error")
-                            else "Unknown error"
-                        )
-                        aggregate_content += f"## Page {i + 1}: {url}\n\n"
-                        aggregate_content += f"Failed to crawl: {error_msg}\n\n"
-                        aggregate_content += "-" * 80 + "\n\n"
+                    if fetcher is not None:
+                        pages_rendered += fetcher.browser_pages
+                    dispatcher.controller.log_summary()
+                elif journal.completed:
+                    logger.info("All internal links already crawled")
+                else:
+                    logger.info("No additional internal links found to crawl")
 
-                        logger.error("Failed to crawl: %s, Error: %s", url, error_msg)
-            else:
-                logger.info("No additional internal links found to crawl")
+                await f.write(f"{CRAWL_COMPLETE_MARKER}\n")
 
-    finally:
-        # Restore original recursion limit
-        sys.setrecursionlimit(original_limit)
+        finally:
+            if browser_pool is not None:
+                browser_pool.record_pages(pages_rendered)
+
+    if deduplicator is not None:
+        near_duplicates = await remove_near_duplicates_from_file(
+            output_markdown_file, min_page_fraction=boilerplate_page_fraction
+        )
+        for url, original_url in near_duplicates:
+            logger.info("Dropping %s: near duplicate of %s", url, original_url)
+            journal.record_duplicate(url, original_url)
+            journal.completed.pop(url, None)
+        deduplicator.unique_pages -= len(near_duplicates)
+        deduplicator.near_duplicates += len(near_duplicates)
+        deduplicator.log_summary(get_host(main_url))
+
+    if boilerplate_page_fraction > 0:
+        await remove_boilerplate_from_file(
+            output_markdown_file, boilerplate_page_fraction
+        )
 
-    # Write the aggregate content to file
-    with open(output_markdown_file, "w", encoding="utf-8") as f:
-        f.write(aggregate_content)
+    # The aggregated file is complete, the journal is no longer needed
+    journal.remove()
     logger.info("Aggregate content saved to %s", output_markdown_file)
 
-    # Count total pages crawled (main URL + internal links that were successfully crawled)
-    total_crawled = (
-        1 + len([r for r in results if getattr(r, "success", False)])  # type: ignore
-        if "results" in locals()
-        else 1
+    crawled_urls = [main_url] + list(journal.completed)
+    page_states.retain(crawled_urls)
+    page_states.save()
+    structured_data.retain(crawled_urls)
+    structured_data.save()
+    if structured_data.pages:
+        logger.info(
+            "Structured data harvested from %d of %d pages",
+            len(structured_data.pages),
+            len(crawled_urls),
+        )
+    unchanged = (
+        previous_urls is not None
+        and changed_pages == 0
+        and set(crawled_urls) == set(previous_urls)
     )
+    if unchanged:
+        logger.info("Content of %s unchanged since the last crawl", main_url)
+    mark_domain_unchanged(output_markdown_file, unchanged)
+
+    # Count total pages crawled (main URL + internal links that were successfully crawled)
+    total_crawled = 1 + len(journal.completed)
+
+    if crawl_store is not None:
+        await archive_to_store(
+            output_markdown_file,
+            crawl_store,
+            main_url=main_url,
+            company_name=company_name,
+        )
 
     return output_markdown_file, total_crawled
 
@@ -1067,6 +2133,26 @@ async def main(
     output_dir: Optional[str] = None,
     max_links: Optional[int] = None,
     overwrite: bool = False,
+    recycle_after_pages: int = DEFAULT_RECYCLE_AFTER_PAGES,
+    max_concurrent_domains: int = DEFAULT_MAX_CONCURRENT_DOMAINS,
+    max_per_host: int = DEFAULT_MAX_PER_HOST,
+    host_crawl_delay: float = DEFAULT_HOST_CRAWL_DELAY,
+    use_sitemap: bool = True,
+    use_http_fast_path: bool = True,
+    link_scoring: Optional[Dict[str, Any]] = None,
+    adaptive_wait: bool = True,
+    block_resources: bool = True,
+    resource_blocking: Optional[Dict[str, Any]] = None,
+    dispatcher_config: Optional[Dict[str, Any]] = None,
+    deduplicate_content: bool = True,
+    boilerplate_page_fraction: float = BOILERPLATE_PAGE_FRACTION,
+    triage: bool = True,
+    triage_cache_file: Optional[str] = None,
+    crawl_store_dir: Optional[str] = None,
+    use_page_cache: bool = True,
+    page_cache_config: Optional[Dict[str, Any]] = None,
+    refresh: bool = False,
+    html_guard_config: Optional[Dict[str, Any]] = None,
 ) -> Optional[str]:
     """
     Main function to initiate the web crawling process.
@@ -1079,19 +2165,78 @@ async def main(
     1. Parses command line arguments (if called without parameters)
     2. Reads URLs and company names from an Excel or CSV file
     3. Creates the output directory
-    4. Crawls each domain to collect and save content
-    5. Outputs a summary of results
+    4. Skips dead, parked and redirected domains and rewrites live URLs to
+       their canonical origin (pre-crawl triage)
+    5. Launches one shared browser pool and crawls several domains concurrently
+       with it, limited globally and per host
+    6. Outputs a summary of results
 
     Args:
         input_csv_path: Path to Excel/CSV file containing URLs and company names
         output_dir: Directory to save aggregated content
         max_links: Maximum number of internal links to crawl per domain
         overwrite: Whether to overwrite existing files
+        recycle_after_pages: Pages rendered before the shared browser is relaunched
+        max_concurrent_domains: Number of companies crawled at the same time
+        max_per_host: Number of concurrent domain crawls allowed on one host
+        host_crawl_delay: Seconds between two domain crawls starting on the same host
+        use_sitemap: Whether to discover internal links from sitemaps first
+        use_http_fast_path: Whether to fetch internal pages over plain HTTP first
+        link_scoring: Link scoring weights (see webcrawl.link_scoring), e.g. the
+            "link_scoring" entry of the webcrawl section in config.json
+        adaptive_wait: Whether to read pages as soon as they have settled instead
+            of after a fixed delay
+        block_resources: Whether to abort requests the crawl does not need
+            (images, fonts, media, trackers, third-party scripts)
+        resource_blocking: Resource blocking policy (see webcrawl.resource_blocking),
+            e.g. the "resource_blocking" entry of the webcrawl section in config.json
+        dispatcher_config: Adaptive concurrency settings (see
+            webcrawl.adaptive_concurrency), e.g. the "dispatcher" entry of the
+            webcrawl section in config.json
+        deduplicate_content: Whether to drop pages duplicating the content of an
+            already crawled page of the same domain
+        boilerplate_page_fraction: Share of a domain's pages a text block must
+            recur on to be kept only once; 0 disables the boilerplate removal
+        triage: Whether to check all URLs for dead, parked or redirected domains
+            before crawling
+        triage_cache_file: JSON file caching triage results between runs
+            (default: TRIAGE_CACHE_FILENAME in the output directory)
+        crawl_store_dir: Directory of the compressed crawl store. When set, each
+            finished domain is moved into the store and its markdown file is
+            replaced by a manifest; None keeps the plain markdown files.
+        use_page_cache: Whether to reuse pages crawled within the cache TTL
+        page_cache_config: page_cache section of the webcrawl config (path,
+            ttl_days, max_size_mb); the cache file defaults to PAGE_CACHE_FILENAME
+            in the output directory
+        refresh: Re-crawl already crawled domains with conditional requests,
+            keeping unmodified pages and marking unchanged domains
+        html_guard_config: html_guard section of the webcrawl config
+            (max_html_mb, max_dom_depth); oversized pages are truncated and
+            deeply nested elements unwrapped before processing
 
     Command Line Arguments (when called from CLI):
         --excel (-e): Path to Excel file containing URLs and company names
         --output (-o): Directory where the output files will be saved
         --max-links: Maximum number of links to crawl per domain (default: 60)
+        --recycle-after-pages: Pages rendered before the shared browser is relaunched
+        --max-concurrent-domains: Number of companies crawled at the same time
+        --max-per-host: Number of concurrent domain crawls allowed on one host
+        --host-crawl-delay: Seconds between two domain crawls starting on the same host
+        --no-sitemap: Discover internal links from the rendered main page only
+        --no-http-fast-path: Render every internal page in the browser
+        --no-adaptive-wait: Always wait the fixed delay before reading a page
+        --no-resource-blocking: Let the browser load images, fonts, media and trackers
+        --no-content-dedup: Keep pages whose content duplicates an earlier page
+        --boilerplate-fraction: Share of pages a text block must recur on to be
+            stripped as boilerplate (0 disables)
+        --no-triage: Crawl every URL without checking for dead or parked domains
+        --no-page-cache: Crawl every page again, ignoring the page cache
+        --refresh: Re-crawl already crawled domains, skipping unmodified pages
+        --crawl-store: Directory of the compressed crawl store
+        --config-file: Pipeline config whose webcrawl section provides
+            dispatcher_config, page_cache_config, html_guard_config,
+            link_scoring, resource_blocking and the crawl store (as in
+            master_pipeline)
 
     Returns:
         Optional[str]: Output directory path if successful, None otherwise
@@ -1106,6 +2251,30 @@ async def main(
         output_directory = args.output or output_dir
         max_links_count = args.max_links or max_links
         overwrite_flag = args.overwrite or overwrite
+        recycle_after_pages = args.recycle_after_pages
+        max_concurrent_domains = args.max_concurrent_domains
+        max_per_host = args.max_per_host
+        host_crawl_delay = args.host_crawl_delay
+        use_sitemap = args.use_sitemap
+        use_http_fast_path = args.use_http_fast_path
+        adaptive_wait = args.adaptive_wait
+        block_resources = args.block_resources
+        deduplicate_content = args.deduplicate_content
+        boilerplate_page_fraction = args.boilerplate_fraction
+        triage = args.triage
+        crawl_store_dir = args.crawl_store_dir
+        use_page_cache = args.use_page_cache
+        refresh = args.refresh
+        if args.config_file:
+            webcrawl_config = load_webcrawl_config(args.config_file)
+            link_scoring = webcrawl_config.get("link_scoring")
+            resource_blocking = webcrawl_config.get("resource_blocking")
+            dispatcher_config = webcrawl_config.get("dispatcher")
+            page_cache_config = webcrawl_config.get("page_cache")
+            html_guard_config = webcrawl_config.get("html_guard")
+            crawl_store_config = webcrawl_config.get("crawl_store", {})
+            if crawl_store_dir is None and crawl_store_config.get("enabled", False):
+                crawl_store_dir = crawl_store_config.get("path")
     else:
         excel_file = input_csv_path
         output_directory = output_dir
@@ -1167,15 +2336,84 @@ async def main(
             )
 
     ensure_output_directory(output_directory)
-    results = []
+
+    skipped_companies = []
+    if triage:
+        triage_cache = TriageCache(
+            triage_cache_file or os.path.join(output_directory, TRIAGE_CACHE_FILENAME)
+        )
+        triage_results = await triage_domains(urls_and_companies, cache=triage_cache)
+        urls_and_companies, skipped_companies = apply_triage(
+            urls_and_companies, triage_results
+        )
+        input_urls = moved_input_urls(triage_results)
+    else:
+        input_urls = {}
+
+    # Crawl every website once, even if several companies of the input use it
+    site_groups = group_by_site(urls_and_companies)
+    shared_with = {url: companies[1:] for url, companies in site_groups}
+    if len(site_groups) < len(urls_and_companies):
+        logger.info(
+            "Collapsed %d companies into %d unique websites",
+            len(urls_and_companies),
+            len(site_groups),
+        )
+    urls_and_companies = [(url, companies[0]) for url, companies in site_groups]
+    write_shared_sites(
+        output_directory,
+        [(input_urls.get(url, url), companies) for url, companies in site_groups],
+    )
+
     num_companies = len(urls_and_companies)
     logger.info("Total number of companies to crawl: %d", num_companies)
+    logger.info(
+        "Crawling up to %d domains concurrently (%d per host, %.1fs host delay)",
+        max_concurrent_domains,
+        max_per_host,
+        host_crawl_delay,
+    )
+
+    wait_strategy = AdaptiveWaiter() if adaptive_wait else None
+    resource_blocker = (
+        ResourceBlocker(ResourcePolicy.from_config(resource_blocking))
+        if block_resources
+        else None
+    )
+    html_guard = HtmlGuard.from_config(html_guard_config)
+    browser_pool = BrowserPool(
+        browser_config=create_browser_config(),
+        headers=GERMAN_LANGUAGE_HEADERS,
+        recycle_after_pages=recycle_after_pages,
+        memory_threshold_percent=DEFAULT_RECYCLE_MEMORY_PERCENT,
+        hooks=combine_hooks(wait_strategy, resource_blocker),
+        html_guard=html_guard,
+    )
+    link_scorer = LinkScorer.from_config(link_scoring)
+    concurrency_policy = ConcurrencyPolicy.from_config(dispatcher_config)
+    crawl_store = CrawlStore(crawl_store_dir) if crawl_store_dir else None
+    page_cache = (
+        PageCache.from_config(
+            page_cache_config,
+            default_path=os.path.join(output_directory, PAGE_CACHE_FILENAME),
+        )
+        if use_page_cache
+        else None
+    )
+    scheduler = DomainScheduler(
+        max_concurrent_domains=max_concurrent_domains,
+        max_per_host=max_per_host,
+        host_crawl_delay=host_crawl_delay,
+    )
+    started_count = 0
 
-    for index, (url, company_name) in enumerate(urls_and_companies):
-        current_company_num = index + 1
+    async def crawl_company(url_and_company: Tuple[str, str]) -> Dict[str, Any]:
+        nonlocal started_count
+        url, company_name = url_and_company
+        started_count += 1
         # Log progress using the standard format
         logger.info(
-            f"PROGRESS:webcrawl:crawl_domain:{current_company_num}/{num_companies}:Crawling domain {url} for company {company_name}"
+            f"PROGRESS:webcrawl:crawl_domain:{started_count}/{num_companies}:Crawling domain {url} for company {company_name}"
         )
 
         company_info = f" ({company_name})" if company_name else ""
@@ -1188,15 +2426,40 @@ async def main(
             max_links=max_links_count,
             company_name=company_name,
             overwrite=overwrite_flag,
+            browser_pool=browser_pool,
+            use_sitemap=use_sitemap,
+            use_http_fast_path=use_http_fast_path,
+            link_scorer=link_scorer,
+            wait_strategy=wait_strategy,
+            resource_blocker=resource_blocker,
+            concurrency_policy=concurrency_policy,
+            deduplicate_content=deduplicate_content,
+            boilerplate_page_fraction=boilerplate_page_fraction,
+            shared_with=shared_with[url],
+            crawl_store=crawl_store,
+            page_cache=page_cache,
+            refresh=refresh,
+            input_url=input_urls.get(url),
+            html_guard=html_guard,
         )
-        results.append(
-            {
-                "domain": url,
-                "company_name": company_name,
-                "markdown_file": markdown_file,
-                "pages_crawled": page_count,
-            }
-        )
+        return {
+            "domain": url,
+            "company_name": company_name,
+            "shared_with": shared_with[url],
+            "markdown_file": markdown_file,
+            "pages_crawled": page_count,
+        }
+
+    try:
+        async with browser_pool:
+            results = await scheduler.run(
+                urls_and_companies,
+                crawl_company,
+                host_of=lambda url_and_company: get_host(url_and_company[0]),
+            )
+    finally:
+        if page_cache is not None:
+            page_cache.save()
 
     # Summary of results
     logger.info("\n\n" + "=" * 40)
@@ -1206,9 +2469,29 @@ async def main(
         logger.info("Domain: %s", result["domain"])
         if result["company_name"]:
             logger.info("Company: %s", result["company_name"])
+        if result["shared_with"]:
+            logger.info("Shared by: %s", "; ".join(result["shared_with"]))
         logger.info("Pages crawled: %d", result["pages_crawled"])
         logger.info("Markdown file: %s", os.path.basename(result["markdown_file"]))
         logger.info("-" * 40)
+    for url, company_name, triage_result in skipped_companies:
+        logger.info(
+            "Skipped: %s (%s) - %s: %s",
+            url,
+            company_name,
+            triage_result.status,
+            triage_result.reason,
+        )
+    if wait_strategy is not None:
+        wait_strategy.log_summary()
+    if resource_blocker is not None:
+        resource_blocker.log_summary()
+    html_guard.log_summary()
+    if crawl_store is not None:
+        crawl_store.log_summary()
+    if page_cache is not None:
+        page_cache.log_summary()
+        page_cache.close()
 
     return output_dir
 
@@ -1217,10 +2500,4 @@ if __name__ == "__main__":
     # Configure logging
     configure_logging()
 
-    # Increase the recursion limit for the entire program
-    sys.setrecursionlimit(5000)
-
-    # Disable colorama for potentially large outputs
-    disable_colorama()
-
     asyncio.run(main())
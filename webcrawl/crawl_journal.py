@@ -0,0 +1,223 @@
+"""
+Per-domain crawl journal used to resume interrupted domain crawls.
+
+crawl_domain() appends one JSON line to the journal for every step of a domain
+crawl: the main page section, the list of discovered internal links, and every
+internal page that completed, failed or was dropped as a duplicate. When a run
+dies partway through a domain (browser crash, OOM kill), the next run loads the
+journal, crawls only the pages that have not completed yet, and rebuilds the aggregated markdown
+from the journaled sections. The journal is removed once the domain finishes.
+
+The file is append-only, so a crash can at most truncate the last line, which
+is ignored on load.
+"""
+
+import json
+import logging
+import os
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_SUFFIX = ".journal.jsonl"
+
+# Journal record types
+RECORD_MAIN = "main"
+RECORD_DISCOVERED = "discovered"
+RECORD_PAGE = "page"
+RECORD_DUPLICATE = "duplicate"
+
+PAGE_COMPLETED = "completed"
+PAGE_FAILED = "failed"
+
+
+def get_journal_path(markdown_file: str) -> str:
+    """
+    Get the journal path belonging to an aggregated markdown file.
+
+    Args:
+        markdown_file: Path to the aggregated markdown file (e.g. out/example.com.md)
+
+    Returns:
+        str: Path of the journal file (e.g. out/example.com.journal.jsonl)
+    """
+    base, _ = os.path.splitext(markdown_file)
+    return base + JOURNAL_SUFFIX
+
+
+class CrawlJournal:
+    """
+    Append-only record of the progress of one domain crawl.
+
+    Attributes:
+        main_section: Markdown section of the main page, if already crawled
+        discovered_links: Internal links selected for crawling, if already collected
+        completed: Page number of every completed internal page, by URL
+        failed: Page number of every internal page whose last attempt failed, by URL
+        duplicates: URL of the page with the same content, by dropped duplicate URL
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Path of the journal file
+        """
+        self.path = path
+        self.main_section: Optional[str] = None
+        self.discovered_links: Optional[List[str]] = None
+        self.completed: Dict[str, int] = {}
+        self.failed: Dict[str, int] = {}
+        self.duplicates: Dict[str, str] = {}
+        self._last_page_number = 0
+
+    @property
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    @property
+    def next_page_number(self) -> int:
+        return self._last_page_number + 1
+
+    def _iter_records(self) -> Iterator[Dict[str, Any]]:
+        if not self.exists:
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # Most likely a line truncated by a crash during the write
+                    logger.warning(
+                        "Ignoring unreadable line %d in crawl journal %s",
+                        line_number,
+                        self.path,
+                    )
+
+    def load(self) -> "CrawlJournal":
+        """
+        Load the crawl state from the journal file, if it exists.
+
+        Page sections are not kept in memory; use iter_completed_sections() to
+        read them back when rebuilding the markdown.
+
+        Returns:
+            CrawlJournal: self, for chaining
+        """
+        for record in self._iter_records():
+            record_type = record.get("type")
+            if record_type == RECORD_MAIN:
+                self.main_section = record.get("section", "")
+            elif record_type == RECORD_DISCOVERED:
+                self.discovered_links = list(record.get("links", []))
+            elif record_type == RECORD_PAGE:
+                self._apply_page(record["url"], record["status"], record["page_number"])
+            elif record_type == RECORD_DUPLICATE:
+                self.duplicates[record["url"]] = record.get("duplicate_of", "")
+                self.failed.pop(record["url"], None)
+        if self.exists:
+            logger.info(
+                "Loaded crawl journal %s: %d completed, %d failed, %s discovered",
+                self.path,
+                len(self.completed),
+                len(self.failed),
+                len(self.discovered_links)
+                if self.discovered_links is not None
+                else "no links",
+            )
+        return self
+
+    def _apply_page(self, url: str, status: str, page_number: int) -> None:
+        self._last_page_number = max(self._last_page_number, page_number)
+        if status == PAGE_COMPLETED:
+            self.completed[url] = page_number
+            self.failed.pop(url, None)
+        else:
+            self.failed[url] = page_number
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def record_main(self, section: str) -> None:
+        """Record the markdown section of the crawled main page."""
+        self.main_section = section
+        self._append({"type": RECORD_MAIN, "section": section})
+
+    def record_discovered(self, links: List[str]) -> None:
+        """Record the internal links selected for crawling."""
+        self.discovered_links = list(links)
+        self._append({"type": RECORD_DISCOVERED, "links": self.discovered_links})
+
+    def record_page(
+        self, url: str, page_number: int, success: bool, section: str
+    ) -> None:
+        """
+        Record the outcome of an internal page.
+
+        Args:
+            url: URL of the page
+            page_number: Number of the page in the aggregated markdown
+            success: Whether the page was crawled successfully
+            section: Markdown section written for the page
+        """
+        status = PAGE_COMPLETED if success else PAGE_FAILED
+        self._apply_page(url, status, page_number)
+        record = {
+            "type": RECORD_PAGE,
+            "url": url,
+            "page_number": page_number,
+            "status": status,
+        }
+        if success:
+            # Failed pages are crawled again on resume, their section is not reused
+            record["section"] = section
+        self._append(record)
+
+    def record_duplicate(self, url: str, duplicate_of: str) -> None:
+        """
+        Record an internal page that was dropped because its content was seen before.
+
+        Args:
+            url: URL of the dropped page
+            duplicate_of: URL of the page with the same content
+        """
+        self.duplicates[url] = duplicate_of
+        self.failed.pop(url, None)
+        self._append(
+            {"type": RECORD_DUPLICATE, "url": url, "duplicate_of": duplicate_of}
+        )
+
+    def pending_links(self) -> List[str]:
+        """
+        Get the discovered links that still have to be crawled.
+
+        Returns:
+            List[str]: Discovered links that have neither completed nor been
+                dropped as duplicates, in discovery order
+        """
+        return [
+            link
+            for link in (self.discovered_links or [])
+            if link not in self.completed and link not in self.duplicates
+        ]
+
+    def iter_completed_sections(self) -> Iterator[str]:
+        """
+        Read back the sections of completed internal pages, in journal order.
+
+        Yields:
+            str: Markdown section of each completed page
+        """
+        for record in self._iter_records():
+            if record.get("type") == RECORD_PAGE and record.get("status") == PAGE_COMPLETED:
+                yield record.get("section", "")
+
+    def remove(self) -> None:
+        """Delete the journal file, e.g. once the domain crawl has finished."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,298 @@
+"""
+Content-addressed, compressed store of crawled pages.
+
+The aggregated markdown of a domain is kept as separate blobs (header, one blob
+per page section, footer), each compressed and named by the SHA-256 of its
+text. A small JSON manifest per domain lists the blobs in order together with
+the URL, title and fetch time of every page:
+
+    <store root>/objects/ab/abcdef....zst   (or .gz without the zstandard package)
+    <crawl output dir>/<domain>.manifest.json
+
+Pages with identical content, within one domain, across domains or across runs
+sharing the store root, are stored once. The aggregated markdown is produced on
+demand from the manifest, either streamed (iter_markdown) or written to a file
+for tools that need one (materialize, materialized_markdown).
+"""
+
+import contextlib
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_SUFFIX = ".manifest.json"
+ZSTD_LEVEL = 10
+GZIP_LEVEL = 6
+
+# Compression codecs by file extension
+CODEC_ZSTD = ".zst"
+CODEC_GZIP = ".gz"
+
+
+def get_manifest_path(markdown_file: str) -> str:
+    """Get the manifest path that replaces an aggregated markdown file."""
+    return os.path.splitext(markdown_file)[0] + MANIFEST_SUFFIX
+
+
+def get_markdown_name(manifest_path: str) -> str:
+    """Get the file name of the aggregated markdown described by a manifest."""
+    return os.path.basename(manifest_path)[: -len(MANIFEST_SUFFIX)] + ".md"
+
+
+class CrawlStore:
+    """
+    Directory of compressed blobs keyed by their content hash.
+
+    Usage:
+        store = CrawlStore("crawl_store")
+        digest = store.put(section)
+        assert store.get(digest) == section
+    """
+
+    def __init__(self, root: str, codec: Optional[str] = None):
+        """
+        Args:
+            root: Store directory, shared by all crawl runs that should share blobs
+            codec: CODEC_ZSTD or CODEC_GZIP; defaults to zstd when the zstandard
+                package is installed
+        """
+        if codec is None:
+            codec = CODEC_ZSTD if zstandard is not None else CODEC_GZIP
+        if codec == CODEC_ZSTD and zstandard is None:
+            raise ValueError("zstd compression requires the zstandard package")
+        self.root = root
+        self.codec = codec
+        self.objects_dir = os.path.join(root, "objects")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.blobs_written = 0
+        self.blobs_reused = 0
+        self.raw_bytes = 0
+        self.stored_bytes = 0
+
+    def _blob_path(self, digest: str, codec: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest + codec)
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.codec == CODEC_ZSTD:
+            return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+    def has(self, digest: str) -> bool:
+        """Check whether a blob is stored, with any codec."""
+        return any(
+            os.path.exists(self._blob_path(digest, codec))
+            for codec in (CODEC_ZSTD, CODEC_GZIP)
+        )
+
+    def put(self, text: str) -> str:
+        """
+        Store a text unless a blob with the same content exists.
+
+        Args:
+            text: Blob content
+
+        Returns:
+            str: Content hash of the blob
+        """
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        self.raw_bytes += len(data)
+        if self.has(digest):
+            self.blobs_reused += 1
+            return digest
+
+        path = self._blob_path(digest, self.codec)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        compressed = self._compress(data)
+        # Written to a temporary file first, so a blob is either complete or absent
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(compressed)
+        os.replace(temp_path, path)
+        self.blobs_written += 1
+        self.stored_bytes += len(compressed)
+        return digest
+
+    def get(self, digest: str) -> str:
+        """
+        Read a blob.
+
+        Args:
+            digest: Content hash returned by put()
+
+        Returns:
+            str: Blob content
+
+        Raises:
+            KeyError: If the blob is not stored
+        """
+        path = self._blob_path(digest, CODEC_ZSTD)
+        if os.path.exists(path):
+            if zstandard is None:
+                raise ValueError(f"Blob {digest} is zstd compressed, zstandard missing")
+            with open(path, "rb") as f:
+                return zstandard.ZstdDecompressor().decompress(f.read()).decode("utf-8")
+        path = self._blob_path(digest, CODEC_GZIP)
+        if os.path.exists(path):
+            with gzip.open(path, "rb") as f:
+                return f.read().decode("utf-8")
+        raise KeyError(digest)
+
+    def write_manifest(
+        self,
+        manifest_path: str,
+        header: str,
+        pages: List[Dict[str, Any]],
+        footer: str = "",
+        **metadata: Any,
+    ) -> Dict[str, Any]:
+        """
+        Store the parts of an aggregated markdown file and write its manifest.
+
+        Args:
+            manifest_path: Path of the manifest to write
+            header: Text before the first page section
+            pages: One dict per page section in file order, with the keys 'url',
+                'title', 'fetched_at' and 'content' (the full section text)
+            footer: Text after the last page section
+            **metadata: Additional manifest fields, e.g. main_url or company_name
+
+        Returns:
+            Dict[str, Any]: The written manifest
+        """
+        manifest: Dict[str, Any] = dict(metadata)
+        manifest["store"] = os.path.abspath(self.root)
+        manifest["created_at"] = time.time()
+        manifest["header"] = self.put(header)
+        manifest["pages"] = [
+            {
+                "url": page.get("url", ""),
+                "title": page.get("title", ""),
+                "fetched_at": page.get("fetched_at"),
+                "hash": self.put(page["content"]),
+            }
+            for page in pages
+        ]
+        manifest["footer"] = self.put(footer)
+
+        temp_path = manifest_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, manifest_path)
+        return manifest
+
+    def iter_markdown(self, manifest_path: str) -> Iterator[str]:
+        """
+        Stream the aggregated markdown described by a manifest, one part at a time.
+
+        Args:
+            manifest_path: Path of the manifest
+
+        Yields:
+            str: Header, page sections and footer, in file order
+        """
+        manifest = load_manifest(manifest_path)
+        yield self.get(manifest["header"])
+        for page in manifest["pages"]:
+            yield self.get(page["hash"])
+        yield self.get(manifest["footer"])
+
+    def read_markdown(self, manifest_path: str) -> str:
+        """Get the complete aggregated markdown described by a manifest."""
+        return "".join(self.iter_markdown(manifest_path))
+
+    def materialize(self, manifest_path: str, output_file: str) -> str:
+        """
+        Write the aggregated markdown described by a manifest to a file.
+
+        Args:
+            manifest_path: Path of the manifest
+            output_file: Path of the markdown file to write
+
+        Returns:
+            str: output_file
+        """
+        with open(output_file, "w", encoding="utf-8") as f:
+            for part in self.iter_markdown(manifest_path):
+                f.write(part)
+        return output_file
+
+    def log_summary(self) -> None:
+        """Log how many blobs were written and how much space compression saved."""
+        if not self.blobs_written and not self.blobs_reused:
+            return
+        logger.info(
+            "Crawl store %s: %d new blobs, %d already stored, %.1f KB of text "
+            "stored as %.1f KB",
+            self.root,
+            self.blobs_written,
+            self.blobs_reused,
+            self.raw_bytes / 1024,
+            self.stored_bytes / 1024,
+        )
+
+
+def load_manifest(manifest_path: str) -> Dict[str, Any]:
+    """Read a domain manifest."""
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def find_manifests(directory: str) -> List[str]:
+    """
+    Find the manifests of domains whose aggregated markdown is not on disk.
+
+    Args:
+        directory: Crawl output directory
+
+    Returns:
+        List[str]: Manifest paths, sorted
+    """
+    manifests = []
+    for root, _, files in os.walk(directory):
+        for file in files:
+            if not file.endswith(MANIFEST_SUFFIX):
+                continue
+            if get_markdown_name(file) in files:
+                continue
+            manifests.append(os.path.join(root, file))
+    return sorted(manifests)
+
+
+@contextlib.contextmanager
+def materialized_markdown(
+    manifest_paths: List[str], store: Optional[CrawlStore] = None
+) -> Iterator[List[str]]:
+    """
+    Write the aggregated markdown of manifests to a temporary directory.
+
+    The files keep the names the crawler would have given them, so output named
+    after the markdown file stays the same. They are deleted on exit.
+
+    Args:
+        manifest_paths: Manifests, as returned by find_manifests()
+        store: Store holding the blobs of the manifests; by default the store
+            recorded in each manifest
+
+    Yields:
+        List[str]: Paths of the markdown files, in the order of manifest_paths
+    """
+    with tempfile.TemporaryDirectory(prefix="crawl_store_") as temp_dir:
+        markdown_files = []
+        for path in manifest_paths:
+            path_store = store or CrawlStore(load_manifest(path)["store"])
+            output_file = os.path.join(temp_dir, get_markdown_name(path))
+            markdown_files.append(path_store.materialize(path, output_file))
+        yield markdown_files
@@ -0,0 +1,184 @@
+"""
+Domain-level scheduler for crawling several companies at once.
+
+crawl_domain() already crawls the internal links of one site concurrently; this
+module runs several of those domain crawls side by side while staying polite to
+each host:
+
+- a global cap on the number of domains crawled at the same time
+- a per-host cap, so rows that share a host are never crawled in parallel
+- a per-host crawl delay between two domain crawls starting on the same host
+- fair interleaving, so rows sharing a host are spread over the run instead of
+  queueing up behind each other
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from typing import Awaitable, Callable, Dict, List, Optional, TypeVar
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Scheduler defaults
+DEFAULT_MAX_CONCURRENT_DOMAINS = 4
+DEFAULT_MAX_PER_HOST = 1
+DEFAULT_HOST_CRAWL_DELAY = 1.0  # seconds between crawls starting on the same host
+
+
+def get_host(url: str) -> str:
+    """
+    Get the host key used for politeness limits.
+
+    Args:
+        url: The URL to analyze
+
+    Returns:
+        str: Lower-cased network location without a leading 'www.'
+    """
+    netloc = urlparse(url).netloc.lower()
+    if netloc.startswith("www."):
+        netloc = netloc[4:]
+    return netloc
+
+
+def interleave_by_host(hosts: List[str]) -> List[int]:
+    """
+    Order item indices round-robin across hosts.
+
+    Hosts are visited in order of first appearance; within a host, the original
+    order is kept. Example: hosts [a, a, b, c, b] -> indices [0, 2, 3, 1, 4].
+
+    Args:
+        hosts: Host key for every item, in input order
+
+    Returns:
+        List[int]: Indices of the items in scheduling order
+    """
+    queues: "OrderedDict[str, deque]" = OrderedDict()
+    for index, host in enumerate(hosts):
+        queues.setdefault(host, deque()).append(index)
+
+    order = []
+    while queues:
+        for host in list(queues.keys()):
+            order.append(queues[host].popleft())
+            if not queues[host]:
+                del queues[host]
+    return order
+
+
+class DomainScheduler:
+    """
+    Run one coroutine per item with global and per-host concurrency limits.
+    """
+
+    def __init__(
+        self,
+        max_concurrent_domains: int = DEFAULT_MAX_CONCURRENT_DOMAINS,
+        max_per_host: int = DEFAULT_MAX_PER_HOST,
+        host_crawl_delay: float = DEFAULT_HOST_CRAWL_DELAY,
+    ):
+        """
+        Args:
+            max_concurrent_domains: Maximum number of items running at once
+            max_per_host: Maximum number of items running at once for one host
+            host_crawl_delay: Minimum seconds between two starts on the same host
+        """
+        self.max_concurrent_domains = max(1, max_concurrent_domains)
+        self.max_per_host = max(1, max_per_host)
+        self.host_crawl_delay = max(0.0, host_crawl_delay)
+
+    async def run(
+        self,
+        items: List[T],
+        worker: Callable[[T], Awaitable[R]],
+        host_of: Callable[[T], str],
+    ) -> List[R]:
+        """
+        Run worker(item) for all items and return the results in input order.
+
+        If a worker raises, no further items are started, the workers already
+        running are allowed to finish, and the first exception is re-raised.
+
+        Args:
+            items: Items to process (e.g. (url, company_name) tuples)
+            worker: Coroutine function processing a single item
+            host_of: Function returning the host key of an item
+
+        Returns:
+            List[R]: Worker results, in the same order as items
+        """
+        loop = asyncio.get_running_loop()
+        hosts = [host_of(item) for item in items]
+        pending = deque(interleave_by_host(hosts))
+        results: List[Optional[R]] = [None] * len(items)
+
+        running: Dict[asyncio.Task, int] = {}
+        first_error: Optional[BaseException] = None
+        host_active: Dict[str, int] = {}
+        host_last_start: Dict[str, float] = {}
+
+        def delay_left(host: str, now: float) -> float:
+            last_start = host_last_start.get(host)
+            if last_start is None:
+                return 0.0
+            return max(0.0, self.host_crawl_delay - (now - last_start))
+
+        try:
+            while pending or running:
+                now = loop.time()
+                next_wakeup: Optional[float] = None
+
+                # Fill free global slots with the first eligible items
+                for index in list(pending):
+                    if len(running) >= self.max_concurrent_domains:
+                        break
+                    host = hosts[index]
+                    if host_active.get(host, 0) >= self.max_per_host:
+                        continue
+                    wait = delay_left(host, now)
+                    if wait > 0:
+                        next_wakeup = (
+                            wait if next_wakeup is None else min(next_wakeup, wait)
+                        )
+                        continue
+                    pending.remove(index)
+                    host_active[host] = host_active.get(host, 0) + 1
+                    host_last_start[host] = now
+                    task = asyncio.create_task(worker(items[index]))
+                    running[task] = index
+
+                if not running:
+                    # Everything left is waiting for a host crawl delay
+                    await asyncio.sleep(next_wakeup or 0)
+                    continue
+
+                done, _ = await asyncio.wait(
+                    running.keys(),
+                    timeout=next_wakeup,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    index = running.pop(task)
+                    host_active[hosts[index]] -= 1
+                    if task.exception() is not None:
+                        if first_error is None:
+                            first_error = task.exception()
+                            # Stop scheduling new items; running ones finish cleanly
+                            pending.clear()
+                        continue
+                    results[index] = task.result()
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running.keys(), return_exceptions=True)
+
+        if first_error is not None:
+            raise first_error
+
+        return results  # type: ignore
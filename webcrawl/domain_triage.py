@@ -0,0 +1,578 @@
+"""
+Pre-crawl triage of the company URLs from the input sheet.
+
+Dead, parked or redirected company URLs used to cost a full browser render in
+crawl_domain() before failing or producing useless content. triage_domains()
+checks all URLs concurrently before the crawl:
+
+1. resolve the host name (DNS)
+2. request the start page over HTTP, following redirects (https first, then http)
+3. classify the domain:
+   - live: reachable; the URL is rewritten to the canonical origin the site
+     redirects to (e.g. http://firma.de -> https://www.firma.de)
+   - dead: no DNS record, unreachable, or the start page is gone (404/410)
+   - parked: a domain-parking, for-sale or hosting placeholder page
+   - redirected: the site redirects to another domain that does not carry the
+     company's name (typically the new owner after an acquisition)
+
+apply_triage() keeps live companies with their canonical URL and skips all
+others. A company that moved to another domain is crawled there, but keeps its
+input URL for the output file and the company URL (moved_input_urls()), so the
+later stages still join it with the input sheet. Results are cached in a JSON
+file for TRIAGE_CACHE_TTL seconds, so repeated runs over the same input do not
+probe every domain again; failed DNS lookups and unreachable servers may be
+transient and are checked again on the next run.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import aiohttp
+from lxml import etree
+from lxml import html as lxml_html
+
+from webcrawl.domain_scheduler import get_host
+from webcrawl.get_company_by_top1machine import clean_url
+from webcrawl.http_fetcher import HTTP_HEADERS
+from webcrawl.link_scoring import normalize_for_matching
+from webcrawl.resource_blocking import is_same_site
+
+logger = logging.getLogger(__name__)
+
+# Triage defaults
+TRIAGE_TIMEOUT = 10.0  # seconds per DNS lookup and per HTTP probe
+TRIAGE_MAX_CONCURRENT = 20
+TRIAGE_MAX_REDIRECTS = 10
+TRIAGE_MAX_BODY_BYTES = 256 * 1024  # enough to recognize a parking page
+TRIAGE_CACHE_TTL = 3 * 24 * 3600  # seconds
+TRIAGE_CACHE_FILENAME = ".domain_triage_cache.json"
+
+# Triage statuses
+STATUS_LIVE = "live"
+STATUS_DEAD = "dead"
+STATUS_PARKED = "parked"
+STATUS_REDIRECTED = "redirected"
+
+# Reasons of dead results that may be transient; they are not cached
+TRANSIENT_REASONS = {"no DNS record", "unreachable"}
+
+# HTTP statuses meaning the start page does not exist (anything else is answered
+# by a running web server and may still render in the browser)
+DEAD_HTTP_STATUSES = {404, 410}
+
+# Hosts serving domain-parking pages
+PARKING_HOSTS = [
+    "sedoparking.com",
+    "sedo.com",
+    "parkingcrew.net",
+    "bodis.com",
+    "dan.com",
+    "afternic.com",
+    "hugedomains.com",
+    "above.com",
+    "parklogic.com",
+    "domainmarket.com",
+]
+# Phrases of parking, for-sale and hosting placeholder pages (normalized text)
+PARKED_PAGE_HINTS = [
+    "domain is for sale",
+    "this domain may be for sale",
+    "buy this domain",
+    "domain steht zum verkauf",
+    "diese domain kaufen",
+    "diese domain steht zum verkauf",
+    "diese domain ist geparkt",
+    "domain parking",
+    "domain wurde registriert",
+    "domain ist bereits registriert",
+    "hier entsteht eine neue internetpraesenz",
+    "hier entsteht in kuerze",
+    "website under construction",
+    "default web site page",
+    "sedoparking",
+    "parkingcrew",
+]
+# Tokens of company names that do not identify the company (legal forms shorter
+# than MIN_COMPANY_TOKEN_LENGTH are dropped anyway)
+COMPANY_NAME_STOPWORDS = {
+    "gmbh",
+    "haftungsbeschraenkt",
+    "holding",
+    "gruppe",
+    "group",
+    "inhaber",
+    "gesellschaft",
+    "verwaltung",
+    "verwaltungs",
+    "beteiligungs",
+    "international",
+}
+MIN_COMPANY_TOKEN_LENGTH = 4
+
+
+class TriageResult:
+    """
+    Outcome of the triage of one company URL.
+
+    Attributes:
+        url: URL as given in the input
+        status: STATUS_LIVE, STATUS_DEAD, STATUS_PARKED or STATUS_REDIRECTED
+        canonical_url: URL to crawl (the redirect target's origin for live sites)
+        final_url: URL the probe ended on after following redirects
+        http_status: HTTP status of the final response, if any
+        reason: Short explanation of the status
+        checked_at: Unix time of the check
+    """
+
+    def __init__(
+        self,
+        url: str,
+        status: str,
+        canonical_url: Optional[str] = None,
+        final_url: Optional[str] = None,
+        http_status: Optional[int] = None,
+        reason: str = "",
+        checked_at: Optional[float] = None,
+    ):
+        self.url = url
+        self.status = status
+        self.canonical_url = canonical_url or url
+        self.final_url = final_url
+        self.http_status = http_status
+        self.reason = reason
+        self.checked_at = time.time() if checked_at is None else checked_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "status": self.status,
+            "canonical_url": self.canonical_url,
+            "final_url": self.final_url,
+            "http_status": self.http_status,
+            "reason": self.reason,
+            "checked_at": self.checked_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TriageResult":
+        return cls(**data)
+
+    @property
+    def is_transient(self) -> bool:
+        """Whether the result may change on the next check (DNS or network failure)."""
+        return self.status == STATUS_DEAD and self.reason in TRANSIENT_REASONS
+
+    def __repr__(self) -> str:
+        return f"TriageResult({self.url!r}, {self.status!r}, {self.reason!r})"
+
+
+class TriageCache:
+    """
+    JSON file cache of triage results with a time-to-live.
+
+    Results are cached per URL and company name, as whether a redirect to
+    another domain counts as the company's new site depends on the company.
+    """
+
+    def __init__(self, path: str, ttl: float = TRIAGE_CACHE_TTL):
+        """
+        Args:
+            path: Path of the cache file
+            ttl: Seconds a cached result stays valid
+        """
+        self.path = path
+        self.ttl = ttl
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning("Ignoring unreadable triage cache %s: %s", path, e)
+
+    @staticmethod
+    def _key(url: str, company_name: Optional[str]) -> str:
+        return f"{url} {company_name or ''}"
+
+    def get(self, url: str, company_name: Optional[str] = None) -> Optional[TriageResult]:
+        """Get the cached result of url for a company, or None if missing or expired."""
+        entry = self._entries.get(self._key(url, company_name))
+        if entry is None or time.time() - entry.get("checked_at", 0) > self.ttl:
+            return None
+        result = TriageResult.from_dict(entry)
+        # Written by earlier versions, which cached transient failures
+        return None if result.is_transient else result
+
+    def put(self, result: TriageResult, company_name: Optional[str] = None) -> None:
+        """Cache the result of a company's URL; transient failures are not cached."""
+        key = self._key(result.url, company_name)
+        if result.is_transient:
+            self._entries.pop(key, None)
+            return
+        self._entries[key] = result.to_dict()
+
+    def save(self) -> None:
+        """Write the cache file, dropping expired entries."""
+        now = time.time()
+        entries = {
+            key: entry
+            for key, entry in self._entries.items()
+            if now - entry.get("checked_at", 0) <= self.ttl
+        }
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, indent=2)
+        os.replace(temp_path, self.path)
+
+
+def is_parked_page(final_url: str, html: str) -> bool:
+    """
+    Check whether a page is a domain-parking, for-sale or placeholder page.
+
+    Args:
+        final_url: URL the page was served from
+        html: HTML of the page
+
+    Returns:
+        bool: True for parked domains
+    """
+    host = get_host(final_url)
+    if any(host == parked or host.endswith("." + parked) for parked in PARKING_HOSTS):
+        return True
+    try:
+        document = lxml_html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return False
+    etree.strip_elements(document, "script", "style", "noscript", with_tail=False)
+    text = " ".join(normalize_for_matching(document.text_content()).split())
+    return any(hint in text for hint in PARKED_PAGE_HINTS)
+
+
+def company_name_tokens(company_name: Optional[str]) -> List[str]:
+    """
+    Get the distinctive tokens of a company name.
+
+    Args:
+        company_name: Company name, e.g. 'Muster Maschinenbau GmbH & Co. KG'
+
+    Returns:
+        List[str]: Normalized tokens without legal forms and generic words,
+            e.g. ['muster', 'maschinenbau']
+    """
+    if not company_name:
+        return []
+    text = normalize_for_matching(company_name)
+    tokens = "".join(c if c.isalnum() else " " for c in text).split()
+    return [
+        token
+        for token in tokens
+        if len(token) >= MIN_COMPANY_TOKEN_LENGTH
+        and token not in COMPANY_NAME_STOPWORDS
+    ]
+
+
+def _page_title(html: str) -> str:
+    try:
+        document = lxml_html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return ""
+    title = document.find(".//title")
+    return title.text_content() if title is not None else ""
+
+
+def mentions_company(final_url: str, html: str, company_name: Optional[str]) -> bool:
+    """
+    Check whether a redirect target belongs to the company.
+
+    Args:
+        final_url: URL the redirect ended on
+        html: HTML of the redirect target
+        company_name: Company name from the input sheet
+
+    Returns:
+        bool: True if a distinctive company name token appears in the target's
+            host or page title
+    """
+    host = normalize_for_matching(get_host(final_url))
+    title = normalize_for_matching(_page_title(html))
+    return any(
+        token in host or token in title for token in company_name_tokens(company_name)
+    )
+
+
+async def resolve_host(host: str, timeout: float = TRIAGE_TIMEOUT) -> bool:
+    """
+    Check whether a host name resolves.
+
+    Args:
+        host: Host name without port
+        timeout: Timeout in seconds
+
+    Returns:
+        bool: True if DNS returned at least one address
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        addresses = await asyncio.wait_for(
+            loop.getaddrinfo(host, None, type=socket.SOCK_STREAM), timeout
+        )
+    except (socket.gaierror, UnicodeError, asyncio.TimeoutError, OSError):
+        return False
+    return bool(addresses)
+
+
+async def probe_url(
+    session: aiohttp.ClientSession, url: str
+) -> Tuple[Optional[int], Optional[str], str]:
+    """
+    Request a URL, following redirects.
+
+    Args:
+        session: Open aiohttp session
+        url: URL to request
+
+    Returns:
+        Tuple[Optional[int], Optional[str], str]: (HTTP status, final URL, body);
+            status and final URL are None if the server could not be reached
+    """
+    try:
+        async with session.get(
+            url, allow_redirects=True, max_redirects=TRIAGE_MAX_REDIRECTS
+        ) as response:
+            body = await response.content.read(TRIAGE_MAX_BODY_BYTES)
+            if "html" not in response.headers.get("Content-Type", "").lower():
+                return response.status, str(response.url), ""
+            # get_encoding() needs the complete body when the header has no charset
+            try:
+                text = body.decode(response.charset or "utf-8", "replace")
+            except LookupError:
+                text = body.decode("utf-8", "replace")
+            return response.status, str(response.url), text
+    except aiohttp.TooManyRedirects:
+        return None, None, ""
+    except (aiohttp.ClientError, asyncio.TimeoutError, LookupError, RuntimeError) as e:
+        logger.debug("Triage probe of %s failed: %s", url, e)
+        return None, None, ""
+
+
+async def triage_url(
+    session: aiohttp.ClientSession,
+    url: str,
+    company_name: Optional[str] = None,
+    timeout: float = TRIAGE_TIMEOUT,
+) -> TriageResult:
+    """
+    Classify one company URL.
+
+    Args:
+        session: Open aiohttp session
+        url: Company URL (as cleaned by clean_url())
+        company_name: Company name, used to judge cross-domain redirects
+        timeout: Timeout in seconds for the DNS lookup
+
+    Returns:
+        TriageResult: Classification of the URL
+    """
+    parsed = urlparse(url)
+    host = parsed.hostname or ""
+    if not host or not await resolve_host(host, timeout):
+        return TriageResult(url, STATUS_DEAD, reason="no DNS record")
+
+    # Try the given scheme first, then the other one
+    candidates = [url]
+    if parsed.scheme in ("http", "https"):
+        other = "http" if parsed.scheme == "https" else "https"
+        candidates.append(parsed._replace(scheme=other).geturl())
+
+    status, final_url, body = None, None, ""
+    for candidate in candidates:
+        status, final_url, body = await probe_url(session, candidate)
+        if status is not None:
+            break
+    if status is None or final_url is None:
+        return TriageResult(url, STATUS_DEAD, reason="unreachable")
+
+    if is_parked_page(final_url, body):
+        return TriageResult(
+            url,
+            STATUS_PARKED,
+            final_url=final_url,
+            http_status=status,
+            reason="parking page",
+        )
+    if status in DEAD_HTTP_STATUSES:
+        return TriageResult(
+            url,
+            STATUS_DEAD,
+            final_url=final_url,
+            http_status=status,
+            reason=f"HTTP {status}",
+        )
+
+    canonical_url = clean_url(final_url) or url
+    if not is_same_site(get_host(final_url), get_host(url)):
+        if not mentions_company(final_url, body, company_name):
+            return TriageResult(
+                url,
+                STATUS_REDIRECTED,
+                canonical_url=canonical_url,
+                final_url=final_url,
+                http_status=status,
+                reason=f"redirects to {get_host(final_url)}",
+            )
+        reason = f"moved to {get_host(final_url)}"
+    elif canonical_url.rstrip("/") != url.rstrip("/"):
+        reason = f"canonical origin {canonical_url}"
+    else:
+        reason = f"HTTP {status}"
+    return TriageResult(
+        url,
+        STATUS_LIVE,
+        canonical_url=canonical_url,
+        final_url=final_url,
+        http_status=status,
+        reason=reason,
+    )
+
+
+async def triage_domains(
+    urls_and_companies: List[Tuple[str, str]],
+    cache: Optional[TriageCache] = None,
+    max_concurrent: int = TRIAGE_MAX_CONCURRENT,
+    timeout: float = TRIAGE_TIMEOUT,
+) -> Dict[str, TriageResult]:
+    """
+    Triage all company URLs concurrently.
+
+    Args:
+        urls_and_companies: (url, company_name) tuples as returned by
+            read_urls_and_companies_by_top1machine()
+        cache: Optional result cache; fresh entries are reused, new results added
+            and the cache file saved
+        max_concurrent: Maximum number of URLs checked at the same time
+        timeout: Timeout in seconds for every DNS lookup and HTTP probe
+
+    Returns:
+        Dict[str, TriageResult]: Result by URL
+    """
+    results: Dict[str, TriageResult] = {}
+    to_check: Dict[str, Optional[str]] = {}
+    for url, company_name in urls_and_companies:
+        if not url or url in results or url in to_check:
+            continue
+        cached = cache.get(url, company_name) if cache is not None else None
+        if cached is not None:
+            results[url] = cached
+        else:
+            to_check[url] = company_name
+
+    if to_check:
+        semaphore = asyncio.Semaphore(max(1, max_concurrent))
+        connector = aiohttp.TCPConnector(limit=max(1, max_concurrent))
+        async with aiohttp.ClientSession(
+            connector=connector,
+            headers=HTTP_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as session:
+
+            async def check(url: str, company_name: Optional[str]) -> TriageResult:
+                async with semaphore:
+                    return await triage_url(session, url, company_name, timeout)
+
+            checked = await asyncio.gather(
+                *(check(url, company) for url, company in to_check.items())
+            )
+        for result in checked:
+            results[result.url] = result
+            if cache is not None:
+                cache.put(result, to_check[result.url])
+        if cache is not None:
+            try:
+                cache.save()
+            except OSError as e:
+                logger.warning("Could not save triage cache %s: %s", cache.path, e)
+
+    logger.info(
+        "Domain triage: %d URLs (%d from cache) - %s",
+        len(results),
+        len(results) - len(to_check),
+        {
+            status: sum(1 for r in results.values() if r.status == status)
+            for status in (STATUS_LIVE, STATUS_DEAD, STATUS_PARKED, STATUS_REDIRECTED)
+        },
+    )
+    return results
+
+
+def moved_input_urls(results: Dict[str, TriageResult]) -> Dict[str, str]:
+    """
+    Get the input URLs of live companies that moved to another domain.
+
+    The company is crawled at its canonical URL on the new domain, but the
+    output file and company URL keep the input URL, which the later stages
+    join with the input sheet.
+
+    Args:
+        results: Triage result by URL, as returned by triage_domains()
+
+    Returns:
+        Dict[str, str]: Input URL by canonical URL
+    """
+    moved: Dict[str, str] = {}
+    for url, result in results.items():
+        if result.status == STATUS_LIVE and not is_same_site(
+            get_host(result.canonical_url), get_host(url)
+        ):
+            moved.setdefault(result.canonical_url, url)
+    return moved
+
+
+def apply_triage(
+    urls_and_companies: List[Tuple[str, str]], results: Dict[str, TriageResult]
+) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str, TriageResult]]]:
+    """
+    Drop companies whose URL is not live and rewrite the others to their canonical URL.
+
+    Args:
+        urls_and_companies: (url, company_name) tuples in input order
+        results: Triage result by URL, as returned by triage_domains()
+
+    Returns:
+        Tuple[List[Tuple[str, str]], List[Tuple[str, str, TriageResult]]]:
+            - (canonical_url, company_name) of the companies to crawl
+            - (url, company_name, result) of the skipped companies
+    """
+    to_crawl: List[Tuple[str, str]] = []
+    skipped: List[Tuple[str, str, TriageResult]] = []
+    for url, company_name in urls_and_companies:
+        result = results.get(url)
+        if result is None:
+            to_crawl.append((url, company_name))
+        elif result.status == STATUS_LIVE:
+            if result.canonical_url != url:
+                logger.info(
+                    "Crawling %s instead of %s (%s)",
+                    result.canonical_url,
+                    url,
+                    result.reason,
+                )
+            to_crawl.append((result.canonical_url, company_name))
+        else:
+            logger.warning(
+                "Skipping %s (%s): %s - %s",
+                url,
+                company_name,
+                result.status,
+                result.reason,
+            )
+            skipped.append((url, company_name, result))
+    return to_crawl, skipped
@@ -6,11 +6,19 @@ import os
 from typing import Any, Dict, List, Optional  # Added Any, Optional
 from urllib.parse import urlparse
 
-from crawl4ai import AsyncWebCrawler, CacheMode, MemoryAdaptiveDispatcher, RateLimiter
-from crawl4ai.async_configs import CrawlerRunConfig, LLMConfig
+from crawl4ai.async_configs import LLMConfig
 from crawl4ai.extraction_strategy import LLMExtractionStrategy
 from pydantic import BaseModel, Field
 
+from webcrawl.change_detection import is_domain_unchanged
+from webcrawl.crawl_store import (
+    find_manifests,
+    get_markdown_name,
+    materialized_markdown,
+)
+from webcrawl.llm_extraction import DirectExtractor
+from webcrawl.structured_data import structured_prefixed_markdown
+
 
 # Define logger at the module level
 logger = logging.getLogger(__name__)
@@ -81,14 +89,8 @@ def ensure_output_directory(directory="llm_extracted_data") -> str:
     return directory
 
 
-dispatcher = MemoryAdaptiveDispatcher(
-    memory_threshold_percent=70.0,
-    check_interval=2.0,
-    max_session_permit=3,
-)
-rate_limiter = RateLimiter(
-    base_delay=(30, 60), max_delay=60, max_retries=3, rate_limit_codes=[429, 503]
-)
+# Maximum number of LLM requests in flight during an extraction run
+MAX_CONCURRENT_REQUESTS = 3
 
 
 def _get_output_filename(file_path: str, output_dir: str) -> str:
@@ -101,9 +103,23 @@ def _get_output_filename(file_path: str, output_dir: str) -> str:
 def _filter_files_to_process(
     file_paths: List[str], output_dir: str, overwrite: bool
 ) -> List[str]:
-    """Filters the list of file paths based on existing output files and overwrite flag."""
+    """Filters the list of file paths based on existing output files and overwrite flag.
+
+    Even with overwrite, domains marked unchanged by a refresh crawl keep their
+    existing output (see webcrawl.change_detection).
+    """
     if overwrite:
-        return file_paths
+        unchanged = [
+            path
+            for path in file_paths
+            if is_domain_unchanged(path)
+            and os.path.exists(_get_output_filename(path, output_dir))
+        ]
+        if unchanged:
+            logger.info(
+                f"Skipped {len(unchanged)} files of unchanged domains, keeping their output."
+            )
+        return [path for path in file_paths if path not in unchanged]
 
     filtered_file_paths = []
     for path in file_paths:
@@ -129,6 +145,16 @@ def _filter_files_to_process(
     return filtered_file_paths
 
 
+def _is_unchanged_manifest(manifest_path: str, output_dir: str) -> bool:
+    """Checks whether a stored domain is unchanged and already has its output."""
+    markdown_file = os.path.join(
+        os.path.dirname(manifest_path), get_markdown_name(manifest_path)
+    )
+    return is_domain_unchanged(markdown_file) and os.path.exists(
+        _get_output_filename(markdown_file, output_dir)
+    )
+
+
 def _save_result(result_content: Any, output_dir: str, source_url: str):
     """Saves the extracted content to a JSON file."""
     parsed_url = urlparse(source_url)
@@ -195,15 +221,21 @@ async def process_files(
     llm_strategy: LLMExtractionStrategy,
     output_dir: str,
     overwrite: bool = False,
+    structured_dir: Optional[str] = None,
 ) -> List[Dict]:
     """
     Process one or more files using a specified LLM extraction strategy and save the results.
 
+    Markdown files of domains with harvested structured data (JSON-LD, meta tags)
+    are read with a compact summary of that data in front of them.
+
     Args:
         file_paths (list of str): List of file paths to be processed.
         llm_strategy (LLMExtractionStrategy): The language model strategy to use for extraction.
         output_dir (str): Directory where the extracted data and combined results will be saved.
         overwrite (bool, optional): Whether to overwrite existing output files. Defaults to False.
+        structured_dir (Optional[str]): Directory searched for structured data files
+            not found next to the input files (e.g. files materialized from the crawl store).
 
     Returns:
         List[Dict]: A list of extracted content (as dictionaries) from each file.
@@ -217,28 +249,17 @@ async def process_files(
     if not actual_files_to_process:
         return []  # Return early if no files need processing
 
-    # Convert file paths to URLs with file:// protocol
-    file_urls = [f"file://{os.path.abspath(path)}" for path in actual_files_to_process]
-
     logger.info(f"Processing {len(actual_files_to_process)} files...")
 
-    config = CrawlerRunConfig(
-        cache_mode=CacheMode.ENABLED,
-        extraction_strategy=llm_strategy,
-    )
-
-    async with AsyncWebCrawler() as crawler:
-        results = await crawler.arun_many(
-            urls=file_urls,
-            config=config,
-            dispatcher=dispatcher,
-            rate_limiter=rate_limiter,
-        )
-
-        extracted_data = []
-        total_files = len(actual_files_to_process)
-        for idx, result in enumerate(results):
-            current_file_num = idx + 1
+    extractor = DirectExtractor(llm_strategy, max_concurrent=MAX_CONCURRENT_REQUESTS)
+    extracted_data = []
+    total_files = len(actual_files_to_process)
+    with structured_prefixed_markdown(
+        actual_files_to_process, structured_dir
+    ) as prefixed_files:
+        current_file_num = 0
+        async for result in extractor.extract_many(prefixed_files):
+            current_file_num += 1
             source_url = result.url
             # Extract original filename for logging
             original_filename = os.path.basename(urlparse(source_url).path)
@@ -259,11 +280,13 @@ async def process_files(
                     )
 
             else:
-                logger.warning(f"No content extracted from {source_url}")
+                logger.warning(
+                    f"No content extracted from {source_url}: {result.error_message}"
+                )
 
-        # Show usage stats
-        llm_strategy.show_usage()
-        return extracted_data
+    # Show usage stats
+    llm_strategy.show_usage()
+    return extracted_data
 
 
 def _find_original_file(
@@ -338,7 +361,11 @@ def _find_error_files(output_dir: str) -> List[str]:
 
 
 async def check_and_reprocess_error_files(
-    output_dir: str, input_dir: str, ext: str, llm_strategy: LLMExtractionStrategy
+    output_dir: str,
+    input_dir: str,
+    ext: str,
+    llm_strategy: LLMExtractionStrategy,
+    stored_files: Optional[List[str]] = None,
 ) -> int:
     """
     Check for files with errors in the output directory and reprocess them.
@@ -348,6 +375,8 @@ async def check_and_reprocess_error_files(
         input_dir (str): Directory containing the original source files
         ext (str): File extension of the original files (e.g., ".md")
         llm_strategy (LLMExtractionStrategy): The language model strategy to use for extraction
+        stored_files (Optional[List[str]]): Source files materialized from the crawl
+            store, looked up by name before searching input_dir
 
     Returns:
         int: Number of files reprocessed
@@ -357,9 +386,13 @@ async def check_and_reprocess_error_files(
 
     error_json_files = _find_error_files(output_dir)
 
+    stored_by_name = {os.path.basename(path): path for path in stored_files or []}
     files_to_reprocess = []
     for error_file_path in error_json_files:
-        original_file = _find_original_file(error_file_path, input_dir, ext)
+        original_name = os.path.basename(error_file_path).replace("_extracted.json", ext)
+        original_file = stored_by_name.get(original_name) or _find_original_file(
+            error_file_path, input_dir, ext
+        )
         if original_file:
             files_to_reprocess.append(original_file)
             logger.info(
@@ -372,7 +405,11 @@ async def check_and_reprocess_error_files(
         logger.info(f"Reprocessing {len(files_to_reprocess)} files with errors...")
         # Always overwrite error files
         await process_files(
-            files_to_reprocess, llm_strategy, output_dir, overwrite=True
+            files_to_reprocess,
+            llm_strategy,
+            output_dir,
+            overwrite=True,
+            structured_dir=input_dir,
         )
         return len(files_to_reprocess)
     else:
@@ -433,6 +470,8 @@ def run_extract_llm(
         )
 
     files_to_process = []
+    # Domains moved into the crawl store only have a manifest next to them
+    manifests = []
     if os.path.isfile(input_path):
         files_to_process = [input_path]
     elif os.path.isdir(input_path):
@@ -440,20 +479,29 @@ def run_extract_llm(
             for file in files:
                 if file.endswith(ext):
                     files_to_process.append(os.path.join(root, file))
+        if ext == ".md":
+            manifests = [
+                path
+                for path in find_manifests(input_path)
+                if not _is_unchanged_manifest(path, output_dir)
+            ]
     else:
         logger.error(f"Error: {input_path} is not a valid file or directory")
         raise FileNotFoundError(
             f"Input path '{input_path}' does not exist or is not a valid file/directory."
         )
 
-    if not files_to_process:
+    if not files_to_process and not manifests:
         logger.warning(f"No {ext} files found in {input_path}")
         return output_dir
 
     if limit is not None and limit > 0:
         files_to_process = files_to_process[:limit]
+        manifests = manifests[: max(0, limit - len(files_to_process))]
 
-    logger.info(f"Found {len(files_to_process)} files to potentially process...")
+    logger.info(
+        f"Found {len(files_to_process) + len(manifests)} files to potentially process..."
+    )
 
     if os.path.isdir(input_path):
         input_dir = input_path
@@ -461,17 +509,22 @@ def run_extract_llm(
         input_dir = os.path.dirname(input_path)
 
     async def _run():
-        if only_recheck:
-            logger.info(
-                "Only rechecking files with errors, skipping initial processing."
-            )
-            await check_and_reprocess_error_files(
-                output_dir, input_dir, ext, llm_strategy
-            )
-        else:
-            await process_files(files_to_process, llm_strategy, output_dir, overwrite)
+        # Stored domains are written out as markdown only for the extraction
+        with materialized_markdown(manifests) as stored_files:
+            if only_recheck:
+                logger.info(
+                    "Only rechecking files with errors, skipping initial processing."
+                )
+            else:
+                await process_files(
+                    files_to_process + stored_files,
+                    llm_strategy,
+                    output_dir,
+                    overwrite,
+                    structured_dir=input_dir,
+                )
             await check_and_reprocess_error_files(
-                output_dir, input_dir, ext, llm_strategy
+                output_dir, input_dir, ext, llm_strategy, stored_files
             )
 
     asyncio.run(_run())
@@ -5,14 +5,22 @@ import logging
 import os
 import random
 import re
+import threading
 import time
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
 import litellm
 from litellm import completion
 from litellm.exceptions import JSONSchemaValidationError
 from pydantic import BaseModel, Field
 
+from webcrawl.llm_cache import get_llm_cache, llm_cache_key
+from webcrawl.llm_executor import (
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    configure_llm_executor,
+    get_llm_executor,
+)
+
 # Module-specific logger
 logger = logging.getLogger("webcrawl.fill_process_type")
 
@@ -54,6 +62,11 @@ processed_companies = 0
 empty_process_types_filled = 0
 conjugation_issues_fixed = 0
 conjugation_issues_fixed_companies = []
+# Guards the counters above, which LLM worker threads may update
+_stats_lock = threading.Lock()
+
+# Version of the process type prompt, part of the LLM cache key
+PROCESS_TYPE_PROMPT_VERSION = "1"
 
 # Folder patterns for category extraction
 FOLDER_PATTERNS = [r"llm_extracted_([^/\\]+)", r"pluralized_([^/\\]+)"]
@@ -149,22 +162,31 @@ def generate_process_types(
     Deine Antwort (nur JSON!):
     """
     litellm.enable_json_schema_validation = True
+    model = "bedrock/amazon.nova-pro-v1:0"
+    request = {
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": 0.3,
+        "max_tokens": 800,
+        "response_format": ProcessTypes,  # Use Pydantic model for schema
+    }
+    cache = get_llm_cache()
+    cache_key = llm_cache_key(PROCESS_TYPE_PROMPT_VERSION, model, **request)
     retries = 0
     while retries <= max_retries:
         try:
-            response = completion(
-                model="bedrock/amazon.nova-pro-v1:0",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.3,
-                max_tokens=800,
-                response_format=ProcessTypes,  # Use Pydantic model for schema
-            )
-            # Extract JSON string from response and parse it
-            content = response.choices[0].message.content  # type: ignore
-            if content is None:
-                logger.error("LLM response content is None")
-                return []
+            content = cache.get(cache_key) if cache else None
+            from_cache = content is not None
+            if not from_cache:
+                get_llm_executor().throttle()
+                response = completion(model=model, **request)
+                # Extract JSON string from response and parse it
+                content = response.choices[0].message.content  # type: ignore
+                if content is None:
+                    logger.error("LLM response content is None")
+                    return []
             data = json.loads(content)
+            if cache and not from_cache:
+                cache.put(cache_key, model, content)
             process_types = data.get("process_types", [])
             logger.debug(f"LLM returned process_types: {process_types}")
             return [p.strip() for p in process_types if p.strip()]
@@ -218,9 +240,10 @@ def check_for_conjugations(process_types: List[str], company_name: str) -> List[
         for conj in conjugation_words:
             if conj in process.lower():
                 has_conjugation = True
-                conjugation_issues_fixed += 1
-                if company_name not in conjugation_issues_fixed_companies:
-                    conjugation_issues_fixed_companies.append(company_name)
+                with _stats_lock:
+                    conjugation_issues_fixed += 1
+                    if company_name not in conjugation_issues_fixed_companies:
+                        conjugation_issues_fixed_companies.append(company_name)
                 break
 
         # Only add processes without conjugations
@@ -246,22 +269,16 @@ def remove_na_words(process_types: List[str]) -> List[str]:
     return [p for p in process_types if p.strip().lower() not in NA_WORDS]
 
 
-def process_json_file(
-    input_file: str, output_file: str, category: Optional[str] = None
-) -> None:
+def resolve_category(input_file: str, category: Optional[str] = None) -> str:
     """
-    Process a single JSON file to fill empty process_type fields.
+    Get the category used in the LLM prompt for the companies of a file.
+
     Args:
         input_file (str): Path to the input JSON file
-        output_file (str): Path to save the processed JSON file
-        category (Optional[str]): Category to use for LLM prompt. If None, extract from filename.
-    Raises:
-        ValueError: If the input JSON is not a list of companies.
-        json.JSONDecodeError: If the input file is not valid JSON.
+        category (Optional[str]): Category to use. If None, extract from filename.
+    Returns:
+        str: The category, 'manufacturing' if none could be extracted
     """
-    global processed_companies, empty_process_types_filled
-
-    # Get category from argument or filename
     if not category:
         category = extract_category_from_filename(os.path.basename(input_file))
     if not category:
@@ -269,10 +286,20 @@ def process_json_file(
             f"Could not extract category from filename: {input_file}, using default category 'manufacturing'"
         )
         category = "manufacturing"
+    return category
 
-    logger.info(f"Processing file: {input_file} (Category: {category})")
 
-    # Load the JSON file
+def load_companies(input_file: str) -> List[dict]:
+    """
+    Load the companies of a JSON file.
+    Args:
+        input_file (str): Path to the input JSON file
+    Returns:
+        List[dict]: The companies of the file
+    Raises:
+        ValueError: If the input JSON is not a list of companies.
+        json.JSONDecodeError: If the input file is not valid JSON.
+    """
     try:
         with open(input_file, "r", encoding="utf-8") as f:
             data = json.load(f)
@@ -284,11 +311,34 @@ def process_json_file(
         raise ValueError(
             f"Input JSON must be a list of companies, got {type(data).__name__}"
         )
+    return data
+
+
+def needs_process_types(company: dict) -> bool:
+    """Check whether the process types of a company are generated by the LLM."""
+    return not company.get("process_type") and bool(company.get("products"))
+
+
+def fill_companies(
+    data: List[dict], generated: Iterator[List[str]], input_file: str
+) -> None:
+    """
+    Fill and clean the process_type fields of the companies of one file.
+
+    Runs in the calling thread, so the PROGRESS lines of the companies come out
+    in order while the LLM requests run concurrently.
+    Args:
+        data (List[dict]): Companies of the file, updated in place
+        generated (Iterator[List[str]]): Generated process types, one item for
+            every company for which needs_process_types() is True, in order
+        input_file (str): Path of the file, for logging
+    """
+    global processed_companies, empty_process_types_filled
 
     total_companies = len(data)
-    # Process each company in the data
     for index, company in enumerate(data):
-        processed_companies += 1
+        with _stats_lock:
+            processed_companies += 1
         company_name = company.get("company_name", "Unknown")
         current_company_num = index + 1
         # Log progress for each company
@@ -301,15 +351,16 @@ def process_json_file(
             products = company.get("products", [])
             machines = company.get("machines", [])
             if products:
-                # Generate process types using LLM
-                process_types = generate_process_types(products, machines, category)
+                # Process types generated by the LLM
+                process_types = next(generated)
                 # Remove 'na' words before further processing
                 process_types = remove_na_words(process_types)
                 # Check for and fix conjugations
                 process_types = check_for_conjugations(process_types, company_name)
                 # Update the company data
                 company["process_type"] = process_types
-                empty_process_types_filled += 1
+                with _stats_lock:
+                    empty_process_types_filled += 1
                 logger.info(
                     f"  Updated process_type for company: {company.get('company_name', 'Unknown')}"
                 )
@@ -332,7 +383,10 @@ def process_json_file(
                 logger.info(f"  Original: {original_process_type}")
                 logger.info(f"  Fixed: {cleaned_process_type}")
 
-    # Save the updated data
+
+
+def save_companies(data: List[dict], output_file: str) -> None:
+    """Write the processed companies of a file."""
     os.makedirs(os.path.dirname(output_file), exist_ok=True)
     with open(output_file, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
@@ -340,6 +394,46 @@ def process_json_file(
     logger.info(f"Saved processed data to: {output_file}")
 
 
+def generate_all(jobs: List[tuple]) -> Iterator[List[str]]:
+    """
+    Generate process types concurrently, yielding them in the order of the jobs.
+
+    Args:
+        jobs (List[tuple]): (company, category) of every company needing process types
+    Returns:
+        Iterator[List[str]]: Process types of every job
+    """
+    return get_llm_executor().imap(
+        lambda job: generate_process_types(
+            job[0].get("products", []), job[0].get("machines", []), job[1]
+        ),
+        jobs,
+    )
+
+
+def process_json_file(
+    input_file: str, output_file: str, category: Optional[str] = None
+) -> None:
+    """
+    Process a single JSON file to fill empty process_type fields.
+    Args:
+        input_file (str): Path to the input JSON file
+        output_file (str): Path to save the processed JSON file
+        category (Optional[str]): Category to use for LLM prompt. If None, extract from filename.
+    Raises:
+        ValueError: If the input JSON is not a list of companies.
+        json.JSONDecodeError: If the input file is not valid JSON.
+    """
+    category = resolve_category(input_file, category)
+    logger.info(f"Processing file: {input_file} (Category: {category})")
+
+    data = load_companies(input_file)
+    # Generate the missing process types concurrently, in company order
+    generated = generate_all([(c, category) for c in data if needs_process_types(c)])
+    fill_companies(data, generated, input_file)
+    save_companies(data, output_file)
+
+
 def find_pluralized_files(folder_path: str) -> List[str]:
     """
     Find all JSON files in the given folder.
@@ -450,30 +544,48 @@ def run_fill_process_type(
 
     output_paths: List[str] = []
     total_files = len(files_to_process)
-    for index, input_path in enumerate(files_to_process):
-        filename = os.path.basename(input_path)
-        output_filename = filename
-        if output_dir:
-            out_dir = output_dir
-        else:
-            out_dir = os.path.dirname(input_path)
-        output_file = os.path.join(out_dir, output_filename)
-
+    output_files = [
+        os.path.join(output_dir or os.path.dirname(input_path), os.path.basename(input_path))
+        for input_path in files_to_process
+    ]
+    # The companies of all files are loaded first, so that their process types
+    # are generated concurrently across files (extract_llm writes one file per
+    # domain); the files are then filled and saved in order, so the file and
+    # company PROGRESS lines stay in order
+    loaded = []
+    for input_path in files_to_process:
+        try:
+            loaded.append(
+                (load_companies(input_path), resolve_category(input_path, category))
+            )
+        except json.JSONDecodeError:
+            logger.error(f"Malformed JSON in file: {input_path}")
+            raise
+        except ValueError:
+            logger.error(f"Empty input file: {input_path}")
+            raise
+    generated = generate_all(
+        [
+            (company, file_category)
+            for data, file_category in loaded
+            for company in data
+            if needs_process_types(company)
+        ]
+    )
+    for index, (input_path, output_file, (data, file_category)) in enumerate(
+        zip(files_to_process, output_files, loaded)
+    ):
         current_file_num = index + 1
         # Log progress for each file
         logger.info(
             f"PROGRESS:webcrawl:fill_process_type:{current_file_num}/{total_files}:Processing file {input_path}"
         )
+        logger.info(f"Processing file: {input_path} (Category: {file_category})")
 
         try:
-            process_json_file(input_path, output_file, category=category)
+            fill_companies(data, generated, input_path)
+            save_companies(data, output_file)
             output_paths.append(output_file)
-        except json.JSONDecodeError:
-            logger.error(f"Malformed JSON in file: {input_path}")
-            raise
-        except ValueError:
-            logger.error(f"Empty input file: {input_path}")
-            raise
         except Exception as e:
             logger.error(f"Error processing file {input_path}: {e}")
             raise
@@ -518,15 +630,24 @@ def main() -> Optional[List[str]]:
         default="INFO",
         help="Set the logging level",
     )
-    args = parser.parse_args()
-
-    output_paths = run_fill_process_type(
-        input_file=args.input_file,
-        folder=args.folder,
-        output_dir=args.output_dir,
-        category=args.category,
-        log_level=args.log_level,
+    parser.add_argument(
+        "--max-concurrent",
+        type=int,
+        default=DEFAULT_MAX_CONCURRENT_REQUESTS,
+        help="Maximum number of LLM requests in flight",
     )
+    args = parser.parse_args()
+    configure_llm_executor({"max_concurrent_requests": args.max_concurrent})
+    try:
+        output_paths = run_fill_process_type(
+            input_file=args.input_file,
+            folder=args.folder,
+            output_dir=args.output_dir,
+            category=args.category,
+            log_level=args.log_level,
+        )
+    finally:
+        configure_llm_executor(None)
     if output_paths:
         logger.info(f"output_paths: {output_paths}")
     else:
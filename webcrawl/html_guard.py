@@ -0,0 +1,351 @@
+"""
+Size and depth guard for the HTML of crawled pages.
+
+crawl4ai's scraping strategy walks the DOM recursively and processes the whole
+document at once, so a single enormous or pathologically nested page can stall a
+worker, run out of memory or fail with RecursionError (at roughly 900 levels of
+nesting with Python's default recursion limit). Instead of raising the
+interpreter's recursion limit, HtmlGuard rewrites such pages before they reach
+the crawler's HTML processing:
+
+- elements nested deeper than max_dom_depth are unwrapped; their text is kept,
+  their tags are dropped
+- pages larger than max_html_size are truncated at an element boundary; script
+  and style contents (except JSON-LD) are dropped first so inline code does not
+  use up the budget
+
+The rewrite is a single streaming pass over the tokens of the page
+(html.parser), so it does not recurse and never holds more than the truncated
+output. Pages below both limits are passed through untouched after a cheap
+regex scan of their tag nesting. HtmlGuard.install() puts the guard in front of
+AsyncWebCrawler.aprocess_html, which serves both browser-rendered pages and
+pages fetched over plain HTTP (see webcrawl.http_fetcher).
+"""
+
+import logging
+import re
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_HTML_MB = 2.0
+DEFAULT_MAX_DOM_DEPTH = 200
+# Size of the chunks fed to the parser; parsing stops once the budget is used up
+PARSE_CHUNK_CHARS = 64 * 1024
+
+# Elements without content
+VOID_ELEMENTS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+    "param", "source", "track", "wbr",
+}
+# Elements whose end tag may be omitted; they do not count towards the nesting
+# depth so sloppy markup with unclosed paragraphs is not mistaken for a deep DOM
+OPTIONAL_END_ELEMENTS = {
+    "p", "li", "dt", "dd", "tr", "td", "th", "thead", "tbody", "tfoot",
+    "option", "optgroup", "colgroup", "caption", "rt", "rp",
+}
+# Elements whose content is dropped from oversized pages
+HEAVY_ELEMENTS = {"script", "style", "svg", "noscript", "template"}
+
+TAG_PATTERN = re.compile(r"<(/?)([a-zA-Z][a-zA-Z0-9-]*)[^>]*?(/?)>")
+
+REASON_DEEP = "deep DOM"
+REASON_LARGE = "oversized"
+
+
+def _counts_for_depth(tag: str) -> bool:
+    return tag not in VOID_ELEMENTS and tag not in OPTIONAL_END_ELEMENTS
+
+
+def estimate_max_depth(html: str, limit: int) -> int:
+    """
+    Estimate the nesting depth of a page from its tags.
+
+    The estimate may be too high (e.g. tags inside scripts), never too low for
+    well-formed markup; it is only used to decide whether a page needs the
+    rewrite.
+
+    Args:
+        html: Raw HTML
+        limit: Depth at which the scan stops
+
+    Returns:
+        int: Estimated maximum nesting depth, at most limit + 1
+    """
+    depth = max_depth = 0
+    for match in TAG_PATTERN.finditer(html):
+        closing, tag, self_closing = match.groups()
+        tag = tag.lower()
+        if self_closing or not _counts_for_depth(tag):
+            continue
+        if closing:
+            depth = max(0, depth - 1)
+            continue
+        depth += 1
+        if depth > max_depth:
+            max_depth = depth
+            if max_depth > limit:
+                break
+    return max_depth
+
+
+class _GuardParser(HTMLParser):
+    """Streaming rewrite of a page within a depth and size budget."""
+
+    def __init__(self, max_depth: int, max_size: Optional[int]):
+        super().__init__(convert_charrefs=False)
+        self.max_depth = max_depth
+        self.max_size = max_size
+        self.parts: List[str] = []
+        self.size = 0
+        # Open elements as (tag, written)
+        self.stack: List[Tuple[str, bool]] = []
+        self.depth = 0
+        self.unwrapped = 0
+        self.truncated = False
+        # Name of the heavy element whose content is being dropped
+        self.skipping: Optional[str] = None
+
+    def _write(self, text: str, divisible: bool = False) -> None:
+        if self.truncated:
+            return
+        if self.max_size is not None and self.size + len(text) > self.max_size:
+            self.truncated = True
+            if not divisible:
+                return
+            # Keep the start of a long text, cut at a word boundary
+            text = text[: self.max_size - self.size].rsplit(" ", 1)[0]
+        self.parts.append(text)
+        self.size += len(text)
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Any]]) -> None:
+        text = self.get_starttag_text() or f"<{tag}>"
+        if not _counts_for_depth(tag):
+            if self.skipping is None:
+                self._write(text)
+            return
+        self.depth += 1
+        written = False
+        if self.depth > self.max_depth:
+            self.unwrapped += 1
+        elif self.skipping is None:
+            self._write(text)
+            written = not self.truncated
+        self.stack.append((tag, written))
+        if (
+            self.max_size is not None
+            and self.skipping is None
+            and tag in HEAVY_ELEMENTS
+            and (dict(attrs).get("type") or "").lower() != "application/ld+json"
+        ):
+            self.skipping = tag
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Any]]) -> None:
+        if self.skipping is None:
+            self._write(self.get_starttag_text() or f"<{tag}/>")
+
+    def handle_endtag(self, tag: str) -> None:
+        if not _counts_for_depth(tag):
+            if self.skipping is None:
+                self._write(f"</{tag}>")
+            return
+        # Close the innermost open element of that name (and everything left
+        # open inside it); stray end tags are dropped
+        for index in range(len(self.stack) - 1, -1, -1):
+            if self.stack[index][0] == tag:
+                break
+        else:
+            return
+        while len(self.stack) > index:
+            open_tag, written = self.stack.pop()
+            self.depth -= 1
+            if self.skipping == open_tag:
+                self.skipping = None
+            if written and self.skipping is None:
+                # Always written, so every element written is closed again
+                self.parts.append(f"</{open_tag}>")
+                self.size += len(open_tag) + 3
+
+    def handle_data(self, data: str) -> None:
+        if self.skipping is None:
+            self._write(data, divisible=True)
+
+    def handle_entityref(self, name: str) -> None:
+        self.handle_data(f"&{name};")
+
+    def handle_charref(self, name: str) -> None:
+        self.handle_data(f"&#{name};")
+
+    def handle_comment(self, data: str) -> None:
+        if self.skipping is None and self.max_size is None:
+            self._write(f"<!--{data}-->")
+
+    def handle_decl(self, decl: str) -> None:
+        self._write(f"<!{decl}>")
+
+    def result(self) -> str:
+        """Get the rewritten page with all elements left open closed."""
+        closing = [f"</{tag}>" for tag, written in reversed(self.stack) if written]
+        return "".join(self.parts + closing)
+
+
+class HtmlGuard:
+    """
+    Bound the size and nesting depth of pages before crawl4ai processes them.
+
+    Usage:
+        guard = HtmlGuard.from_config(config.get("html_guard"))
+        guard.install(crawler)  # every processed page passes through apply()
+        guard.log_summary()
+    """
+
+    def __init__(
+        self,
+        max_html_mb: float = DEFAULT_MAX_HTML_MB,
+        max_dom_depth: int = DEFAULT_MAX_DOM_DEPTH,
+    ):
+        """
+        Args:
+            max_html_mb: Maximum size of a page's HTML in megabytes (counted in
+                characters); larger pages are truncated (0 disables)
+            max_dom_depth: Maximum nesting depth; deeper elements are unwrapped
+        """
+        self.max_size = int(max_html_mb * 1024 * 1024) or None
+        self.max_depth = max(1, max_dom_depth)
+        self.pages_truncated = 0
+        self.pages_flattened = 0
+        self.bytes_dropped = 0
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> "HtmlGuard":
+        """
+        Create the guard from the html_guard section of the webcrawl config.
+
+        Args:
+            config: Dict with the optional keys max_html_mb and max_dom_depth
+
+        Returns:
+            HtmlGuard: The configured guard
+        """
+        config = config or {}
+        return cls(
+            max_html_mb=config.get("max_html_mb", DEFAULT_MAX_HTML_MB),
+            max_dom_depth=config.get("max_dom_depth", DEFAULT_MAX_DOM_DEPTH),
+        )
+
+    def check(self, html: str) -> List[str]:
+        """
+        Check whether a page exceeds the limits.
+
+        Args:
+            html: Raw HTML of the page
+
+        Returns:
+            List[str]: REASON_LARGE and/or REASON_DEEP; empty for pages that are
+                passed through untouched
+        """
+        reasons = []
+        if self.max_size is not None and len(html) > self.max_size:
+            reasons.append(REASON_LARGE)
+        if html.count("<") > self.max_depth and (
+            estimate_max_depth(html, self.max_depth) > self.max_depth
+        ):
+            reasons.append(REASON_DEEP)
+        return reasons
+
+    def apply(self, url: str, html: str, max_depth: Optional[int] = None) -> str:
+        """
+        Rewrite a page that exceeds the limits.
+
+        Args:
+            url: URL of the page (for logging)
+            html: Raw HTML of the page
+            max_depth: Depth limit overriding the configured one
+
+        Returns:
+            str: The page itself if it is within the limits, else the rewritten
+                page
+        """
+        if not isinstance(html, str) or not html:
+            return html
+        depth_limit = max_depth or self.max_depth
+        if max_depth is None:
+            reasons = self.check(html)
+            if not reasons:
+                return html
+        else:
+            reasons = [REASON_DEEP]
+        oversized = REASON_LARGE in reasons
+
+        parser = _GuardParser(depth_limit, self.max_size if oversized else None)
+        for start in range(0, len(html), PARSE_CHUNK_CHARS):
+            parser.feed(html[start : start + PARSE_CHUNK_CHARS])
+            if parser.truncated:
+                break
+        else:
+            parser.close()
+        guarded = parser.result()
+
+        if parser.unwrapped:
+            self.pages_flattened += 1
+        if parser.truncated:
+            self.pages_truncated += 1
+        self.bytes_dropped += max(0, len(html) - len(guarded))
+        logger.info(
+            "Guarded %s page %s: %d -> %d characters, %d deep elements unwrapped%s",
+            " and ".join(reasons),
+            url,
+            len(html),
+            len(guarded),
+            parser.unwrapped,
+            ", truncated" if parser.truncated else "",
+        )
+        return guarded
+
+    def install(self, crawler: Any) -> None:
+        """
+        Guard every page processed by a crawler.
+
+        Wraps the crawler's aprocess_html, which processes browser-rendered
+        pages (from arun/arun_many) as well as HTML fetched over plain HTTP. A
+        page that still overflows the recursion limit is processed once more
+        with a quarter of the depth limit.
+
+        Args:
+            crawler: AsyncWebCrawler instance
+        """
+        process_html = crawler.aprocess_html
+
+        async def guarded_process_html(url: str, html: str, **kwargs: Any) -> Any:
+            try:
+                return await process_html(
+                    url=url, html=self.apply(url, html), **kwargs
+                )
+            except (RecursionError, ValueError) as e:
+                # crawl4ai reports errors of its scraping step as ValueError
+                if not isinstance(e, RecursionError) and not isinstance(
+                    e.__context__, RecursionError
+                ):
+                    raise
+                logger.warning(
+                    "Recursion limit hit while processing %s, retrying flatter", url
+                )
+                return await process_html(
+                    url=url,
+                    html=self.apply(url, html, max_depth=max(1, self.max_depth // 4)),
+                    **kwargs,
+                )
+
+        crawler.aprocess_html = guarded_process_html
+
+    def log_summary(self) -> None:
+        """Log how many pages had to be truncated or flattened."""
+        if not self.pages_truncated and not self.pages_flattened:
+            return
+        logger.info(
+            "HTML guard: %d pages truncated, %d pages flattened, %.1f MB dropped",
+            self.pages_truncated,
+            self.pages_flattened,
+            self.bytes_dropped / (1024 * 1024),
+        )
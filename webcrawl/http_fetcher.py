@@ -0,0 +1,351 @@
+"""
+HTTP-first page fetcher with headless-browser fallback.
+
+Most manufacturer websites are rendered on the server, so their pages can be
+fetched with a plain HTTP client and converted to markdown without starting a
+browser page. HybridFetcher fetches every URL with one pooled aiohttp session
+(keep-alive, compressed transfer) and runs the HTML through the crawler's own
+processing pipeline (AsyncWebCrawler.aprocess_html) with the same run config,
+so scraping strategy, excluded tags and PruningContentFilter settings stay
+identical to the browser path.
+
+A page is escalated to the browser when it does not look server-rendered:
+- the HTTP request fails or does not return HTML with status 200
+- the visible body text is tiny
+- an empty single-page-app root element (e.g. <div id="root"></div>) is present
+- a <noscript> block asks for JavaScript and the page has little text
+
+429/503 responses are throttling, not a reason to render the page: the request is
+retried after the Retry-After delay (or an exponential back-off) and only escalated
+once the retries are used up. When the browser dispatcher follows a
+ConcurrencyController (see webcrawl.adaptive_concurrency), every HTTP response is
+reported to it and the number of HTTP requests in flight is capped by its current
+session limit, so a throttling site slows down both phases.
+"""
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import aiohttp
+from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CrawlResult
+from lxml import etree
+from lxml import html as lxml_html
+
+from webcrawl.adaptive_concurrency import THROTTLE_STATUS_CODES
+
+logger = logging.getLogger(__name__)
+
+# HTTP client settings
+HTTP_FETCH_TIMEOUT = 15.0  # seconds per request
+HTTP_MAX_CONCURRENT_REQUESTS = 8  # per domain crawl
+HTTP_THROTTLE_MAX_ATTEMPTS = 3  # requests per URL while the site answers 429/503
+HTTP_THROTTLE_BASE_DELAY = 2.0  # seconds, doubled on every retry
+HTTP_THROTTLE_MAX_DELAY = 30.0  # upper bound of a Retry-After delay
+HTTP_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "de-DE,de;q=0.9",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+# JS-rendering heuristic thresholds
+MIN_BODY_TEXT_CHARS = 200  # less visible text than this -> render in browser
+NOSCRIPT_TEXT_CHARS = 1500  # noscript JS hints only count below this much text
+SPA_ROOT_IDS = {"root", "app", "__next", "__nuxt", "q-app"}
+SPA_ROOT_TAGS = {"app-root"}
+NOSCRIPT_JS_HINTS = ["javascript", "js aktivieren", "enable js"]
+
+# Escalation reasons
+REASON_HTTP_ERROR = "http error"
+REASON_THROTTLED = "throttled"
+REASON_NOT_HTML = "not html"
+REASON_TINY_BODY = "tiny body"
+REASON_SPA_ROOT = "spa root"
+REASON_NOSCRIPT = "noscript hint"
+
+
+def _normalize_text(text: str) -> str:
+    return " ".join(text.split())
+
+
+def detect_js_rendering(html: str) -> Optional[str]:
+    """
+    Decide whether a page fetched over HTTP needs a browser to render its content.
+
+    Args:
+        html: Raw HTML returned by the server
+
+    Returns:
+        Optional[str]: Reason for escalating to the browser, or None if the HTML
+            can be used as is
+    """
+    try:
+        document = lxml_html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return REASON_TINY_BODY
+
+    # An empty mount point of a single-page app means the content comes from JS
+    for element in document.iter():
+        if not isinstance(element.tag, str):
+            continue
+        if element.get("id") in SPA_ROOT_IDS or element.tag in SPA_ROOT_TAGS:
+            if len(element) == 0 and not (element.text or "").strip():
+                return REASON_SPA_ROOT
+
+    noscript_text = " ".join(
+        _normalize_text(element.text_content()).lower()
+        for element in document.iter("noscript")
+    )
+    etree.strip_elements(
+        document, "script", "style", "noscript", "template", with_tail=False
+    )
+    body = document.find("body")
+    text_length = len(
+        _normalize_text((body if body is not None else document).text_content())
+    )
+
+    if text_length < MIN_BODY_TEXT_CHARS:
+        return REASON_TINY_BODY
+    if text_length < NOSCRIPT_TEXT_CHARS and any(
+        hint in noscript_text for hint in NOSCRIPT_JS_HINTS
+    ):
+        return REASON_NOSCRIPT
+    return None
+
+
+class HybridFetcher:
+    """
+    Fetch pages over HTTP and fall back to the browser for JS-rendered pages.
+
+    Usage:
+        fetcher = HybridFetcher(crawler, body_only_config, dispatcher)
+        async for result in fetcher.fetch_many(urls):
+            ...
+        fetcher.browser_pages  # pages that needed the browser
+    """
+
+    def __init__(
+        self,
+        crawler: AsyncWebCrawler,
+        config: CrawlerRunConfig,
+        dispatcher=None,
+        timeout: float = HTTP_FETCH_TIMEOUT,
+        max_concurrent_requests: int = HTTP_MAX_CONCURRENT_REQUESTS,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Args:
+            crawler: Running crawler used for HTML processing and browser fallback
+            config: Run config applied to both HTTP-fetched and browser-rendered pages
+            dispatcher: Dispatcher for the browser fallback (optional); if it has
+                a ConcurrencyController, the HTTP requests follow its limit too
+            timeout: Timeout in seconds for every HTTP request
+            max_concurrent_requests: Upper bound of the HTTP requests in flight
+            headers: Request headers (default: HTTP_HEADERS)
+        """
+        self.crawler = crawler
+        self.config = config
+        self.dispatcher = dispatcher
+        self.controller = getattr(dispatcher, "controller", None)
+        self.timeout = timeout
+        self.max_concurrent_requests = max(1, max_concurrent_requests)
+        self.headers = headers or HTTP_HEADERS
+        self.http_pages = 0
+        self.browser_pages = 0
+        self.escalation_reasons: Counter = Counter()
+        # (status, final URL, headers) of fetched pages, attached to their
+        # results like crawl4ai does for browser-rendered pages
+        self._responses: Dict[str, Tuple[int, str, Dict[str, str]]] = {}
+        self._in_flight = 0
+        self._slot_freed: Optional[asyncio.Condition] = None
+
+    @property
+    def request_limit(self) -> int:
+        """Number of HTTP requests allowed in flight right now."""
+        if self.controller is None:
+            return self.max_concurrent_requests
+        return max(1, min(self.max_concurrent_requests, self.controller.limit))
+
+    @asynccontextmanager
+    async def _permit(self) -> AsyncIterator[None]:
+        """Hold one of the request_limit slots."""
+        slot_freed = self._slot_freed
+        async with slot_freed:  # type: ignore
+            await slot_freed.wait_for(  # type: ignore
+                lambda: self._in_flight < self.request_limit
+            )
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            async with slot_freed:  # type: ignore
+                self._in_flight -= 1
+                slot_freed.notify_all()  # type: ignore
+
+    def _record(
+        self,
+        latency: float,
+        success: bool,
+        status_code: Optional[int] = None,
+        error_message: str = "",
+    ) -> None:
+        """Report an HTTP response to the controller of the browser dispatcher."""
+        if self.controller is None:
+            return
+        self.dispatcher.max_session_permit = self.controller.record(
+            latency=latency,
+            success=success,
+            status_code=status_code,
+            error_message=error_message,
+        )
+
+    async def _fetch_once(
+        self, session: aiohttp.ClientSession, url: str
+    ) -> Tuple[Optional[str], Optional[str], Optional[float]]:
+        """Request one URL once; returns (html, escalation_reason, retry_after)."""
+        start = time.monotonic()
+        try:
+            async with session.get(url, allow_redirects=True) as response:
+                content_type = response.headers.get("Content-Type", "")
+                if response.status in THROTTLE_STATUS_CODES:
+                    self._record(
+                        time.monotonic() - start, False, status_code=response.status
+                    )
+                    try:
+                        retry_after = float(response.headers.get("Retry-After", ""))
+                    except ValueError:
+                        retry_after = None
+                    return None, REASON_THROTTLED, retry_after
+                if response.status != 200:
+                    self._record(
+                        time.monotonic() - start, False, status_code=response.status
+                    )
+                    return None, REASON_HTTP_ERROR, None
+                if "html" not in content_type.lower():
+                    self._record(time.monotonic() - start, True, response.status)
+                    return None, REASON_NOT_HTML, None
+                html = await response.text(errors="replace")
+                self._responses[url] = (
+                    response.status,
+                    str(response.url),
+                    dict(response.headers),
+                )
+        except (aiohttp.ClientError, asyncio.TimeoutError, UnicodeDecodeError) as e:
+            logger.debug("HTTP fetch of %s failed: %s", url, e)
+            self._record(
+                time.monotonic() - start,
+                False,
+                error_message=str(e) or type(e).__name__,
+            )
+            return None, REASON_HTTP_ERROR, None
+        self._record(time.monotonic() - start, True, 200)
+        return html, detect_js_rendering(html), None
+
+    async def _fetch(
+        self, session: aiohttp.ClientSession, url: str
+    ) -> Tuple[str, Optional[str], Optional[str]]:
+        """Fetch one URL, backing off while throttled; returns (url, html, reason)."""
+        for attempt in range(HTTP_THROTTLE_MAX_ATTEMPTS):
+            async with self._permit():
+                html, reason, retry_after = await self._fetch_once(session, url)
+            if reason != REASON_THROTTLED or attempt == HTTP_THROTTLE_MAX_ATTEMPTS - 1:
+                break
+            if retry_after is None:
+                delay = HTTP_THROTTLE_BASE_DELAY * (2**attempt)
+            else:
+                delay = min(HTTP_THROTTLE_MAX_DELAY, max(0.0, retry_after))
+            logger.debug("HTTP fetch of %s throttled, retrying in %.0fs", url, delay)
+            await asyncio.sleep(delay)
+        return url, html, reason
+
+    async def _process(self, url: str, html: str) -> Optional[CrawlResult]:
+        """Run fetched HTML through the crawler's processing pipeline."""
+        try:
+            return await self.crawler.aprocess_html(
+                url=url,
+                html=html,
+                extracted_content=None,
+                config=self.config,
+                screenshot=None,
+                pdf_data=None,
+                verbose=False,
+            )
+        except ValueError as e:
+            logger.debug("Processing HTTP-fetched %s failed: %s", url, e)
+            return None
+
+    async def fetch_many(self, urls: List[str]) -> AsyncIterator[CrawlResult]:
+        """
+        Fetch all URLs, yielding results as soon as they are available.
+
+        Server-rendered pages are yielded first, straight from the HTTP phase;
+        the remaining pages (including those still throttled after all retries)
+        are then crawled with the browser and streamed.
+
+        Args:
+            urls: URLs to fetch
+
+        Yields:
+            CrawlResult: Result of every URL (successful or failed)
+        """
+        escalated: List[str] = []
+        self._slot_freed = asyncio.Condition()
+        connector = aiohttp.TCPConnector(limit=self.max_concurrent_requests)
+
+        async with aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        ) as session:
+            tasks = [asyncio.create_task(self._fetch(session, url)) for url in urls]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    url, html, reason = await next_done
+                    result = None
+                    if reason is None:
+                        result = await self._process(url, html)  # type: ignore
+                        if result is None:
+                            reason = REASON_HTTP_ERROR
+                    if result is None:
+                        self.escalation_reasons[reason] += 1
+                        escalated.append(url)
+                        continue
+                    (
+                        result.status_code,
+                        result.redirected_url,
+                        result.response_headers,
+                    ) = self._responses.pop(url)
+                    self.http_pages += 1
+                    yield result
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+        logger.info(
+            "HTTP fast path: %d of %d pages without browser, %d escalated %s",
+            self.http_pages,
+            len(urls),
+            len(escalated),
+            dict(self.escalation_reasons),
+        )
+        if not escalated:
+            return
+
+        # Keep the original page order for the browser phase
+        escalated_set = set(escalated)
+        escalated = [url for url in urls if url in escalated_set]
+        self.browser_pages += len(escalated)
+        results = await self.crawler.arun_many(
+            escalated,
+            config=self.config.clone(stream=True),
+            dispatcher=self.dispatcher,
+        )
+        async for result in results:  # type: ignore
+            yield result
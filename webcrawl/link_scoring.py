@@ -0,0 +1,205 @@
+"""
+Relevance ranking of candidate internal links.
+
+A domain crawl only fetches max_links internal pages, so the budget should go to
+the pages that describe what a company makes and which machines it runs
+(products, services, manufacturing, machine park) rather than to news, blog or
+career pages. LinkScorer scores every candidate URL from keywords in its path
+and anchor text, its path depth and language hints; crawl_domain keeps the
+highest-scoring links.
+
+All weights are configurable, e.g. from the "link_scoring" entry of the webcrawl
+section in config.json:
+
+    "link_scoring": {
+        "keyword_weights": {"maschinenpark": 5.0},
+        "depth_penalty": 1.0
+    }
+
+Keys that are not given keep their defaults; keyword weights given in the config
+are merged into the default keyword table.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+from urllib.parse import unquote, urlparse
+
+logger = logging.getLogger(__name__)
+
+# Keyword -> weight; matched as substrings of the normalized path and anchor text
+DEFAULT_KEYWORD_WEIGHTS: Dict[str, float] = {
+    # Products and services
+    "produkt": 3.0,
+    "leistung": 2.5,
+    "loesung": 1.5,
+    "angebot": 1.5,
+    "portfolio": 1.5,
+    "sortiment": 1.5,
+    # Manufacturing and machines
+    "fertigung": 3.0,
+    "maschine": 3.0,
+    "maschinenpark": 2.0,  # on top of "maschine"
+    "anlage": 2.0,
+    "technologie": 2.0,
+    "technik": 1.5,
+    "verfahren": 2.0,
+    "bearbeitung": 2.0,
+    "produktion": 2.5,
+    "kompetenz": 1.5,
+    "werkstoff": 1.0,
+    "branche": 1.0,
+    "unternehmen": 0.5,
+    "ueber-uns": 0.5,
+    # Pages that rarely help the extraction
+    "news": -2.0,
+    "blog": -2.0,
+    "aktuell": -2.0,
+    "presse": -2.0,
+    "magazin": -1.5,
+    "karriere": -3.0,
+    "job": -3.0,
+    "stellenangebot": -3.0,
+    "ausbildung": -2.0,
+    "event": -2.0,
+    "veranstaltung": -2.0,
+    "termin": -1.5,
+    "messe": -1.0,
+    "archiv": -2.0,
+    "referenz": -0.5,
+}
+DEFAULT_ANCHOR_TEXT_FACTOR = 1.0  # anchor text matches count with this factor
+DEFAULT_DEPTH_PENALTY = 0.5  # subtracted per path segment below the first
+DEFAULT_GERMAN_BONUS = 1.0  # added for explicit German language paths
+GERMAN_PATH_HINTS = ["/de/", "/de-de/", "/de_de/"]
+
+UMLAUT_REPLACEMENTS = {"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"}
+
+
+def normalize_for_matching(text: str) -> str:
+    """
+    Lower-case text and spell out umlauts so 'Lösungen' matches 'loesung'.
+
+    Args:
+        text: Path or anchor text
+
+    Returns:
+        str: Normalized text
+    """
+    text = unquote(text).lower()
+    for umlaut, replacement in UMLAUT_REPLACEMENTS.items():
+        text = text.replace(umlaut, replacement)
+    return text
+
+
+class LinkScorer:
+    """
+    Score internal links by their expected relevance for the extraction.
+    """
+
+    def __init__(
+        self,
+        keyword_weights: Optional[Dict[str, float]] = None,
+        anchor_text_factor: float = DEFAULT_ANCHOR_TEXT_FACTOR,
+        depth_penalty: float = DEFAULT_DEPTH_PENALTY,
+        german_bonus: float = DEFAULT_GERMAN_BONUS,
+    ):
+        """
+        Args:
+            keyword_weights: Keyword -> weight table (default: DEFAULT_KEYWORD_WEIGHTS)
+            anchor_text_factor: Factor applied to keyword matches in the anchor text
+            depth_penalty: Penalty per path segment below the first
+            german_bonus: Bonus for URLs with an explicit German language path
+        """
+        weights = (
+            DEFAULT_KEYWORD_WEIGHTS if keyword_weights is None else keyword_weights
+        )
+        self.keyword_weights = {
+            normalize_for_matching(keyword): weight
+            for keyword, weight in weights.items()
+        }
+        self.anchor_text_factor = anchor_text_factor
+        self.depth_penalty = depth_penalty
+        self.german_bonus = german_bonus
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> "LinkScorer":
+        """
+        Build a scorer from a config dict, falling back to defaults for missing keys.
+
+        Args:
+            config: Dict with optional keys keyword_weights, anchor_text_factor,
+                depth_penalty and german_bonus
+
+        Returns:
+            LinkScorer: Configured scorer
+        """
+        config = config or {}
+        keyword_weights = dict(DEFAULT_KEYWORD_WEIGHTS)
+        keyword_weights.update(config.get("keyword_weights", {}))
+        return cls(
+            keyword_weights=keyword_weights,
+            anchor_text_factor=config.get(
+                "anchor_text_factor", DEFAULT_ANCHOR_TEXT_FACTOR
+            ),
+            depth_penalty=config.get("depth_penalty", DEFAULT_DEPTH_PENALTY),
+            german_bonus=config.get("german_bonus", DEFAULT_GERMAN_BONUS),
+        )
+
+    def _keyword_score(self, text: str) -> float:
+        return sum(
+            weight
+            for keyword, weight in self.keyword_weights.items()
+            if keyword in text
+        )
+
+    def score(self, url: str, anchor_text: Optional[str] = None) -> float:
+        """
+        Score a single URL.
+
+        Args:
+            url: Absolute URL of the candidate page
+            anchor_text: Text of the link pointing to the page, if known
+
+        Returns:
+            float: Relevance score; higher is more relevant
+        """
+        path = normalize_for_matching(urlparse(url).path)
+        score = self._keyword_score(path)
+        if anchor_text:
+            score += self.anchor_text_factor * self._keyword_score(
+                normalize_for_matching(anchor_text)
+            )
+
+        depth = len([segment for segment in path.split("/") if segment])
+        score -= self.depth_penalty * max(0, depth - 1)
+
+        if any(hint in path + "/" for hint in GERMAN_PATH_HINTS):
+            score += self.german_bonus
+        return score
+
+    def rank(
+        self, urls: List[str], anchor_texts: Optional[Dict[str, str]] = None
+    ) -> List[str]:
+        """
+        Sort URLs by descending score; equally scored URLs keep their order.
+
+        Args:
+            urls: Candidate URLs
+            anchor_texts: Anchor text per URL, if known
+
+        Returns:
+            List[str]: URLs ordered from most to least relevant
+        """
+        anchor_texts = anchor_texts or {}
+        scores = {
+            url: self.score(
+                url, anchor_texts.get(url) or anchor_texts.get(url.rstrip("/"))
+            )
+            for url in urls
+        }
+        ranked = sorted(urls, key=lambda url: -scores[url])
+        logger.debug(
+            "Top ranked links: %s",
+            [(url, round(scores[url], 2)) for url in ranked[:10]],
+        )
+        return ranked
@@ -0,0 +1,303 @@
+"""
+Persistent cache of LLM answers shared by all LLM stages.
+
+The extraction stages (extract_llm, extract_sachanlagen), fill_process_type and
+pluralize_with_llm send the same prompts again whenever a job is re-run or
+overlapping jobs process the same companies. LlmCache memoizes the answers on
+disk:
+
+- keyed by a SHA-256 hash of the model, the version of the calling stage's
+  prompt template, the request parameters and the prompt itself; API keys and
+  endpoints are not part of the key
+- entries older than the TTL are requested again
+- the total size of the cached answers is bounded; least recently used entries
+  are evicted first
+- hits, misses, stores and evictions are counted for the pipeline summary
+
+The answers are stored in a single SQLite file in WAL mode, committed after
+every store, so concurrent pipeline runs share it. Only answers a stage could
+use are stored (parsed and validated), so failed answers are retried.
+
+The cache is process-wide and opt-in: master_pipeline configures it from the
+llm_cache section of the config with configure_llm_cache(); the call sites ask
+for it with get_llm_cache(), which returns None when it is not configured,
+disabled or bypassed with the LLM_CACHE_BYPASS environment variable.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_FILENAME = "llm_cache.sqlite"
+LLM_CACHE_TTL_DAYS = 90.0
+LLM_CACHE_MAX_SIZE_MB = 256.0
+# Set to a non-empty value other than "0" to send every request to the LLM
+BYPASS_ENV_VAR = "LLM_CACHE_BYPASS"
+# Request parameters that do not change the answer
+IGNORED_PARAMETERS = ("api_key", "base_url", "api_base", "timeout", "num_retries")
+
+
+def _jsonable(value: Any) -> Any:
+    """Make request parameters such as pydantic response formats hashable."""
+    if isinstance(value, type) and hasattr(value, "model_json_schema"):
+        return value.model_json_schema()
+    return str(value)
+
+
+def llm_cache_key(prompt_version: str, model: str, **request: Any) -> str:
+    """
+    Get the cache key of an LLM request.
+
+    Args:
+        prompt_version: Version of the calling stage's prompt template; bump it
+            when answers to the same prompt should no longer be reused
+        model: Model the request is sent to
+        **request: Remaining completion arguments (messages, temperature,
+            response_format, fallbacks, ...)
+
+    Returns:
+        str: Hex digest identifying the request
+    """
+    parameters = {
+        name: value
+        for name, value in request.items()
+        if name not in IGNORED_PARAMETERS and value is not None
+    }
+    payload = json.dumps(
+        {"version": prompt_version, "model": model, "request": parameters},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=_jsonable,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LlmCache:
+    """
+    Size-bounded cache of LLM answers with a freshness TTL and LRU eviction.
+
+    Usage:
+        cache = get_llm_cache()
+        key = llm_cache_key(PROMPT_VERSION, model, messages=messages)
+        content = cache.get(key) if cache else None
+        if content is None:
+            content = completion(model=model, messages=messages).choices[0].message.content
+            if cache and answer_is_usable(content):
+                cache.put(key, model, content)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_days: float = LLM_CACHE_TTL_DAYS,
+        max_size_mb: float = LLM_CACHE_MAX_SIZE_MB,
+    ):
+        """
+        Args:
+            path: Path of the SQLite cache file, created on first use
+            ttl_days: Days a cached answer stays fresh
+            max_size_mb: Maximum total size of the cached answers
+        """
+        self.path = path
+        self.ttl = ttl_days * 24 * 3600
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._db: Optional[sqlite3.Connection] = None
+        # Stages call the cache from worker threads
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(
+        cls, config: Optional[Dict[str, Any]], default_path: str = LLM_CACHE_FILENAME
+    ) -> Optional["LlmCache"]:
+        """
+        Create the cache from the llm_cache section of the pipeline config.
+
+        Args:
+            config: Dict with the optional keys path, ttl_days, max_size_mb and
+                enabled
+            default_path: Cache file used when the config has no path
+
+        Returns:
+            Optional[LlmCache]: The cache, or None if it is disabled
+        """
+        config = config or {}
+        if not config.get("enabled", True):
+            return None
+        return cls(
+            config.get("path") or default_path,
+            ttl_days=config.get("ttl_days", LLM_CACHE_TTL_DAYS),
+            max_size_mb=config.get("max_size_mb", LLM_CACHE_MAX_SIZE_MB),
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(
+                self.path, timeout=30.0, check_same_thread=False
+            )
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS answers ("
+                "key TEXT PRIMARY KEY, model TEXT, stored_at REAL, accessed_at REAL, "
+                "size INTEGER, content TEXT)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS answers_accessed_at ON answers (accessed_at)"
+            )
+            self._db.commit()
+        return self._db
+
+    @property
+    def size(self) -> int:
+        """Total size of the cached answers in bytes."""
+        with self._lock:
+            query = "SELECT COALESCE(SUM(size), 0) FROM answers"
+            return self._connect().execute(query).fetchone()[0]
+
+    @property
+    def entry_count(self) -> int:
+        """Number of cached answers."""
+        with self._lock:
+            query = "SELECT COUNT(*) FROM answers"
+            return self._connect().execute(query).fetchone()[0]
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached answer.
+
+        Args:
+            key: Cache key from llm_cache_key()
+
+        Returns:
+            Optional[str]: The answer's content, or None if it is not cached or
+                older than the TTL
+        """
+        now = time.time()
+        with self._lock:
+            db = self._connect()
+            row = db.execute(
+                "SELECT content FROM answers WHERE key = ? AND stored_at >= ?",
+                (key, now - self.ttl),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            db.execute("UPDATE answers SET accessed_at = ? WHERE key = ?", (now, key))
+            db.commit()
+            self.hits += 1
+        return row[0]
+
+    def put(self, key: str, model: str, content: str) -> None:
+        """
+        Cache an answer.
+
+        Args:
+            key: Cache key from llm_cache_key()
+            model: Model that gave the answer
+            content: Content of the answer
+        """
+        now = time.time()
+        size = len(content.encode("utf-8"))
+        with self._lock:
+            db = self._connect()
+            db.execute(
+                "INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, now, now, size, content),
+            )
+            self.stores += 1
+            self._evict(db)
+            db.commit()
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        """Remove expired answers, then least recently used ones beyond the size limit."""
+        expired = db.execute(
+            "DELETE FROM answers WHERE stored_at < ?", (time.time() - self.ttl,)
+        ).rowcount
+        self.evictions += max(0, expired)
+        excess = (
+            db.execute("SELECT COALESCE(SUM(size), 0) FROM answers").fetchone()[0]
+            - self.max_size
+        )
+        if excess <= 0:
+            return
+        evicted = []
+        for key, size in db.execute(
+            "SELECT key, size FROM answers ORDER BY accessed_at"
+        ).fetchall():
+            if excess <= 0:
+                break
+            excess -= size
+            evicted.append((key,))
+        db.executemany("DELETE FROM answers WHERE key = ?", evicted)
+        self.evictions += len(evicted)
+
+    def close(self) -> None:
+        """Close the cache file."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def log_summary(self) -> None:
+        """Log the hit rate and size of the cache."""
+        lookups = self.hits + self.misses
+        if not lookups and not self.stores:
+            return
+        logger.info(
+            "LLM cache: %d hits, %d misses (%.0f%% hit rate), %d stored, "
+            "%d evicted, %d answers / %.1f MB cached",
+            self.hits,
+            self.misses,
+            100.0 * self.hits / lookups if lookups else 0.0,
+            self.stores,
+            self.evictions,
+            self.entry_count,
+            self.size / (1024 * 1024),
+        )
+
+
+_llm_cache: Optional[LlmCache] = None
+
+
+def configure_llm_cache(config: Optional[Dict[str, Any]]) -> Optional[LlmCache]:
+    """
+    Set up the process-wide LLM cache.
+
+    Args:
+        config: The llm_cache section of the pipeline config; None or
+            {"enabled": false} disables the cache
+
+    Returns:
+        Optional[LlmCache]: The configured cache, or None if it is disabled
+    """
+    global _llm_cache
+    if _llm_cache is not None:
+        _llm_cache.close()
+    _llm_cache = LlmCache.from_config(config) if config is not None else None
+    return _llm_cache
+
+
+def get_llm_cache() -> Optional[LlmCache]:
+    """
+    Get the process-wide LLM cache.
+
+    Returns:
+        Optional[LlmCache]: The cache, or None if it is not configured or
+            bypassed with the LLM_CACHE_BYPASS environment variable
+    """
+    if os.environ.get(BYPASS_ENV_VAR, "") not in ("", "0"):
+        return None
+    return _llm_cache
@@ -0,0 +1,211 @@
+"""
+Concurrent execution of the per-file and per-entry LLM work of the keyword stages.
+
+fill_process_type and pluralize_with_llm send one synchronous litellm request
+per company entry, one after another, so the stages spend nearly all their time
+waiting on the network. LlmExecutor keeps several of these requests in flight:
+
+- imap() runs a function over items on a thread pool and yields the results in
+  the order of the items, so output files and PROGRESS lines come out exactly as
+  before; at most twice max_concurrent items are started ahead of the consumer
+- imap() called from inside one of its own workers (e.g. the entries of a file
+  that is itself processed by a worker) runs inline, so nested work cannot
+  starve the pool
+- throttle() spaces the LLM requests of all workers to requests_per_minute;
+  call sites call it right before each request that is actually sent (not for
+  LLM cache hits)
+
+Retries keep their blocking backoff, which now only holds the one worker.
+
+The executor is process-wide: master_pipeline (and the stages' command lines)
+configure it with configure_llm_executor() for the duration of a run; the stages
+ask for it with get_llm_executor(), which is sequential (one request at a time,
+run inline) when it is not configured.
+"""
+
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_MAX_CONCURRENT_REQUESTS = 8
+DEFAULT_REQUESTS_PER_MINUTE = 0  # 0 = no rate limit
+# Items started ahead of the consumer, per worker
+PREFETCH_FACTOR = 2
+
+# Marks the threads of an executor's pool
+_worker = threading.local()
+
+
+class LlmExecutor:
+    """
+    Thread pool with ordered results and a shared request rate limit.
+
+    Usage:
+        executor = get_llm_executor()
+        results = executor.imap(process_entry, entries)
+        for entry in entries:
+            logger.info("PROGRESS:...")
+            result = next(results)
+
+        # in process_entry, right before the request:
+        executor.throttle()
+        response = completion(...)
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 1,
+        requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+    ):
+        """
+        Args:
+            max_concurrent: Maximum number of items processed at once; 1 runs
+                everything inline in the calling thread
+            requests_per_minute: Maximum rate of LLM requests (0 disables)
+        """
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.min_interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self.requests = 0
+        self.throttled_seconds = 0.0
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> "LlmExecutor":
+        """
+        Create the executor from the llm_executor section of the pipeline config.
+
+        Args:
+            config: Dict with the optional keys max_concurrent_requests and
+                requests_per_minute
+
+        Returns:
+            LlmExecutor: The configured executor
+        """
+        config = config or {}
+        return cls(
+            max_concurrent=config.get(
+                "max_concurrent_requests", DEFAULT_MAX_CONCURRENT_REQUESTS
+            ),
+            requests_per_minute=config.get(
+                "requests_per_minute", DEFAULT_REQUESTS_PER_MINUTE
+            ),
+        )
+
+    def _run(self, fn: Callable[[T], R], item: T) -> R:
+        _worker.executor = self
+        try:
+            return fn(item)
+        finally:
+            _worker.executor = None
+
+    def imap(self, fn: Callable[[T], R], items: Iterable[T]) -> Iterator[R]:
+        """
+        Apply a function to items concurrently, yielding results in item order.
+
+        An exception raised for an item is raised when its result is reached;
+        items not started yet are then cancelled.
+
+        Args:
+            fn: Function processing one item
+            items: Items to process
+
+        Yields:
+            Result of fn for every item, in the order of items
+        """
+        if self.max_concurrent == 1 or getattr(_worker, "executor", None) is self:
+            for item in items:
+                yield fn(item)
+            return
+
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_concurrent, thread_name_prefix="llm"
+            )
+        remaining = iter(items)
+        pending: Deque[Future] = deque(
+            self._pool.submit(self._run, fn, item)
+            for item in itertools.islice(
+                remaining, self.max_concurrent * PREFETCH_FACTOR
+            )
+        )
+        try:
+            while pending:
+                result = pending.popleft().result()
+                for item in itertools.islice(remaining, 1):
+                    pending.append(self._pool.submit(self._run, fn, item))
+                yield result
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def throttle(self) -> None:
+        """Wait for the next free request slot of the rate limit."""
+        with self._lock:
+            self.requests += 1
+            if not self.min_interval:
+                return
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.min_interval
+            if wait > 0:
+                self.throttled_seconds += wait
+        if wait > 0:
+            time.sleep(wait)
+
+    def shutdown(self) -> None:
+        """Stop the worker threads."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def log_summary(self) -> None:
+        """Log the number of requests and the time spent waiting for the rate limit."""
+        if not self.requests:
+            return
+        logger.info(
+            "LLM executor: %d requests with up to %d in flight, %.1fs rate limited",
+            self.requests,
+            self.max_concurrent,
+            self.throttled_seconds,
+        )
+
+
+_llm_executor = LlmExecutor()
+
+
+def configure_llm_executor(config: Optional[Dict[str, Any]]) -> LlmExecutor:
+    """
+    Set up the process-wide LLM executor.
+
+    Args:
+        config: The llm_executor section of the pipeline config ({} for the
+            defaults); None restores the sequential executor
+
+    Returns:
+        LlmExecutor: The configured executor
+    """
+    global _llm_executor
+    _llm_executor.shutdown()
+    _llm_executor = LlmExecutor.from_config(config) if config is not None else LlmExecutor()
+    return _llm_executor
+
+
+def get_llm_executor() -> LlmExecutor:
+    """
+    Get the process-wide LLM executor.
+
+    Returns:
+        LlmExecutor: The configured executor, or a sequential one
+    """
+    return _llm_executor
@@ -0,0 +1,319 @@
+"""
+Browser-free LLM extraction of local files.
+
+The extraction stages used to turn their input files into file:// URLs and
+crawl them with AsyncWebCrawler.arun_many, which launches Chromium only to read
+local markdown/HTML and hand the text to LLMExtractionStrategy. DirectExtractor
+reads the files itself and calls the LLM asynchronously through litellm, whose
+HTTP client is shared by all requests of the process:
+
+- the file content is passed in the strategy's input_format: markdown files as
+  they are, HTML files as they are for "html" or converted with the crawler's
+  own scraping and markdown generation (no browser) for markdown formats
+- the prompt is built and the answer parsed exactly like
+  LLMExtractionStrategy.extract(), with the strategy's schema, instruction and
+  chunking settings, so answers that cannot be parsed (and failed requests)
+  still become {"error": True, ...} blocks that the error rechecks pick up
+- requests run concurrently up to max_concurrent and are retried with
+  exponential backoff on rate limit errors
+- token usage is added to the strategy, so llm_strategy.show_usage() keeps
+  reporting it
+- answers are memoized in the shared LLM cache (see webcrawl.llm_cache) when it
+  is configured; answers with error blocks are not cached. The cache key names
+  the file by its basename instead of its file:// URL, as extract_llm reads some
+  files from temporary copies whose path changes on every run
+
+Results mirror the CrawlResult fields the extraction stages read (url as a
+file:// URL, success, extracted_content, error_message), so output naming such
+as <name>_extracted.json is unchanged.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from crawl4ai import AsyncWebCrawler, CrawlerRunConfig
+from crawl4ai.extraction_strategy import LLMExtractionStrategy
+from crawl4ai.models import TokenUsage
+from crawl4ai.prompts import (
+    PROMPT_EXTRACT_BLOCKS,
+    PROMPT_EXTRACT_BLOCKS_WITH_INSTRUCTION,
+    PROMPT_EXTRACT_SCHEMA_WITH_INSTRUCTION,
+)
+from crawl4ai.utils import (
+    escape_json_string,
+    extract_xml_data,
+    merge_chunks,
+    sanitize_html,
+    sanitize_input_encode,
+    split_and_parse_json_objects,
+)
+from litellm import acompletion
+from litellm.exceptions import RateLimitError
+
+from webcrawl.llm_cache import get_llm_cache, llm_cache_key
+
+logger = logging.getLogger(__name__)
+
+# Version of the prompt building and answer parsing, part of the LLM cache key
+EXTRACTION_PROMPT_VERSION = "1"
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+RATE_LIMIT_MAX_ATTEMPTS = 3
+RATE_LIMIT_BASE_DELAY = 2.0  # seconds, doubled on every retry
+# Files whose text is sent as is for every input format
+MARKDOWN_EXTENSIONS = (".md", ".markdown", ".txt")
+
+
+class ExtractionResult:
+    """Outcome of the extraction of one file."""
+
+    def __init__(
+        self,
+        file_path: str,
+        extracted_content: Optional[str] = None,
+        error_message: Optional[str] = None,
+    ):
+        """
+        Args:
+            file_path: Path of the extracted file
+            extracted_content: Extracted blocks as a JSON string
+            error_message: Why the file could not be extracted
+        """
+        self.file_path = file_path
+        self.url = f"file://{os.path.abspath(file_path)}"
+        self.extracted_content = extracted_content
+        self.error_message = error_message
+        self.success = error_message is None
+
+
+def error_block(message: str) -> Dict[str, Any]:
+    """Get the block LLMExtractionStrategy reports for a failed section."""
+    return {"index": 0, "error": True, "tags": ["error"], "content": message}
+
+
+def build_prompt(strategy: LLMExtractionStrategy, url: str, content: str) -> str:
+    """Build the extraction prompt like LLMExtractionStrategy.extract()."""
+    variable_values = {
+        "URL": url,
+        "HTML": escape_json_string(sanitize_html(content)),
+    }
+    prompt = PROMPT_EXTRACT_BLOCKS
+    if strategy.instruction:
+        variable_values["REQUEST"] = strategy.instruction
+        prompt = PROMPT_EXTRACT_BLOCKS_WITH_INSTRUCTION
+    if strategy.extract_type == "schema" and strategy.schema:
+        variable_values["SCHEMA"] = json.dumps(strategy.schema, indent=2)
+        prompt = PROMPT_EXTRACT_SCHEMA_WITH_INSTRUCTION
+    for variable, value in variable_values.items():
+        prompt = prompt.replace("{" + variable + "}", value)
+    return prompt
+
+
+def parse_blocks(answer: str) -> List[Dict[str, Any]]:
+    """Parse the LLM answer like LLMExtractionStrategy.extract()."""
+    try:
+        blocks = json.loads(extract_xml_data(["blocks"], answer)["blocks"])
+        for block in blocks:
+            block["error"] = False
+    except Exception:
+        blocks, unparsed = split_and_parse_json_objects(answer)
+        if unparsed:
+            blocks.append(error_block(unparsed))
+    return blocks
+
+
+class DirectExtractor:
+    """
+    Extract structured data from local files with an LLM, without a browser.
+
+    Usage:
+        extractor = DirectExtractor(llm_strategy)
+        async for result in extractor.extract_many(file_paths):
+            if result.extracted_content:
+                ...
+        llm_strategy.show_usage()
+    """
+
+    def __init__(
+        self,
+        llm_strategy: LLMExtractionStrategy,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+    ):
+        """
+        Args:
+            llm_strategy: Strategy providing the LLM config, schema, instruction,
+                input format and chunking settings; receives the token usage
+            max_concurrent: Maximum number of LLM requests in flight
+        """
+        self.strategy = llm_strategy
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrent))
+        # Never started: HTML processing needs no browser
+        self._converter: Optional[AsyncWebCrawler] = None
+
+    async def read_content(self, file_path: str) -> str:
+        """
+        Read a file in the input format of the strategy.
+
+        Args:
+            file_path: Path of a markdown or HTML file
+
+        Returns:
+            str: Text to send to the LLM
+        """
+        with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+            text = f.read()
+        input_format = self.strategy.input_format
+        if input_format == "html" or file_path.lower().endswith(MARKDOWN_EXTENSIONS):
+            return text
+
+        if self._converter is None:
+            self._converter = AsyncWebCrawler()
+        processed = await self._converter.aprocess_html(
+            url=f"file://{os.path.abspath(file_path)}",
+            html=text,
+            extracted_content=None,
+            config=CrawlerRunConfig(verbose=False),
+            screenshot=None,
+            pdf_data=None,
+            verbose=False,
+        )
+        if input_format == "cleaned_html":
+            return processed.cleaned_html or ""
+        markdown = processed.markdown
+        if input_format == "fit_markdown" and markdown.fit_markdown:
+            return markdown.fit_markdown
+        return markdown.raw_markdown
+
+    def _request_arguments(self) -> Dict[str, Any]:
+        llm_config = self.strategy.llm_config
+        extra_args = {
+            "temperature": 0.01,
+            "api_key": llm_config.api_token,
+            "base_url": llm_config.base_url,
+        }
+        extra_args.update(self.strategy.extra_args or {})
+        return extra_args
+
+    async def _complete(self, prompt: str) -> Any:
+        """Send a prompt, retrying with exponential backoff on rate limits."""
+        for attempt in range(RATE_LIMIT_MAX_ATTEMPTS):
+            try:
+                async with self._semaphore:
+                    return await acompletion(
+                        model=self.strategy.llm_config.provider,
+                        messages=[{"role": "user", "content": prompt}],
+                        **self._request_arguments(),
+                    )
+            except RateLimitError as e:
+                if attempt == RATE_LIMIT_MAX_ATTEMPTS - 1:
+                    raise
+                delay = RATE_LIMIT_BASE_DELAY * (2**attempt)
+                logger.warning("Rate limited (%s), retrying in %.0fs", e, delay)
+                await asyncio.sleep(delay)
+
+    def _record_usage(self, response: Any) -> None:
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        token_usage = TokenUsage(
+            completion_tokens=usage.completion_tokens,
+            prompt_tokens=usage.prompt_tokens,
+            total_tokens=usage.total_tokens,
+        )
+        self.strategy.usages.append(token_usage)
+        self.strategy.total_usage.completion_tokens += token_usage.completion_tokens
+        self.strategy.total_usage.prompt_tokens += token_usage.prompt_tokens
+        self.strategy.total_usage.total_tokens += token_usage.total_tokens
+
+    async def _extract_section(
+        self, url: str, section: str, source: str
+    ) -> List[Dict[str, Any]]:
+        section = sanitize_input_encode(section)
+        prompt = build_prompt(self.strategy, url, section)
+        model = self.strategy.llm_config.provider
+        cache = get_llm_cache()
+        # The same prompt with the file's stable name in place of its URL
+        key = llm_cache_key(
+            EXTRACTION_PROMPT_VERSION,
+            model,
+            messages=[
+                {"role": "user", "content": build_prompt(self.strategy, source, section)}
+            ],
+            **self._request_arguments(),
+        )
+        answer = cache.get(key) if cache else None
+        if answer is not None:
+            return parse_blocks(answer)
+
+        try:
+            response = await self._complete(prompt)
+        except Exception as e:
+            logger.warning("LLM request for %s failed: %s", url, e)
+            return [error_block(str(e))]
+        self._record_usage(response)
+        answer = response.choices[0].message.content or ""
+        blocks = parse_blocks(answer)
+        if cache and not any(
+            isinstance(block, dict) and block.get("error") is True for block in blocks
+        ):
+            cache.put(key, model, answer)
+        return blocks
+
+    async def extract_file(self, file_path: str) -> ExtractionResult:
+        """
+        Extract one file.
+
+        Args:
+            file_path: Path of the file
+
+        Returns:
+            ExtractionResult: Extracted blocks, or the reason nothing was extracted
+        """
+        try:
+            content = await self.read_content(file_path)
+        except (OSError, ValueError) as e:
+            return ExtractionResult(file_path, error_message=str(e))
+        if not content.strip():
+            return ExtractionResult(file_path, error_message="File is empty")
+
+        url = f"file://{os.path.abspath(file_path)}"
+        threshold = self.strategy.chunk_token_threshold
+        sections = merge_chunks(
+            docs=[content],
+            target_size=threshold,
+            overlap=int(threshold * self.strategy.overlap_rate),
+            word_token_ratio=self.strategy.word_token_rate,
+        )
+        section_blocks = await asyncio.gather(
+            *(
+                self._extract_section(url, section, os.path.basename(file_path))
+                for section in sections
+            )
+        )
+        blocks = [block for blocks in section_blocks for block in blocks]
+        return ExtractionResult(
+            file_path,
+            extracted_content=json.dumps(
+                blocks, indent=4, default=str, ensure_ascii=False
+            ),
+        )
+
+    async def extract_many(self, file_paths: List[str]) -> AsyncIterator[ExtractionResult]:
+        """
+        Extract files concurrently, yielding results as they complete.
+
+        Args:
+            file_paths: Paths of the files
+
+        Yields:
+            ExtractionResult: Result of every file, in completion order
+        """
+        tasks = [asyncio.create_task(self.extract_file(path)) for path in file_paths]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,305 @@
+"""
+Pipeline-owned cache of crawled pages.
+
+crawl4ai's own cache lives in the user's home directory, grows without bound
+and was only read for link collection. PageCache replaces it for domain crawls:
+
+- keyed by the normalized URL (scheme and host lower-cased, fragment, trailing
+  slash and tracking parameters dropped, query parameters sorted)
+- entries older than the TTL are crawled again
+- the total size of the cached pages is bounded; least recently used entries are
+  evicted first
+- hits, misses, stores and evictions are counted for the crawl summary
+
+Only the parts of a CrawlResult the crawler uses are cached (raw markdown,
+metadata, internal links, status and headers), gzip compressed, in a single SQLite
+file together with their timestamps and sizes. The HTML is dropped, so the
+structured data harvested from it is kept in the cached metadata. The file is in
+WAL mode and every stored page is committed at once, so concurrent runs can share
+it and an interrupted run keeps the pages it crawled.
+"""
+
+import gzip
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from crawl4ai import CrawlResult
+from crawl4ai.models import MarkdownGenerationResult
+
+from webcrawl.structured_data import STRUCTURED_DATA_KEY, harvest_result
+
+logger = logging.getLogger(__name__)
+
+PAGE_CACHE_FILENAME = ".page_cache.sqlite"
+PAGE_CACHE_TTL_DAYS = 30.0
+PAGE_CACHE_MAX_SIZE_MB = 1024.0
+# Query parameters that never change the content of a page
+TRACKING_PARAMETERS = ("utm_", "gclid", "fbclid", "mc_cid", "mc_eid", "_ga")
+
+
+def normalize_cache_url(url: str) -> str:
+    """
+    Normalize a URL so variants of the same page share one cache entry.
+
+    Args:
+        url: Page URL
+
+    Returns:
+        str: Normalized URL
+    """
+    parsed = urlparse(url.strip())
+    query = sorted(
+        (name, value)
+        for name, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not name.lower().startswith(TRACKING_PARAMETERS)
+    )
+    return urlunparse(
+        (
+            parsed.scheme.lower(),
+            parsed.netloc.lower(),
+            parsed.path.rstrip("/"),
+            "",
+            urlencode(query),
+            "",
+        )
+    )
+
+
+def serialize_result(result: CrawlResult) -> Dict[str, Any]:
+    """Get the cached fields of a successful crawl result."""
+    markdown = result.markdown
+    raw_markdown = getattr(markdown, "raw_markdown", None)
+    if raw_markdown is None:
+        raw_markdown = str(markdown or "")
+    links = result.links or {}
+    metadata = dict(result.metadata or {})
+    metadata[STRUCTURED_DATA_KEY] = harvest_result(result)
+    return {
+        "url": result.url,
+        "markdown": raw_markdown,
+        "metadata": metadata,
+        "links": {"internal": links.get("internal", [])},
+        "status_code": result.status_code,
+        "response_headers": result.response_headers,
+        "redirected_url": result.redirected_url,
+    }
+
+
+def deserialize_result(data: Dict[str, Any]) -> CrawlResult:
+    """Rebuild a crawl result from its cached fields."""
+    return CrawlResult(
+        url=data["url"],
+        html="",
+        success=True,
+        markdown=MarkdownGenerationResult(
+            raw_markdown=data["markdown"],
+            markdown_with_citations="",
+            references_markdown="",
+        ),
+        metadata=data.get("metadata") or {},
+        links=data.get("links") or {},
+        status_code=data.get("status_code"),
+        response_headers=data.get("response_headers"),
+        redirected_url=data.get("redirected_url"),
+    )
+
+
+class PageCache:
+    """
+    Size-bounded cache of crawl results with a freshness TTL and LRU eviction.
+
+    Usage:
+        cache = PageCache.from_config(config.get("page_cache"))
+        result = cache.get(url)
+        if result is None:
+            result = await crawler.arun(url, config=run_config)
+            cache.put(url, result)
+        cache.save()
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_days: float = PAGE_CACHE_TTL_DAYS,
+        max_size_mb: float = PAGE_CACHE_MAX_SIZE_MB,
+    ):
+        """
+        Args:
+            path: Path of the SQLite cache file
+            ttl_days: Days a cached page stays fresh
+            max_size_mb: Maximum total size of the cached pages (compressed)
+        """
+        self.path = path
+        self.ttl = ttl_days * 24 * 3600
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=30.0, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "key TEXT PRIMARY KEY, url TEXT, stored_at REAL, accessed_at REAL, "
+            "size INTEGER, data BLOB)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at)"
+        )
+        self._db.commit()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(
+        cls, config: Optional[Dict[str, Any]], default_path: str = PAGE_CACHE_FILENAME
+    ) -> Optional["PageCache"]:
+        """
+        Create the cache from the page_cache section of the webcrawl config.
+
+        Args:
+            config: Dict with the optional keys path, ttl_days, max_size_mb and
+                enabled
+            default_path: Cache file used when the config has no path
+
+        Returns:
+            Optional[PageCache]: The cache, or None if it is disabled
+        """
+        config = config or {}
+        if not config.get("enabled", True):
+            return None
+        return cls(
+            config.get("path") or default_path,
+            ttl_days=config.get("ttl_days", PAGE_CACHE_TTL_DAYS),
+            max_size_mb=config.get("max_size_mb", PAGE_CACHE_MAX_SIZE_MB),
+        )
+
+    @property
+    def size(self) -> int:
+        """Total size of the cached pages in bytes."""
+        query = "SELECT COALESCE(SUM(size), 0) FROM pages"
+        with self._lock:
+            return self._db.execute(query).fetchone()[0]
+
+    @property
+    def page_count(self) -> int:
+        """Number of cached pages."""
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def get(self, url: str) -> Optional[CrawlResult]:
+        """
+        Get the cached result of a page.
+
+        Args:
+            url: Page URL
+
+        Returns:
+            Optional[CrawlResult]: The cached result, or None if the page is not
+                cached or older than the TTL
+        """
+        key = normalize_cache_url(url)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data FROM pages WHERE key = ? AND stored_at >= ?",
+                (key, now - self.ttl),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            try:
+                result = deserialize_result(json.loads(gzip.decompress(row[0])))
+            except (OSError, ValueError, KeyError) as e:
+                logger.debug("Dropping unreadable page cache entry of %s: %s", url, e)
+                self._db.execute("DELETE FROM pages WHERE key = ?", (key,))
+                self._db.commit()
+                self.misses += 1
+                return None
+            self._db.execute(
+                "UPDATE pages SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._db.commit()
+            self.hits += 1
+        return result
+
+    def put(self, url: str, result: CrawlResult) -> None:
+        """
+        Cache a crawl result; failed results are not cached.
+
+        Args:
+            url: URL the page was requested with
+            result: Crawl result of the page
+        """
+        if not result.success:
+            return
+        data = gzip.compress(
+            json.dumps(serialize_result(result), ensure_ascii=False).encode("utf-8")
+        )
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)",
+                (normalize_cache_url(url), url, now, now, len(data), data),
+            )
+            self.stores += 1
+            self._evict()
+            self._db.commit()
+
+    def _evict(self) -> None:
+        """Remove least recently used pages until the cache fits its size limit."""
+        excess = (
+            self._db.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+            - self.max_size
+        )
+        if excess <= 0:
+            return
+        evicted = []
+        for key, size in self._db.execute(
+            "SELECT key, size FROM pages ORDER BY accessed_at"
+        ).fetchall():
+            if excess <= 0:
+                break
+            excess -= size
+            evicted.append((key,))
+        self._db.executemany("DELETE FROM pages WHERE key = ?", evicted)
+        self.evictions += len(evicted)
+
+    def save(self) -> None:
+        """Drop pages older than the TTL."""
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM pages WHERE stored_at < ?", (time.time() - self.ttl,)
+            )
+            self._db.commit()
+
+    def close(self) -> None:
+        """Save and close the cache file."""
+        self.save()
+        with self._lock:
+            self._db.close()
+
+    def log_summary(self) -> None:
+        """Log the hit rate and size of the cache."""
+        lookups = self.hits + self.misses
+        if not lookups and not self.stores:
+            return
+        logger.info(
+            "Page cache: %d hits, %d misses (%.0f%% hit rate), %d stored, "
+            "%d evicted, %d pages / %.1f MB cached",
+            self.hits,
+            self.misses,
+            100.0 * self.hits / lookups if lookups else 0.0,
+            self.stores,
+            self.evictions,
+            self.page_count,
+            self.size / (1024 * 1024),
+        )
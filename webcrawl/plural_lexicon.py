@@ -0,0 +1,435 @@
+"""
+Persistent German plural lexicon consulted before the pluralization LLM.
+
+pluralize_with_llm sends the same words (Drehteile, Frästeile, Baugruppen,
+CNC-Fräsmaschinen, ...) to the LLM again in every file and every run. The
+lexicon remembers the plural of every word the LLM answered:
+
+- pluralize_with_llm looks up all words of an entry first and only sends the
+  words missing from the lexicon; entries whose words are all known need no
+  LLM call at all
+- it grows automatically: the word pairs of every validated LLM answer are
+  learned (learn_fields())
+- it can be seeded from the input and output directories of past pluralization
+  runs (seed_from_directories(), or the command line of this module)
+- manual overrides in a JSON file ({"word": "plural", ...}) take precedence
+  over learned plurals and are never replaced by them
+
+Words are the entry words after compound word cleaning, matched exactly. The
+learned plurals are stored in a single SQLite file in WAL mode, committed after
+every answer, so concurrent pipeline runs share it.
+
+The lexicon is process-wide and used only when it is configured: master_pipeline
+configures it from the plural_lexicon section of the config (enabled in the
+shipped config.json, {"enabled": false} turns it off) with
+configure_plural_lexicon(); pluralize_with_llm asks for it with
+get_plural_lexicon(), which returns None when it is not configured or disabled.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PLURAL_LEXICON_FILENAME = "plural_lexicon.sqlite"
+PLURAL_OVERRIDES_FILENAME = "plural_overrides.json"
+FIELDS = ("products", "machines", "process_type")
+
+
+class PluralLexicon:
+    """
+    Word-level lexicon of German plurals with manual overrides.
+
+    Usage:
+        lexicon = get_plural_lexicon()
+        known, unknown_fields = split_known_words(lexicon, fields)
+        # send only unknown_fields to the LLM, validate the answer, then
+        lexicon.learn_fields(unknown_fields, answer)
+        result = merge_known_words(fields, known, answer)
+    """
+
+    def __init__(self, path: str, overrides_path: Optional[str] = None):
+        """
+        Args:
+            path: Path of the SQLite lexicon file, created on first use
+            overrides_path: Optional JSON file mapping words to their plural
+        """
+        self.path = path
+        self.overrides_path = overrides_path
+        self.overrides = self._load_overrides(overrides_path)
+        self.hits = 0
+        self.misses = 0
+        self.learned = 0
+        self._db: Optional[sqlite3.Connection] = None
+        # pluralize_with_llm calls the lexicon from worker threads
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(
+        cls,
+        config: Optional[Dict[str, Any]],
+        default_path: str = PLURAL_LEXICON_FILENAME,
+    ) -> Optional["PluralLexicon"]:
+        """
+        Create the lexicon from the plural_lexicon section of the pipeline config.
+
+        Args:
+            config: Dict with the optional keys path, overrides_path and enabled
+            default_path: Lexicon file used when the config has no path
+
+        Returns:
+            Optional[PluralLexicon]: The lexicon, or None if it is disabled
+        """
+        config = config or {}
+        if not config.get("enabled", True):
+            return None
+        return cls(
+            config.get("path") or default_path,
+            overrides_path=config.get("overrides_path"),
+        )
+
+    @staticmethod
+    def _load_overrides(overrides_path: Optional[str]) -> Dict[str, str]:
+        if not overrides_path or not os.path.exists(overrides_path):
+            return {}
+        try:
+            with open(overrides_path, "r", encoding="utf-8") as f:
+                overrides = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring plural overrides {overrides_path}: {e}")
+            return {}
+        if not isinstance(overrides, dict):
+            logger.warning(f"Ignoring plural overrides {overrides_path}: not a JSON object")
+            return {}
+        return {str(word): str(plural) for word, plural in overrides.items()}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(
+                self.path, timeout=30.0, check_same_thread=False
+            )
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS plurals ("
+                "word TEXT PRIMARY KEY, plural TEXT, learned_at REAL, seen INTEGER)"
+            )
+            self._db.commit()
+        return self._db
+
+    @property
+    def word_count(self) -> int:
+        """Number of learned words."""
+        with self._lock:
+            query = "SELECT COUNT(*) FROM plurals"
+            return self._connect().execute(query).fetchone()[0]
+
+    def lookup(self, words: Iterable[str]) -> Dict[str, str]:
+        """
+        Look up the plurals of words.
+
+        Args:
+            words: Words to look up
+
+        Returns:
+            Dict[str, str]: Plural of every known word; overrides take precedence
+        """
+        words = list(words)
+        known = {word: self.overrides[word] for word in words if word in self.overrides}
+        missing = list(dict.fromkeys(word for word in words if word not in known))
+        if missing:
+            with self._lock:
+                db = self._connect()
+                # Stay below SQLite's limit of host parameters per statement
+                for start in range(0, len(missing), 500):
+                    chunk = missing[start : start + 500]
+                    placeholders = ", ".join("?" * len(chunk))
+                    known.update(
+                        db.execute(
+                            f"SELECT word, plural FROM plurals WHERE word IN ({placeholders})",
+                            chunk,
+                        ).fetchall()
+                    )
+        with self._lock:
+            for word in words:
+                if word in known:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+        return known
+
+    def learn(self, pairs: Iterable[Tuple[str, str]]) -> None:
+        """
+        Store the plurals of words.
+
+        Args:
+            pairs: (word, plural) pairs from a validated LLM answer
+        """
+        now = time.time()
+        rows = [
+            (word, plural, now)
+            for word, plural in pairs
+            if word and plural and word not in self.overrides
+        ]
+        if not rows:
+            return
+        with self._lock:
+            db = self._connect()
+            db.executemany(
+                "INSERT INTO plurals VALUES (?, ?, ?, 1) ON CONFLICT(word) DO UPDATE "
+                "SET plural = excluded.plural, learned_at = excluded.learned_at, "
+                "seen = seen + 1",
+                rows,
+            )
+            db.commit()
+            self.learned += len(rows)
+
+    def learn_fields(
+        self, input_fields: Dict[str, List[str]], output_fields: Dict[str, List[str]]
+    ) -> None:
+        """
+        Store the word pairs of a validated pluralization answer.
+
+        Args:
+            input_fields: Fields sent to the LLM
+            output_fields: Pluralized fields of the answer, with the same word counts
+        """
+        self.learn(
+            (word, plural)
+            for field, words in input_fields.items()
+            for word, plural in zip(words, output_fields.get(field, []))
+        )
+
+    def set_override(self, word: str, plural: str) -> None:
+        """
+        Add a manual override and save it to the overrides file.
+
+        Args:
+            word: Word as it appears in the entries
+            plural: Plural to use for the word
+        """
+        if not self.overrides_path:
+            raise ValueError("The plural lexicon has no overrides file")
+        self.overrides[word] = plural
+        directory = os.path.dirname(self.overrides_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.overrides_path, "w", encoding="utf-8") as f:
+            json.dump(self.overrides, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+    def close(self) -> None:
+        """Close the lexicon file."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def log_summary(self) -> None:
+        """Log the share of words answered by the lexicon."""
+        lookups = self.hits + self.misses
+        if not lookups and not self.learned:
+            return
+        logger.info(
+            "Plural lexicon: %d of %d words known (%.0f%%), %d learned, "
+            "%d words and %d overrides in lexicon",
+            self.hits,
+            lookups,
+            100.0 * self.hits / lookups if lookups else 0.0,
+            self.learned,
+            self.word_count,
+            len(self.overrides),
+        )
+
+
+def split_known_words(
+    lexicon: Optional[PluralLexicon], fields_dict: Dict[str, List[str]]
+) -> Tuple[Dict[str, str], Dict[str, List[str]]]:
+    """
+    Separate the words of an entry the lexicon knows from those the LLM must answer.
+
+    Args:
+        lexicon: The plural lexicon, or None
+        fields_dict: Dictionary with products, machines, and process_type lists
+
+    Returns:
+        Tuple[Dict[str, str], Dict[str, List[str]]]:
+            - Plural of every known word
+            - The fields with only the unknown words; fields without unknown
+              words are left out (unchanged fields_dict if no word is known)
+    """
+    if lexicon is None:
+        return {}, fields_dict
+    known = lexicon.lookup(word for words in fields_dict.values() for word in words)
+    if not known:
+        return {}, fields_dict
+    unknown_fields = {}
+    for field, words in fields_dict.items():
+        unknown = [word for word in words if word not in known]
+        if unknown:
+            unknown_fields[field] = unknown
+    return known, unknown_fields
+
+
+def merge_known_words(
+    fields_dict: Dict[str, List[str]],
+    known: Dict[str, str],
+    answered_fields: Dict[str, List[str]],
+) -> Dict[str, List[str]]:
+    """
+    Combine the plurals of known words with the LLM's answer for the unknown ones.
+
+    Args:
+        fields_dict: The entry's fields
+        known: Plural of every known word from split_known_words()
+        answered_fields: Validated answer for the unknown words, in order
+
+    Returns:
+        Dict[str, List[str]]: Pluralized fields in the order of fields_dict
+    """
+    merged = {}
+    for field, words in fields_dict.items():
+        answered = iter(answered_fields.get(field, []))
+        merged[field] = [
+            known[word] if word in known else next(answered, word) for word in words
+        ]
+    return merged
+
+
+def seed_from_directories(
+    lexicon: PluralLexicon, input_dir: str, output_dir: str
+) -> int:
+    """
+    Learn the plurals of a past pluralization run from its input and output files.
+
+    Entries are paired by position in files of the same name; fields whose word
+    counts differ between input and output, or that were left unchanged (failed
+    pluralizations), are skipped. Compound words are
+    cleaned like pluralize_with_llm does before they are learned.
+
+    Args:
+        lexicon: The lexicon to seed
+        input_dir: Directory with the JSON files given to pluralize_with_llm
+        output_dir: Directory with the pluralized JSON files
+
+    Returns:
+        int: Number of word pairs learned
+    """
+    from webcrawl.pluralize_with_llm import clean_compound_words
+
+    pairs: List[Tuple[str, str]] = []
+    for filename in sorted(os.listdir(input_dir)):
+        output_path = os.path.join(output_dir, filename)
+        if not filename.endswith(".json") or not os.path.exists(output_path):
+            continue
+        try:
+            with open(os.path.join(input_dir, filename), "r", encoding="utf-8") as f:
+                inputs = json.load(f)
+            with open(output_path, "r", encoding="utf-8") as f:
+                outputs = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Skipping {filename}: {e}")
+            continue
+        if not isinstance(inputs, list) or not isinstance(outputs, list):
+            continue
+        for input_entry, output_entry in zip(inputs, outputs):
+            for field in FIELDS:
+                words = input_entry.get(field)
+                plurals = output_entry.get(field)
+                if not isinstance(words, list) or not isinstance(plurals, list):
+                    continue
+                words = clean_compound_words({field: [str(w) for w in words if w]})[0]
+                words = words.get(field, [])
+                if words and len(words) == len(plurals) and words != plurals:
+                    pairs.extend(zip(words, (str(p) for p in plurals)))
+    lexicon.learn(pairs)
+    return len(pairs)
+
+
+_plural_lexicon: Optional[PluralLexicon] = None
+
+
+def configure_plural_lexicon(
+    config: Optional[Dict[str, Any]],
+) -> Optional[PluralLexicon]:
+    """
+    Set up the process-wide plural lexicon.
+
+    Args:
+        config: The plural_lexicon section of the pipeline config; None or
+            {"enabled": false} disables the lexicon
+
+    Returns:
+        Optional[PluralLexicon]: The configured lexicon, or None if it is disabled
+    """
+    global _plural_lexicon
+    if _plural_lexicon is not None:
+        _plural_lexicon.close()
+    _plural_lexicon = PluralLexicon.from_config(config) if config is not None else None
+    return _plural_lexicon
+
+
+def get_plural_lexicon() -> Optional[PluralLexicon]:
+    """
+    Get the process-wide plural lexicon.
+
+    Returns:
+        Optional[PluralLexicon]: The lexicon, or None if it is not configured
+    """
+    return _plural_lexicon
+
+
+def main() -> None:
+    """Seed the lexicon from past runs or add manual overrides."""
+    parser = argparse.ArgumentParser(
+        description="Manage the German plural lexicon of pluralize_with_llm."
+    )
+    parser.add_argument(
+        "--lexicon", default=PLURAL_LEXICON_FILENAME, help="Path of the lexicon file"
+    )
+    parser.add_argument(
+        "--overrides",
+        default=PLURAL_OVERRIDES_FILENAME,
+        help="Path of the JSON file with manual overrides",
+    )
+    parser.add_argument(
+        "--seed",
+        nargs=2,
+        metavar=("INPUT_DIR", "OUTPUT_DIR"),
+        help="Learn the plurals of a past run from its input and pluralized output directories",
+    )
+    parser.add_argument(
+        "--override",
+        nargs=2,
+        action="append",
+        default=[],
+        metavar=("WORD", "PLURAL"),
+        help="Always use PLURAL for WORD (can be repeated)",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    lexicon = PluralLexicon(args.lexicon, overrides_path=args.overrides)
+    for word, plural in args.override:
+        lexicon.set_override(word, plural)
+    if args.seed:
+        learned = seed_from_directories(lexicon, *args.seed)
+        logger.info(f"Learned {learned} word pairs from {args.seed[1]}")
+    logger.info(
+        f"{lexicon.word_count} words and {len(lexicon.overrides)} overrides in lexicon"
+    )
+    lexicon.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,30 @@
 #!/usr/bin/env python3
 import argparse
+import itertools
 import json
 import logging
 import os
 import re
-from typing import Any, Dict, List, Optional, Tuple
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import litellm
 from litellm import completion
 from litellm.exceptions import JSONSchemaValidationError
 from pydantic import BaseModel, Field
 
+from webcrawl.llm_cache import get_llm_cache, llm_cache_key
+from webcrawl.llm_executor import (
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    configure_llm_executor,
+    get_llm_executor,
+)
+from webcrawl.plural_lexicon import (
+    get_plural_lexicon,
+    merge_known_words,
+    split_known_words,
+)
+
 # Set up module-specific logger
 logger = logging.getLogger("webcrawl.pluralize_with_llm.py")
 
@@ -20,6 +34,10 @@ failed_files = []
 # Track compound word modifications for reporting
 compound_word_stats = {"files_affected": set(), "words_modified": []}
 
+# Track batch requests and the entries retried individually
+batch_stats = {"requests": 0, "cached": 0, "entries": 0, "retried": 0}
+_stats_lock = threading.Lock()
+
 
 class PluralizedFields(BaseModel):
     """
@@ -39,6 +57,37 @@ class PluralizedFields(BaseModel):
     )
 
 
+class PluralizedEntry(PluralizedFields):
+    """
+    The pluralized fields of one entry of a batch request, keyed by the entry id.
+    """
+
+    id: str = Field(description="Id of the input entry")
+
+
+class PluralizedBatch(BaseModel):
+    """
+    A model representing the answer to a batch request with several entries.
+    """
+
+    entries: List[PluralizedEntry] = Field(
+        default_factory=list, description="Pluralized fields of every input entry"
+    )
+
+
+# Version of the pluralization prompt, part of the LLM cache key
+PLURALIZATION_PROMPT_VERSION = "1"
+BATCH_PLURALIZATION_PROMPT_VERSION = "1"
+
+# Entries packed into one LLM request; 1 sends one request per entry
+DEFAULT_BATCH_SIZE = 20
+# Estimated tokens of the input entries of one batch request
+DEFAULT_BATCH_TOKEN_BUDGET = 1500
+# Rough number of characters per token of the JSON input
+CHARS_PER_TOKEN = 4
+# The answer to a batch request is about as long as its input
+BATCH_MAX_TOKENS = 4000
+
 # Default temperature settings for retries
 DEFAULT_TEMPERATURES = [0.5, 0.1, 1.0]
 
@@ -341,6 +390,47 @@ def validate_pluralized_response(
     return True, ""
 
 
+def create_batch_pluralization_prompt(
+    entries: Dict[str, Dict[str, List[str]]],
+) -> str:
+    """
+    Create a prompt for the LLM to pluralize the words of several entries at once.
+
+    The instructions are sent once for all entries; each entry is keyed by its id.
+
+    Args:
+        entries (Dict[str, Dict[str, List[str]]]): Fields of each entry, keyed by entry id
+
+    Returns:
+        str: The prompt for the LLM
+    """
+    prompt = """Please translate each of the following words into their correct German plural forms.
+    The input is a JSON object mapping entry ids to entries with the fields products, machines and process_type.
+    Return your answer as a JSON object with one item per input entry, using the entry id of the input,
+    containing only the pluralized German words in their respective categories.
+    Do not use tools.
+
+    Each input word must be translated and pluralized into German, with exactly one output word per input, in the same order.
+    Ensure you include all entries and all fields of each entry, even if they are empty lists.
+    Output must be valid JSON with the structure: { "entries": [{ "id": "...", "products": [...], "machines": [...], "process_type": [...] }, ...] }.
+
+    Do not include any explanations, thoughts, or extra text.
+
+    Here is the input:
+    """
+
+    json_input = {
+        entry_id: {
+            field: fields_dict.get(field, [])
+            for field in ["products", "machines", "process_type"]
+        }
+        for entry_id, fields_dict in entries.items()
+    }
+    prompt += json.dumps(json_input, ensure_ascii=False)
+
+    return prompt
+
+
 def pluralize_with_llm(
     fields_dict: Dict[str, List[str]],
     file_path: Optional[str] = None,
@@ -377,8 +467,18 @@ def pluralize_with_llm(
     if modified_pairs_by_field and file_path:
         track_cleaning_stats(modified_pairs_by_field, file_path)
 
+    # Only words missing from the plural lexicon are sent to the LLM
+    lexicon = get_plural_lexicon()
+    known_words, request_fields = split_known_words(lexicon, cleaned_fields)
+    if known_words and not any(request_fields.values()):
+        return finalize_pluralized_fields(
+            cleaned_fields,
+            merge_known_words(cleaned_fields, known_words, {}),
+            file_path,
+        )
+
     # Create a structured prompt for the LLM
-    prompt = create_pluralization_prompt(cleaned_fields)
+    prompt = create_pluralization_prompt(request_fields)
 
     # Set up models for fallbacks
     if models is None:
@@ -396,50 +496,49 @@ def pluralize_with_llm(
     
     logger.info(f"Attempting pluralization with model fallbacks: {primary_model} -> {fallback_models}")
     
-    try:
-        # Call the LLM using LiteLLM with automatic model fallbacks
-        response = completion(
-            model=primary_model,
-            fallbacks=fallback_models,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=temperature,
-            max_tokens=1000,
-            response_format=PluralizedFields,
-            num_retries=2,  # Built-in retries per model
-            timeout=45,     # 45 seconds per model attempt
-        )
+    request = {
+        "fallbacks": fallback_models,
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": temperature,
+        "max_tokens": 1000,
+        "response_format": PluralizedFields,
+        "num_retries": 2,  # Built-in retries per model
+        "timeout": 45,     # 45 seconds per model attempt
+    }
+    cache = get_llm_cache()
+    cache_key = llm_cache_key(PLURALIZATION_PROMPT_VERSION, primary_model, **request)
 
-        # Extract the content directly as a dictionary
-        content = response.choices[0].message.content  # type: ignore
-        if content is None:
-            raise ValueError("LLM response content is None")
+    try:
+        content = cache.get(cache_key) if cache else None
+        from_cache = content is not None
+        if not from_cache:
+            # Call the LLM using LiteLLM with automatic model fallbacks
+            get_llm_executor().throttle()
+            response = completion(model=primary_model, **request)
+
+            # Extract the content directly as a dictionary
+            content = response.choices[0].message.content  # type: ignore
+            if content is None:
+                raise ValueError("LLM response content is None")
 
         output_fields = json.loads(content)
 
         # Validate response structure and word counts
         is_valid, error_message = validate_pluralized_response(
-            cleaned_fields, output_fields
+            request_fields, output_fields
         )
 
         if is_valid:
-            # Run clean_compound_words again on the response to handle any compound words
-            final_cleaned_fields, final_modified_pairs = clean_compound_words(
-                output_fields
-            )
-
-            # Track statistics for any compounds cleaned in the response
-            if final_modified_pairs and file_path:
-                track_cleaning_stats(final_modified_pairs, file_path)
-
-            # Create result from the cleaned response
-            result = {}
-            for field in cleaned_fields:
-                if field in final_cleaned_fields:
-                    result[field] = final_cleaned_fields[field]
-                else:
-                    result[field] = cleaned_fields[field]  # Use original if missing
-
-            return result
+            if cache and not from_cache:
+                cache.put(cache_key, primary_model, content)
+            if lexicon:
+                lexicon.learn_fields(request_fields, output_fields)
+            if known_words:
+                output_fields = merge_known_words(
+                    cleaned_fields, known_words, output_fields
+                )
+
+            return finalize_pluralized_fields(cleaned_fields, output_fields, file_path)
         else:
             # If validation failed, log and return cleaned fields
             logger.warning(f"Validation error: {error_message}")
@@ -467,6 +566,247 @@ def pluralize_with_llm(
     return cleaned_fields  # Return cleaned words even if pluralization failed
 
 
+def finalize_pluralized_fields(
+    cleaned_fields: Dict[str, List[str]],
+    output_fields: Dict[str, List[str]],
+    file_path: Optional[str] = None,
+) -> Dict[str, List[str]]:
+    """
+    Build the result for an entry from a validated LLM response.
+
+    Args:
+        cleaned_fields (Dict[str, List[str]]): Input fields after compound word cleaning
+        output_fields (Dict[str, List[str]]): Validated pluralized fields from the LLM
+        file_path (str, optional): Path to the file being processed
+
+    Returns:
+        Dict[str, List[str]]: Dictionary with pluralized words for each input field
+    """
+    # Run clean_compound_words again on the response to handle any compound words
+    final_cleaned_fields, final_modified_pairs = clean_compound_words(output_fields)
+
+    # Track statistics for any compounds cleaned in the response
+    if final_modified_pairs and file_path:
+        track_cleaning_stats(final_modified_pairs, file_path)
+
+    # Create result from the cleaned response
+    result = {}
+    for field in cleaned_fields:
+        if field in final_cleaned_fields:
+            result[field] = final_cleaned_fields[field]
+        else:
+            result[field] = cleaned_fields[field]  # Use original if missing
+
+    return result
+
+
+def estimate_tokens(fields_dict: Dict[str, List[str]]) -> int:
+    """
+    Estimate the number of prompt tokens of an entry's fields.
+
+    Args:
+        fields_dict (Dict[str, List[str]]): Dictionary with products, machines, and process_type lists
+
+    Returns:
+        int: Estimated number of tokens
+    """
+    return len(json.dumps(fields_dict, ensure_ascii=False)) // CHARS_PER_TOKEN + 1
+
+
+def create_batches(
+    items: List[Tuple[str, Dict[str, List[str]]]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    token_budget: int = DEFAULT_BATCH_TOKEN_BUDGET,
+) -> List[List[Tuple[str, Dict[str, List[str]]]]]:
+    """
+    Split entries into consecutive batches for batch requests.
+
+    A batch holds at most batch_size entries whose estimated tokens stay within
+    token_budget; an entry exceeding the budget on its own gets its own batch.
+
+    Args:
+        items (List[Tuple[str, Dict[str, List[str]]]]): (file path, fields) of each entry
+        batch_size (int): Maximum number of entries per batch
+        token_budget (int): Maximum estimated tokens of the entries of a batch
+
+    Returns:
+        List[List[Tuple[str, Dict[str, List[str]]]]]: The batches, in entry order
+    """
+    batches = []
+    batch: List[Tuple[str, Dict[str, List[str]]]] = []
+    batch_tokens = 0
+    for item in items:
+        tokens = estimate_tokens(item[1])
+        if batch and (len(batch) >= batch_size or batch_tokens + tokens > token_budget):
+            batches.append(batch)
+            batch, batch_tokens = [], 0
+        batch.append(item)
+        batch_tokens += tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def pluralize_batch_with_llm(
+    batch: List[Tuple[str, Dict[str, List[str]]]],
+    temperatures: Optional[List[float]] = None,
+    models: Optional[List[str]] = None,
+) -> List[Dict[str, List[str]]]:
+    """
+    Pluralize the fields of several entries with a single LLM request.
+
+    The response is keyed by entry id and validated per entry with
+    validate_pluralized_response(); entries missing from the response or
+    failing validation are retried individually with pluralize_with_llm().
+
+    Args:
+        batch (List[Tuple[str, Dict[str, List[str]]]]): (file path, fields) of each entry
+        temperatures (List[float], optional): DEPRECATED - passed on to individual retries
+        models (List[str], optional): List of models to use as fallbacks (ordered by preference)
+
+    Returns:
+        List[Dict[str, List[str]]]: Pluralized fields of each entry, in batch order
+    """
+    if len(batch) == 1:
+        file_path, fields_dict = batch[0]
+        return [pluralize_with_llm(fields_dict, file_path, temperatures, models)]
+
+    cleaned = [clean_compound_words(fields_dict) for _, fields_dict in batch]
+    # Only words missing from the plural lexicon are sent to the LLM
+    lexicon = get_plural_lexicon()
+    split = [split_known_words(lexicon, cleaned_fields) for cleaned_fields, _ in cleaned]
+    # Entry ids are the positions in the batch
+    request_entries = {
+        str(i): request_fields
+        for i, (_, request_fields) in enumerate(split, 1)
+        if any(request_fields.values())
+    }
+    if not request_entries:
+        return [
+            _pluralize_known_entry(cleaned_fields, modified_pairs, known_words, file_path)
+            for (file_path, _), (cleaned_fields, modified_pairs), (known_words, _) in zip(
+                batch, cleaned, split
+            )
+        ]
+    prompt = create_batch_pluralization_prompt(request_entries)
+
+    if models is None:
+        models = DEFAULT_MODELS.copy()
+    litellm.enable_json_schema_validation = True
+    primary_model = models[0] if models else "bedrock/amazon.nova-pro-v1:0"
+    fallback_models = models[1:] if len(models) > 1 else []
+
+    logger.info(
+        f"Pluralizing a batch of {len(request_entries)} entries with {primary_model}"
+    )
+
+    request = {
+        "fallbacks": fallback_models,
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": 0.3,
+        "max_tokens": BATCH_MAX_TOKENS,
+        "response_format": PluralizedBatch,
+        "num_retries": 2,
+        "timeout": 90,
+    }
+    cache = get_llm_cache()
+    cache_key = llm_cache_key(BATCH_PLURALIZATION_PROMPT_VERSION, primary_model, **request)
+
+    answers: Dict[str, Dict[str, Any]] = {}
+    content = None
+    from_cache = False
+    try:
+        content = cache.get(cache_key) if cache else None
+        from_cache = content is not None
+        if not from_cache:
+            get_llm_executor().throttle()
+            response = completion(model=primary_model, **request)
+            content = response.choices[0].message.content  # type: ignore
+            if content is None:
+                raise ValueError("LLM response content is None")
+        answers = {
+            str(entry.get("id")): entry
+            for entry in json.loads(content).get("entries", [])
+            if isinstance(entry, dict)
+        }
+    except Exception as e:
+        message = str(e).splitlines()[0] if str(e) else type(e).__name__
+        logger.warning(
+            f"Batch pluralization of {len(request_entries)} entries failed: {message}"
+        )
+
+    results = []
+    retried = 0
+    for i, (
+        (file_path, fields_dict),
+        (cleaned_fields, modified_pairs),
+        (known_words, request_fields),
+    ) in enumerate(zip(batch, cleaned, split), 1):
+        if str(i) not in request_entries:
+            results.append(
+                _pluralize_known_entry(
+                    cleaned_fields, modified_pairs, known_words, file_path
+                )
+            )
+            continue
+
+        output_fields = answers.get(str(i))
+        if output_fields is None:
+            is_valid, error_message = False, "Missing entry in response"
+        else:
+            is_valid, error_message = validate_pluralized_response(
+                request_fields, output_fields
+            )
+
+        if is_valid:
+            if modified_pairs and file_path:
+                track_cleaning_stats(modified_pairs, file_path)
+            if lexicon:
+                lexicon.learn_fields(request_fields, output_fields)
+            if known_words:
+                output_fields = merge_known_words(
+                    cleaned_fields, known_words, output_fields
+                )
+            results.append(
+                finalize_pluralized_fields(cleaned_fields, output_fields, file_path)
+            )
+        else:
+            if answers:
+                logger.warning(
+                    f"Validation error for entry {i} of batch: {error_message}, retrying individually"
+                )
+            retried += 1
+            results.append(
+                pluralize_with_llm(fields_dict, file_path, temperatures, models)
+            )
+
+    # Only answers that were usable for every entry are reused
+    if cache and not from_cache and answers and not retried:
+        cache.put(cache_key, primary_model, content)
+
+    with _stats_lock:
+        # Batches answered from the LLM cache are not LLM requests
+        batch_stats["cached" if from_cache else "requests"] += 1
+        batch_stats["entries"] += len(request_entries)
+        batch_stats["retried"] += retried
+
+    return results
+
+
+def _pluralize_known_entry(
+    cleaned_fields: Dict[str, List[str]],
+    modified_pairs: Dict[str, List[Tuple[str, str]]],
+    known_words: Dict[str, str],
+    file_path: Optional[str],
+) -> Dict[str, List[str]]:
+    """Build the result of a batch entry whose words are all in the plural lexicon."""
+    if modified_pairs and file_path:
+        track_cleaning_stats(modified_pairs, file_path)
+    return finalize_pluralized_fields(
+        cleaned_fields, merge_known_words(cleaned_fields, known_words, {}), file_path
+    )
+
+
 def extract_fields_from_entry(entry: Dict[str, Any]) -> Dict[str, List[str]]:
     """
     Extract the relevant fields from a single entry in the JSON file.
@@ -511,17 +851,46 @@ def update_entry_with_pluralized_fields(
     return updated_entry
 
 
-def process_json_file(
-    input_file_path: str,
-    output_file_path: str,
+def pluralize_entries(
+    items: List[Tuple[str, Dict[str, List[str]]]],
     temperatures: Optional[List[float]] = None,
-) -> None:
+    batch_size: int = 1,
+    batch_token_budget: int = DEFAULT_BATCH_TOKEN_BUDGET,
+) -> Iterator[Dict[str, List[str]]]:
     """
-    Process a single JSON file, pluralizing specific fields.
+    Pluralize the fields of entries concurrently, yielding the results in entry order.
+
+    Args:
+        items (List[Tuple[str, Dict[str, List[str]]]]): (file path, fields) of each entry
+        temperatures (List[float], optional): List of temperature values for each retry
+        batch_size (int): Maximum number of entries per LLM request; 1 sends one
+            request per entry
+        batch_token_budget (int): Maximum estimated tokens of the entries of a batch request
+
+    Returns:
+        Iterator[Dict[str, List[str]]]: Pluralized fields of each entry
+    """
+    executor = get_llm_executor()
+    if batch_size <= 1:
+        return executor.imap(
+            lambda item: pluralize_with_llm(item[1], item[0], temperatures), items
+        )
+    batches = create_batches(items, batch_size, batch_token_budget)
+    return itertools.chain.from_iterable(
+        executor.imap(
+            lambda batch: pluralize_batch_with_llm(batch, temperatures), batches
+        )
+    )
+
+
+def load_json_entries(input_file_path: str) -> List[Dict[str, Any]]:
+    """
+    Load the entries of a JSON file.
+
     Args:
         input_file_path (str): Path to the input JSON file.
-        output_file_path (str): Path to save the processed JSON file.
-        temperatures (List[float], optional): List of temperature values for each retry.
+    Returns:
+        List[Dict[str, Any]]: The entries of the file.
     Raises:
         ValueError: If the JSON is malformed or has invalid structure.
     """
@@ -537,7 +906,27 @@ def process_json_file(
         logger.error(f"Expected JSON array in {input_file_path}, but got {type(data)}")
         failed_files.append((input_file_path, "invalid_json_structure"))
         raise ValueError(f"Invalid JSON structure in file: {input_file_path}")
+    return data
+
 
+def write_pluralized_entries(
+    data: List[Dict[str, Any]],
+    fields_per_entry: List[Dict[str, List[str]]],
+    pluralized: Iterator[Dict[str, List[str]]],
+    input_file_path: str,
+    output_file_path: str,
+) -> None:
+    """
+    Update the entries of a file with their pluralized fields and save them.
+
+    Args:
+        data (List[Dict[str, Any]]): The entries of the input file
+        fields_per_entry (List[Dict[str, List[str]]]): Extracted fields of each entry
+        pluralized (Iterator[Dict[str, List[str]]]): Pluralized fields of each entry
+            with non-empty fields, in entry order
+        input_file_path (str): Path to the input JSON file.
+        output_file_path (str): Path to save the processed JSON file.
+    """
     total_entries = len(data)
     # Process each entry in the JSON file
     for i, entry in enumerate(data):
@@ -549,14 +938,9 @@ def process_json_file(
             f"PROGRESS:webcrawl:pluralize_llm_entry:{current_entry_num}/{total_entries}:Processing entry for {company_name} in file {os.path.basename(input_file_path)}"
         )
 
-        # Extract fields to be pluralized
-        fields_dict = extract_fields_from_entry(entry)
-
-        if fields_dict:
-            # Pluralize all fields at once
-            pluralized_fields = pluralize_with_llm(
-                fields_dict, input_file_path, temperatures
-            )
+        if fields_per_entry[i]:
+            # All fields of the entry are pluralized at once
+            pluralized_fields = next(pluralized)
 
             # Update the entry with pluralized fields
             data[i] = update_entry_with_pluralized_fields(entry, pluralized_fields)
@@ -571,16 +955,59 @@ def process_json_file(
     logger.info(f"Processed {input_file_path} -> {output_file_path}")
 
 
+def process_json_file(
+    input_file_path: str,
+    output_file_path: str,
+    temperatures: Optional[List[float]] = None,
+    batch_size: int = 1,
+    batch_token_budget: int = DEFAULT_BATCH_TOKEN_BUDGET,
+) -> None:
+    """
+    Process a single JSON file, pluralizing specific fields.
+    Args:
+        input_file_path (str): Path to the input JSON file.
+        output_file_path (str): Path to save the processed JSON file.
+        temperatures (List[float], optional): List of temperature values for each retry.
+        batch_size (int): Maximum number of entries per LLM request; 1 sends one request per entry.
+        batch_token_budget (int): Maximum estimated tokens of the entries of a batch request.
+    Raises:
+        ValueError: If the JSON is malformed or has invalid structure.
+    """
+    data = load_json_entries(input_file_path)
+    # Extract fields to be pluralized
+    fields_per_entry = [extract_fields_from_entry(entry) for entry in data]
+    # Pluralize the entries concurrently, in entry order
+    pluralized = pluralize_entries(
+        [(input_file_path, fields_dict) for fields_dict in fields_per_entry if fields_dict],
+        temperatures,
+        batch_size,
+        batch_token_budget,
+    )
+    write_pluralized_entries(
+        data, fields_per_entry, pluralized, input_file_path, output_file_path
+    )
+
+
 def process_directory(
-    input_dir: str, output_dir: str, temperatures: Optional[List[float]] = None
+    input_dir: str,
+    output_dir: str,
+    temperatures: Optional[List[float]] = None,
+    batch_size: int = 1,
+    batch_token_budget: int = DEFAULT_BATCH_TOKEN_BUDGET,
 ) -> str:
     """
     Process all JSON files in the input directory and save results to the output directory.
 
+    The entries of all files are pluralized concurrently, as the files usually
+    hold a single company each; with batch_size > 1 they are packed into shared
+    batch requests.
+
     Args:
         input_dir (str): Directory containing JSON files to process.
         output_dir (str): Directory to save processed JSON files.
         temperatures (List[float], optional): List of temperature values for each retry.
+        batch_size (int): Maximum number of entries per LLM request; 1 sends one request per entry.
+        batch_token_budget (int): Maximum estimated tokens of the entries of a batch request.
     Returns:
         str: The output directory path.
     Raises:
@@ -606,14 +1033,37 @@ def process_directory(
             logger.info(f"No JSON files found in {input_dir}")
             return output_dir
         logger.info(f"Found {total_files} JSON files to process")
-        for i, filename in enumerate(json_files, 1):
-            input_file_path = os.path.join(input_dir, filename)
-            output_file_path = os.path.join(output_dir, filename)
-            # Log progress for each file
+        # The entries of all files are pluralized concurrently (in shared batch
+        # requests with batch_size > 1); the files are written in order from
+        # this loop, so the file and entry PROGRESS lines stay in order
+        files = []
+        for filename in json_files:
+            data = load_json_entries(os.path.join(input_dir, filename))
+            files.append(
+                (filename, data, [extract_fields_from_entry(e) for e in data])
+            )
+        pluralized = pluralize_entries(
+            [
+                (os.path.join(input_dir, filename), fields_dict)
+                for filename, _, fields_per_entry in files
+                for fields_dict in fields_per_entry
+                if fields_dict
+            ],
+            temperatures,
+            batch_size,
+            batch_token_budget,
+        )
+        for i, (filename, data, fields_per_entry) in enumerate(files, 1):
             logger.info(
                 f"PROGRESS:webcrawl:pluralize_llm_file:{i}/{total_files}:Processing file {filename}"
             )
-            process_json_file(input_file_path, output_file_path, temperatures)
+            write_pluralized_entries(
+                data,
+                fields_per_entry,
+                pluralized,
+                os.path.join(input_dir, filename),
+                os.path.join(output_dir, filename),
+            )
     except Exception as e:
         logger.error(f"Error accessing input directory: {e}")
         raise
@@ -630,6 +1080,12 @@ def process_directory(
                 f"  - {item['file']} ({item['field']}): '{item['original']}' → '{item['cleaned']}'"
             )
 
+    if batch_stats["requests"] or batch_stats["cached"]:
+        logger.info(
+            f"Batch pluralization: {batch_stats['entries']} entries in {batch_stats['requests']} requests "
+            f"and {batch_stats['cached']} cached batches, {batch_stats['retried']} retried individually"
+        )
+
     # Log summary of failed files
     if failed_files:
         logger.info("===== FAILURE SUMMARY =====")
@@ -651,7 +1107,11 @@ def process_directory(
 
 
 def process_file_or_directory(
-    input_path: str, output_path: str, temperatures: Optional[List[float]] = None
+    input_path: str,
+    output_path: str,
+    temperatures: Optional[List[float]] = None,
+    batch_size: int = 1,
+    batch_token_budget: int = DEFAULT_BATCH_TOKEN_BUDGET,
 ) -> str:
     """
     Process a file or directory based on the input path.
@@ -659,6 +1119,8 @@ def process_file_or_directory(
         input_path (str): Path to an input file or directory
         output_path (str): Path to an output file or directory
         temperatures (List[float], optional): List of temperature values for each retry
+        batch_size (int): Maximum number of entries per LLM request; 1 sends one request per entry
+        batch_token_budget (int): Maximum estimated tokens of the entries of a batch request
     Returns:
         str: The output file or directory path
     Raises:
@@ -671,11 +1133,15 @@ def process_file_or_directory(
             logger.error(f"Input file must be a JSON file: {input_path}")
             raise ValueError(f"Input file must be a JSON file: {input_path}")
         logger.info(f"Processing single file: {input_path}")
-        process_json_file(input_path, output_path, temperatures)
+        process_json_file(
+            input_path, output_path, temperatures, batch_size, batch_token_budget
+        )
         return output_path
     elif os.path.isdir(input_path):
         logger.info(f"Processing directory: {input_path}")
-        return process_directory(input_path, output_path, temperatures)
+        return process_directory(
+            input_path, output_path, temperatures, batch_size, batch_token_budget
+        )
     else:
         logger.error(f"Input path does not exist: {input_path}")
         raise FileNotFoundError(f"Input path does not exist: {input_path}")
@@ -718,6 +1184,24 @@ def main() -> str:
         default="INFO",
         help="Set the logging level",
     )
+    parser.add_argument(
+        "--max-concurrent",
+        type=int,
+        default=DEFAULT_MAX_CONCURRENT_REQUESTS,
+        help="Maximum number of LLM requests in flight",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="Maximum number of entries per LLM request (1 sends one request per entry)",
+    )
+    parser.add_argument(
+        "--batch-token-budget",
+        type=int,
+        default=DEFAULT_BATCH_TOKEN_BUDGET,
+        help="Maximum estimated tokens of the entries of a batch request",
+    )
     args = parser.parse_args()
     log_level = getattr(logging, args.log_level)
     setup_logging(log_level)
@@ -728,7 +1212,17 @@ def main() -> str:
     if os.path.isdir(args.input) and os.path.isfile(args.output):
         logger.error("When input is a directory, output must be a directory path")
         raise ValueError("When input is a directory, output must be a directory path")
-    output_path = process_file_or_directory(args.input, args.output, args.temperatures)
+    configure_llm_executor({"max_concurrent_requests": args.max_concurrent})
+    try:
+        output_path = process_file_or_directory(
+            args.input,
+            args.output,
+            args.temperatures,
+            args.batch_size,
+            args.batch_token_budget,
+        )
+    finally:
+        configure_llm_executor(None)
     logger.info("Pluralization process completed")
     return output_path
 
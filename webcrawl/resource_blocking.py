@@ -0,0 +1,330 @@
+"""
+Request interception for headless crawls.
+
+BrowserConfig(text_mode=True) and excluded_tags only remove content after it was
+downloaded; the browser still fetches trackers, fonts, videos and third-party
+scripts on every render. ResourceBlocker installs a Playwright route on every
+page (crawl4ai 'on_page_context_created' hook) and aborts requests according to
+a ResourcePolicy:
+
+- requests to blocked hosts (analytics, ads, web fonts) are aborted
+- requests of blocked resource types (images, media, fonts by default) are aborted
+- scripts from other sites are aborted, except from allowed hosts (library CDNs)
+- documents (the page itself and its frames) are never blocked
+
+Allowed requests fall through to crawl4ai's own text-mode routes. After each page
+('before_return_html' hook) the number of blocked requests and an estimate of the
+bytes saved are logged. Aborted requests are never answered, so their real size
+is unknown; the estimate assumes a typical size per resource type
+(ESTIMATED_BYTES_BY_TYPE) and is labelled as such in the log. The policy is
+configurable, e.g. from the "resource_blocking" entry of the webcrawl section in
+config.json:
+
+    "resource_blocking": {
+        "blocked_resource_types": ["image", "media", "font", "stylesheet"],
+        "allowed_hosts": ["cdn.example-shop.de"]
+    }
+"""
+
+import logging
+import weakref
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+from webcrawl.domain_scheduler import get_host
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BLOCKED_RESOURCE_TYPES = ["image", "media", "font"]
+DEFAULT_BLOCKED_HOSTS = [
+    # Analytics and tag managers
+    "google-analytics.com",
+    "googletagmanager.com",
+    "analytics.google.com",
+    "hotjar.com",
+    "clarity.ms",
+    "etracker.com",
+    "etracker.de",
+    "matomo.cloud",
+    "mouseflow.com",
+    "leadinfo.net",
+    "bat.bing.com",
+    # Advertising and social pixels
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "facebook.net",
+    "connect.facebook.com",
+    "licdn.com",
+    "ads.linkedin.com",
+    # Web fonts
+    "fonts.googleapis.com",
+    "fonts.gstatic.com",
+    "use.typekit.net",
+]
+# Off-site scripts from these hosts are still loaded (JS libraries some sites need)
+DEFAULT_ALLOWED_HOSTS = [
+    "code.jquery.com",
+    "ajax.googleapis.com",
+    "cdnjs.cloudflare.com",
+    "cdn.jsdelivr.net",
+    "unpkg.com",
+]
+DEFAULT_BLOCK_THIRD_PARTY_SCRIPTS = True
+
+# Typical transfer sizes used to estimate the bytes saved by a blocked request
+ESTIMATED_BYTES_BY_TYPE = {
+    "image": 50_000,
+    "media": 500_000,
+    "font": 40_000,
+    "script": 60_000,
+    "stylesheet": 30_000,
+    "xhr": 5_000,
+    "fetch": 5_000,
+}
+DEFAULT_ESTIMATED_BYTES = 10_000
+
+# Block reasons
+REASON_HOST = "blocked host"
+REASON_RESOURCE_TYPE = "resource type"
+REASON_THIRD_PARTY_SCRIPT = "third-party script"
+
+
+def _host_matches(host: str, patterns: List[str]) -> bool:
+    """Check whether host equals one of the patterns or is a subdomain of one."""
+    return any(host == pattern or host.endswith("." + pattern) for pattern in patterns)
+
+
+def is_same_site(request_host: str, page_host: str) -> bool:
+    """
+    Check whether a request goes to the site of the page (including subdomains).
+
+    Args:
+        request_host: Host of the request, as returned by get_host()
+        page_host: Host of the page, as returned by get_host()
+
+    Returns:
+        bool: True for the same host or a subdomain/parent domain of it
+    """
+    return (
+        request_host == page_host
+        or request_host.endswith("." + page_host)
+        or page_host.endswith("." + request_host)
+    )
+
+
+class ResourcePolicy:
+    """
+    Allow/deny policy for the requests a page makes.
+    """
+
+    def __init__(
+        self,
+        blocked_resource_types: Optional[List[str]] = None,
+        blocked_hosts: Optional[List[str]] = None,
+        allowed_hosts: Optional[List[str]] = None,
+        block_third_party_scripts: bool = DEFAULT_BLOCK_THIRD_PARTY_SCRIPTS,
+    ):
+        """
+        Args:
+            blocked_resource_types: Playwright resource types to abort
+                (default: DEFAULT_BLOCKED_RESOURCE_TYPES)
+            blocked_hosts: Hosts (and their subdomains) whose requests are aborted
+                (default: DEFAULT_BLOCKED_HOSTS)
+            allowed_hosts: Hosts that are never blocked (default: DEFAULT_ALLOWED_HOSTS)
+            block_third_party_scripts: Whether to abort scripts from other sites
+        """
+        self.blocked_resource_types = set(
+            DEFAULT_BLOCKED_RESOURCE_TYPES
+            if blocked_resource_types is None
+            else blocked_resource_types
+        )
+        if blocked_hosts is None:
+            blocked_hosts = DEFAULT_BLOCKED_HOSTS
+        if allowed_hosts is None:
+            allowed_hosts = DEFAULT_ALLOWED_HOSTS
+        self.blocked_hosts = [host.lower() for host in blocked_hosts]
+        self.allowed_hosts = [host.lower() for host in allowed_hosts]
+        self.block_third_party_scripts = block_third_party_scripts
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> "ResourcePolicy":
+        """
+        Build a policy from a config dict, falling back to defaults for missing keys.
+
+        Hosts listed under extra_blocked_hosts / extra_allowed_hosts are added to
+        the defaults; blocked_hosts / allowed_hosts replace them.
+
+        Args:
+            config: Dict with optional keys blocked_resource_types, blocked_hosts,
+                extra_blocked_hosts, allowed_hosts, extra_allowed_hosts and
+                block_third_party_scripts
+
+        Returns:
+            ResourcePolicy: Configured policy
+        """
+        config = config or {}
+        blocked_hosts = list(config.get("blocked_hosts", DEFAULT_BLOCKED_HOSTS))
+        blocked_hosts += config.get("extra_blocked_hosts", [])
+        allowed_hosts = list(config.get("allowed_hosts", DEFAULT_ALLOWED_HOSTS))
+        allowed_hosts += config.get("extra_allowed_hosts", [])
+        return cls(
+            blocked_resource_types=config.get("blocked_resource_types"),
+            blocked_hosts=blocked_hosts,
+            allowed_hosts=allowed_hosts,
+            block_third_party_scripts=config.get(
+                "block_third_party_scripts", DEFAULT_BLOCK_THIRD_PARTY_SCRIPTS
+            ),
+        )
+
+    def block_reason(
+        self, resource_type: str, request_url: str, page_url: str
+    ) -> Optional[str]:
+        """
+        Decide whether a request should be aborted.
+
+        Args:
+            resource_type: Playwright resource type (document, script, image, ...)
+            request_url: URL of the request
+            page_url: URL of the page making the request
+
+        Returns:
+            Optional[str]: Reason for blocking, or None to let the request through
+        """
+        if resource_type == "document":
+            return None
+        request_host = urlparse(request_url).netloc.lower().split(":")[0]
+        if _host_matches(request_host, self.allowed_hosts):
+            return None
+        if _host_matches(request_host, self.blocked_hosts):
+            return REASON_HOST
+        if resource_type in self.blocked_resource_types:
+            return REASON_RESOURCE_TYPE
+        if (
+            resource_type == "script"
+            and self.block_third_party_scripts
+            and page_url.startswith(("http://", "https://"))
+            and not is_same_site(get_host(request_url), get_host(page_url))
+        ):
+            return REASON_THIRD_PARTY_SCRIPT
+        return None
+
+
+class PageBlockStats:
+    """Blocked requests of a single page."""
+
+    def __init__(self):
+        self.blocked = 0
+        self.allowed = 0
+        # Typical sizes of the blocked requests, not measured transfers
+        self.estimated_bytes_saved = 0
+        self.reasons: Counter = Counter()
+
+
+class ResourceBlocker:
+    """
+    Install the resource policy on every page and report what was blocked.
+
+    Usage:
+        blocker = ResourceBlocker(ResourcePolicy())
+        for hook_type, hook in blocker.hooks().items():
+            crawler.crawler_strategy.set_hook(hook_type, hook)
+    """
+
+    def __init__(self, policy: Optional[ResourcePolicy] = None):
+        """
+        Args:
+            policy: Policy deciding which requests are aborted
+                (default: ResourcePolicy())
+        """
+        self.policy = policy or ResourcePolicy()
+        self._page_stats: "weakref.WeakKeyDictionary[Any, PageBlockStats]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.pages = 0
+        self.total_blocked = 0
+        self.total_estimated_bytes_saved = 0
+
+    async def handle_route(self, route: Any, page: Any, stats: PageBlockStats) -> None:
+        """Abort or pass on a single intercepted request."""
+        request = route.request
+        reason = self.policy.block_reason(request.resource_type, request.url, page.url)
+        if reason is None:
+            stats.allowed += 1
+            # Let crawl4ai's own context routes (text mode) handle the request
+            await route.fallback()
+            return
+        stats.blocked += 1
+        stats.reasons[reason] += 1
+        stats.estimated_bytes_saved += ESTIMATED_BYTES_BY_TYPE.get(
+            request.resource_type, DEFAULT_ESTIMATED_BYTES
+        )
+        await route.abort("blockedbyclient")
+
+    async def on_page_context_created(
+        self, page: Any, context: Any = None, config: Any = None, **kwargs
+    ) -> Any:
+        """crawl4ai hook: intercept all requests of a newly created page."""
+        stats = PageBlockStats()
+        self._page_stats[page] = stats
+
+        async def route_handler(route):
+            try:
+                await self.handle_route(route, page, stats)
+            except Exception as e:
+                # The page may have been closed while the request was pending
+                logger.debug("Route handling failed for %s: %s", route.request.url, e)
+
+        await page.route("**/*", route_handler)
+        return page
+
+    async def before_return_html(
+        self,
+        page: Any,
+        html: str = "",
+        context: Any = None,
+        config: Any = None,
+        **kwargs,
+    ) -> Any:
+        """crawl4ai hook: report the blocked requests of the page."""
+        stats = self._page_stats.pop(page, None)
+        if stats is None:
+            return page
+        self.pages += 1
+        self.total_blocked += stats.blocked
+        self.total_estimated_bytes_saved += stats.estimated_bytes_saved
+        if stats.blocked:
+            logger.info(
+                "Blocked %d of %d requests on %s (~%.0f KB saved, estimated; %s)",
+                stats.blocked,
+                stats.blocked + stats.allowed,
+                page.url,
+                stats.estimated_bytes_saved / 1024,
+                dict(stats.reasons),
+            )
+        return page
+
+    def hooks(self) -> Dict[str, Callable]:
+        """
+        Get the crawl4ai hooks implementing the request interception.
+
+        Returns:
+            Dict[str, Callable]: Hook callables by hook type
+        """
+        return {
+            "on_page_context_created": self.on_page_context_created,
+            "before_return_html": self.before_return_html,
+        }
+
+    def log_summary(self) -> None:
+        """Log the blocked requests of all pages and the estimated bytes saved."""
+        if not self.pages:
+            return
+        logger.info(
+            "Resource blocking: %d requests blocked on %d pages "
+            "(~%.1f MB saved, estimated from typical resource sizes)",
+            self.total_blocked,
+            self.pages,
+            self.total_estimated_bytes_saved / (1024 * 1024),
+        )
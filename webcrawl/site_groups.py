@@ -0,0 +1,138 @@
+"""
+Grouping of company rows that share one website.
+
+Input sheets often list several legal entities of one company (holding, GmbH,
+GmbH & Co. KG) with the same website. crawl_domain.main() groups the rows by
+their canonical site (www/non-www and http/https are the same site; redirects
+were already resolved by the pre-crawl triage), crawls and extracts every site
+once, and records the groups in a SHARED_SITES_FILENAME manifest next to the
+aggregated markdown files. convert_to_csv later fans the extracted data of a
+shared site out to every company row that references it.
+"""
+
+import json
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+from webcrawl.domain_scheduler import get_host
+
+logger = logging.getLogger(__name__)
+
+SHARED_SITES_FILENAME = "shared_sites.json"
+
+
+def site_key(url: str) -> str:
+    """
+    Get the key identifying the website of a URL.
+
+    Args:
+        url: Company URL, e.g. 'http://www.firma.de/de/'
+
+    Returns:
+        str: Host without 'www.' plus path, scheme-independent, e.g. 'firma.de/de'
+    """
+    path = url.split("://", 1)[-1].partition("/")[2].strip("/")
+    key = get_host(url) if "://" in url else get_host("https://" + url)
+    return f"{key}/{path}" if path else key
+
+
+def group_by_site(
+    urls_and_companies: List[Tuple[str, str]],
+) -> List[Tuple[str, List[str]]]:
+    """
+    Group company rows by website, keeping the input order.
+
+    Args:
+        urls_and_companies: (url, company_name) tuples
+
+    Returns:
+        List[Tuple[str, List[str]]]: (url of the first row, company names of all
+            rows of the site) for every unique site
+    """
+    groups: Dict[str, Tuple[str, List[str]]] = {}
+    for url, company_name in urls_and_companies:
+        key = site_key(url)
+        if key not in groups:
+            groups[key] = (url, [])
+        if company_name not in groups[key][1]:
+            groups[key][1].append(company_name)
+    return list(groups.values())
+
+
+def write_shared_sites(
+    output_dir: str, site_groups: List[Tuple[str, List[str]]]
+) -> Optional[str]:
+    """
+    Write the sites shared by several companies to the manifest file.
+
+    Args:
+        output_dir: Directory of the aggregated markdown files
+        site_groups: Groups as returned by group_by_site()
+
+    Returns:
+        Optional[str]: Path of the manifest, or None if no site is shared
+    """
+    shared = [
+        {"url": url, "companies": companies}
+        for url, companies in site_groups
+        if len(companies) > 1
+    ]
+    path = os.path.join(output_dir, SHARED_SITES_FILENAME)
+    if not shared:
+        if os.path.exists(path):
+            os.remove(path)
+        return None
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(shared, f, indent=2, ensure_ascii=False)
+    return path
+
+
+def load_shared_sites(path: Optional[str]) -> Dict[str, List[str]]:
+    """
+    Load the shared-site manifest.
+
+    Args:
+        path: Path of the manifest; a missing file means no shared sites
+
+    Returns:
+        Dict[str, List[str]]: Company names by site key
+    """
+    if not path or not os.path.isfile(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning("Ignoring unreadable shared-site manifest %s: %s", path, e)
+        return {}
+    return {site_key(entry["url"]): list(entry["companies"]) for entry in entries}
+
+
+def companies_sharing_site(
+    shared_sites: Dict[str, List[str]], company_url: str
+) -> List[str]:
+    """
+    Get the other companies of the input that use the site of an extracted company.
+
+    The first company of a group is the one the site was crawled for; its row is
+    the extracted row itself, whatever company name the LLM read from the page.
+
+    Args:
+        shared_sites: Manifest as returned by load_shared_sites()
+        company_url: URL of the extracted company
+
+    Returns:
+        List[str]: Names of the other companies sharing the site
+    """
+    if not company_url:
+        return []
+    companies = shared_sites.get(site_key(company_url))
+    if companies is None:
+        # The extracted URL may be the bare host of a site crawled with a path
+        host = site_key(company_url).split("/")[0]
+        companies = next(
+            (names for key, names in shared_sites.items() if key.split("/")[0] == host),
+            [],
+        )
+    return companies[1:]
@@ -0,0 +1,239 @@
+"""
+Sitemap-based discovery of the internal pages of a website.
+
+Most company websites publish a sitemap.xml, either at the default location or
+referenced from robots.txt. Reading it over plain HTTP is much cheaper than
+rendering the homepage in a browser to collect its links, and usually lists more
+pages. This module fetches robots.txt and the sitemaps it references (falling
+back to the default sitemap locations), follows sitemap indexes, transparently
+decompresses gzipped sitemaps, and returns the page URLs found.
+
+The returned URLs are raw; crawl_domain.collect_internal_links() passes them
+through the same filter chain as browser-discovered links.
+"""
+
+import asyncio
+import gzip
+import io
+import logging
+import xml.etree.ElementTree as ET
+from collections import deque
+from typing import List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Default locations tried when robots.txt does not reference a sitemap
+DEFAULT_SITEMAP_PATHS = ["/sitemap.xml", "/sitemap_index.xml"]
+SITEMAP_REQUEST_TIMEOUT = 10.0  # seconds per request
+MAX_SITEMAP_FILES = 20  # sitemap files fetched per site, including indexes
+MAX_SITEMAP_URLS = 5000  # page URLs collected per site
+MAX_SITEMAP_BYTES = 20 * 1024 * 1024  # largest (decompressed) sitemap accepted
+GZIP_MAGIC = b"\x1f\x8b"
+SITEMAP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; webcrawl-sitemap/1.0)",
+    "Accept-Language": "de-DE,de;q=0.9",
+}
+
+
+def _strip_www(netloc: str) -> str:
+    netloc = netloc.lower()
+    return netloc[4:] if netloc.startswith("www.") else netloc
+
+
+def parse_robots_sitemaps(robots_txt: str, base_url: str) -> List[str]:
+    """
+    Extract the sitemap URLs declared in a robots.txt file.
+
+    Args:
+        robots_txt: Content of robots.txt
+        base_url: URL robots.txt was fetched from, used to resolve relative entries
+
+    Returns:
+        List[str]: Absolute sitemap URLs in declaration order
+    """
+    sitemaps = []
+    for line in robots_txt.splitlines():
+        key, _, value = line.partition(":")
+        if key.strip().lower() == "sitemap" and value.strip():
+            sitemap_url = urljoin(base_url, value.strip())
+            if sitemap_url not in sitemaps:
+                sitemaps.append(sitemap_url)
+    return sitemaps
+
+
+def parse_sitemap(content: bytes) -> Tuple[List[str], List[str]]:
+    """
+    Parse a sitemap or sitemap index document.
+
+    Args:
+        content: Raw (already decompressed) XML content
+
+    Returns:
+        Tuple[List[str], List[str]]: (page_urls, child_sitemap_urls)
+            - page_urls: <loc> entries of a <urlset>
+            - child_sitemap_urls: <loc> entries of a <sitemapindex>
+    """
+    try:
+        root = ET.fromstring(content)
+    except ET.ParseError as e:
+        logger.debug("Could not parse sitemap XML: %s", e)
+        return [], []
+
+    # Strip the XML namespace, e.g. '{http://www.sitemaps.org/...}urlset'
+    root_tag = root.tag.rsplit("}", 1)[-1].lower()
+    locs = [
+        element.text.strip()
+        for element in root.iter()
+        if element.tag.rsplit("}", 1)[-1].lower() == "loc" and element.text
+    ]
+
+    if root_tag == "sitemapindex":
+        return [], locs
+    if root_tag == "urlset":
+        return locs, []
+    logger.debug("Unexpected sitemap root element: %s", root.tag)
+    return [], []
+
+
+async def fetch_url(session: aiohttp.ClientSession, url: str) -> Optional[bytes]:
+    """
+    Fetch a URL over HTTP and return its body, gunzipping it if needed.
+
+    Args:
+        session: Open aiohttp session
+        url: URL to fetch
+
+    Returns:
+        Optional[bytes]: Response body, or None on errors and non-200 responses
+    """
+    try:
+        async with session.get(url, allow_redirects=True) as response:
+            if response.status != 200:
+                logger.debug(
+                    "Sitemap request %s returned HTTP %d", url, response.status
+                )
+                return None
+            body = await response.content.read(MAX_SITEMAP_BYTES + 1)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.debug("Sitemap request %s failed: %s", url, e)
+        return None
+
+    # Servers send .xml.gz files either as application/gzip or with
+    # Content-Encoding: gzip (already decoded by aiohttp)
+    if body.startswith(GZIP_MAGIC):
+        try:
+            with gzip.GzipFile(fileobj=io.BytesIO(body)) as f:
+                body = f.read(MAX_SITEMAP_BYTES + 1)
+        except (OSError, EOFError) as e:
+            logger.debug("Could not decompress %s: %s", url, e)
+            return None
+
+    if len(body) > MAX_SITEMAP_BYTES:
+        logger.warning("Sitemap %s exceeds %d bytes, skipping", url, MAX_SITEMAP_BYTES)
+        return None
+    return body
+
+
+def _same_site_url(url: str, main_url: str) -> Optional[str]:
+    """
+    Map a sitemap URL onto the scheme and host of main_url.
+
+    Sitemaps often list 'https://www.example.de/...' for a site crawled as
+    'http://example.de'; both are the same site, so the URL is rewritten to the
+    main URL's origin to pass the same-domain check of the link filters.
+
+    Returns:
+        Optional[str]: Rewritten URL, or None if it belongs to another site
+    """
+    parsed = urlparse(url)
+    main = urlparse(main_url)
+    if parsed.scheme not in ("http", "https"):
+        return None
+    if _strip_www(parsed.netloc) != _strip_www(main.netloc):
+        return None
+    return parsed._replace(scheme=main.scheme, netloc=main.netloc).geturl()
+
+
+async def discover_sitemap_urls(
+    main_url: str,
+    timeout: float = SITEMAP_REQUEST_TIMEOUT,
+    max_sitemaps: int = MAX_SITEMAP_FILES,
+    max_urls: int = MAX_SITEMAP_URLS,
+) -> List[str]:
+    """
+    Discover the pages of a website from its sitemaps.
+
+    Looks up sitemaps in robots.txt first and falls back to the default
+    locations. Sitemap indexes are followed breadth-first.
+
+    Args:
+        main_url: Primary URL of the website
+        timeout: Timeout in seconds for every HTTP request
+        max_sitemaps: Maximum number of sitemap files to fetch
+        max_urls: Maximum number of page URLs to return
+
+    Returns:
+        List[str]: Page URLs of the site (empty if no usable sitemap was found)
+    """
+    parsed = urlparse(main_url)
+    origin = f"{parsed.scheme}://{parsed.netloc}"
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+
+    page_urls: List[str] = []
+    seen_pages = set()
+
+    async with aiohttp.ClientSession(
+        timeout=client_timeout, headers=SITEMAP_HEADERS
+    ) as session:
+        robots_url = f"{origin}/robots.txt"
+        robots = await fetch_url(session, robots_url)
+        sitemap_urls = (
+            parse_robots_sitemaps(robots.decode("utf-8", "replace"), robots_url)
+            if robots
+            else []
+        )
+        declared_in_robots = bool(sitemap_urls)
+        if declared_in_robots:
+            logger.info(
+                "Found %d sitemap(s) in robots.txt of %s", len(sitemap_urls), origin
+            )
+        else:
+            sitemap_urls = [origin + path for path in DEFAULT_SITEMAP_PATHS]
+
+        queue = deque(sitemap_urls)
+        visited = set()
+        while queue and len(visited) < max_sitemaps and len(page_urls) < max_urls:
+            sitemap_url = queue.popleft()
+            if sitemap_url in visited:
+                continue
+            visited.add(sitemap_url)
+
+            content = await fetch_url(session, sitemap_url)
+            if content is None:
+                continue
+            pages, children = parse_sitemap(content)
+            queue.extend(child for child in children if child not in visited)
+
+            for page in pages:
+                same_site = _same_site_url(page, main_url)
+                if same_site is None or same_site in seen_pages:
+                    continue
+                seen_pages.add(same_site)
+                page_urls.append(same_site)
+                if len(page_urls) >= max_urls:
+                    break
+
+            # Without robots.txt, the first default location that works is enough
+            if not declared_in_robots and pages:
+                break
+
+    logger.info(
+        "Sitemap discovery for %s: %d page URLs from %d sitemap file(s)",
+        origin,
+        len(page_urls),
+        len(visited),
+    )
+    return page_urls
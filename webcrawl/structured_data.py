@@ -0,0 +1,318 @@
+"""
+Structured data harvested from crawled pages.
+
+Many manufacturer websites already describe their products and the company in
+machine-readable markup. While crawl_domain() renders a page, the cheap,
+high-signal parts of that markup are kept:
+
+- schema.org JSON-LD entities of product and organization types (also nested
+  ones, e.g. Offer -> itemOffered -> Product), reduced to a few text fields
+- meta description and keywords, OpenGraph title and description
+
+The harvested data of all pages of a domain is stored in a JSON file next to
+the aggregated markdown. extract_llm prefixes the markdown with a compact,
+de-duplicated summary of it (see structured_prefixed_markdown()).
+"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from lxml import etree
+from lxml import html as lxml_html
+
+logger = logging.getLogger(__name__)
+
+STRUCTURED_DATA_SUFFIX = ".structured.json"
+# Key under which cached pages keep their harvested data (their HTML is not cached)
+STRUCTURED_DATA_KEY = "structured_data"
+STRUCTURED_PREFIX_MAX_CHARS = 4000
+MAX_FIELD_CHARS = 300
+
+# schema.org types worth passing to the extraction
+RELEVANT_TYPES = {
+    "Product",
+    "ProductModel",
+    "IndividualProduct",
+    "ProductGroup",
+    "Service",
+    "Organization",
+    "Corporation",
+    "LocalBusiness",
+    "Brand",
+}
+# Entity fields kept, in output order
+ENTITY_FIELDS = (
+    "name",
+    "legalName",
+    "description",
+    "brand",
+    "manufacturer",
+    "model",
+    "category",
+    "material",
+    "slogan",
+    "knowsAbout",
+)
+# Meta tags kept, by name or OpenGraph property
+META_FIELDS = ("description", "keywords", "og:title", "og:description")
+
+
+def get_structured_data_path(markdown_file: str) -> str:
+    """Get the structured data file belonging to an aggregated markdown file."""
+    return os.path.splitext(markdown_file)[0] + STRUCTURED_DATA_SUFFIX
+
+
+def _text(value: Any) -> str:
+    """Flatten a JSON-LD value (text, named object or list) to short text."""
+    if isinstance(value, dict):
+        value = value.get("name") or value.get("@id") or ""
+    elif isinstance(value, list):
+        value = ", ".join(filter(None, (_text(item) for item in value)))
+    text = " ".join(str(value).split())
+    if len(text) > MAX_FIELD_CHARS:
+        text = text[:MAX_FIELD_CHARS].rstrip() + "…"
+    return text
+
+
+def _types(node: Dict[str, Any]) -> List[str]:
+    types = node.get("@type") or []
+    if isinstance(types, str):
+        types = [types]
+    # Full IRIs like "http://schema.org/Product" count as their short name
+    return [str(t).rsplit("/", 1)[-1] for t in types]
+
+
+def _collect_entities(node: Any, entities: List[Dict[str, str]]) -> None:
+    """Walk a JSON-LD document and collect the relevant entities it contains."""
+    if isinstance(node, list):
+        for item in node:
+            _collect_entities(item, entities)
+        return
+    if not isinstance(node, dict):
+        return
+    types = [t for t in _types(node) if t in RELEVANT_TYPES]
+    if types:
+        entity = {"type": types[0]}
+        for field in ENTITY_FIELDS:
+            text = _text(node.get(field, ""))
+            if text:
+                entity[field] = text
+        if len(entity) > 1:
+            entities.append(entity)
+    for value in node.values():
+        if isinstance(value, (dict, list)):
+            _collect_entities(value, entities)
+
+
+def harvest_structured_data(html: str) -> Dict[str, Any]:
+    """
+    Harvest JSON-LD entities and meta tags from the HTML of a page.
+
+    Args:
+        html: Raw HTML of the page
+
+    Returns:
+        Dict[str, Any]: {"json_ld": [...], "meta": {...}} with only the non-empty
+            parts; empty if the page has no usable markup
+    """
+    if not html or not isinstance(html, str):
+        return {}
+    try:
+        document = lxml_html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return {}
+
+    entities: List[Dict[str, str]] = []
+    for script in document.iter("script"):
+        if (script.get("type") or "").strip().lower() != "application/ld+json":
+            continue
+        try:
+            _collect_entities(json.loads(script.text or ""), entities)
+        except ValueError:
+            logger.debug("Skipping invalid JSON-LD block")
+
+    meta = {}
+    for element in document.iter("meta"):
+        name = (element.get("name") or element.get("property") or "").strip().lower()
+        content = _text(element.get("content") or "")
+        if name in META_FIELDS and content and name not in meta:
+            meta[name] = content
+
+    data: Dict[str, Any] = {}
+    if entities:
+        data["json_ld"] = entities
+    if meta:
+        data["meta"] = meta
+    return data
+
+
+def harvest_result(result: Any) -> Dict[str, Any]:
+    """
+    Get the structured data of a crawl result.
+
+    Results served from the page cache carry the data harvested when the page
+    was fetched in their metadata.
+
+    Args:
+        result: Crawl result of a page
+
+    Returns:
+        Dict[str, Any]: Harvested data as returned by harvest_structured_data()
+    """
+    metadata = result.metadata if isinstance(result.metadata, dict) else {}
+    if STRUCTURED_DATA_KEY in metadata:
+        return metadata[STRUCTURED_DATA_KEY] or {}
+    html = getattr(result, "html", None)
+    return harvest_structured_data(html if isinstance(html, str) else "")
+
+
+class StructuredData:
+    """
+    Structured data of the pages of one domain, kept in a JSON file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Path of the structured data file
+        """
+        self.path = path
+        self.pages: Dict[str, Dict[str, Any]] = load_structured_data(path)
+
+    def record(self, url: str, data: Dict[str, Any]) -> None:
+        """Record the harvested data of a page; pages without data are dropped."""
+        if data:
+            self.pages[url] = data
+        else:
+            self.pages.pop(url, None)
+
+    def retain(self, urls: List[str]) -> None:
+        """Forget the pages that are no longer part of the domain crawl."""
+        keep = set(urls)
+        self.pages = {url: data for url, data in self.pages.items() if url in keep}
+
+    def save(self) -> None:
+        """Write the file, or remove it if no page had structured data."""
+        if not self.pages:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            return
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.pages, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.path)
+
+
+def load_structured_data(path: str) -> Dict[str, Dict[str, Any]]:
+    """Load a structured data file; missing or unreadable files give no pages."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning("Ignoring unreadable structured data file %s: %s", path, e)
+        return {}
+
+
+def format_structured_data(
+    pages: Dict[str, Dict[str, Any]], max_chars: int = STRUCTURED_PREFIX_MAX_CHARS
+) -> str:
+    """
+    Format the structured data of a domain as a compact markdown block.
+
+    Entities and descriptions repeated on several pages (e.g. the Organization
+    block in every page template) are listed once.
+
+    Args:
+        pages: Harvested data by page URL
+        max_chars: Maximum length of the block; further lines are left out
+
+    Returns:
+        str: Markdown block, empty if there is no structured data
+    """
+    lines: List[str] = []
+    seen = set()
+    for data in pages.values():
+        for entity in data.get("json_ld", []):
+            fields = [
+                f"{field}: {entity[field]}"
+                for field in ENTITY_FIELDS
+                if field in entity and field != "name"
+            ]
+            line = f"- {entity['type']}: {entity.get('name', '')}"
+            if fields:
+                line += " | " + " | ".join(fields)
+            if line not in seen:
+                seen.add(line)
+                lines.append(line)
+    for data in pages.values():
+        for name, content in data.get("meta", {}).items():
+            if content not in seen:
+                seen.add(content)
+                lines.append(f"- {name}: {content}")
+    if not lines:
+        return ""
+
+    block = "## Structured Data (schema.org, meta tags)\n\n"
+    for line in lines:
+        if len(block) + len(line) + 1 > max_chars:
+            break
+        block += line + "\n"
+    return block + "\n"
+
+
+@contextmanager
+def structured_prefixed_markdown(
+    file_paths: List[str], structured_dir: Optional[str] = None
+) -> Iterator[List[str]]:
+    """
+    Provide the markdown files prefixed with the structured data of their domain.
+
+    Files with structured data are copied to a temporary directory under their
+    own name with the formatted block in front; the others are passed through.
+
+    Args:
+        file_paths: Aggregated markdown files
+        structured_dir: Directory searched for structured data files not found
+            next to the markdown (files materialized from the crawl store)
+
+    Yields:
+        List[str]: Paths to read instead of file_paths, in the same order
+    """
+    temp_dir = None
+    prefixed_paths = []
+    try:
+        for path in file_paths:
+            structured_path = get_structured_data_path(path)
+            if not os.path.exists(structured_path) and structured_dir:
+                structured_path = os.path.join(
+                    structured_dir, os.path.basename(structured_path)
+                )
+            block = format_structured_data(load_structured_data(structured_path))
+            if not block:
+                prefixed_paths.append(path)
+                continue
+            if temp_dir is None:
+                temp_dir = tempfile.mkdtemp(prefix="structured_")
+            prefixed_path = os.path.join(temp_dir, os.path.basename(path))
+            with open(path, "r", encoding="utf-8") as f:
+                content = f.read()
+            with open(prefixed_path, "w", encoding="utf-8") as f:
+                f.write(block + content)
+            prefixed_paths.append(prefixed_path)
+        if temp_dir is not None:
+            logger.info(
+                "Prefixed %d of %d files with structured data",
+                len(os.listdir(temp_dir)),
+                len(file_paths),
+            )
+        yield prefixed_paths
+    finally:
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
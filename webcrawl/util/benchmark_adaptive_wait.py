@@ -0,0 +1,118 @@
+"""
+Benchmark the adaptive page wait against the fixed delay_before_return_html sleep.
+
+Serves a local fixture site and crawls it twice with the body-only settings of
+crawl_domain: once with the fixed 0.5s delay and once with AdaptiveWaiter. The
+fixture mixes static pages, pages that render their content with JavaScript
+after a short delay, and pages with a never-ending ticker animation, so both
+the early return and the learned per-host cap are exercised. For every mode the
+wall time and the number of pages whose late content made it into the markdown
+are printed.
+
+Usage:
+    python -m webcrawl.util.benchmark_adaptive_wait --pages 30
+"""
+
+import argparse
+import asyncio
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig
+
+from webcrawl.adaptive_wait import AdaptiveWaiter
+from webcrawl.crawl_domain import BODY_PAGE_DELAY, create_browser_config
+
+LATE_CONTENT_MARKER = "Spaet geladener Inhalt"
+STATIC_TEXT = "<p>Wir fertigen Praezisionsteile fuer den Maschinenbau.</p>" * 20
+
+STATIC_PAGE = f"<html><body><main>{STATIC_TEXT}</main></body></html>"
+# Content inserted by JavaScript 150 ms after load
+JS_PAGE = f"""<html><body><main id="content">{STATIC_TEXT}</main>
+<script>
+setTimeout(() => {{
+    const p = document.createElement("p");
+    p.textContent = "{LATE_CONTENT_MARKER}";
+    document.getElementById("content").appendChild(p);
+}}, 150);
+</script></body></html>"""
+# A ticker that mutates the DOM forever, so the page never settles
+TICKER_PAGE = f"""<html><body><main>{STATIC_TEXT}</main><div id="ticker">0</div>
+<script>
+let i = 0;
+setInterval(() => {{ document.getElementById("ticker").textContent = i++; }}, 50);
+</script></body></html>"""
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        index = int(self.path.strip("/").split("-")[-1] or 0)
+        body = [STATIC_PAGE, JS_PAGE, TICKER_PAGE][index % 3].encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+async def crawl(urls, adaptive: bool):
+    config = CrawlerRunConfig(
+        cache_mode=CacheMode.BYPASS,
+        delay_before_return_html=BODY_PAGE_DELAY,
+        verbose=False,
+    )
+    waiter = AdaptiveWaiter() if adaptive else None
+    if waiter is not None:
+        config = waiter.configure(config, BODY_PAGE_DELAY)
+
+    async with AsyncWebCrawler(config=create_browser_config()) as crawler:
+        if waiter is not None:
+            for hook_type, hook in waiter.hooks().items():
+                crawler.crawler_strategy.set_hook(hook_type, hook)
+        start = time.perf_counter()
+        late_content_pages = 0
+        for url in urls:
+            result = await crawler.arun(url, config=config)
+            if result.success and LATE_CONTENT_MARKER in (result.markdown or ""):
+                late_content_pages += 1
+        elapsed = time.perf_counter() - start
+    return elapsed, late_content_pages, waiter
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=30, help="Pages to crawl per mode")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    urls = [f"http://{host}:{port}/page-{i}" for i in range(args.pages)]
+    js_pages = len([i for i in range(args.pages) if i % 3 == 1])
+
+    try:
+        for adaptive in (False, True):
+            elapsed, late_pages, waiter = asyncio.run(crawl(urls, adaptive))
+            mode = "adaptive" if adaptive else "fixed"
+            print(
+                f"{mode:>8}: {elapsed:6.2f}s for {len(urls)} pages "
+                f"({elapsed / len(urls):.3f}s/page), "
+                f"late JS content captured on {late_pages}/{js_pages} pages"
+            )
+            if waiter is not None:
+                print(
+                    f"          waited {waiter.total_waited:.2f}s "
+                    f"instead of {waiter.total_fixed:.2f}s"
+                )
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark crawl4ai's HTML processing on pathological pages with and without HtmlGuard.
+
+Runs AsyncWebCrawler.aprocess_html (the step shared by browser-rendered and
+HTTP-fetched pages, no browser needed) on generated fixture pages: a normal
+page, DOMs nested thousands of levels deep, a page with tens of megabytes of
+text, a page whose size is mostly inline script and a very wide flat page.
+Every page is processed once by a plain crawler and once by a crawler with
+HtmlGuard installed, with Python's default recursion limit. For every page and
+mode the processing time, the outcome and the length of the markdown are
+printed.
+
+Usage:
+    python -m webcrawl.util.benchmark_html_guard --size-mb 20
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig
+
+from webcrawl.html_guard import HtmlGuard
+
+PARAGRAPH = "<p>Wir fertigen Praezisionsteile fuer den Maschinenbau.</p>"
+
+
+def nested_page(depth: int) -> str:
+    return (
+        "<html><body>"
+        + PARAGRAPH
+        + "<div>" * depth
+        + "<p>Tief verschachtelter Inhalt</p>"
+        + "</div>" * depth
+        + PARAGRAPH
+        + "</body></html>"
+    )
+
+
+def fixture_pages(size_mb: float):
+    repeats = int(size_mb * 1024 * 1024 / len(PARAGRAPH))
+    yield "normal page", f"<html><body>{PARAGRAPH * 50}</body></html>"
+    yield "nested 1000", nested_page(1000)
+    yield "nested 20000", nested_page(20000)
+    yield f"{size_mb:g} MB text", f"<html><body>{PARAGRAPH * repeats}</body></html>"
+    yield (
+        f"{size_mb:g} MB inline script",
+        "<html><head><script>var data = '"
+        + "x" * int(size_mb * 1024 * 1024)
+        + f"';</script></head><body>{PARAGRAPH * 50}</body></html>",
+    )
+    yield (
+        "200k siblings",
+        "<html><body>" + "<span>Teil</span>" * 200000 + "</body></html>",
+    )
+
+
+async def process(crawler: AsyncWebCrawler, html: str):
+    config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS, verbose=False)
+    start = time.perf_counter()
+    try:
+        result = await crawler.aprocess_html(
+            url="https://fixture.example",
+            html=html,
+            extracted_content=None,
+            config=config,
+            screenshot=None,
+            pdf_data=None,
+            verbose=False,
+        )
+        outcome, markdown = "ok", str(result.markdown or "")
+    except (RecursionError, MemoryError, ValueError) as e:
+        outcome, markdown = type(e).__name__, ""
+        if "recursion" in str(e):
+            outcome = "RecursionError"
+    return time.perf_counter() - start, outcome, len(markdown)
+
+
+async def run(size_mb: float, max_html_mb: float, max_dom_depth: int):
+    plain = AsyncWebCrawler()
+    guarded = AsyncWebCrawler()
+    guard = HtmlGuard(max_html_mb=max_html_mb, max_dom_depth=max_dom_depth)
+    guard.install(guarded)
+
+    for name, html in fixture_pages(size_mb):
+        print(f"{name} ({len(html) / (1024 * 1024):.1f} MB)")
+        for mode, crawler in (("plain", plain), ("guarded", guarded)):
+            elapsed, outcome, markdown_chars = await process(crawler, html)
+            print(
+                f"  {mode:>8}: {elapsed:7.3f}s  {outcome:<15} "
+                f"{markdown_chars:>10} markdown characters"
+            )
+    guard.log_summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--size-mb", type=float, default=20, help="Size of the oversized fixtures"
+    )
+    parser.add_argument("--max-html-mb", type=float, default=2, help="Guard size limit")
+    parser.add_argument("--max-dom-depth", type=int, default=200, help="Guard depth limit")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("webcrawl.html_guard").setLevel(logging.INFO)
+
+    asyncio.run(run(args.size_mb, args.max_html_mb, args.max_dom_depth))
+
+
+if __name__ == "__main__":
+    main()